@@ -1,22 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
 
 # 세션 상태 초기화 (Streamlit 명령 아님)
 if "app_state" not in st.session_state:
     st.session_state.app_state = {
         "analysis_done": False,
-        "apt1_selected": False,
-        "apt2_selected": False,
-        "apt1_complex": None,
-        "apt2_complex": None,
-        "apt1_pyeong": None,
-        "apt2_pyeong": None,
+        "selections": [],          # 비교 목록: [{"complexNo", "complexName", "pyeong"}, ...]
         "last_analysis_time": None,
+        "job_id": None,
+        "run_id": None,
         "error": None
     }
 
@@ -28,17 +19,9 @@ st.set_page_config(
 )
 
 # 이후 모듈 임포트
-from src.config import UI_CONFIG
-from src.data_loader import (
-    load_region_mapping,
-    load_analysis_data,
-    get_dropdown_options,
-    get_sigungu_options,
-    get_dong_options,
-    load_pyeong_data
-)
-from src.api_client import fetch_complex_list
-from src.ui_components_v2 import render_sidebar, render_visualization
+# (plotly, requests 등 무거운 모듈은 해당 화면을 그릴 때 각 함수에서 임포트)
+from src.data_loader import load_region_mapping
+from src.ui_components_v2 import render_sidebar, render_visualization, poll_active_job, get_current_run, render_performance_panel
 from src.styles import STREAMLIT_STYLE
 
 # 스타일 적용
@@ -62,9 +45,15 @@ st.caption("내가 갈아타고 싶은 아파트의 실거래와 매물을 좀
 if st.session_state.app_state["error"]:
     st.error(st.session_state.app_state["error"])
 elif not st.session_state.app_state["analysis_done"]:
-    st.info("아파트1과 아파트2를 선택하고 '분석 실행' 버튼을 눌러주세요.")
+    st.info("비교할 아파트를 2개 이상 추가하고 '분석 실행' 버튼을 눌러주세요.")
 else:
-    render_visualization(selected_complexes, df_filtered)
+    render_visualization(selected_complexes, df_filtered, get_current_run())
+
+# 사이드바 하단 성능 패널 (이번 렌더링 시간까지 반영하도록 본문 뒤에 그림)
+render_performance_panel()
+
+# 진행 중인 분석 작업이 있으면 상태 갱신 (화면을 모두 그린 뒤 대기)
+poll_active_job()
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
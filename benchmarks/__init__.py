@@ -0,0 +1 @@
+"""성능 측정 도구 (합성 데이터 생성기, 파이프라인 벤치마크)"""
@@ -0,0 +1,507 @@
+"""네이버 부동산 API 로컬 대역 서버 (수집기 부하 테스트용)
+
+    python -m benchmarks.fake_naver serve --scale district --port 8765 --latency-ms 80 --throttle-rate 0.02
+    python -m benchmarks.fake_naver serve --fixtures benchmarks/fixtures/sample
+    python -m benchmarks.fake_naver record 138183 136913 --out benchmarks/fixtures/sample
+    python -m benchmarks.fake_naver loadtest --scale district --complexes 20 --workers 8 --latency-ms 50
+
+수집기가 호출하는 엔드포인트(complexes/{id}, prices/real 페이지 조회, prices(공급자 시세), schools,
+articles/complex 페이지 조회, buildings/landprice, regions/complexes)를 합성 데이터셋(benchmarks.synthetic)
+또는 녹화한 실제 응답(fixtures)으로 응답함. 지연/오류(500)/요청 제한(429)을 주입할 수 있으며,
+수집기는 NAVER_LAND_BASE_URL 환경변수나 main_function(api_base_url=...)로 이 서버를 바라보게 함.
+GET /__stats 는 경로별 응답 코드 집계, GET /__reset 은 집계 초기화.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from src.config import COLLECT_CONFIG
+from src.instrumentation import trace
+from src.naver_apt_v5 import COMPLEX_KEYS
+from src.raw_archive import archive_responses, response_key
+from benchmarks.synthetic import SCALES, ARTICLE_KEYS, generate, dataset_paths
+
+# 엔드포인트 이름과 경로 패턴 (/api/ 이후)
+ROUTES: List[Tuple[str, "re.Pattern"]] = [
+    ("complex", re.compile(r"^complexes/(\d+)$")),
+    ("real_price", re.compile(r"^complexes/(\d+)/prices/real$")),
+    ("prices", re.compile(r"^complexes/(\d+)/prices$")),
+    ("schools", re.compile(r"^complexes/(\d+)/schools$")),
+    ("landprice", re.compile(r"^complexes/(\d+)/buildings/landprice$")),
+    ("articles", re.compile(r"^articles/complex/(\d+)$")),
+    ("regions", re.compile(r"^regions/complexes$")),
+]
+
+ARTICLE_PAGE_SIZE = 20      # articles/complex 한 페이지 매물 수
+REAL_PRICE_PAGE_ROWS = 10   # prices/real 한 번에 내려주는 거래 수 (addedRowCount 단위)
+
+
+def match_route(api_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """API 경로 → (엔드포인트 이름, 단지번호)"""
+    for name, pattern in ROUTES:
+        m = pattern.match(api_path)
+        if m:
+            return name, (m.group(1) if m.groups() else None)
+    return None, None
+
+
+def fixture_key(url: str) -> str:
+    """요청 URL을 녹화 파일 조회 키로 변환 (/api/ 이후 경로 + 정렬한 쿼리, 서버 주소와 무관)"""
+    return response_key(url)
+
+
+def _fixture_filename(key: str) -> str:
+    api_path = key.split("?", 1)[0]
+    return f"{api_path.replace('/', '_')}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}.json"
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """JSON으로 내보낼 수 있는 레코드 목록 (결측값은 빈 문자열, 수집기 CSV와 같은 처리)"""
+    return df.astype(object).where(df.notna(), "").to_dict("records")
+
+
+def _compact_date(value) -> str:
+    """'2024-01-31' → '20240131' (API 원본 날짜 형식)"""
+    return str(value).replace("-", "")
+
+
+class SyntheticApi:
+    """합성 데이터셋(benchmarks.synthetic.generate 결과)을 API 응답 형태로 제공"""
+
+    def __init__(self, dataset: Dict[str, pd.DataFrame]):
+        self.dataset = dataset
+        complexes = _records(dataset["COMPLEX"])
+        self.complexes = {str(c["complexNo"]): c for c in complexes}
+        self.region_complexes: Dict[str, List[Dict]] = {}
+        for c in complexes:
+            self.region_complexes.setdefault(str(c["cortarNo"]), []).append(c)
+
+        self.pyeongs: Dict[str, List[Dict]] = {}
+        for p in _records(dataset["PYEONG"]):
+            self.pyeongs.setdefault(str(p["complexNo"]), []).append(p)
+
+        # (단지, 평형번호) → 최근 거래부터 정렬한 거래 목록
+        self.trades: Dict[Tuple[str, str], List[Dict]] = {}
+        df_price = dataset["REAL_PRICE"].sort_values("dealDate", ascending=False, kind="stable")
+        for t in _records(df_price):
+            year, month, day = str(t["dealDate"]).split("-")
+            self.trades.setdefault((str(t["complexNo"]), str(t["pyeongNo"])), []).append({
+                "tradeType": t["tradeType"], "tradeYear": year, "tradeMonth": int(month), "tradeDate": int(day),
+                "dealPrice": t["dealAmount"], "floor": t["floor"],
+            })
+
+        self.providers = {
+            (str(p["complexNo"]), str(p["pyeongNo"]), p["provider"]): p for p in _records(dataset["PROVIDER"])
+        }
+
+        self.articles: Dict[str, List[Dict]] = {}
+        df_sell = dataset["SELL"]
+        sell_keys = [k for k in ARTICLE_KEYS if k in df_sell.columns]
+        for a in _records(df_sell[sell_keys + ["complexNo", "rentPrc"]]):
+            complex_no = str(a.pop("complexNo"))
+            a["articleConfirmYmd"] = _compact_date(a["articleConfirmYmd"])
+            self.articles.setdefault(complex_no, []).append(a)
+
+        self.dongs = {(str(d["complexNo"]), str(d["dongNo"])): d for d in _records(dataset["DONG"])}
+
+    def respond(self, route: str, complex_no: Optional[str], query: Dict[str, str]) -> Tuple[int, Dict]:
+        handler = getattr(self, f"_{route}")
+        if complex_no is not None and complex_no not in self.complexes:
+            return 404, {"message": "complex not found"}
+        return 200, handler(complex_no, query)
+
+    def _complex(self, complex_no, query):
+        c = self.complexes[complex_no]
+        detail = {k: c.get(k, "") for k in COMPLEX_KEYS}
+        detail["useApproveYmd"] = _compact_date(detail["useApproveYmd"])
+        detail["pyoengNames"] = str(detail["pyoengNames"]).replace("㎡", "")
+        pyeong_list = [{
+            "pyeongNo": str(p["pyeongNo"]),
+            "supplyArea": p["supplyArea"],
+            "supplyPyeong": p["supplyPyeong"],
+            "pyeongName": p["pyeongName"],
+            "pyeongName2": p["pyeongName2"],
+            "exclusiveArea": p["exclusiveArea"],
+            "exclusivePyeong": p["exclusivePyeong"],
+            "exclusiveRate": p["exclusiveRate"],
+            "realEstateTypeCode": p["realEstateTypeCode"],
+            "householdCountByPyeong": p["householdCountByPyeong"],
+            "roomCnt": p["roomCnt"],
+            "bathroomCnt": p["bathroomCnt"],
+            "articleStatistics": {
+                "dealCount": p["dealCount"], "leaseCount": p["leaseCount"], "rentCount": p["rentCount"],
+                "shortTermRentCount": p["shortTermRentCount"],
+                "dealPriceMin": p["dealPriceMin"], "dealPriceMax": p["dealPriceMax"],
+            },
+            "averageMaintenanceCost": {},
+        } for p in self.pyeongs.get(complex_no, [])]
+        return {"complexDetail": detail, "complexPyeongDetailList": pyeong_list}
+
+    def _real_price(self, complex_no, query):
+        rows = self.trades.get((complex_no, str(query.get("areaNo", ""))), [])
+        start = int(query.get("addedRowCount") or 0)
+        page = rows[start:start + REAL_PRICE_PAGE_ROWS]
+        months: List[Dict] = []
+        for t in page:
+            if not months or (months[-1]["tradeBaseYear"], months[-1]["tradeBaseMonth"]) != (t["tradeYear"], t["tradeMonth"]):
+                months.append({"tradeBaseYear": t["tradeYear"], "tradeBaseMonth": t["tradeMonth"], "realPriceList": []})
+            months[-1]["realPriceList"].append(t)
+        return {"realPriceOnMonthList": months, "addedRowCount": start + len(page)}
+
+    def _prices(self, complex_no, query):
+        p = self.providers.get((complex_no, str(query.get("areaNo", "")), query.get("provider", "")))
+        if p is None:
+            return {"marketPrices": []}
+        market = {k: v for k, v in p.items() if k not in ("complexNo", "complexName", "pyeongNo", "pyeongName", "pyeongName2", "downloadDate")}
+        market["baseYearMonthDay"] = _compact_date(market["baseYearMonthDay"])
+        return {"marketPrices": [market]}
+
+    def _schools(self, complex_no, query):
+        c = self.complexes[complex_no]
+        return {"schools": [{"schoolName": c["schoolName"], "walkTime": c["walkTime"], "totalStudentCount": c["totalStudentCount"]}]}
+
+    def _landprice(self, complex_no, query):
+        d = self.dongs.get((complex_no, str(query.get("dongNo", ""))))
+        if d is None:
+            return {"landPriceTotal": {}}
+        return {"landPriceTotal": {"landPriceFloors": [{
+            "floor": d["max_floor"],
+            "landPrices": [{"hscpNo": complex_no, "hscpNm": d["complexName"], "dongNm": d["dongNm"]}],
+        }]}}
+
+    def _articles(self, complex_no, query):
+        articles = self.articles.get(complex_no, [])
+        page = max(int(query.get("page") or 1), 1)
+        start = (page - 1) * ARTICLE_PAGE_SIZE
+        return {
+            "articleList": articles[start:start + ARTICLE_PAGE_SIZE],
+            "isMoreData": start + ARTICLE_PAGE_SIZE < len(articles),
+        }
+
+    def _regions(self, complex_no, query):
+        return {"complexList": [{
+            "complexNo": str(c["complexNo"]), "complexName": c["complexName"], "cortarNo": str(c["cortarNo"]),
+            "realEstateTypeCode": "APT", "realEstateTypeName": "아파트",
+            "latitude": c["latitude"], "longitude": c["longitude"],
+            "totalHouseholdCount": c["totalHouseholdCount"], "totalBuildingCount": c["totalDongCount"],
+            "highFloor": c["highFloor"], "lowFloor": c["lowFloor"],
+            "useApproveYmd": _compact_date(c["useApproveYmd"]),
+            "dealCount": c["dealCount"], "leaseCount": c["leaseCount"], "rentCount": c["rentCount"],
+        } for c in self.region_complexes.get(str(query.get("cortarNo", "")), [])]}
+
+
+class FixtureApi:
+    """record 명령으로 저장한 실제 응답을 같은 요청(경로+쿼리)에 그대로 재생"""
+
+    def __init__(self, fixtures_dir):
+        self.responses: Dict[str, Dict] = {}
+        for path in Path(fixtures_dir).glob("*.json"):
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+            self.responses[fixture["key"]] = fixture["data"]
+
+    def respond_to(self, key: str) -> Tuple[int, Dict]:
+        if key not in self.responses:
+            return 404, {"message": f"no fixture for {key}"}
+        return 200, self.responses[key]
+
+
+class FaultInjector:
+    """요청마다 지연을 주고, 요청 제한(429)/서버 오류(500)를 주입
+
+    rate_limit: 초당 허용 요청 수 (토큰 버킷, 초과 시 429). None이면 제한 없음.
+    throttle_rate / error_rate: 무작위로 429 / 500을 돌려줄 비율.
+    """
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, rate_limit: Optional[float] = None, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0.0
+        self._refilled_at = time.monotonic()
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def before_request(self) -> Optional[int]:
+        """주입할 오류 상태 코드 반환 (정상 응답이면 None). 지연은 호출한 스레드에서 대기."""
+        with self._lock:
+            delay = self.latency_ms + (self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+            if self.rate_limit and not self._take_token():
+                status = 429
+            elif self._random.random() < self.throttle_rate:
+                status = 429
+            elif self._random.random() < self.error_rate:
+                status = 500
+            else:
+                status = None
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return status
+
+
+class RequestStats:
+    """엔드포인트/응답 코드별 요청 수 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts: Counter = Counter()
+            self.started_at = time.time()
+
+    def add(self, route: str, status: int):
+        with self._lock:
+            self.counts[(route, status)] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            by_route: Dict[str, Dict[str, int]] = {}
+            for (route, status), count in self.counts.items():
+                by_route.setdefault(route, {})[str(status)] = count
+            total = sum(self.counts.values())
+            elapsed = time.time() - self.started_at
+        return {"total": total, "elapsed_sec": round(elapsed, 3), "by_route": by_route}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeNaverServer"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/__stats":
+            return self._send(200, self.server.stats.snapshot())
+        if parts.path == "/__reset":
+            self.server.stats.reset()
+            return self._send(200, {"reset": True})
+
+        api_path = parts.path.split("/api/", 1)[-1].strip("/") if "/api/" in parts.path else ""
+        route, complex_no = match_route(api_path)
+        if route is None:
+            return self._send(404, {"message": "unknown endpoint"}, "unknown")
+
+        injected = self.server.faults.before_request()
+        if injected == 429:
+            return self._send(429, {"message": "Too Many Requests"}, route, {"Retry-After": "1"})
+        if injected == 500:
+            return self._send(500, {"message": "Internal Server Error"}, route)
+
+        api = self.server.api
+        if isinstance(api, FixtureApi):
+            status, payload = api.respond_to(fixture_key(self.path))
+        else:
+            status, payload = api.respond(route, complex_no, dict(parse_qsl(parts.query, keep_blank_values=True)))
+        self._send(status, payload, route)
+
+    def _send(self, status: int, payload: Dict, route: Optional[str] = None, headers: Optional[Dict] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if route is not None:
+            self.server.stats.add(route, status)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 출력하지 않음 (/__stats로 확인)
+
+
+class FakeNaverServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, api, faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.api = api
+        self.faults = faults or FaultInjector()
+        self.stats = RequestStats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(api, faults: Optional[FaultInjector] = None, host: str = "127.0.0.1", port: int = 0) -> FakeNaverServer:
+    """백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트 자동 선택). 종료는 server.shutdown()."""
+    server = FakeNaverServer(api, faults, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record_fixtures(complex_ids: Iterable, out_dir, cortar_nos: Iterable[str] = (), api_base_url: Optional[str] = None) -> int:
+    """실제 API(또는 api_base_url)로 수집기를 한 번 실행하며 모든 정상 응답을 out_dir에 저장
+
+    수집 산출물은 임시 폴더에 쓰고 버림. cortar_nos가 있으면 지역별 단지 목록 응답도 저장.
+    저장한 응답 수 반환.
+    """
+    from src.naver_apt_v5 import main_function, fetch_json, response_hook
+    from src.credentials import api_url, get_request_profile
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+    saved = set()
+
+    def save(url, data):
+        key = fixture_key(url)
+        with lock:
+            (out_dir / _fixture_filename(key)).write_text(
+                json.dumps({"key": key, "data": data}, ensure_ascii=False), encoding="utf-8"
+            )
+            saved.add(key)
+
+    with response_hook(save):
+        cookies, headers = get_request_profile("REGION")
+        for cortar_no in cortar_nos:
+            fetch_json(api_url("regions/complexes", api_base_url),
+                       {"cortarNo": str(cortar_no), "realEstateType": "APT:PRE:JGC:ABYG", "order": ""},
+                       cookies, headers)
+        with tempfile.TemporaryDirectory() as tmp:
+            main_function(list(complex_ids), paths=dataset_paths(tmp), api_base_url=api_base_url)
+    return len(saved)
+
+
+def run_loadtest(scale: str, complexes: int, workers: int, faults: FaultInjector, seed: int = 0) -> Dict:
+    """합성 데이터 대역 서버를 띄우고 main_function 전체 수집을 실행한 결과 요약
+
+    수집률은 대역 서버가 가진 실거래/매물 행 수 대비 수집기가 저장한 행 수.
+    trace_summary는 수집기 쪽에서 잰 단계/엔드포인트별 소요 시간 (src.instrumentation.summarize).
+    """
+    from src.naver_apt_v5 import main_function
+
+    dataset = generate(scale, seed)
+    server = start_server(SyntheticApi(dataset), faults)
+    ids = dataset["COMPLEX"]["complexNo"].astype(str).head(complexes).tolist()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = dataset_paths(tmp)
+            started = time.perf_counter()
+            # 원본 응답 보관까지 수집 비용에 포함하되, 합성 데이터 응답은 임시 폴더에 보관
+            with contextlib.redirect_stdout(io.StringIO()), trace("loadtest") as collect_trace, \
+                    archive_responses(time.strftime("%Y-%m-%d %H:%M:%S"), base_dir=Path(tmp) / "raw"):
+                main_function(ids, paths=paths, api_base_url=server.base_url, max_workers=workers)
+            elapsed = time.perf_counter() - started
+
+            def count_rows(key):
+                path = paths[key]
+                return len(pd.read_csv(path, encoding="utf-8-sig")) if path.exists() and path.stat().st_size else 0
+
+            def expected_rows(key):
+                return int(dataset[key]["complexNo"].astype(str).isin(ids).sum())
+
+            coverage = {key: (count_rows(key), expected_rows(key)) for key in ("REAL_PRICE", "SELL", "DONG")}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = server.stats.snapshot()
+    return {
+        "complexes": len(ids),
+        "workers": workers,
+        "elapsed_sec": elapsed,
+        "requests": stats["total"],
+        "requests_per_sec": stats["total"] / elapsed if elapsed > 0 else 0.0,
+        "by_route": stats["by_route"],
+        "coverage": coverage,
+        "trace_summary": collect_trace.summary(),
+    }
+
+
+def _add_fault_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=0, help="응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 편차 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="무작위 429 응답 비율")
+    parser.add_argument("--rate-limit", type=float, help="초당 허용 요청 수 (초과 시 429)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def _faults_from_args(args) -> FaultInjector:
+    return FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.rate_limit, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 부동산 API 로컬 대역 서버")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="대역 서버 실행")
+    serve.add_argument("--scale", choices=list(SCALES), default="district", help="합성 데이터 규모")
+    serve.add_argument("--fixtures", help="녹화 응답 폴더 (지정 시 합성 데이터 대신 사용)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    _add_fault_arguments(serve)
+
+    record = sub.add_parser("record", help="실제 API 응답을 fixtures로 저장")
+    record.add_argument("complex_ids", nargs="+")
+    record.add_argument("--out", required=True)
+    record.add_argument("--cortar", nargs="*", default=[], help="단지 목록도 저장할 법정동 코드")
+    record.add_argument("--base-url", help="녹화할 서버 주소 (기본: 실제 API)")
+
+    loadtest = sub.add_parser("loadtest", help="대역 서버로 main_function 전체 수집 부하 테스트")
+    loadtest.add_argument("--scale", choices=list(SCALES), default="district")
+    loadtest.add_argument("--complexes", type=int, default=20, help="수집할 단지 수")
+    loadtest.add_argument("--workers", type=int, default=COLLECT_CONFIG["MAX_WORKERS"], help="단지별 동시 수집 수")
+    _add_fault_arguments(loadtest)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        api = FixtureApi(args.fixtures) if args.fixtures else SyntheticApi(generate(args.scale, args.seed))
+        server = FakeNaverServer(api, _faults_from_args(args), args.host, args.port)
+        print(f"대역 서버 실행 중: {server.base_url}  (NAVER_LAND_BASE_URL={server.base_url})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif args.command == "record":
+        count = record_fixtures(args.complex_ids, args.out, args.cortar, args.base_url)
+        print(f"응답 {count}개 저장: {args.out}")
+    else:
+        result = run_loadtest(args.scale, args.complexes, args.workers, _faults_from_args(args), args.seed)
+        print(f"단지 {result['complexes']}개, 동시 수집 {result['workers']}개: "
+              f"{result['elapsed_sec']:.2f}s, 요청 {result['requests']:,}건 ({result['requests_per_sec']:.1f} req/s)")
+        for route, counts in sorted(result["by_route"].items()):
+            print(f"  {route:12s} " + ", ".join(f"{status}: {n:,}" for status, n in sorted(counts.items())))
+        summary = result["trace_summary"]
+        for category, title in (("stage", "단계"), ("http", "요청")):
+            rows = summary[summary["category"] == category]
+            print(f"  [{title}]")
+            for row in rows.itertuples():
+                print(f"    {row.label:32s} {row.count:6,}회  p50 {row.p50_ms:8.1f}ms  p95 {row.p95_ms:8.1f}ms  최대 {row.max_ms:8.1f}ms")
+        for key, (got, expected) in result["coverage"].items():
+            ratio = got / expected * 100 if expected else 100.0
+            print(f"  수집률 {key:10s} {got:,}/{expected:,} ({ratio:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
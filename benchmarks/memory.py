@@ -0,0 +1,127 @@
+"""수집/병합/화면 계산 단계별 메모리 프로파일링
+
+    python -m benchmarks.memory --scale district
+    python -m benchmarks.memory --scale city --complexes 300 --top 20 --json data/bench/memory.json
+    python -m benchmarks.memory --scale city --skip-collect      # 합성 데이터셋으로 병합/화면 계산만
+
+수집은 별도 프로세스로 띄운 대역 서버(benchmarks.fake_naver)를 상대로 실행하므로
+서버 쪽 메모리는 측정에 섞이지 않음. 각 단계의 최고/잔류 메모리와 상위 할당 위치를 출력함.
+"""
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+from src.config import BASE_DIR
+from src.schema import read_dataset
+from src.instrumentation import span, trace
+from src.memory_profile import memory_profiling, memory_report
+from src.raw_archive import archive_responses
+from benchmarks.synthetic import SCALES, dataset_paths, ensure_dataset
+from benchmarks.run import CASES, prepare_context, _run_merge
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_fake_server(scale: str, seed: int, timeout: float = 120.0):
+    """대역 서버를 별도 프로세스로 실행하고 (프로세스, 주소) 반환"""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_naver", "serve", "--scale", scale, "--seed", str(seed), "--port", str(port)],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("대역 서버가 시작되지 않았습니다.")
+        try:
+            urllib.request.urlopen(f"{base_url}/__stats", timeout=1).read()
+            return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("대역 서버 시작 대기 시간 초과")
+
+
+def profile_pipeline(scale: str, complexes: int = 0, seed: int = 0, top: int = 10,
+                     skip_collect: bool = False) -> List[Dict]:
+    """수집 → 병합 → 화면 계산을 메모리 프로파일링하며 실행하고 span 기록 반환
+
+    complexes: 수집할 단지 수 (0이면 전체). skip_collect면 합성 데이터셋을 그대로 입력으로 사용.
+    """
+    from src.naver_apt_v5 import main_function
+
+    source = ensure_dataset(scale, seed)
+    ids = read_dataset(source["COMPLEX"], "complex", columns=["complexNo"])["complexNo"].tolist()
+    if complexes:
+        ids = ids[:complexes]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if skip_collect:
+            paths = source
+        else:
+            paths = dataset_paths(tmp)
+            server, base_url = spawn_fake_server(scale, seed)
+        try:
+            with memory_profiling(top), trace("memory") as memory_trace:
+                if server is not None:
+                    with span("pipeline.collect", complexes=len(ids)), \
+                            archive_responses(time.strftime("%Y-%m-%d %H:%M:%S"), base_dir=Path(tmp) / "raw"):
+                        main_function(ids, paths=paths, api_base_url=base_url)
+                with span("pipeline.merge"):
+                    _run_merge(ids, paths)
+                with span("render.prepare"):
+                    ctx = prepare_context(paths)
+                for name, case in CASES:
+                    if name.startswith("viz."):
+                        with span(f"render.{name[len('viz.'):]}"):
+                            case(ctx)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            if skip_collect and paths["RESULT"].exists():
+                paths["RESULT"].unlink()  # 데이터셋 폴더에 병합 결과를 남기지 않음
+    return memory_trace.records()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="단계별 메모리 프로파일링 (tracemalloc)")
+    parser.add_argument("--scale", choices=list(SCALES), default="district")
+    parser.add_argument("--complexes", type=int, default=0, help="수집할 단지 수 (0이면 전체)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10, help="단계별로 기록할 할당 위치 수 (0이면 최고/잔류만)")
+    parser.add_argument("--skip-collect", action="store_true", help="수집 없이 합성 데이터셋으로 병합/화면 계산만")
+    parser.add_argument("--json", help="span 기록을 저장할 파일 (JSON)")
+    args = parser.parse_args(argv)
+
+    from streamlit import config as st_config
+    import streamlit.logger
+    st_config.get_option("logger.level")  # 설정을 먼저 읽어야 아래 로그 레벨이 덮어쓰이지 않음
+    streamlit.logger.set_log_level("error")
+
+    started = time.perf_counter()
+    records = profile_pipeline(args.scale, args.complexes, args.seed, args.top, args.skip_collect)
+    print(f"규모 {args.scale}: {time.perf_counter() - started:.1f}s (프로파일링 부하 포함)\n")
+    print(memory_report(records, limit=max(args.top, 15)))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(records, ensure_ascii=False, indent=1, default=str), encoding="utf-8")
+        print(f"\n기록 저장: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""파이프라인 벤치마크 (병합 / 로더 / 시각화 데이터 준비)
+
+    python -m benchmarks                                  # pair, district 규모 측정
+    python -m benchmarks --scale city --repeat 3
+    python -m benchmarks --save v1                        # 결과를 benchmarks/baselines/v1.json에 저장
+    python -m benchmarks --compare v1                     # 저장된 기준과 비교 (느려진 항목이 있으면 종료 코드 1)
+    python -m benchmarks --cases viz merge                # 이름이 해당 접두어로 시작하는 항목만
+
+데이터는 benchmarks.synthetic으로 생성한 합성 데이터셋(data/bench/<scale>-<seed>)을 사용함.
+st.cache_data 로더는 캐시를 거치지 않도록 원본 함수(__wrapped__)를 직접 호출함.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import BASE_DIR, CHART_CONFIG, UI_CONFIG
+from src.schema import read_dataset
+from benchmarks.synthetic import SCALES, ensure_dataset
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# 기준 대비 이 비율 이상 느려지고, 차이가 NOISE_FLOOR_SEC 이상이면 회귀로 판단
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_SEC = 0.002
+
+
+def _run_merge(ids: List[str], paths: Dict[str, Path]):
+    """병합 실행 (실패 시 마지막 로그 메시지로 예외 발생 - 실패 경로를 측정하지 않도록)"""
+    from src import sell_price_merge_v2
+    messages = []
+    if sell_price_merge_v2.main(complex_ids=ids, log=messages.append, paths=paths) is None:
+        raise RuntimeError(messages[-1] if messages else "병합 실패")
+
+
+def prepare_context(paths: Dict[str, Path]) -> Dict:
+    """측정에 필요한 입력 데이터 준비 (병합 결과가 없으면 한 번 실행)
+
+    선택 단지/평형은 앱의 최대 비교 개수(MAX_SELECTIONS)만큼 앞에서부터 고름.
+    """
+    from src.data_loader import load_real_price_data, load_result_data
+    from src.aggregates import build_monthly_cube
+
+    ids = read_dataset(paths["COMPLEX"], "complex", columns=["complexNo"])["complexNo"].tolist()
+    if not paths["RESULT"].exists():
+        _run_merge(ids, paths)
+
+    df_real = load_real_price_data.__wrapped__(str(paths["REAL_PRICE"]), 0.0)
+    df_result = load_result_data.__wrapped__(str(paths["RESULT"]), 0.0)
+    cube = build_monthly_cube(df_real)
+
+    pairs = list(
+        cube.loc[cube["period"] == 5, ["complexNo", "pyeongName3"]]
+        .drop_duplicates().head(UI_CONFIG["MAX_SELECTIONS"]).itertuples(index=False, name=None)
+    )
+    df_pairs = pd.DataFrame(pairs, columns=["complexNo", "pyeongName3"])
+    df_listing = df_pairs.merge(df_result, on=["complexNo", "pyeongName3"], how="inner")
+    df_trades = df_pairs.merge(df_real, on=["complexNo", "pyeongName3"], how="inner")
+    return {
+        "paths": paths,
+        "ids": ids,
+        "df_real": df_real,
+        "df_result": df_result,
+        "cube": cube,
+        "pairs": pairs,
+        "df_listing": df_listing,
+        "df_trades": df_trades,
+    }
+
+
+def _case_merge(ctx):
+    _run_merge(ctx["ids"], ctx["paths"])
+
+
+def _case_load_real_price(ctx):
+    from src.data_loader import load_real_price_data
+    load_real_price_data.__wrapped__(str(ctx["paths"]["REAL_PRICE"]), 0.0)
+
+
+def _case_load_result(ctx):
+    from src.data_loader import load_result_data
+    load_result_data.__wrapped__(str(ctx["paths"]["RESULT"]), 0.0)
+
+
+def _case_load_pyeong(ctx):
+    from src.data_loader import load_pyeong_data
+    load_pyeong_data(ctx["ids"], paths=ctx["paths"])
+
+
+def _case_monthly_cube(ctx):
+    from src.aggregates import build_monthly_cube
+    build_monthly_cube(ctx["df_real"])
+
+
+def _case_pairwise_gap(ctx):
+    from src.aggregates import query_monthly, compute_pairwise_gap_indices
+    df_monthly = query_monthly(ctx["cube"], ctx["pairs"], period=5)
+    compute_pairwise_gap_indices(df_monthly, list(df_monthly["color_label"].unique()))
+
+
+def _case_basic_info(ctx):
+    from src.ui_components_v2 import build_basic_info_table
+    build_basic_info_table(ctx["df_listing"])
+
+
+def _case_metrics_html(ctx):
+    from src.aggregates import query_monthly
+    from src.figures import MONTHLY_COLUMNS
+    from src.ui_components_v2 import build_metrics_html
+    df_metrics = ctx["df_listing"][ctx["df_listing"]["tradeTypeName"] == "매매"]
+    df_monthly = query_monthly(ctx["cube"], ctx["pairs"], period=5)
+    build_metrics_html(
+        df_metrics[["complexNo", "complexName", "pyeongName3", "bubble_score"]],
+        df_monthly[MONTHLY_COLUMNS],
+        list(df_monthly["color_label"].unique()),
+    )
+
+
+def _case_trade_table(ctx):
+    from src.ui_components_v2 import build_trade_table
+    build_trade_table(ctx["df_trades"])
+
+
+def _case_trend_figure(ctx):
+    from src.aggregates import query_monthly, compute_gap_frame
+    from src.figures import build_trend_figure, DAILY_COLUMNS, MONTHLY_COLUMNS
+    df_daily = ctx["df_trades"]
+    df_monthly = query_monthly(ctx["cube"], ctx["pairs"], period=5)
+    labels = list(df_daily["color_label"].unique())
+    df_gap = compute_gap_frame(df_monthly[df_monthly["color_label"].isin(labels[:2])], labels[:2]) if len(labels) >= 2 else pd.DataFrame()
+    use_webgl = len(df_daily) > CHART_CONFIG["WEBGL_POINT_THRESHOLD"]
+    build_trend_figure(
+        df_daily[DAILY_COLUMNS], df_monthly[MONTHLY_COLUMNS], df_gap, labels,
+        downsample_target=CHART_CONFIG["DOWNSAMPLE_TARGET"] if use_webgl else None
+    )
+
+
+def _case_listing_table(ctx):
+    from src.ui_components_v2 import build_listing_table
+    build_listing_table(ctx["df_result"][ctx["df_result"]["tradeTypeName"] == "매매"])
+
+
+def _case_range_figure(ctx):
+    from src.figures import build_range_figure, RANGE_COLUMNS
+    df_range = ctx["df_listing"][ctx["df_listing"]["tradeTypeName"] == "매매"]
+    build_range_figure(df_range[RANGE_COLUMNS], use_webgl=len(df_range) > CHART_CONFIG["WEBGL_POINT_THRESHOLD"])
+
+
+# (이름, 측정 함수) - 이름의 접두어(merge/load/viz)로 묶어서 선택 가능
+CASES: List[Tuple[str, Callable[[Dict], None]]] = [
+    ("merge.sell_price", _case_merge),
+    ("load.real_price", _case_load_real_price),
+    ("load.result", _case_load_result),
+    ("load.pyeong", _case_load_pyeong),
+    ("viz.monthly_cube", _case_monthly_cube),
+    ("viz.pairwise_gap", _case_pairwise_gap),
+    ("viz.basic_info", _case_basic_info),
+    ("viz.metrics_html", _case_metrics_html),
+    ("viz.trade_table", _case_trade_table),
+    ("viz.trend_figure", _case_trend_figure),
+    ("viz.listing_table", _case_listing_table),
+    ("viz.range_figure", _case_range_figure),
+]
+
+
+def time_case(func: Callable[[Dict], None], ctx: Dict, repeat: int) -> Dict[str, float]:
+    """워밍업 1회 후 repeat회 실행한 시간 통계 (초)"""
+    func(ctx)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(ctx)
+        runs.append(time.perf_counter() - started)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def run_benchmarks(scales: List[str], repeat: int, seed: int = 0, prefixes: Optional[List[str]] = None) -> Dict:
+    """규모별로 데이터셋을 준비하고 선택된 항목을 측정"""
+    results = {}
+    for scale in scales:
+        paths = ensure_dataset(scale, seed)
+        ctx = prepare_context(paths)
+        rows = {
+            "complexes": len(ctx["ids"]),
+            "trades": len(ctx["df_real"]),
+            "listings": len(ctx["df_result"]),
+        }
+        print(f"\n[{scale}] 단지 {rows['complexes']:,}개, 실거래 {rows['trades']:,}건, 매물 {rows['listings']:,}건")
+        cases = {}
+        for name, func in CASES:
+            if prefixes and not any(name.startswith(p) for p in prefixes):
+                continue
+            stats = time_case(func, ctx, repeat)
+            cases[name] = stats
+            print(f"  {name:22s} median {stats['median'] * 1000:9.1f} ms   min {stats['min'] * 1000:9.1f} ms")
+        results[scale] = {"rows": rows, "cases": cases}
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+        return proc.stdout.strip()
+    except OSError:
+        return ""
+
+
+def save_baseline(name: str, results: Dict, repeat: int, seed: int) -> Path:
+    """측정 결과를 benchmarks/baselines/<name>.json으로 저장"""
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    payload = {
+        "name": name,
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def compare_baseline(name: str, results: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """저장된 기준과 중위값 비교 결과 출력, 느려진 항목 이름 목록 반환"""
+    path = BASELINE_DIR / f"{name}.json"
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    print(f"\n[기준 비교] {name} (git {baseline.get('git') or '-'}, {baseline.get('created')})")
+    regressions = []
+    for scale, current in results.items():
+        base_cases = baseline["results"].get(scale, {}).get("cases", {})
+        for case, stats in current["cases"].items():
+            if case not in base_cases:
+                continue
+            before, after = base_cases[case]["median"], stats["median"]
+            ratio = after / before if before > 0 else float("inf")
+            slower = ratio > 1 + tolerance and after - before > NOISE_FLOOR_SEC
+            mark = "▲ 느려짐" if slower else ("▼ 빨라짐" if ratio < 1 - tolerance else "")
+            print(f"  {scale:9s} {case:22s} {before * 1000:9.1f} → {after * 1000:9.1f} ms  x{ratio:5.2f} {mark}")
+            if slower:
+                regressions.append(f"{scale}/{case}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="병합/로더/시각화 데이터 준비 벤치마크")
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=["pair", "district"])
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수 (워밍업 제외)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--cases", nargs="+", help="측정할 항목 이름 접두어 (예: merge load viz.listing)")
+    parser.add_argument("--save", metavar="NAME", help="결과를 기준으로 저장")
+    parser.add_argument("--compare", metavar="NAME", help="저장된 기준과 비교")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="회귀로 판단할 느려짐 비율")
+    args = parser.parse_args(argv)
+
+    # 스크립트로 실행하므로 Streamlit 런타임 없음 경고는 생략 (설정 로드 후 로그 레벨 지정)
+    from streamlit import config as streamlit_config, logger as streamlit_logger
+    streamlit_config.get_option("logger.level")
+    streamlit_logger.set_log_level("error")
+
+
+    results = run_benchmarks(args.scale, args.repeat, args.seed, args.cases)
+    if args.save:
+        print(f"\n기준 저장: {save_baseline(args.save, results, args.repeat, args.seed)}")
+    if args.compare:
+        regressions = compare_baseline(args.compare, results, args.tolerance)
+        if regressions:
+            print(f"\n느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
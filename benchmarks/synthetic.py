@@ -0,0 +1,411 @@
+"""네이버 부동산 수집 결과와 같은 스키마의 합성 데이터 생성기
+
+    python -m benchmarks.synthetic --scale district --out data/bench/district
+
+수집기(naver_apt_v5.main_function)가 저장하는 CSV와 같은 컬럼/형식으로
+complex_data, pyeong_data, price_data, provider_data, sell_data, dong_data를 만듦.
+같은 seed면 같은 데이터가 생성되므로 버전 간 벤치마크 비교에 사용할 수 있음.
+"""
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import DATA_DIR, DATA_PATHS
+from src.naver_apt_v5 import (
+    COMPLEX_HEADER, PYEONG_HEADER, PRICE_HEADER, PROVIDER_HEADER, DONG_HEADER,
+    SELL_PYEONG_FIELDS, SELL_PROVIDER_FIELDS, build_sell_columns, get_floor_type
+)
+
+# 규모별 설정 (단지 수, 단지를 배치할 지역)
+SCALES: Dict[str, Dict] = {
+    "pair": {"complexes": 2, "sido": "서울특별시", "sigungu": "강남구"},
+    "district": {"complexes": 80, "sido": "서울특별시", "sigungu": "강남구"},
+    "city": {"complexes": 1200, "sido": "서울특별시", "sigungu": None},
+}
+
+DATASET_DIR = DATA_DIR / "bench"
+
+# 매물 목록 API(articles/complex)의 articleList 항목 필드 (응답 순서)
+ARTICLE_KEYS = [
+    "articleNo", "articleName", "articleStatus", "realEstateTypeCode", "realEstateTypeName",
+    "articleRealEstateTypeCode", "articleRealEstateTypeName", "tradeTypeCode", "tradeTypeName",
+    "verificationTypeCode", "floorInfo", "priceChangeState", "isPriceModification", "dealOrWarrantPrc",
+    "areaName", "area1", "area2", "direction", "articleConfirmYmd", "siteImageCount", "articleFeatureDesc",
+    "tagList", "buildingName", "sameAddrCnt", "sameAddrDirectCnt", "sameAddrMaxPrc", "sameAddrMinPrc",
+    "cpid", "cpName", "cpPcArticleUrl", "cpPcArticleBridgeUrl", "cpPcArticleLinkUseAtArticleTitleYn",
+    "cpPcArticleLinkUseAtCpNameYn", "cpMobileArticleUrl", "cpMobileArticleLinkUseAtArticleTitleYn",
+    "cpMobileArticleLinkUseAtCpNameYn", "latitude", "longitude", "isLocationShow", "realtorName", "realtorId",
+    "tradeCheckedByOwner", "isDirectTrade", "isInterest", "isComplex", "detailAddress", "detailAddressYn",
+    "isVrExposed"
+]
+
+# 수집기가 매물에 덧붙이는 필드 (complexNo/complexName/pyeongName/rentPrc → 경과일 → 평형 → KB 시세 순)
+SELL_COLUMNS = build_sell_columns(
+    ARTICLE_KEYS + ["complexNo", "complexName", "pyeongName", "rentPrc", "매물등록경과일"]
+    + SELL_PYEONG_FIELDS + SELL_PROVIDER_FIELDS
+)
+
+# (평형명 숫자, 전용면적㎡, 방 수) 후보
+PYEONG_TYPES = [(18, 39, 2), (24, 59, 3), (25, 59, 3), (32, 84, 3), (33, 84, 3), (34, 84, 3),
+                (40, 101, 4), (45, 114, 4), (50, 134, 4), (60, 164, 5)]
+BRANDS = ["래미안", "자이", "힐스테이트", "푸르지오", "아이파크", "e편한세상", "롯데캐슬", "더샵", "SK뷰", "센트레빌"]
+DIRECTIONS = ["남향", "남동향", "남서향", "동향", "서향", "북향"]
+FEATURES = ["올수리", "역세권", "급매", "로열층", "조망좋음", "학군좋음", "입주가능", ""]
+TRADE_TYPES = np.array(["매매", "전세", "월세"])
+
+
+def _load_region(sido: str, sigungu: Optional[str]) -> pd.DataFrame:
+    """단지를 배치할 법정동 목록 (cortarNo.csv 기준)"""
+    df = pd.read_csv(DATA_PATHS["CORTAR"], encoding="utf-8-sig", dtype=str)
+    df = df[df["시/도"] == sido]
+    if sigungu:
+        df = df[df["시/군/구"] == sigungu]
+    return df.dropna(subset=["읍/면/동"]).reset_index(drop=True)
+
+
+def format_price(amount) -> str:
+    """만원 단위 정수를 매물 호가 문자열로 변환 (134050 → '13억 4050', 쉼표 없음)"""
+    eok, rest = divmod(int(amount), 10000)
+    if eok and rest:
+        return f"{eok}억 {rest}"
+    return f"{eok}억" if eok else str(rest)
+
+
+def _rate(count, total) -> np.ndarray:
+    """수집기와 같은 '12.3%' 형식의 출현율 (세대수가 0이면 빈 문자열)"""
+    count = np.asarray(count, dtype=float)
+    total = np.asarray(total, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = count / total * 100
+    return np.where(total > 0, pd.Series(values).map("{:.1f}%".format).to_numpy(), "")
+
+
+def generate(scale: str = "pair", seed: int = 0, today: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+    """규모(scale)에 맞는 합성 데이터셋 생성
+
+    반환값은 DATA_PATHS 키(COMPLEX, PYEONG, REAL_PRICE, PROVIDER, SELL, DONG)별 DataFrame이며,
+    컬럼은 수집기가 저장하는 CSV 헤더와 같음 (downloadDate 포함).
+    """
+    config = SCALES[scale]
+    rng = np.random.default_rng(seed)
+    today = today or datetime.now().replace(microsecond=0)
+    download_date = today.strftime("%Y-%m-%d %H:%M:%S")
+    regions = _load_region(config["sido"], config["sigungu"])
+    n = config["complexes"]
+
+    # ---------------- 단지 ----------------
+    complex_no = 100000 + np.arange(n) * 7 + rng.integers(0, 7, n)
+    region_idx = rng.integers(0, len(regions), n)
+    dong_names = regions["읍/면/동"].to_numpy()[region_idx]
+    brand = np.array(BRANDS)[rng.integers(0, len(BRANDS), n)]
+    names = [f"{d}{b}{i // len(BRANDS) + 1}차" for i, (d, b) in enumerate(zip(dong_names, brand))]
+    # 법정동마다 고정된 중심 좌표 주변에 단지 배치
+    centers = np.random.default_rng(seed + 1).normal(0, 0.06, (len(regions), 2)) + [37.53, 127.02]
+    lat = centers[region_idx, 0] + rng.normal(0, 0.004, n)
+    lon = centers[region_idx, 1] + rng.normal(0, 0.004, n)
+    households = rng.integers(200, 3000, n)
+    dong_count = np.maximum(households // 120, 2)
+    high_floor = rng.integers(12, 36, n)
+    approve = [today.date() - timedelta(days=int(d)) for d in rng.integers(365, 365 * 35, n)]
+    price_per_m2 = rng.lognormal(np.log(1300), 0.35, n)  # 전용 ㎡당 만원
+    listing_ratio = rng.uniform(0.01, 0.04, n)
+
+    # ---------------- 평형 ----------------
+    pyeong_rows = []
+    for i in range(n):
+        k = rng.integers(2, 6)
+        types = sorted(rng.choice(len(PYEONG_TYPES), size=k, replace=False))
+        for pyeong_no, t in enumerate(types, start=1):
+            label, area, rooms = PYEONG_TYPES[t]
+            suffix = "AB"[rng.integers(0, 2)] if rng.random() < 0.6 else ""
+            pyeong_rows.append((i, pyeong_no, f"{label}{suffix}", label, area, rooms))
+    df_py = pd.DataFrame(pyeong_rows, columns=["ci", "pyeongNo", "pyeongName", "pyeong", "exclusiveArea", "roomCnt"])
+    # 같은 단지에서 평형명이 겹치면 pyeongNo를 붙여 고유하게 (수집기는 (단지, 평형명)으로 매핑)
+    dup = df_py.duplicated(["ci", "pyeongName"], keep=False)
+    df_py.loc[dup, "pyeongName"] = df_py.loc[dup, "pyeong"].astype(str) + df_py.loc[dup, "pyeongNo"].map(lambda x: "ABCDEF"[x - 1])
+    ci = df_py["ci"].to_numpy()
+    share = rng.dirichlet(np.ones(len(df_py)))  # 단지 안의 세대 배분 비율 (정규화는 아래)
+    share = share / pd.Series(share).groupby(ci).transform("sum").to_numpy()
+    df_py["householdCountByPyeong"] = np.maximum((households[ci] * share).round().astype(int), 1)
+    df_py["base_price"] = (price_per_m2[ci] * df_py["exclusiveArea"] * rng.lognormal(0, 0.05, len(df_py))).round(-1)
+    df_py["dealCount"] = rng.binomial(df_py["householdCountByPyeong"], listing_ratio[ci])
+    df_py["leaseCount"] = rng.binomial(df_py["householdCountByPyeong"], listing_ratio[ci] / 2)
+    df_py["rentCount"] = rng.binomial(df_py["householdCountByPyeong"], listing_ratio[ci] / 4)
+
+    # ---------------- 실거래 ----------------
+    n_trades = rng.poisson(df_py["householdCountByPyeong"].to_numpy() * 0.06 + 4)
+    ti = np.repeat(np.arange(len(df_py)), n_trades)
+    days_ago = rng.integers(0, 365 * 5 + 180, len(ti))
+    years_ago = days_ago / 365.25
+    trade_price = (df_py["base_price"].to_numpy()[ti] * (1 - 0.045 * years_ago) * rng.lognormal(0, 0.06, len(ti))).round().astype(int)
+    deal_dates = pd.Series(pd.Timestamp(today.date()) - pd.to_timedelta(days_ago, unit="D")).dt.strftime("%Y-%m-%d")
+    date_class = np.select([years_ago <= 1, years_ago <= 3, years_ago <= 5], ["1", "3", "5"], "")
+    py_of_trade = df_py.iloc[ti]
+    df_price = pd.DataFrame({
+        "complexNo": complex_no[py_of_trade["ci"]],
+        "complexName": np.array(names)[py_of_trade["ci"]],
+        "pyeongNo": py_of_trade["pyeongNo"].to_numpy(),
+        "pyeongName": py_of_trade["pyeongName"].to_numpy(),
+        "pyeongName2": py_of_trade["pyeongName"].to_numpy(),
+        "tradeType": "A1",
+        "year": "5",
+        "floor": rng.integers(1, high_floor[py_of_trade["ci"]] + 1),
+        "date": deal_dates.to_numpy(),
+        "price": trade_price,
+        "pyeongName3": py_of_trade["pyeong"].astype(str).to_numpy(),
+        "dealDate": deal_dates.to_numpy(),
+        "dealAmount": trade_price,
+        "dealDateClass": date_class,
+    }).sort_values(["complexNo", "pyeongNo", "dealDate"], ascending=[True, True, False], kind="stable")
+
+    # ---------------- KB/부동산원 시세 ----------------
+    df_prov = df_py.loc[df_py.index.repeat(2)].reset_index(drop=True)
+    df_prov["provider"] = np.tile(["kbstar", "kab"], len(df_py))
+    avg = (df_prov["base_price"] * rng.lognormal(0, 0.02, len(df_prov))).round(-2).astype(int)
+    lease_rate = rng.uniform(0.45, 0.7, len(df_prov))
+    df_provider = pd.DataFrame({
+        "complexNo": complex_no[df_prov["ci"]],
+        "complexName": np.array(names)[df_prov["ci"]],
+        "pyeongNo": df_prov["pyeongNo"],
+        "pyeongName": df_prov["pyeongName"],
+        "pyeongName2": df_prov["pyeongName"],
+        "provider": df_prov["provider"],
+        "baseYearMonthDay": (today.date() - timedelta(days=today.weekday())).strftime("%Y-%m-%d"),
+        "dealUpperPriceLimit": (avg * 1.06).round(-2).astype(int),
+        "dealAveragePrice": avg,
+        "dealLowPriceLimit": (avg * 0.93).round(-2).astype(int),
+        "dealAveragePriceChangeAmount": rng.integers(-3, 4, len(df_prov)) * 500,
+        "leaseUpperPriceLimit": (avg * lease_rate * 1.05).round(-2).astype(int),
+        "leaseAveragePrice": (avg * lease_rate).round(-2).astype(int),
+        "leaseLowPriceLimit": (avg * lease_rate * 0.95).round(-2).astype(int),
+        "leaseAveragePriceChangeAmount": rng.integers(-2, 3, len(df_prov)) * 500,
+        "leasePerDealRate": pd.Series((lease_rate * 100).round().astype(int)).astype(str) + "%",
+    })
+
+    # ---------------- 매물 ----------------
+    ai = np.repeat(np.arange(len(df_py)), (df_py["dealCount"] + df_py["leaseCount"] + df_py["rentCount"]).to_numpy())
+    trade_kind = np.concatenate([
+        np.repeat(TRADE_TYPES, [d, l, r])
+        for d, l, r in zip(df_py["dealCount"], df_py["leaseCount"], df_py["rentCount"])
+    ]) if len(ai) else np.array([], dtype=str)
+    py_of_article = df_py.iloc[ai]
+    a_ci = py_of_article["ci"].to_numpy()
+    base = py_of_article["base_price"].to_numpy()
+    asking = np.select(
+        [trade_kind == "매매", trade_kind == "전세"],
+        [base * rng.lognormal(0.06, 0.08, len(ai)), base * rng.uniform(0.45, 0.7, len(ai))],
+        base * rng.uniform(0.05, 0.2, len(ai)),
+    ).round(-2).astype(int)
+    rent = np.where(trade_kind == "월세", rng.integers(10, 60, len(ai)) * 10, 0)
+    floor_no = rng.integers(1, high_floor[a_ci] + 1)
+    floor_text = np.where(rng.random(len(ai)) < 0.3, np.array(["저", "중", "고"])[np.minimum(floor_no * 3 // (high_floor[a_ci] + 1), 2)], floor_no.astype(str))
+    confirm_days = rng.integers(0, 60, len(ai))
+    confirm = pd.Series(pd.Timestamp(today.date()) - pd.to_timedelta(confirm_days, unit="D")).dt.strftime("%Y-%m-%d")
+    realtor_no = rng.integers(1, max(n // 3, 2) + 1, len(ai))
+    py_household = py_of_article["householdCountByPyeong"].to_numpy()
+
+    # 평형별 매매 호가 최저/최고 (평형 API의 articleStatistics.dealPriceMin/Max에 해당)
+    deal_asking = pd.Series(np.where(trade_kind == "매매", asking, np.nan)).groupby(ai).agg(["min", "max"])
+    deal_asking = deal_asking.reindex(np.arange(len(df_py)))
+    df_py["dealPriceMin2"] = deal_asking["min"].astype("Int64").to_numpy()
+    df_py["dealPriceMax2"] = deal_asking["max"].astype("Int64").to_numpy()
+    kb = df_provider[df_provider["provider"] == "kbstar"].reset_index(drop=True).iloc[ai]
+
+    df_sell = pd.DataFrame({
+        "articleNo": 2400000000 + np.arange(len(ai)) * 3 + rng.integers(0, 3, len(ai)),
+        "complexNo": complex_no[a_ci],
+        "articleName": np.array(names)[a_ci],
+        "articleRealEstateTypeName": "아파트",
+        "tradeTypeName": trade_kind,
+        "floorInfo": np.char.add(np.char.add(floor_text.astype(str), "/"), high_floor[a_ci].astype(str)),
+        "priceChangeState": np.where(rng.random(len(ai)) < 0.1, "DECREASE", "SAME"),
+        "isPriceModification": "False",
+        "dealOrWarrantPrc": [format_price(v) for v in asking],
+        "rentPrc": np.where(rent > 0, rent.astype(str), ""),
+        "areaName": py_of_article["pyeongName"].to_numpy(),
+        "pyeongName": py_of_article["pyeongName"].to_numpy(),
+        "area1": (py_of_article["exclusiveArea"].to_numpy() * 1.32).round().astype(int),
+        "area2": py_of_article["exclusiveArea"].to_numpy(),
+        "direction": np.array(DIRECTIONS)[rng.integers(0, len(DIRECTIONS), len(ai))],
+        "articleConfirmYmd": confirm.to_numpy(),
+        "articleFeatureDesc": np.array(FEATURES)[rng.integers(0, len(FEATURES), len(ai))],
+        "tagList": "['25년이상', '대단지']",
+        "buildingName": pd.Series(101 + rng.integers(0, dong_count[a_ci])).astype(str) + "동",
+        "sameAddrCnt": rng.integers(1, 4, len(ai)),
+        "sameAddrMaxPrc": [format_price(v) for v in asking],
+        "sameAddrMinPrc": [format_price(v) for v in asking],
+        "cpName": "매경부동산",
+        "cpPcArticleUrl": "",
+        "latitude": lat[a_ci].round(6),
+        "longitude": lon[a_ci].round(6),
+        "realtorName": np.char.add("합성공인중개사", realtor_no.astype(str)),
+        "complexName": np.array(names)[a_ci],
+        "매물등록경과일": confirm_days,
+        "householdCountByPyeong": py_household,
+        "dealCount": py_of_article["dealCount"].to_numpy(),
+        "leaseCount": py_of_article["leaseCount"].to_numpy(),
+        "rentCount": py_of_article["rentCount"].to_numpy(),
+        "shortTermRentCount": 0,
+        "roomCnt": py_of_article["roomCnt"].to_numpy(),
+        "bathroomCnt": 2,
+        "dealPriceMin2": df_py["dealPriceMin2"].to_numpy()[ai],
+        "dealPriceMax2": df_py["dealPriceMax2"].to_numpy()[ai],
+        "매매매물출현율": _rate(py_of_article["dealCount"], py_household),
+        "전세매물출현율": _rate(py_of_article["rentCount"], py_household),
+        "월세매물출현율": _rate(0, py_household),
+        **{col: kb[col].to_numpy() for col in SELL_PROVIDER_FIELDS if col in kb.columns},
+    })
+    df_sell["floorType"] = df_sell["floorInfo"].map(get_floor_type)
+
+    # ---------------- 단지 정보 (매물/평형 집계 포함) ----------------
+    deal_by_complex = np.bincount(df_py["ci"], weights=df_py["dealCount"], minlength=n).astype(int)
+    lease_by_complex = np.bincount(df_py["ci"], weights=df_py["leaseCount"], minlength=n).astype(int)
+    rent_by_complex = np.bincount(df_py["ci"], weights=df_py["rentCount"], minlength=n).astype(int)
+    pyeong_names = df_py.groupby("ci")["exclusiveArea"].agg(lambda s: ", ".join(str(a) for a in sorted(set(s))) + "㎡")
+    lease_households = (households * rng.uniform(0, 0.2, n)).astype(int)
+    df_complex = pd.DataFrame({
+        "complexNo": complex_no,
+        "complexName": names,
+        "cortarNo": regions["cortarNo"].to_numpy()[region_idx],
+        "realEstateTypeCode": "APT",
+        "realEstateTypeName": "아파트",
+        "detailAddress": [f"{d} {rng.integers(1, 999)}" for d in dong_names],
+        "latitude": lat.round(6),
+        "longitude": lon.round(6),
+        "totalHouseholdCount": households,
+        "totalLeaseHouseholdCount": lease_households,
+        "permanentLeaseHouseholdCount": 0,
+        "nationLeaseHouseholdCount": 0,
+        "civilLeaseHouseholdCount": lease_households,
+        "publicLeaseHouseholdCount": 0,
+        "longTermLeaseHouseholdCount": 0,
+        "etcLeaseHouseholdCount": 0,
+        "highFloor": high_floor,
+        "lowFloor": rng.integers(5, 12, n),
+        "useApproveYmd": [d.strftime("%Y-%m-%d") for d in approve],
+        "totalDongCount": dong_count,
+        "maxSupplyArea": df_py.groupby("ci")["exclusiveArea"].max().to_numpy() * 1.32,
+        "minSupplyArea": df_py.groupby("ci")["exclusiveArea"].min().to_numpy() * 1.32,
+        "dealCount": deal_by_complex,
+        "rentCount": rent_by_complex,
+        "leaseCount": lease_by_complex,
+        "shortTermRentCount": 0,
+        "isBookmarked": "False",
+        "batlRatio": rng.integers(150, 300, n),
+        "btlRatio": rng.integers(12, 30, n),
+        "parkingPossibleCount": (households * rng.uniform(0.8, 1.6, n)).astype(int),
+        "parkingCountByHousehold": rng.uniform(0.8, 1.6, n).round(2),
+        "constructionCompanyName": np.char.add(brand.astype(str), "건설"),
+        "heatMethodTypeCode": "HT001",
+        "heatFuelTypeCode": "HF001",
+        "pyoengNames": pyeong_names.to_numpy(),
+        "address": [f"{config['sido']} {d}" for d in dong_names],
+        "매매매물출현율": _rate(deal_by_complex, households),
+        "전세매물출현율": _rate(rent_by_complex, households),
+        "월세매물출현율": _rate(lease_by_complex, households),
+        "schoolName": np.char.add(dong_names.astype(str), "초등학교"),
+        "walkTime": rng.integers(2, 20, n),
+        "totalStudentCount": rng.integers(300, 1500, n),
+    })
+
+    # ---------------- 평형 정보 ----------------
+    df_pyeong = pd.DataFrame({
+        "complexNo": complex_no[ci],
+        "complexName": np.array(names)[ci],
+        "pyeongNo": df_py["pyeongNo"],
+        "supplyArea": (df_py["exclusiveArea"] * 1.32).round(2),
+        "supplyPyeong": df_py["pyeong"],
+        "pyeongName": df_py["pyeongName"],
+        "pyeongName2": df_py["pyeongName"],
+        "exclusiveArea": df_py["exclusiveArea"],
+        "exclusivePyeong": (df_py["exclusiveArea"] / 3.3058).round(2),
+        "exclusiveRate": 76,
+        "realEstateTypeCode": "APT",
+        "householdCountByPyeong": df_py["householdCountByPyeong"],
+        "dealCount": df_py["dealCount"],
+        "leaseCount": df_py["leaseCount"],
+        "rentCount": df_py["rentCount"],
+        "shortTermRentCount": 0,
+        "dealPriceMin": df_py["dealPriceMin2"].map(lambda v: format_price(v) if pd.notnull(v) else ""),
+        "dealPriceMax": df_py["dealPriceMax2"].map(lambda v: format_price(v) if pd.notnull(v) else ""),
+        "roomCnt": df_py["roomCnt"],
+        "bathroomCnt": 2,
+        "dealPriceMin2": df_py["dealPriceMin2"],
+        "dealPriceMax2": df_py["dealPriceMax2"],
+        "매매매물출현율": _rate(df_py["dealCount"], df_py["householdCountByPyeong"]),
+        "전세매물출현율": _rate(df_py["rentCount"], df_py["householdCountByPyeong"]),
+        "월세매물출현율": _rate(0, df_py["householdCountByPyeong"]),
+    })
+
+    # ---------------- 동 정보 ----------------
+    di = np.repeat(np.arange(n), dong_count)
+    dong_no = np.concatenate([np.arange(1, c + 1) for c in dong_count])
+    df_dong = pd.DataFrame({
+        "complexNo": complex_no[di],
+        "complexName": np.array(names)[di],
+        "dongNo": dong_no,
+        "dongNm": (100 + dong_no).astype(str),
+        "max_floor": np.maximum(high_floor[di] - rng.integers(0, 5, len(di)), 5),
+    })
+
+    frames = {
+        "COMPLEX": (df_complex, COMPLEX_HEADER),
+        "PYEONG": (df_pyeong, PYEONG_HEADER),
+        "REAL_PRICE": (df_price, PRICE_HEADER),
+        "PROVIDER": (df_provider, PROVIDER_HEADER),
+        "SELL": (df_sell, SELL_COLUMNS[:-1]),
+        "DONG": (df_dong, DONG_HEADER),
+    }
+    dataset = {}
+    for key, (df, header) in frames.items():
+        df = df.reindex(columns=header, fill_value="").reset_index(drop=True)
+        df["downloadDate"] = download_date
+        dataset[key] = df
+    return dataset
+
+
+def dataset_paths(out_dir) -> Dict[str, Path]:
+    """out_dir 아래에 DATA_PATHS와 같은 파일명을 쓰는 경로 딕셔너리 (CORTAR는 공용 파일)"""
+    out_dir = Path(out_dir)
+    return {key: (path if key == "CORTAR" else out_dir / path.name) for key, path in DATA_PATHS.items()}
+
+
+def write_dataset(dataset: Dict[str, pd.DataFrame], out_dir) -> Dict[str, Path]:
+    """수집기와 같은 인코딩(utf-8-sig)으로 CSV 저장 후 경로 딕셔너리 반환"""
+    paths = dataset_paths(out_dir)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    for key, df in dataset.items():
+        df.to_csv(paths[key], index=False, encoding="utf-8-sig")
+    return paths
+
+
+def ensure_dataset(scale: str, seed: int = 0) -> Dict[str, Path]:
+    """DATASET_DIR/<scale>-<seed>에 데이터셋이 없으면 생성하고 경로 딕셔너리 반환"""
+    out_dir = DATASET_DIR / f"{scale}-{seed}"
+    paths = dataset_paths(out_dir)
+    if not all(paths[key].exists() for key in ("COMPLEX", "PYEONG", "REAL_PRICE", "PROVIDER", "SELL", "DONG")):
+        write_dataset(generate(scale, seed), out_dir)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 네이버 부동산 데이터셋 생성")
+    parser.add_argument("--scale", choices=list(SCALES), default="pair")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="저장 폴더 (기본: data/bench/<scale>-<seed>)")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out) if args.out else DATASET_DIR / f"{args.scale}-{args.seed}"
+    dataset = generate(args.scale, args.seed)
+    write_dataset(dataset, out_dir)
+    for key, df in dataset.items():
+        print(f"{DATA_PATHS[key].name:20s} {len(df):>8,d}행")
+    print(f"저장 위치: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
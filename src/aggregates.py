@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Dict, List, Optional, Tuple
+from src.data_loader import load_real_price_data
+
+# 기간 옵션별 포함되는 dealDateClass (최근 5년 = 5/3/1, 최근 3년 = 3/1, 최근 1년 = 1)
+PERIOD_CLASSES: Dict[int, List[int]] = {
+    5: [5, 3, 1],
+    3: [3, 1],
+    1: [1],
+}
+
+CUBE_KEYS = ["period", "complexNo", "complexName", "pyeongName3", "year_month"]
+CUBE_STATS = ["count", "mean", "median", "min", "max"]
+
+
+def build_monthly_cube(df_real: pd.DataFrame) -> pd.DataFrame:
+    """(기간, complexNo, pyeongName3, 월) 단위 실거래가 집계 큐브 생성
+
+    df_real은 load_real_price_data로 파싱된 데이터여야 함 (dealAmount_numeric, year_month 포함).
+    통계값 단위는 만원.
+    """
+    frames = []
+    for period, classes in PERIOD_CLASSES.items():
+        df_period = df_real[df_real["dealDateClass"].isin(classes)]
+        if df_period.empty:
+            continue
+        df_agg = (
+            df_period.groupby(CUBE_KEYS[1:], as_index=False, sort=True, observed=True)["dealAmount_numeric"]
+            .agg(CUBE_STATS)
+        )
+        df_agg.insert(0, "period", period)
+        frames.append(df_agg)
+
+    if not frames:
+        return pd.DataFrame(columns=CUBE_KEYS + CUBE_STATS + ["color_label"])
+
+    cube = pd.concat(frames, ignore_index=True)
+    cube["color_label"] = cube["complexName"].astype(str) + " " + cube["pyeongName3"] + "평"
+    return cube
+
+
+@st.cache_data
+def load_monthly_cube(path: str, version: float) -> pd.DataFrame:
+    """데이터셋 버전별로 한 번만 집계 큐브를 생성 (path, version이 캐시 키)"""
+    return build_monthly_cube(load_real_price_data(path, version))
+
+
+def query_monthly(cube: pd.DataFrame, pairs: List[Tuple[str, str]], period: int = 5) -> pd.DataFrame:
+    """선택된 (complexNo, pyeongName3) 쌍과 기간에 해당하는 월별 집계 반환"""
+    if cube.empty or not pairs:
+        return cube.iloc[0:0].copy()
+    df_pairs = pd.DataFrame(pairs, columns=["complexNo", "pyeongName3"]).astype(str)
+    df_monthly = cube[cube["period"] == period].merge(df_pairs, on=["complexNo", "pyeongName3"], how="inner")
+    df_monthly["dealAmount_eok"] = df_monthly["mean"] / 10000.0
+    return df_monthly.sort_values(["color_label", "year_month"], ignore_index=True)
+
+
+def compute_gap_frame(df_monthly: pd.DataFrame, labels: List[str]) -> pd.DataFrame:
+    """두 아파트의 월별 평균 실거래가 격차 계산
+
+    직전 실거래가를 forward/backward fill로 채운 뒤 격차(억)를 계산하며,
+    어느 한쪽이라도 해당 월 거래가 없어 채워진 값이면 is_estimated로 표시.
+    """
+    df_gap = df_monthly.pivot(
+        index="year_month",
+        columns="color_label",
+        values="dealAmount_eok"
+    ).reset_index()
+    if df_gap.empty:
+        return df_gap
+
+    for label in labels:
+        df_gap[label] = df_gap[label].ffill().bfill()
+
+    df_gap["price_gap"] = (df_gap[labels[0]] - df_gap[labels[1]]).abs()
+    df_gap["tooltip_date"] = df_gap["year_month"].dt.strftime("'%y.%m월")
+    is_filled_0 = df_gap[labels[0]].ne(df_gap[labels[0]].shift())
+    is_filled_1 = df_gap[labels[1]].ne(df_gap[labels[1]].shift())
+    df_gap["is_estimated"] = (~is_filled_0) | (~is_filled_1)
+    return df_gap
+
+
+def compute_gap_index(df_gap: pd.DataFrame) -> Optional[float]:
+    """갭 지수 계산 ((1-(최대갭-최신갭)/(최대갭-최소갭))×100)"""
+    if df_gap.empty:
+        return None
+    real_gaps = df_gap["price_gap"].dropna()
+    if real_gaps.empty:
+        return None
+    max_real_gap = real_gaps.max()
+    min_real_gap = real_gaps.min()
+    latest_gap = df_gap["price_gap"].iloc[-1]
+    if (max_real_gap - min_real_gap) > 0:
+        return (1 - (max_real_gap - latest_gap) / (max_real_gap - min_real_gap)) * 100
+    return None
+
+
+def compute_pairwise_gap_indices(df_monthly: pd.DataFrame, labels: List[str]) -> pd.DataFrame:
+    """모든 (단지-평형) 쌍의 갭 지수를 한 번에 계산
+
+    월×라벨 가격 행렬을 만든 뒤 브로드캐스팅으로 (월, i, j) 격차 텐서를 구해
+    쌍별 최대/최소/최신 격차와 갭 지수를 벡터 연산으로 계산함 (compute_gap_index와 같은 정의).
+    반환: label_a, label_b, latest_gap(억), gap_index (갭 범위가 0이거나 데이터가 없으면 NaN)
+    """
+    columns = ["label_a", "label_b", "latest_gap", "gap_index"]
+    if df_monthly.empty or len(labels) < 2:
+        return pd.DataFrame(columns=columns)
+
+    wide = df_monthly.pivot(
+        index="year_month",
+        columns="color_label",
+        values="dealAmount_eok"
+    ).reindex(columns=labels).sort_index().ffill().bfill()
+    prices = wide.to_numpy(dtype=float)                          # (월, 라벨)
+    gaps = np.abs(prices[:, :, None] - prices[:, None, :])       # (월, 라벨, 라벨)
+
+    ii, jj = np.triu_indices(len(labels), k=1)
+    pair_gaps = gaps[:, ii, jj]                                  # (월, 쌍)
+    valid = ~np.isnan(pair_gaps).all(axis=0)
+    max_gap = np.full(len(ii), np.nan)
+    min_gap = np.full(len(ii), np.nan)
+    max_gap[valid] = np.nanmax(pair_gaps[:, valid], axis=0)
+    min_gap[valid] = np.nanmin(pair_gaps[:, valid], axis=0)
+    latest_gap = pair_gaps[-1]
+    span = max_gap - min_gap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap_index = np.where(span > 0, (1 - (max_gap - latest_gap) / span) * 100, np.nan)
+
+    return pd.DataFrame({
+        "label_a": np.asarray(labels, dtype=object)[ii],
+        "label_b": np.asarray(labels, dtype=object)[jj],
+        "latest_gap": latest_gap,
+        "gap_index": gap_index,
+    }, columns=columns)
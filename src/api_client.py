@@ -1,55 +1,46 @@
-import os
-from dotenv import load_dotenv
-import requests
-import streamlit as st
-
-# .env 파일 로드
-load_dotenv()
+from src.credentials import get_request_profile, api_url
 
 def get_headers():
     """공통 헤더 반환"""
-    return {
-        'accept': '*/*',
-        'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'authorization': os.getenv('AUTHORIZATION'),
-        'user-agent': os.getenv('USER_AGENT'),
-        'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132", "Google Chrome";v="132"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"Windows"',
-    }
+    return get_request_profile("REGION")[1]
 
 def get_cookies():
     """공통 쿠키 반환"""
-    return {
-        'NNB': os.getenv('NNB'),
-        'ASID': os.getenv('ASID'),
-        'NAC': os.getenv('NAC'),
-        'landHomeFlashUseYn': 'Y',
-    }
+    return get_request_profile("REGION")[0]
 
-def fetch_complex_list(cortarNo: str) -> list:
-    """아파트 단지 목록 조회"""
-    url = "https://new.land.naver.com/api/regions/complexes"
+def request_complex_list(cortarNo: str) -> list:
+    """법정동 아파트 단지 목록 API 호출 (Streamlit 없이 사용 가능, 실패 시 예외 발생)"""
+    import requests  # 첫 화면 로딩 시에는 불필요하므로 실제 조회 시 임포트
+
+    url = api_url("regions/complexes")
     params = {
         'cortarNo': str(cortarNo),
         'realEstateType': 'APT:PRE:JGC:ABYG',
         'order': '',
     }
-    
+    response = requests.get(
+        url,
+        params=params,
+        cookies=get_cookies(),
+        headers=get_headers()
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"API 호출 실패: 상태 코드 {response.status_code}")
+    return response.json().get("complexList", [])
+
+def fetch_complex_list(cortarNo: str) -> list:
+    """아파트 단지 목록 조회 (로컬 단지 목록이 최신이면 API 호출 없이 사용, 오류는 화면에 표시)"""
+    import streamlit as st
+    from src.catalog import cached_complexes, update_catalog
+
+    cached = cached_complexes(cortarNo)
+    if cached is not None:
+        return cached
     try:
-        response = requests.get(
-            url, 
-            params=params, 
-            cookies=get_cookies(),
-            headers=get_headers()
-        )
-        
-        if response.status_code == 200:
-            return response.json().get("complexList", [])
-        else:
-            st.error(f"API 호출 실패: 상태 코드 {response.status_code}")
-            return []
-            
+        complexes = request_complex_list(cortarNo)
     except Exception as e:
         st.error(f"API 호출 에러: {e}")
         return []
+    if complexes:
+        update_catalog({str(cortarNo): complexes})
+    return complexes
@@ -0,0 +1,370 @@
+"""분석 결과 읽기 전용 JSON API (Streamlit 화면 없이 다른 서비스에서 버블 지수/갭 지수/평형별 실거래 통계 조회)
+
+    python -m src.api_server --port 8800                 # 공용 data/ 결과
+    python -m src.api_server --out data/crawls/gangnam/output
+
+    GET /health
+    GET /complexes                                       단지 요약 목록
+    GET /complexes/<complexNo>                           단지 요약 (기본 정보 + 버블 지수 + 최근 실거래)
+    GET /complexes/<complexNo>/pyeongs                   평형별 호가/실거래 통계 (reports.build_pyeong_summary)
+    GET /complexes/<complexNo>/listings?trade=매매&pyeong=34&limit=100&offset=0
+    GET /leaderboard?by=score&top=20&min_listings=1     결과 전체 단지-평형 순위 (reports.build_district_leaderboard)
+    GET /gap?pair=<complexNo>:<평형>&pair=...&period=5   단지-평형 쌍별 갭 지수
+    ?run=<run_id>를 붙이면 해당 실행 폴더(runs/<run_id>/)의 결과를 사용.
+
+결과 파일은 저장소(ResultStore)별로 한 번만 읽어 단지별 인덱스와 요약표를 미리 만들어 둠.
+파일 변경 여부는 RELOAD_CHECK_SEC마다 한 번만 확인하고, 바뀌었으면 새 저장소로 교체함.
+응답은 (데이터 버전, 경로, 정렬된 쿼리) 키로 LRU 캐시하고, 같은 키에서 만든 ETag로 If-None-Match에 304를 돌려줌.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+import numpy as np
+import pandas as pd
+from src.config import DATA_PATHS, API_SERVER_CONFIG
+from src.runs import get_run
+from src.schema import format_dates, read_dataset
+
+# 단지 요약에 포함할 기본 정보 컬럼 (result.csv의 단지 단위 값)
+COMPLEX_FIELDS = [
+    "complexNo", "complexName", "totalHouseholdCount", "totalLeaseHouseholdCount", "useApproveYmd",
+    "totalDongCount", "highFloor", "lowFloor", "batlRatio", "btlRatio", "parkingCountByHousehold",
+    "constructionCompanyName", "pyoengNames", "schoolName", "walkTime",
+    "dealCount_y", "매매매물출현율_y", "전세매물출현율", "월세매물출현율",
+]
+# 매물 표 컬럼 (가격 단위: 만원, *_gap은 %)
+LISTING_FIELDS = [
+    "articleNo", "complexNo", "complexName", "tradeTypeName", "pyeongName3", "pyeongName", "floorInfo",
+    "dealOrWarrantPrc2", "area1", "area2", "direction", "buildingName", "articleConfirmYmd", "sameAddrCnt",
+    "householdCountByPyeong", "dealCount_x", "매매매물출현율_x", "pyeong_max_5", "pyeong_avg_5", "pyeong_min_5",
+    "dealUpperPriceLimit", "dealAveragePrice", "dealLowPriceLimit", "leasePerDealRate",
+    "bubble_score", "real_max_5_gap", "real_min_5_gap", "kb_upper_gap", "realtorName",
+]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """DataFrame → JSON 레코드 (NaN은 null, 날짜는 'YYYY-MM-DD' 문자열)"""
+    return json.loads(format_dates(df).to_json(orient="records", force_ascii=False, date_format="iso"))
+
+
+class ResultStore:
+    """실행 1건(또는 data/)의 분석 결과를 메모리에 올려 조회용으로 미리 가공한 저장소
+
+    version은 결과 파일들의 수정 시각(ns) 조합이며 ETag/캐시 키에 쓰임.
+    """
+
+    WATCHED = ("RESULT", "REAL_PRICE")
+
+    def __init__(self, paths: Dict[str, Path]):
+        from src.data_loader import load_real_price_data
+        from src.aggregates import build_monthly_cube
+        from src.reports import build_pyeong_summary, build_complex_summary, aggregate_leaderboard
+
+        self.paths = paths
+        self.version = self.file_version(paths)
+        self.checked_at = time.monotonic()
+
+        df_result = read_dataset(paths["RESULT"], "result")
+        self.listings = df_result[[c for c in LISTING_FIELDS if c in df_result.columns]]
+        self.listing_index = self.listings.groupby("complexNo", sort=False).indices
+
+        self.pyeong_summary = build_pyeong_summary(df_result)
+        self.pyeong_index = self.pyeong_summary.groupby("complexNo", sort=False).indices
+
+        # 단지 요약: 기본 정보 + 버블 지수(평형별 중위값의 평균, 화면의 투자 지표와 같은 정의) + 최근 실거래
+        complexes = df_result.groupby("complexNo", sort=False)[[c for c in COMPLEX_FIELDS[2:] if c in df_result.columns]].first()
+        summary = build_complex_summary(df_result, self.pyeong_summary).set_index("complexNo")
+        self.complexes = summary[["complexName"]].join(complexes).join(summary.drop(columns="complexName"))
+        self.complexes = self.complexes.reset_index().replace([np.inf, -np.inf], np.nan)
+        self.complex_index = {c: i for i, c in enumerate(self.complexes["complexNo"])}
+
+        # 순위표는 (단지, 평형)별 집계만 미리 해 두고 요청별로 매물 수 조건/순위/정렬을 계산
+        self.leaderboard = aggregate_leaderboard(df_result)
+
+        # 갭 지수용 월별 집계 (최근 5/3/1년) - 화면과 같은 집계 큐브
+        if Path(paths["REAL_PRICE"]).exists():
+            df_real = load_real_price_data.__wrapped__(str(paths["REAL_PRICE"]), 0.0)
+            self.cube = build_monthly_cube(df_real)
+        else:
+            self.cube = build_monthly_cube(pd.DataFrame(columns=["dealDateClass"]))
+
+    @classmethod
+    def file_version(cls, paths: Dict[str, Path]) -> str:
+        stamps = []
+        for key in cls.WATCHED:
+            path = Path(paths[key])
+            stamps.append(str(path.stat().st_mtime_ns) if path.exists() else "0")
+        return "-".join(stamps)
+
+    # ------------------------------------------------------------------
+    # 조회 (캐시 미스일 때만 호출됨)
+    # ------------------------------------------------------------------
+    def complex_list(self) -> Dict:
+        return {"count": len(self.complexes), "complexes": _records(self.complexes)}
+
+    def complex_summary(self, complex_no: str) -> Dict:
+        if complex_no not in self.complex_index:
+            raise ApiError(404, f"단지를 찾을 수 없습니다: {complex_no}")
+        return _records(self.complexes.iloc[[self.complex_index[complex_no]]])[0]
+
+    def pyeong_stats(self, complex_no: str) -> Dict:
+        self.complex_summary(complex_no)
+        rows = self.pyeong_summary.iloc[self.pyeong_index.get(complex_no, [])]
+        return {"complexNo": complex_no, "pyeongs": _records(rows)}
+
+    def listing_table(self, complex_no: str, query: Dict[str, List[str]]) -> Dict:
+        self.complex_summary(complex_no)
+        rows = self.listings.iloc[self.listing_index.get(complex_no, [])]
+        if query.get("trade"):
+            rows = rows[rows["tradeTypeName"].isin(query["trade"])]
+        if query.get("pyeong"):
+            rows = rows[rows["pyeongName3"].isin(query["pyeong"])]
+        rows = rows.sort_values("dealOrWarrantPrc2", kind="stable")
+        limit = min(_int_param(query, "limit", API_SERVER_CONFIG["MAX_LISTINGS"]), API_SERVER_CONFIG["MAX_LISTINGS"])
+        offset = _int_param(query, "offset", 0)
+        return {"complexNo": complex_no, "total": len(rows), "offset": offset,
+                "listings": _records(rows.iloc[offset:offset + limit])}
+
+    def leaderboard_table(self, query: Dict[str, List[str]]) -> Dict:
+        from src.reports import LEADERBOARD_METRICS, score_leaderboard
+
+        by = (query.get("by") or ["score"])[-1]
+        if by not in LEADERBOARD_METRICS:
+            raise ApiError(400, f"by는 {list(LEADERBOARD_METRICS)} 중 하나여야 합니다.")
+        board = score_leaderboard(self.leaderboard, by, _int_param(query, "top", 20),
+                                  _int_param(query, "min_listings", 1))
+        return {"by": by, "count": len(board), "rows": _records(board)}
+
+    def pairwise_gap(self, query: Dict[str, List[str]]) -> Dict:
+        from src.aggregates import PERIOD_CLASSES, query_monthly, compute_pairwise_gap_indices
+
+        period = _int_param(query, "period", 5)
+        if period not in PERIOD_CLASSES:
+            raise ApiError(400, f"period는 {sorted(PERIOD_CLASSES)} 중 하나여야 합니다.")
+        pairs = []
+        for value in query.get("pair", []):
+            complex_no, sep, pyeong = value.partition(":")
+            if not sep or not complex_no or not pyeong:
+                raise ApiError(400, f"pair 형식은 <complexNo>:<평형> 입니다: {value}")
+            pairs.append((complex_no, pyeong))
+        if len(pairs) < 2:
+            raise ApiError(400, "pair를 2개 이상 지정하세요.")
+        df_monthly = query_monthly(self.cube, list(dict.fromkeys(pairs)), period=period)
+        labels = df_monthly.drop_duplicates(["complexNo", "pyeongName3"])[["complexNo", "pyeongName3", "color_label"]]
+        df_gaps = compute_pairwise_gap_indices(df_monthly, labels["color_label"].tolist())
+        return {"period": period, "labels": _records(labels), "pairs": _records(df_gaps)}
+
+
+def _int_param(query: Dict[str, List[str]], name: str, default: int) -> int:
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        raise ApiError(400, f"{name}는 정수여야 합니다: {values[-1]}")
+    if value < 0:
+        raise ApiError(400, f"{name}는 0 이상이어야 합니다.")
+    return value
+
+
+class ResponseCache:
+    """(데이터 버전, 경로, 쿼리) → (ETag, 본문) LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, entry: Tuple[str, bytes]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def make_etag(key: Tuple) -> str:
+    """캐시 키에서 ETag 생성 (데이터 버전이 같으면 같은 응답이므로 본문을 만들지 않고도 비교 가능)"""
+    return '"' + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:20] + '"'
+
+
+class StoreRegistry:
+    """결과 폴더별 ResultStore (파일이 바뀌면 새로 만들고, 확인은 RELOAD_CHECK_SEC마다 한 번)"""
+
+    def __init__(self, default_paths: Dict[str, Path]):
+        self.default_paths = default_paths
+        self._stores: Dict[str, ResultStore] = {}
+        self._lock = threading.Lock()
+
+    def resolve_paths(self, run_id: Optional[str]) -> Dict[str, Path]:
+        if not run_id:
+            return self.default_paths
+        run = get_run(run_id)
+        if run is None:
+            raise ApiError(404, f"실행 결과를 찾을 수 없습니다: {run_id}")
+        return run.paths
+
+    def get(self, run_id: Optional[str] = None) -> ResultStore:
+        paths = self.resolve_paths(run_id)
+        key = str(paths["RESULT"])
+        store = self._stores.get(key)
+        if store is not None and time.monotonic() - store.checked_at < API_SERVER_CONFIG["RELOAD_CHECK_SEC"]:
+            return store
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None and time.monotonic() - store.checked_at < API_SERVER_CONFIG["RELOAD_CHECK_SEC"]:
+                return store
+            if not Path(paths["RESULT"]).exists():
+                raise ApiError(404, f"분석 결과가 없습니다: {paths['RESULT']}")
+            if store is not None and store.version == ResultStore.file_version(paths):
+                store.checked_at = time.monotonic()
+                return store
+            store = ResultStore(paths)
+            self._stores[key] = store
+            return store
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ResultApiServer"
+    protocol_version = "HTTP/1.1"  # keep-alive (요청마다 연결을 새로 맺지 않음)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        segments = [unquote(s) for s in parts.path.strip("/").split("/") if s]
+        query: Dict[str, List[str]] = {}
+        for name, value in parse_qsl(parts.query, keep_blank_values=False):
+            query.setdefault(name, []).append(value)
+
+        if segments == ["health"]:
+            return self._send(200, json.dumps({"ok": True, "cache": self.server.cache.stats()}).encode("utf-8"))
+        try:
+            handler = self._route(segments)
+            run_id = (query.pop("run", None) or [None])[-1]
+            store = self.server.stores.get(run_id)
+            key = (store.version, run_id, tuple(segments), tuple(sorted((k, tuple(v)) for k, v in query.items())))
+            etag = make_etag(key)
+            if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+                return self._send(304, b"", etag)
+            cached = self.server.cache.get(key)
+            if cached is None:
+                body = json.dumps(handler(store, query), ensure_ascii=False).encode("utf-8")
+                cached = (etag, body)
+                self.server.cache.put(key, cached)
+            self._send(200, cached[1], cached[0])
+        except ApiError as e:
+            self._send(e.status, json.dumps({"message": str(e)}, ensure_ascii=False).encode("utf-8"))
+        except Exception as e:
+            self._send(500, json.dumps({"message": f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _route(segments: List[str]):
+        if segments == ["complexes"]:
+            return lambda store, query: store.complex_list()
+        if segments == ["leaderboard"]:
+            return lambda store, query: store.leaderboard_table(query)
+        if segments == ["gap"]:
+            return lambda store, query: store.pairwise_gap(query)
+        if len(segments) == 2 and segments[0] == "complexes":
+            return lambda store, query: store.complex_summary(segments[1])
+        if len(segments) == 3 and segments[0] == "complexes" and segments[2] == "pyeongs":
+            return lambda store, query: store.pyeong_stats(segments[1])
+        if len(segments) == 3 and segments[0] == "complexes" and segments[2] == "listings":
+            return lambda store, query: store.listing_table(segments[1], query)
+        raise ApiError(404, "unknown endpoint")
+
+    def _send(self, status: int, body: bytes, etag: Optional[str] = None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"max-age={int(API_SERVER_CONFIG['RELOAD_CHECK_SEC'])}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 출력하지 않음 (/health로 캐시 통계 확인)
+
+
+class ResultApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, paths: Optional[Dict[str, Path]] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.stores = StoreRegistry(paths or DATA_PATHS)
+        self.cache = ResponseCache(API_SERVER_CONFIG["CACHE_SIZE"])
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(paths: Optional[Dict[str, Path]] = None, host: str = "127.0.0.1", port: int = 0) -> ResultApiServer:
+    """백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트 자동 선택). 종료는 server.shutdown()."""
+    server = ResultApiServer(paths, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    from src.cli import output_paths
+
+    parser = argparse.ArgumentParser(prog="python -m src.api_server", description="분석 결과 읽기 전용 JSON API")
+    parser.add_argument("--out", help="결과 폴더 (기본: data/)")
+    parser.add_argument("--host", default=API_SERVER_CONFIG["HOST"])
+    parser.add_argument("--port", type=int, default=API_SERVER_CONFIG["PORT"])
+    args = parser.parse_args(argv)
+
+    # 집계 함수만 가져다 쓰므로 Streamlit 런타임 없음 경고는 생략 (설정 로드 후 로그 레벨 지정)
+    from streamlit import config as streamlit_config, logger as streamlit_logger
+    streamlit_config.get_option("logger.level")
+    streamlit_logger.set_log_level("error")
+
+    server = ResultApiServer(output_paths(args.out), args.host, args.port)
+    try:
+        server.stores.get()  # 첫 요청이 느리지 않도록 미리 로딩
+    except ApiError as e:
+        print(f"경고: {e}")
+    print(f"serving on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import hashlib
+import pandas as pd
+import streamlit as st
+
+
+def frame_fingerprint(*objs) -> str:
+    """DataFrame/Series 및 일반 파라미터들의 내용 기반 지문(해시) 반환
+
+    Streamlit 캐시 키로 사용하기 위한 것으로, DataFrame은 컬럼명과
+    전체 행의 값 해시를 사용하므로 대용량 프레임도 샘플링 없이 구분됨.
+    """
+    h = hashlib.sha1()
+    for obj in objs:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            if isinstance(obj, pd.DataFrame):
+                h.update(repr(list(obj.columns)).encode("utf-8"))
+            h.update(str(obj.shape).encode("utf-8"))
+            if len(obj):
+                h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        else:
+            h.update(repr(obj).encode("utf-8"))
+        h.update(b"|")
+    return h.hexdigest()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _memoized_call(func_key: str, fingerprint: str, _func, _args: tuple, _kwargs: dict):
+    """fingerprint가 같으면 다시 계산하지 않음 (func_key, fingerprint가 캐시 키)"""
+    return _func(*_args, **_kwargs)
+
+
+def memoize_by_fingerprint(func, *args, **kwargs):
+    """입력 데이터 지문 기반으로 func(*args, **kwargs) 결과를 메모이즈"""
+    func_key = f"{func.__module__}.{func.__qualname__}"
+    fingerprint = frame_fingerprint(*args, sorted(kwargs.items()))
+    return _memoized_call(func_key, fingerprint, func, args, kwargs)
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _memoized_resource(func_key: str, fingerprint: str, _func, _args: tuple, _kwargs: dict):
+    """pickle할 수 없는 결과(Styler 등)용 메모이즈 (복사 없이 같은 객체를 공유하므로 수정하지 말 것)"""
+    return _func(*_args, **_kwargs)
+
+
+def memoize_resource_by_fingerprint(func, *args, **kwargs):
+    """memoize_by_fingerprint와 같으나 결과를 복사하지 않고 공유 (읽기 전용 객체용)"""
+    func_key = f"{func.__module__}.{func.__qualname__}"
+    fingerprint = frame_fingerprint(*args, sorted(kwargs.items()))
+    return _memoized_resource(func_key, fingerprint, func, args, kwargs)
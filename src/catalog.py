@@ -0,0 +1,140 @@
+"""로컬 단지 목록 (법정동별 단지 목록 API 응답 저장소)
+
+읍/면/동(cortarNo) 단위로 단지 목록을 통째로 교체 저장하며, 사이드바 단지 선택은
+CATALOG_CONFIG["TTL_SEC"] 이내에 저장된 목록이 있으면 API를 호출하지 않고 사용함.
+`python -m src.cli warm-cache <지역>`으로 미리 채워 둘 수 있음.
+"""
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from src.config import DATA_PATHS, CATALOG_CONFIG
+from src.schema import coerce, read_dataset, write_dataset
+
+REGION_COLUMNS = ["시/도", "시/군/구", "읍/면/동"]
+
+CATALOG_COLUMNS = [
+    "complexNo", "complexName", "cortarNo", "realEstateTypeCode", "latitude", "longitude",
+    "totalHouseholdCount", "totalBuildingCount", "highFloor", "lowFloor", "useApproveYmd",
+    "dealCount", "leaseCount", "rentCount", "downloadDate",
+]
+
+
+def catalog_path(path=None) -> Path:
+    return Path(path) if path is not None else DATA_PATHS["CATALOG"]
+
+
+def load_catalog(path=None) -> pd.DataFrame:
+    """저장된 단지 목록 전체 (없으면 빈 DataFrame)"""
+    path = catalog_path(path)
+    if not path.exists():
+        return coerce(pd.DataFrame(columns=CATALOG_COLUMNS), "catalog")
+    return read_dataset(path, "catalog")
+
+
+def update_catalog(complexes_by_cortar: Dict[str, List[Dict]], path=None) -> pd.DataFrame:
+    """법정동별 단지 목록을 교체 저장 (다른 법정동 행은 유지) 후 전체 목록 반환
+
+    쓰기는 임시 파일에 한 뒤 os.replace로 교체하므로 읽는 쪽이 중간 상태를 보지 않음.
+    """
+    path = catalog_path(path)
+    downloaded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    fresh = pd.DataFrame(
+        [dict(c, cortarNo=str(cortar_no)) for cortar_no, complexes in complexes_by_cortar.items() for c in complexes],
+        columns=CATALOG_COLUMNS
+    ).assign(downloadDate=downloaded)
+    fresh = coerce(fresh, "catalog")
+
+    catalog = load_catalog(path)
+    catalog = catalog[~catalog["cortarNo"].isin([str(c) for c in complexes_by_cortar])]
+    catalog = coerce(pd.concat([catalog, fresh], ignore_index=True), "catalog") if len(catalog) else fresh
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    write_dataset(catalog, tmp_path, "catalog")
+    os.replace(tmp_path, path)
+    return catalog
+
+
+def cached_complexes(cortar_no: str, max_age_sec: Optional[float] = None, catalog: Optional[pd.DataFrame] = None) -> Optional[List[Dict]]:
+    """TTL 이내에 저장된 법정동 단지 목록 (없거나 오래됐으면 None)"""
+    max_age_sec = CATALOG_CONFIG["TTL_SEC"] if max_age_sec is None else max_age_sec
+    catalog = load_catalog() if catalog is None else catalog
+    rows = catalog[catalog["cortarNo"] == str(cortar_no)]
+    if rows.empty:
+        return None
+    downloaded = rows["downloadDate"].min()
+    if pd.isna(downloaded) or (pd.Timestamp.now() - downloaded).total_seconds() > max_age_sec:
+        return None
+    return rows.drop(columns="downloadDate").to_dict("records")
+
+
+def stale_cortars(cortar_nos: Iterable[str], max_age_sec: Optional[float] = None, path=None) -> List[str]:
+    """저장된 목록이 없거나 TTL이 지난 법정동 코드"""
+    catalog = load_catalog(path)
+    return [c for c in cortar_nos if cached_complexes(c, max_age_sec, catalog) is None]
+
+
+def load_regions() -> pd.DataFrame:
+    """법정동 코드 표 (cortarNo는 문자열)"""
+    return read_dataset(DATA_PATHS["CORTAR"], "region")
+
+
+def resolve_region(name: str, regions: pd.DataFrame) -> List[str]:
+    """지역 이름 → 해당하는 읍/면/동 cortarNo 목록
+
+    공백으로 나눈 단어가 모두 맞는 행을 고름: 시/도는 앞부분 일치("서울" → 서울특별시),
+    시/군/구는 단어 일치("수원시", "장안구", "수원시 장안구"), 읍/면/동은 전체 일치.
+    예) "강남구", "서울 강남구 역삼동", "경기도 수원시"
+    """
+    mask = pd.Series(True, index=regions.index)
+    for token in name.split():
+        word = rf"(?:^|\s){re.escape(token)}(?:$|\s)"
+        mask &= (
+            regions["시/도"].str.startswith(token)
+            | regions["시/군/구"].str.contains(word, regex=True)
+            | regions["읍/면/동"].eq(token)
+        )
+    return regions.loc[mask, "cortarNo"].astype(str).tolist()
+
+
+def fetch_catalog(cortar_nos: Iterable[str], workers: int = 4, max_age_sec: Optional[float] = None,
+                  refresh: bool = False, on_error=None) -> Dict[str, List[Dict]]:
+    """법정동별 단지 목록 (저장된 목록이 최신이면 재사용, 나머지는 병렬 조회 후 저장)
+
+    refresh: 저장된 목록을 무시하고 모두 다시 조회
+    on_error: 조회 실패 시 호출할 함수 (cortarNo, 예외). 실패한 법정동은 결과에서 빠짐.
+    """
+    from src.api_client import request_complex_list
+
+    cortar_nos = [str(c) for c in dict.fromkeys(cortar_nos)]
+    catalog = load_catalog()
+    result: Dict[str, List[Dict]] = {}
+    missing = []
+    for cortar_no in cortar_nos:
+        cached = None if refresh else cached_complexes(cortar_no, max_age_sec, catalog)
+        if cached is None:
+            missing.append(cortar_no)
+        else:
+            result[cortar_no] = cached
+
+    def request(cortar_no):
+        try:
+            return cortar_no, request_complex_list(cortar_no)
+        except Exception as e:
+            if on_error is not None:
+                on_error(cortar_no, e)
+            return cortar_no, None
+
+    fetched = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as executor:
+            fetched = {c: complexes for c, complexes in executor.map(request, missing) if complexes is not None}
+    if fetched:
+        update_catalog(fetched)
+    result.update(fetched)
+    return {c: result[c] for c in cortar_nos if c in result}
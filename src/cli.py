@@ -0,0 +1,433 @@
+"""헤드리스 배치 실행 (브라우저/Streamlit 런타임 없이 수집, 병합, 보고서, 단지 목록 캐시)
+
+    python -m src.cli collect 138183 136913 --out data/nightly --workers 8 --merge
+    python -m src.cli collect "서울 강남구 역삼동" 4113110100 --out data/nightly --limit 50
+    python -m src.cli merge --out data/nightly                      # 수집된 단지 전체 병합
+    python -m src.cli report --out data/nightly --format csv --output report.csv
+    python -m src.cli leaderboard "서울특별시 강남구" --out data/crawls/gangnam/output --by bubble --top 20
+    python -m src.cli similar 138183 34 --out data/crawls/gangnam/output --top 10
+    python -m src.cli similar 138183 34 --out data/nightly --scope run   # --out 폴더의 단지끼리만 비교
+    python -m src.cli warm-cache "서울특별시 강남구" "경기도 수원시" --workers 8
+    python -m src.cli crawl start "서울특별시 강남구" --name gangnam --batch-size 10 --workers 8
+    python -m src.cli crawl resume gangnam --finalize              # 중단 후 이어서 수집, 끝나면 합본/병합
+    python -m src.cli rebuild --day 2026-10-19 --out data/rebuilt --workers 8   # 보관 응답으로 네트워크 없이 다시 만들기
+    python -m src.cli gc-raw --keep-days 14 --max-gb 2                 # 보관 응답 정리 (기본값은 RAW_ARCHIVE_CONFIG)
+
+대상은 단지번호, 법정동 코드(10자리 cortarNo), 지역 이름("강남구", "서울 강남구 역삼동")을 섞어 쓸 수 있음.
+법정동/지역은 로컬 단지 목록(src/catalog.py, 최신이 아니면 API 조회)으로 단지번호를 찾음.
+--out 폴더에는 data/와 같은 파일명으로 저장함 (없으면 공용 data/ 폴더).
+진행 메시지는 stderr, 보고서는 stdout(또는 --output)으로 출력. 종료 코드: 0 성공, 1 실패, 2 인자 오류.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from src.config import DATA_DIR, COLLECT_CONFIG, CRAWL_CONFIG, SIMILARITY_CONFIG, RAW_ARCHIVE_CONFIG
+from src.runs import RunHandle
+from src.schema import format_dates, read_dataset
+from src.catalog import load_regions, resolve_region, fetch_catalog
+from src.reports import LEADERBOARD_METRICS
+
+REPORT_FORMATS = ("table", "csv", "json")
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+class TargetError(ValueError):
+    """단지번호/법정동/지역 이름으로 해석할 수 없는 대상"""
+
+
+def output_paths(out: Optional[str]) -> Dict[str, Path]:
+    """--out 폴더의 산출물 경로 (DATA_PATHS와 같은 키, 법정동 코드/단지 목록은 공용 파일)"""
+    out_dir = Path(out) if out else DATA_DIR
+    return RunHandle(out_dir.name, out_dir).paths
+
+
+def parse_targets(targets: List[str], regions: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """대상 문자열 → (단지번호 목록, 법정동 코드 목록)"""
+    known_cortars = set(regions["cortarNo"])
+    complex_ids, cortar_nos = [], []
+    for target in targets:
+        target = target.strip()
+        if target.isdigit() and target in known_cortars:
+            cortar_nos.append(target)
+        elif target.isdigit():
+            complex_ids.append(target)
+        else:
+            matched = resolve_region(target, regions)
+            if not matched:
+                raise TargetError(f"지역을 찾을 수 없습니다: {target}")
+            cortar_nos.extend(matched)
+    return list(dict.fromkeys(complex_ids)), list(dict.fromkeys(cortar_nos))
+
+
+def resolve_complex_ids(targets: List[str], workers: int, refresh: bool = False) -> List[str]:
+    """대상 → 단지번호 목록 (법정동/지역은 단지 목록으로 펼침, 입력 순서 유지)"""
+    complex_ids, cortar_nos = parse_targets(targets, load_regions())
+    if cortar_nos:
+        log(f"법정동 {len(cortar_nos)}곳의 단지 목록 확인 중...")
+        catalog = fetch_catalog(
+            cortar_nos, workers=workers, refresh=refresh,
+            on_error=lambda c, e: log(f"  단지 목록 조회 실패 ({c}): {e}")
+        )
+        complex_ids += [str(c["complexNo"]) for complexes in catalog.values() for c in complexes]
+    return list(dict.fromkeys(complex_ids))
+
+
+def collected_complex_ids(paths: Dict[str, Path]) -> List[str]:
+    """이미 수집된 단지번호 (complex_data.csv 기준)"""
+    if not paths["COMPLEX"].exists():
+        return []
+    return read_dataset(paths["COMPLEX"], "complex", columns=["complexNo"])["complexNo"].tolist()
+
+
+def run_collect(complex_ids: List[str], paths: Dict[str, Path], workers: int):
+    from src.naver_apt_v5 import main_function
+
+    reported = [-1]
+
+    def progress(fraction, message):
+        step = int(fraction * 10)
+        if step != reported[0]:
+            reported[0] = step
+            log(f"  {fraction * 100:5.1f}%  {message}")
+
+    main_function(complex_ids, progress_callback=progress, paths=paths, max_workers=workers)
+
+
+def run_merge(complex_ids: List[str], paths: Dict[str, Path]) -> bool:
+    from src.sell_price_merge_v2 import main as merge_main
+    return merge_main(complex_ids, log=lambda m: log(f"  {m}"), paths=paths) is not None
+
+
+def cmd_collect(args) -> int:
+    from src.listing_history import record_sell_snapshot
+    from src.similarity import record_units
+
+    complex_ids = resolve_complex_ids(args.targets, args.workers, args.refresh_catalog)
+    if args.limit:
+        complex_ids = complex_ids[:args.limit]
+    if not complex_ids:
+        log("수집할 단지가 없습니다.")
+        return 1
+    paths = output_paths(args.out)
+    paths["COMPLEX"].parent.mkdir(parents=True, exist_ok=True)
+    log(f"단지 {len(complex_ids)}곳 수집 시작 (동시 {args.workers}개) → {paths['COMPLEX'].parent}")
+    started = time.perf_counter()
+    run_collect(complex_ids, paths, args.workers)
+    log(f"수집 완료: {time.perf_counter() - started:.1f}s")
+    record_sell_snapshot(paths, complex_ids, log=log)
+    record_units(paths, log=log)
+    if args.merge:
+        log("병합 시작")
+        if not run_merge(complex_ids, paths):
+            return 1
+    return 0
+
+
+def cmd_merge(args) -> int:
+    paths = output_paths(args.out)
+    complex_ids = resolve_complex_ids(args.targets, args.workers) if args.targets else collected_complex_ids(paths)
+    if not complex_ids:
+        log(f"병합할 단지가 없습니다: {paths['COMPLEX']}")
+        return 1
+    log(f"단지 {len(complex_ids)}곳 병합 → {paths['RESULT']}")
+    started = time.perf_counter()
+    ok = run_merge(complex_ids, paths)
+    log(f"병합 {'완료' if ok else '실패'}: {time.perf_counter() - started:.1f}s")
+    return 0 if ok else 1
+
+
+def format_report(df: pd.DataFrame, fmt: str) -> str:
+    df = format_dates(df)
+    if fmt == "csv":
+        return df.to_csv(index=False)
+    if fmt == "json":
+        return df.to_json(orient="records", force_ascii=False, indent=1)
+    return df.to_string(index=False, float_format=lambda v: f"{v:,.1f}")
+
+
+def cmd_report(args) -> int:
+    from src.reports import build_pyeong_summary, SUMMARY_SOURCE_COLUMNS
+
+    paths = output_paths(args.out)
+    if not paths["RESULT"].exists():
+        log(f"병합 결과가 없습니다: {paths['RESULT']} (merge를 먼저 실행하세요)")
+        return 1
+    df_result = read_dataset(paths["RESULT"], "result", columns=SUMMARY_SOURCE_COLUMNS)
+    summary = build_pyeong_summary(df_result)
+    if args.targets:
+        summary = summary[summary["complexNo"].isin(resolve_complex_ids(args.targets, args.workers))]
+    text = format_report(summary, args.format)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        # CSV는 엑셀에서 바로 열 수 있도록 BOM 포함
+        Path(args.output).write_text(text, encoding="utf-8-sig" if args.format == "csv" else "utf-8")
+        log(f"보고서 저장: {args.output} ({len(summary)}행)")
+    else:
+        sys.stdout.write(text + ("" if text.endswith("\n") else "\n"))
+    return 0
+
+
+def cmd_leaderboard(args) -> int:
+    from src.reports import build_district_leaderboard, LEADERBOARD_SOURCE_COLUMNS
+
+    paths = output_paths(args.out)
+    if not paths["RESULT"].exists():
+        log(f"병합 결과가 없습니다: {paths['RESULT']} (merge를 먼저 실행하세요)")
+        return 1
+    started = time.perf_counter()
+    df_result = read_dataset(paths["RESULT"], "result", columns=LEADERBOARD_SOURCE_COLUMNS)
+    if args.targets:
+        df_result = df_result[df_result["complexNo"].isin(resolve_complex_ids(args.targets, args.workers))]
+    board = build_district_leaderboard(df_result, top=args.top, by=args.by, min_listings=args.min_listings)
+    log(f"단지-평형 {len(board)}개 ({time.perf_counter() - started:.2f}s)")
+    text = format_report(board, args.format)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text, encoding="utf-8-sig" if args.format == "csv" else "utf-8")
+        log(f"순위표 저장: {args.output}")
+    else:
+        sys.stdout.write(text + ("" if text.endswith("\n") else "\n"))
+    return 0
+
+
+def cmd_similar(args) -> int:
+    from src.similarity import SimilarityIndex, load_scope_units, similar_with_stats
+    from src.reports import build_pyeong_summary, SUMMARY_SOURCE_COLUMNS
+
+    paths = output_paths(args.out)
+    if not paths["PYEONG"].exists() or not paths["COMPLEX"].exists():
+        log(f"단지/평형 데이터가 없습니다: {paths['PYEONG'].parent} (collect를 먼저 실행하세요)")
+        return 1
+    started = time.perf_counter()
+    index = SimilarityIndex(load_scope_units(str(paths["PYEONG"]), str(paths["COMPLEX"]), args.scope))
+    if index.locate([(args.complex, args.pyeong)])[0] < 0:
+        log(f"평형을 찾을 수 없습니다: {args.complex} {args.pyeong}평")
+        return 1
+    if paths["RESULT"].exists():
+        summary = build_pyeong_summary(read_dataset(paths["RESULT"], "result", columns=SUMMARY_SOURCE_COLUMNS))
+    else:
+        summary = build_pyeong_summary(pd.DataFrame(columns=["tradeTypeName"]))
+    table = similar_with_stats(index, args.complex, args.pyeong, summary, args.top, not args.same_complex)
+    log(f"단지-평형 {len(index):,}개 중 {len(table) - 1}개 ({time.perf_counter() - started:.2f}s)")
+    text = format_report(table, args.format)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text, encoding="utf-8-sig" if args.format == "csv" else "utf-8")
+        log(f"유사 평형 저장: {args.output}")
+    else:
+        sys.stdout.write(text + ("" if text.endswith("\n") else "\n"))
+    return 0
+
+
+def cmd_warm_cache(args) -> int:
+    regions = load_regions()
+    complex_ids, cortar_nos = parse_targets(args.targets, regions)
+    if complex_ids:
+        log(f"단지번호는 단지 목록 캐시 대상이 아니므로 건너뜀: {', '.join(complex_ids)}")
+    if not cortar_nos:
+        log("갱신할 법정동이 없습니다.")
+        return 1
+    failures = []
+    started = time.perf_counter()
+    catalog = fetch_catalog(
+        cortar_nos, workers=args.workers, refresh=args.force,
+        on_error=lambda c, e: failures.append((c, e))
+    )
+    for cortar_no, error in failures:
+        log(f"  단지 목록 조회 실패 ({cortar_no}): {error}")
+    total = sum(len(complexes) for complexes in catalog.values())
+    log(f"법정동 {len(catalog)}/{len(cortar_nos)}곳, 단지 {total:,}개 캐시됨 ({time.perf_counter() - started:.1f}s)")
+    return 1 if failures else 0
+
+
+def cmd_crawl(args) -> int:
+    from src.crawl import Crawl, open_crawl, list_crawls, CrawlError
+
+    if args.action == "list":
+        for crawl_id in list_crawls():
+            counts = Crawl(crawl_id).status()
+            print(f"{crawl_id}\t" + "\t".join(f"{k}={v}" for k, v in counts.items()))
+        return 0
+    if args.action == "start":
+        crawl = Crawl(args.name or time.strftime("%Y%m%d-%H%M%S"))
+        if crawl.exists():
+            log(f"이미 있는 크롤 작업입니다 (이어서 실행은 resume): {crawl.crawl_id}")
+            return 2
+        complex_ids, cortar_nos = parse_targets(args.targets, load_regions())
+        complexes = [{"complexNo": c} for c in complex_ids]
+        if cortar_nos:
+            log(f"법정동 {len(cortar_nos)}곳의 단지 목록 확인 중...")
+            catalog = fetch_catalog(
+                cortar_nos, workers=args.workers, refresh=args.refresh_catalog,
+                on_error=lambda c, e: log(f"  단지 목록 조회 실패 ({c}): {e}")
+            )
+            complexes += [
+                {"complexNo": c["complexNo"], "complexName": c.get("complexName", ""), "cortarNo": cortar_no}
+                for cortar_no, items in catalog.items() for c in items
+            ]
+        if not complexes:
+            log("수집할 단지가 없습니다.")
+            return 1
+        added = crawl.enqueue(complexes, meta={"targets": " | ".join(args.targets), "created": time.strftime("%Y-%m-%d %H:%M:%S")})
+        log(f"크롤 작업 {crawl.crawl_id}: 단지 {added:,}곳 대기열 등록 → {crawl.base_dir}")
+    else:
+        try:
+            crawl = open_crawl(args.name)
+        except CrawlError as e:
+            log(str(e))
+            return 2
+    if args.action == "retry":
+        log(f"실패한 단지 {crawl.retry_failed():,}곳을 대기열로 되돌림")
+    if args.action in ("start", "resume", "retry"):
+        counts = crawl.run(batch_size=args.batch_size, workers=args.workers, log=log)
+    else:
+        counts = crawl.status()
+    log("상태: " + ", ".join(f"{k} {v:,}" for k, v in counts.items()))
+    if args.action == "status":
+        failures = crawl.failures()
+        if not failures.empty:
+            sys.stdout.write(failures.to_string(index=False) + "\n")
+        return 0
+    if args.action == "finalize" or args.finalize:
+        if counts["pending"] or counts["running"]:
+            log("아직 수집이 끝나지 않은 단지가 있어 완료된 단지만 합칩니다.")
+        paths = crawl.finalize(merge=not args.no_merge, log=lambda m: log(f"  {m}"))
+        log(f"합본 저장: {paths['COMPLEX'].parent}")
+    return 1 if counts["failed"] else 0
+
+
+def cmd_rebuild(args) -> int:
+    from src.raw_archive import rebuild
+
+    try:
+        paths = rebuild(
+            args.day, Path(args.out) if args.out else None, args.targets or None,
+            workers=args.workers, batch_size=args.batch_size, merge=not args.no_merge, log=lambda m: log(f"  {m}")
+        )
+    except FileNotFoundError as e:
+        log(str(e))
+        return 1
+    log(f"저장: {paths['COMPLEX'].parent}")
+    return 0
+
+
+def cmd_gc_raw(args) -> int:
+    from src.raw_archive import gc_archive
+
+    max_bytes = None if args.max_gb is None else int(args.max_gb * 1024 ** 3)
+    removed = gc_archive(keep_days=[time.strftime("%Y-%m-%d")], max_days=args.keep_days, max_bytes=max_bytes)
+    log(f"보관 응답 {len(removed)}일 삭제" + (f": {', '.join(removed)}" if removed else ""))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="집착 배치 실행 (수집/병합/보고서/단지 목록 캐시/지역 크롤/다시 만들기/보관 응답 정리)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p, targets_required):
+        p.add_argument("targets", nargs="+" if targets_required else "*",
+                       help="단지번호, 법정동 코드(10자리) 또는 지역 이름")
+        p.add_argument("--workers", type=int, default=COLLECT_CONFIG["MAX_WORKERS"], help="동시 요청 수")
+
+    collect = sub.add_parser("collect", help="단지 데이터 수집")
+    add_common(collect, True)
+    collect.add_argument("--out", help="산출물 폴더 (기본: data/)")
+    collect.add_argument("--limit", type=int, default=0, help="최대 단지 수 (0이면 전체)")
+    collect.add_argument("--merge", action="store_true", help="수집 후 바로 병합")
+    collect.add_argument("--refresh-catalog", action="store_true", help="저장된 단지 목록을 무시하고 다시 조회")
+    collect.set_defaults(func=cmd_collect)
+
+    merge = sub.add_parser("merge", help="매물/실거래 병합 (result.csv)")
+    add_common(merge, False)
+    merge.add_argument("--out", help="입력/결과 폴더 (기본: data/)")
+    merge.set_defaults(func=cmd_merge)
+
+    report = sub.add_parser("report", help="단지-평형별 요약 보고서")
+    add_common(report, False)
+    report.add_argument("--out", help="병합 결과 폴더 (기본: data/)")
+    report.add_argument("--format", choices=REPORT_FORMATS, default="table")
+    report.add_argument("--output", help="저장할 파일 (없으면 stdout)")
+    report.set_defaults(func=cmd_report)
+
+    board = sub.add_parser("leaderboard", help="지역 전체 단지-평형을 자기 시세 대비 싼 순으로 순위 매김")
+    add_common(board, False)
+    board.add_argument("--out", help="병합 결과 폴더 (기본: data/)")
+    board.add_argument("--by", choices=list(LEADERBOARD_METRICS), default="score",
+                       help="정렬 기준 (score: 세 지표 순위 평균, bubble: 버블 지수, drawdown: 5년 최고가 대비, kb: KB시세 대비)")
+    board.add_argument("--top", type=int, default=20, help="상위 몇 개 (0이면 전체)")
+    board.add_argument("--min-listings", type=int, default=1, help="매매 매물이 이보다 적은 평형은 제외")
+    board.add_argument("--format", choices=REPORT_FORMATS, default="table")
+    board.add_argument("--output", help="저장할 파일 (없으면 stdout)")
+    board.set_defaults(func=cmd_leaderboard)
+
+    similar = sub.add_parser("similar", help="단지/평형 특성이 비슷한 평형 찾기")
+    similar.add_argument("complex", help="기준 단지번호")
+    similar.add_argument("pyeong", help="기준 평형 (예: 34)")
+    similar.add_argument("--out", help="수집/병합 결과 폴더 (기본: data/)")
+    similar.add_argument("--top", type=int, default=SIMILARITY_CONFIG["TOP_K"], help="찾을 평형 수")
+    similar.add_argument("--same-complex", action="store_true", help="같은 단지의 다른 평형도 포함")
+    similar.add_argument("--scope", choices=["catalog", "run"], default=SIMILARITY_CONFIG["SCOPE"],
+                         help="비교 범위 (catalog: 지금까지 수집한 모든 단지, run: --out 폴더의 단지만)")
+    similar.add_argument("--format", choices=REPORT_FORMATS, default="table")
+    similar.add_argument("--output", help="저장할 파일 (없으면 stdout)")
+    similar.set_defaults(func=cmd_similar)
+
+    warm = sub.add_parser("warm-cache", help="법정동 단지 목록 캐시 갱신")
+    add_common(warm, True)
+    warm.add_argument("--force", action="store_true", help="최신 캐시도 다시 조회")
+    warm.set_defaults(func=cmd_warm_cache)
+
+    crawl = sub.add_parser("crawl", help="시/도, 시/군/구 단위 대량 수집 (중단 후 이어서 실행 가능)")
+    crawl_sub = crawl.add_subparsers(dest="action", required=True)
+    crawl_start = crawl_sub.add_parser("start", help="대상 지역의 단지를 대기열에 넣고 수집 시작")
+    crawl_start.add_argument("targets", nargs="+", help="단지번호, 법정동 코드(10자리) 또는 지역 이름")
+    crawl_start.add_argument("--name", help="크롤 작업 이름 (기본: 시작 시각)")
+    crawl_start.add_argument("--refresh-catalog", action="store_true", help="저장된 단지 목록을 무시하고 다시 조회")
+    for action, help_text in (("resume", "중단된 작업 이어서 수집"), ("retry", "실패한 단지를 다시 수집"),
+                              ("status", "진행 상황과 실패 단지 출력"), ("finalize", "완료된 조각을 합쳐 output/에 저장")):
+        p = crawl_sub.add_parser(action, help=help_text)
+        p.add_argument("name", help="크롤 작업 이름")
+    crawl_sub.add_parser("list", help="크롤 작업 목록")
+    for p in crawl_sub.choices.values():
+        p.add_argument("--workers", type=int, default=COLLECT_CONFIG["MAX_WORKERS"], help="동시 요청 수")
+        p.add_argument("--batch-size", type=int, default=CRAWL_CONFIG["BATCH_SIZE"], help="조각 1개에 담을 단지 수")
+        p.add_argument("--finalize", action="store_true", help="수집이 끝나면 조각을 합쳐 병합")
+        p.add_argument("--no-merge", action="store_true", help="finalize 시 result.csv 병합 생략")
+    crawl.set_defaults(func=cmd_crawl)
+
+    rebuild = sub.add_parser("rebuild", help="보관된 원본 응답으로 산출물을 다시 만들기 (네트워크 요청 없음)")
+    rebuild.add_argument("targets", nargs="*", help="단지번호 (없으면 그날 보관된 전체)")
+    rebuild.add_argument("--day", help="보관 날짜 YYYY-MM-DD (기본: 가장 최근)")
+    rebuild.add_argument("--out", help="산출물 폴더 (기본: data/rebuilds/<날짜>)")
+    rebuild.add_argument("--workers", type=int, default=RAW_ARCHIVE_CONFIG["WORKERS"], help="동시 프로세스 수")
+    rebuild.add_argument("--batch-size", type=int, default=RAW_ARCHIVE_CONFIG["BATCH_SIZE"], help="프로세스 1건이 처리하는 단지 수")
+    rebuild.add_argument("--no-merge", action="store_true", help="result.csv 병합 생략")
+    rebuild.set_defaults(func=cmd_rebuild)
+
+    gc_raw = sub.add_parser("gc-raw", help="보관 기간/용량을 넘은 원본 응답 날짜 폴더 삭제")
+    gc_raw.add_argument("--keep-days", type=int, help=f"보관 일수 (기본 {RAW_ARCHIVE_CONFIG['KEEP_DAYS']}, 0이면 제한 없음)")
+    gc_raw.add_argument("--max-gb", type=float, help="전체 용량 상한 GB (기본 RAW_ARCHIVE_CONFIG['MAX_BYTES'], 0이면 제한 없음)")
+    gc_raw.set_defaults(func=cmd_gc_raw)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except TargetError as e:
+        log(str(e))
+        return 2
+    except KeyboardInterrupt:
+        log("중단됨 (crawl 작업은 resume으로 이어서 실행할 수 있음)")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,11 @@ from pathlib import Path
 # Base paths
 BASE_DIR = Path(__file__).resolve().parent.parent  # config.py의 상위 폴더로 변경
 DATA_DIR = BASE_DIR / "data"
+RUNS_DIR = DATA_DIR / "runs"  # 분석 실행별 산출물 폴더 (runs/<run_id>/)
+HISTORY_DIR = DATA_DIR / "history"  # 매물 호가 이력 저장소 (src/listing_history.py)
+CRAWLS_DIR = DATA_DIR / "crawls"  # 지역 단위 대량 수집 작업 폴더 (crawls/<crawl_id>/, src/crawl.py)
+RAW_ARCHIVE_DIR = DATA_DIR / "raw"  # API 원본 응답 보관소 (raw/<날짜>/<단지번호>.jsonl.gz, src/raw_archive.py)
+REBUILDS_DIR = DATA_DIR / "rebuilds"  # 보관 응답으로 다시 만든 산출물 (rebuilds/<날짜>/)
 
 # Data paths
 DATA_PATHS = {
@@ -15,6 +20,9 @@ DATA_PATHS = {
     "REAL_PRICE": DATA_DIR / "price_data.csv",
     "DONG": DATA_DIR / "dong_data.csv",
     "PROVIDER": DATA_DIR / "provider_data.csv",
+    "CATALOG": DATA_DIR / "complex_catalog.csv",  # 법정동별 단지 목록 (src/catalog.py)
+    "CHANGES": DATA_DIR / "listing_changes.csv",  # 직전 수집 대비 매물 변경 (src/listing_history.py)
+    "UNITS": DATA_DIR / "unit_catalog.csv",  # 수집한 모든 단지의 평형 특성 누적 목록 (src/similarity.py)
 }
 
 # UI Constants
@@ -22,5 +30,102 @@ UI_CONFIG = {
     "PAGE_TITLE": "집착 - 아파트를 째려보다",
     "PAGE_ICON": "🏠",
     "LAYOUT": "wide",
-    "INITIAL_SIDEBAR_STATE": "expanded"
+    "INITIAL_SIDEBAR_STATE": "expanded",
+    "MAX_SELECTIONS": 10,        # 한 번에 비교할 수 있는 최대 단지-평형 수
+    "SEARCH_LIMIT": 20,          # 단지명 검색 결과 최대 표시 수
+}
+
+# Chart Constants
+CHART_CONFIG = {
+    "WEBGL_POINT_THRESHOLD": 1500,  # 이 개수를 넘으면 WebGL 트레이스 + 다운샘플링 사용
+    "DOWNSAMPLE_TARGET": 600,       # 다운샘플링 시 라벨(단지-평형)별 최대 표시 점 수
+}
+
+# Background Job Constants
+JOB_CONFIG = {
+    "MAX_WORKERS": 4,            # 동시에 실행할 분석 작업 수 (실행별 폴더에 저장하므로 병렬 가능)
+    "RESULT_TTL_SEC": 600,       # 완료된 동일 단지 조합 작업을 재사용하는 시간
+    "POLL_INTERVAL_SEC": 1.0,    # 진행 중인 작업 상태 갱신 주기
+}
+
+# Run Namespace Constants
+RUN_CONFIG = {
+    "TTL_SEC": 6 * 3600,         # 게시된 실행 폴더 보관 시간
+    "MAX_RUNS": 50,              # 보관할 최대 실행 폴더 수 (초과 시 오래된 것부터 삭제)
+    "STAGING_TTL_SEC": 3600,     # 비정상 종료로 남은 임시 폴더 정리 기준
+}
+
+# Naver Land API (로컬 대역 서버로 부하 테스트할 때는 NAVER_LAND_BASE_URL 환경변수로 변경)
+API_CONFIG = {
+    "BASE_URL": "https://new.land.naver.com",
+}
+
+# Instrumentation Constants (src/instrumentation.py)
+TRACE_CONFIG = {
+    "FILE": os.getenv("ZIPCHECK_TRACE_FILE") or None,  # 끝난 span을 JSON lines로 덧붙일 파일 (없으면 기록 안 함)
+    "MAX_SPANS": 20000,          # Trace 1건이 메모리에 보관하는 최대 span 수 (초과 시 오래된 것부터 버림)
+    "SHOW_PANEL": True,          # 사이드바 "성능" 패널 표시 여부
+    "MEMORY": os.getenv("ZIPCHECK_PROFILE_MEMORY") == "1",  # 단계별 메모리 프로파일링 (src/memory_profile.py, 느려짐)
+}
+
+# Complex Catalog Constants (src/catalog.py)
+CATALOG_CONFIG = {
+    "TTL_SEC": 7 * 24 * 3600,    # 저장된 법정동 단지 목록을 API 대신 사용하는 기간
+}
+
+# Data Collection Constants
+COLLECT_CONFIG = {
+    "MAX_WORKERS": 4,            # 단지별 API 수집 동시 요청 수 (작업 1건 기준)
+}
+
+# Region Crawl Constants (src/crawl.py)
+CRAWL_CONFIG = {
+    "BATCH_SIZE": 10,            # 한 번에 수집해 조각(part)으로 게시하는 단지 수 (중단 시 최대 이만큼만 다시 수집)
+    "MAX_ATTEMPTS": 3,           # 수집 결과가 없는 단지를 다시 시도하는 최대 횟수 (초과 시 failed)
+}
+
+# Result API Server Constants (src/api_server.py)
+API_SERVER_CONFIG = {
+    "HOST": "127.0.0.1",
+    "PORT": 8800,
+    "CACHE_SIZE": 2048,          # LRU 응답 캐시 항목 수
+    "RELOAD_CHECK_SEC": 2.0,     # 결과 파일 변경 확인 주기 (요청마다 확인하지 않음)
+    "MAX_LISTINGS": 500,         # 매물 표 1회 응답 최대 행 수
+}
+
+# Listing History Constants (src/listing_history.py)
+HISTORY_CONFIG = {
+    "RECORD": True,              # 수집할 때마다 매물 호가/확인일자/상태 변경분을 HISTORY_DIR에 기록
+}
+
+# Spatial Index Constants (src/spatial.py)
+SPATIAL_CONFIG = {
+    "CELL_KM": 1.0,              # 좌표 격자 한 칸 크기(km) - 자주 묻는 반경과 비슷하게
+    "RADIUS_KM": 1.0,            # 주변 단지 비교 기본 반경
+    "NEAREST_K": 10,             # 가까운 순 비교 기본 단지 수
+}
+
+# Similarity Search Constants (src/similarity.py)
+SIMILARITY_CONFIG = {
+    "TOP_K": 10,                 # 유사 평형 기본 개수
+    "SCOPE": "catalog",          # 기본 비교 범위 (catalog: 누적 평형 목록 + 이번 실행, run: 이번 실행 단지만)
+    "BATCH_ROWS": 8192,          # 거리 계산 시 한 번에 처리하는 특성 행렬 행 수 (메모리 사용량 상한)
+    "WEIGHTS": {                 # 표준화된 특성별 가중치 (없는 특성은 1.0)
+        "exclusiveArea": 2.0,
+        "roomCnt": 1.5,
+        "useApproveYmd": 1.5,
+    },
+}
+
+# Raw Response Archive Constants (src/raw_archive.py)
+RAW_ARCHIVE_CONFIG = {
+    "RECORD": True,              # 수집할 때마다 API 원본 응답을 RAW_ARCHIVE_DIR에 보관
+    "COMPRESS_LEVEL": 6,         # gzip 압축 수준 (1 빠름 ~ 9 작음)
+    "FLUSH_BYTES": 256 * 1024,   # 단지별 버퍼가 이 크기를 넘으면 압축해 파일에 추가
+    "MAX_BUFFER_BYTES": 32 * 1024 * 1024,  # 전체 버퍼 상한 (넘으면 모든 단지 버퍼를 내보냄)
+    "WORKERS": 4,                # 다시 만들기(rebuild) 동시 프로세스 수
+    "BATCH_SIZE": 20,            # 다시 만들기 프로세스 1건이 처리하는 단지 수
+    "KEEP_DAYS": 30,             # 이보다 오래된 날짜 폴더는 삭제 (0이면 기간 제한 없음)
+    "MAX_BYTES": 5 * 1024 ** 3,  # 보관소 전체 크기 상한 (넘으면 오래된 날짜부터 삭제, 0이면 제한 없음)
+    "GC_INTERVAL_SEC": 3600,     # 수집 종료 시 정리(gc_archive)를 프로세스당 이 간격에 한 번만 실행
 }
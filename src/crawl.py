@@ -0,0 +1,292 @@
+"""지역 단위 대량 수집 (영구 작업 큐 + 단지별 체크포인트, 중단 후 이어서 실행)
+
+    python -m src.cli crawl start "서울 강남구" --name gangnam --batch-size 10 --workers 8
+    python -m src.cli crawl resume gangnam          # 중단/장애 후 끝난 단지는 건너뛰고 이어서
+    python -m src.cli crawl status gangnam
+    python -m src.cli crawl finalize gangnam        # 조각을 합쳐 output/에 저장하고 병합
+
+crawls/<이름>/ 구조:
+    queue.sqlite3     단지별 상태 (pending/running/done/failed), 시도 횟수, 저장된 조각
+    parts/<번호>/     배치 단위 수집 결과 (data/와 같은 파일명), 임시 폴더에서 os.replace로 게시
+    output/           finalize 결과 (조각 합본 + result.csv)
+
+배치가 게시된 뒤에 큐에 완료를 기록하므로, 그 사이에 중단돼도 recover()가 게시된 조각을 보고 완료로 맞춤.
+수집 결과에 없는 단지(요청 실패)는 MAX_ATTEMPTS까지 다시 대기열에 넣음.
+"""
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+from src.config import CRAWLS_DIR, CRAWL_CONFIG
+from src.runs import RunHandle, STAGING_PREFIX
+from src.schema import read_dataset
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 조각을 합칠 산출물 (단지 목록/법정동 코드는 공용 파일이라 제외)
+PART_KEYS = ("COMPLEX", "PYEONG", "SELL", "REAL_PRICE", "DONG", "PROVIDER", "CHANGES")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS queue (
+    complexNo   TEXT PRIMARY KEY,
+    complexName TEXT,
+    cortarNo    TEXT,
+    seq         INTEGER NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    part        TEXT,
+    error       TEXT,
+    updated_at  REAL
+);
+CREATE INDEX IF NOT EXISTS queue_status ON queue (status, seq);
+"""
+
+
+class CrawlError(Exception):
+    """크롤 작업을 만들거나 열 수 없음"""
+
+
+class Crawl:
+    """크롤 작업 1건 (crawls/<crawl_id>/)"""
+
+    def __init__(self, crawl_id: str, base_dir: Optional[Path] = None):
+        self.crawl_id = crawl_id
+        self.base_dir = Path(base_dir) if base_dir is not None else CRAWLS_DIR / crawl_id
+        self.parts_dir = self.base_dir / "parts"
+        self.output_dir = self.base_dir / "output"
+        self.db_path = self.base_dir / "queue.sqlite3"
+
+    # ------------------------------------------------------------------
+    # 큐 저장소
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def enqueue(self, complexes: List[Dict], meta: Optional[Dict[str, str]] = None) -> int:
+        """단지 추가 (이미 있는 단지는 그대로 둠), 새로 추가된 수 반환
+
+        complexes: [{"complexNo", "complexName", "cortarNo"}, ...]
+        """
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            start = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM queue").fetchone()[0]
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO queue (complexNo, complexName, cortarNo, seq, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(str(c["complexNo"]), c.get("complexName", ""), str(c.get("cortarNo", "")), start + i, time.time())
+                 for i, c in enumerate(complexes, start=1)]
+            )
+            added = conn.total_changes - before
+            for key, value in (meta or {}).items():
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+        return added
+
+    def meta(self) -> Dict[str, str]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def status(self) -> Dict[str, int]:
+        """상태별 단지 수"""
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM queue GROUP BY status").fetchall())
+        return {s: counts.get(s, 0) for s in (PENDING, RUNNING, DONE, FAILED)}
+
+    def failures(self) -> pd.DataFrame:
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT complexNo, complexName, attempts, error FROM queue WHERE status = ? ORDER BY seq", conn, params=(FAILED,)
+            )
+
+    def claim(self, limit: int) -> List[str]:
+        """대기 중인 단지를 순서대로 limit개 꺼내 실행 중으로 표시"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [r[0] for r in conn.execute(
+                "SELECT complexNo FROM queue WHERE status = ? ORDER BY seq LIMIT ?", (PENDING, limit)
+            )]
+            conn.executemany(
+                "UPDATE queue SET status = ?, attempts = attempts + 1, updated_at = ? WHERE complexNo = ?",
+                [(RUNNING, time.time(), c) for c in ids]
+            )
+        return ids
+
+    def checkpoint(self, ids: List[str], part: Optional[str], collected: set, error: Optional[str] = None):
+        """배치 결과 기록: collected에 있는 단지는 완료, 나머지는 재시도 대기(시도 횟수 초과 시 실패)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for complex_no in ids:
+                if complex_no in collected:
+                    conn.execute(
+                        "UPDATE queue SET status = ?, part = ?, error = NULL, updated_at = ? WHERE complexNo = ?",
+                        (DONE, part, now, complex_no)
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE queue SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, updated_at = ? "
+                        "WHERE complexNo = ?",
+                        (CRAWL_CONFIG["MAX_ATTEMPTS"], FAILED, PENDING, error or "수집 결과 없음", now, complex_no)
+                    )
+
+    def retry_failed(self) -> int:
+        """실패한 단지를 다시 대기열로 (시도 횟수 초기화)"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE queue SET status = ?, attempts = 0, error = NULL WHERE status = ?", (PENDING, FAILED)
+            ).rowcount
+
+    # ------------------------------------------------------------------
+    # 조각(parts) 관리
+    # ------------------------------------------------------------------
+    def _published_parts(self) -> List[Path]:
+        if not self.parts_dir.exists():
+            return []
+        return sorted(p for p in self.parts_dir.iterdir() if p.is_dir() and not p.name.startswith(STAGING_PREFIX))
+
+    @staticmethod
+    def _part_complexes(part_dir: Path) -> set:
+        path = RunHandle(part_dir.name, part_dir).path("COMPLEX")
+        if not path.exists():
+            return set()
+        return set(read_dataset(path, "complex", columns=["complexNo"])["complexNo"])
+
+    def recover(self) -> int:
+        """중단된 실행 정리: 임시 폴더 삭제, 게시됐지만 기록되지 않은 조각 반영, 실행 중 단지를 대기로 되돌림
+
+        되돌린 단지 수 반환.
+        """
+        if self.parts_dir.exists():
+            for p in self.parts_dir.iterdir():
+                if p.name.startswith(STAGING_PREFIX):
+                    shutil.rmtree(p, ignore_errors=True)
+        with self._connect() as conn:
+            running = [r[0] for r in conn.execute("SELECT complexNo FROM queue WHERE status = ?", (RUNNING,))]
+        if not running:
+            return 0
+        running_set = set(running)
+        for part_dir in self._published_parts():
+            collected = self._part_complexes(part_dir) & running_set
+            if collected:
+                self.checkpoint(sorted(collected), part_dir.name, collected)
+                running_set -= collected
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE queue SET status = ?, attempts = MAX(attempts - 1, 0) WHERE complexNo = ? AND status = ?",
+                [(PENDING, c, RUNNING) for c in running_set]
+            )
+        return len(running_set)
+
+    def _next_part_name(self) -> str:
+        parts = self._published_parts()
+        return f"{int(parts[-1].name) + 1:06d}" if parts else "000001"
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, batch_size: int = CRAWL_CONFIG["BATCH_SIZE"], workers: Optional[int] = None,
+            log: Callable[[str], None] = print, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """대기 중인 단지가 없을 때까지 배치 단위로 수집 (중단돼도 다음 실행에서 이어짐)
+
+        max_batches: 이번 실행에서 처리할 최대 배치 수 (None이면 끝까지)
+        """
+        from src.naver_apt_v5 import main_function
+        from src.listing_history import record_sell_snapshot
+        from src.similarity import record_units
+
+        reverted = self.recover()
+        if reverted:
+            log(f"중단된 배치에서 {reverted}개 단지를 대기열로 되돌림")
+        started = time.perf_counter()
+        finished = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            ids = self.claim(batch_size)
+            if not ids:
+                break
+            batches += 1
+            part = self._next_part_name()
+            staging = RunHandle(part, self.parts_dir / f"{STAGING_PREFIX}{part}")
+            shutil.rmtree(staging.base_dir, ignore_errors=True)
+            staging.base_dir.mkdir(parents=True)
+            try:
+                main_function(ids, paths=staging.paths, max_workers=workers)
+                collected = self._part_complexes(staging.base_dir) & set(ids)
+                os.replace(staging.base_dir, self.parts_dir / part)
+                self.checkpoint(ids, part, collected)
+                part_paths = RunHandle(part, self.parts_dir / part).paths
+                record_sell_snapshot(part_paths, sorted(collected), log=log)
+                record_units(part_paths, log=log)
+            except Exception as e:
+                shutil.rmtree(staging.base_dir, ignore_errors=True)
+                self.checkpoint(ids, None, set(), error=f"{type(e).__name__}: {e}")
+                log(f"배치 {part} 실패: {e}")
+                continue
+            finished += len(collected)
+            counts = self.status()
+            elapsed = time.perf_counter() - started
+            rate = finished / elapsed if elapsed > 0 else 0.0
+            eta = f"{counts[PENDING] / rate / 60:.1f}분" if rate > 0 else "알 수 없음"
+            log(f"배치 {part}: {len(collected)}/{len(ids)}곳 완료 | 전체 완료 {counts[DONE]:,}, 대기 {counts[PENDING]:,}, "
+                f"실패 {counts[FAILED]:,} | {rate * 60:.1f}곳/분, 남은 시간 약 {eta}")
+        return self.status()
+
+    def finalize(self, merge: bool = True, log: Callable[[str], None] = print) -> Dict[str, Path]:
+        """완료된 조각을 output/에 합쳐 저장 (단지가 여러 조각에 있으면 큐에 기록된 조각만 사용)"""
+        with self._connect() as conn:
+            part_of = dict(conn.execute("SELECT complexNo, part FROM queue WHERE status = ?", (DONE,)).fetchall())
+        out = RunHandle(self.crawl_id, self.output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        concat_parts(self._published_parts(), out, owner=part_of, log=log)
+        if merge and part_of:
+            from src.sell_price_merge_v2 import main as merge_main
+            if merge_main(sorted(part_of), log=log, paths=out.paths) is None:
+                raise RuntimeError("병합에 실패했습니다.")
+        return out.paths
+
+
+def concat_parts(part_dirs: List[Path], out: RunHandle, owner: Optional[Dict[str, str]] = None,
+                 keys=PART_KEYS, log: Callable[[str], None] = print):
+    """조각 폴더들의 산출물을 키별로 이어 붙여 out에 저장
+
+    owner: 단지번호 → 그 단지 행을 가져올 조각 폴더 이름 (없으면 모든 조각의 행을 그대로 사용)
+    """
+    for key in keys:
+        frames = []
+        for part_dir in part_dirs:
+            path = RunHandle(part_dir.name, part_dir).path(key)
+            if not path.exists() or path.stat().st_size == 0:
+                continue
+            df = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+            if owner is not None and "complexNo" in df.columns:
+                df = df[df["complexNo"].map(owner).eq(part_dir.name)]
+            frames.append(df)
+        frames = [f for f in frames if len(f.columns) > 1]  # 데이터 없는 조각(헤더만 downloadDate)은 제외
+        merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        merged.to_csv(out.path(key), index=False, encoding="utf-8-sig")
+        log(f"{out.path(key).name}: {len(merged):,}행")
+
+
+def list_crawls() -> List[str]:
+    if not CRAWLS_DIR.exists():
+        return []
+    return sorted(p.name for p in CRAWLS_DIR.iterdir() if (p / "queue.sqlite3").exists())
+
+
+def open_crawl(crawl_id: str) -> Crawl:
+    crawl = Crawl(crawl_id)
+    if not crawl.exists():
+        raise CrawlError(f"크롤 작업이 없습니다: {crawl_id}")
+    return crawl
@@ -0,0 +1,130 @@
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from src.config import API_CONFIG
+
+RequestProfile = Tuple[Dict[str, str], Dict[str, str]]
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """.env 파일을 프로세스당 한 번만 로드"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _common_cookies(getenv: Callable) -> Dict[str, str]:
+    return {
+        'NNB': getenv('NNB'),
+        'ASID': getenv('ASID'),
+        'NAC': getenv('NAC'),
+        'landHomeFlashUseYn': 'Y',
+    }
+
+
+def _base(getenv: Callable) -> RequestProfile:
+    """단지 정보/실거래가/시세 요청용"""
+    cookies = {**_common_cookies(getenv), '_ga': 'GA1.1.737295237.1698157835'}
+    headers = {
+        'accept': '*/*',
+        'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'authorization': getenv('AUTHORIZATION'),
+        'user-agent': getenv('USER_AGENT'),
+        'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+    }
+    return cookies, headers
+
+
+def _region(getenv: Callable) -> RequestProfile:
+    """지역별 단지 목록 요청용"""
+    cookies = _common_cookies(getenv)
+    headers = {
+        'accept': '*/*',
+        'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'authorization': getenv('AUTHORIZATION'),
+        'user-agent': getenv('USER_AGENT'),
+        'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132", "Google Chrome";v="132"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+    }
+    return cookies, headers
+
+
+def _sell(getenv: Callable) -> RequestProfile:
+    """매물 목록 요청용"""
+    cookies = {
+        **_common_cookies(getenv),
+        'REALESTATE': getenv('SELL_REALESTATE'),
+        '_fwb': getenv('SELL_FWB'),
+        'SHOW_FIN_BADGE': getenv('SELL_SHOW_FIN_BADGE'),
+        '_ga_0ZGH3YC3W6': getenv('SELL_GA_0ZGH3YC3W6'),
+        '_ga': getenv('SELL_GA'),
+    }
+    headers = {
+        'accept': '*/*',
+        'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
+        'authorization': getenv('SELL_AUTHORIZATION'),
+        'user-agent': getenv('USER_AGENT'),
+        'referer': getenv('SELL_REFERER'),
+    }
+    return cookies, headers
+
+
+def _page_profile(prefix: str) -> Callable[[Callable], RequestProfile]:
+    """학교/동/평형 요청처럼 page_uid 계열 쿠키를 쓰는 프로필 (환경변수 접두어만 다름)"""
+    def build(getenv: Callable) -> RequestProfile:
+        cookies = {
+            **_common_cookies(getenv),
+            'page_uid': getenv(f'{prefix}_PAGE_UID'),
+            'REALESTATE': getenv(f'{prefix}_REALESTATE'),
+            'SRT30': getenv(f'{prefix}_SRT30'),
+            'SRT5': getenv(f'{prefix}_SRT5'),
+            'BUC': getenv(f'{prefix}_BUC'),
+        }
+        headers = {
+            'accept': '*/*',
+            'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
+            'authorization': getenv(f'{prefix}_AUTHORIZATION'),
+            'user-agent': getenv('USER_AGENT'),
+        }
+        return cookies, headers
+    return build
+
+
+PROFILES: Dict[str, Callable[[Callable], RequestProfile]] = {
+    "BASE": _base,
+    "REGION": _region,
+    "SELL": _sell,
+    "SCHOOL": _page_profile("SCHOOL"),
+    "DONG": _page_profile("DONG"),
+    "BUILDING": _page_profile("BUILDING"),
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve(profile: str) -> RequestProfile:
+    load_env()
+    return PROFILES[profile](os.getenv)
+
+
+def get_request_profile(profile: str) -> RequestProfile:
+    """요청 프로필별 (쿠키, 헤더) 반환
+
+    환경변수는 프로필별로 처음 요청될 때 한 번만 읽으며, 호출자가 수정해도
+    캐시가 오염되지 않도록 사본을 반환함.
+    """
+    cookies, headers = _resolve(profile)
+    return dict(cookies), dict(headers)
+
+
+def get_api_base_url() -> str:
+    """API 서버 주소 (NAVER_LAND_BASE_URL 환경변수가 있으면 우선, 끝의 '/' 제외)"""
+    load_env()
+    return (os.getenv("NAVER_LAND_BASE_URL") or API_CONFIG["BASE_URL"]).rstrip("/")
+
+
+def api_url(path: str, base_url: Optional[str] = None) -> str:
+    """API 경로(예: 'complexes/123')를 전체 URL로 변환"""
+    return f"{(base_url or get_api_base_url()).rstrip('/')}/api/{path.lstrip('/')}"
@@ -1,14 +1,17 @@
 import pandas as pd
 import streamlit as st
 import os
+from pathlib import Path
 from typing import List, Optional, Dict, Tuple
 from src.config import DATA_PATHS, BASE_DIR, DATA_DIR
+from src.schema import read_dataset
 
 @st.cache_data
-def load_pyeong_data(complex_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
-    """평형 데이터 로딩 및 필터링"""
+def load_pyeong_data(complex_ids: Optional[List[str]] = None, paths: Optional[Dict[str, Path]] = None) -> Dict[str, List[str]]:
+    """평형 데이터 로딩 및 필터링 (paths: 실행별 경로 딕셔너리, 없으면 공용 DATA_PATHS)"""
+    paths = paths or DATA_PATHS
     try:
-        df = pd.read_csv(DATA_PATHS["PYEONG"], encoding='utf-8-sig')
+        df = read_dataset(paths["PYEONG"], "pyeong")
         if complex_ids:
             df = df[df['complexNo'].isin(complex_ids)]
         pyeong_dict = {}
@@ -25,17 +28,18 @@ def load_pyeong_data(complex_ids: Optional[List[str]] = None) -> Dict[str, List[
 def load_region_mapping() -> pd.DataFrame:
     """법정동 코드 데이터 로딩"""
     try:
-        return pd.read_csv(DATA_PATHS["CORTAR"], encoding="utf-8-sig")
+        return read_dataset(DATA_PATHS["CORTAR"], "region")
     except Exception as e:
         st.error(f"법정동 데이터 로드 중 오류: {e}")
         return pd.DataFrame()
 
 @st.cache_data
-def load_analysis_data() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-    """분석 결과 데이터 로딩"""
+def load_analysis_data(paths: Optional[Dict[str, Path]] = None) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """분석 결과 데이터 로딩 (paths: 실행별 경로 딕셔너리, 없으면 공용 DATA_PATHS)"""
+    paths = paths or DATA_PATHS
     try:
-        df_result = pd.read_csv(DATA_PATHS["RESULT"], encoding='utf-8-sig')
-        df_real = pd.read_csv(DATA_PATHS["REAL_PRICE"], encoding='utf-8-sig')
+        df_result = read_dataset(paths["RESULT"], "result")
+        df_real = read_dataset(paths["REAL_PRICE"], "price")
         return df_result, df_real
     except Exception as e:
         st.error(f"분석 데이터 로드 중 오류: {e}")
@@ -59,3 +63,54 @@ def get_dong_options(df: pd.DataFrame, selected_sido: str, selected_sigungu: str
         (df["시/도"] == selected_sido) & 
         (df["시/군/구"] == selected_sigungu)
     ]["읍/면/동"].dropna().unique())
+
+def get_data_version(path) -> float:
+    """데이터 파일 버전(수정 시각) 반환 - 캐시 키로 사용"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+@st.cache_data
+def load_real_price_data(path: str, version: float) -> pd.DataFrame:
+    """실거래가 데이터 로딩 및 파싱 (데이터셋 버전별 1회)
+
+    키/가격/날짜 형식은 src/schema.py가 보장함 (dealAmount: Int32, dealDate: datetime64).
+    dealAmount_numeric은 집계·차트용 float 사본 (결측은 NaN).
+    """
+    df_real = read_dataset(path, "price")
+    df_real["dealAmount_numeric"] = df_real["dealAmount"].astype("float64")
+    df_real["dealAmount_eok"] = df_real["dealAmount_numeric"] / 10000.0
+    df_real["year_month"] = df_real["dealDate"].dt.to_period("M").dt.to_timestamp()
+    df_real["color_label"] = df_real["complexName"].astype(str) + " " + df_real["pyeongName3"] + "평"
+    return df_real
+
+@st.cache_data
+def load_result_data(path: str, version: float) -> pd.DataFrame:
+    """병합 결과(result.csv) 로딩 (데이터셋 버전별 1회)"""
+    return read_dataset(path, "result")
+
+@st.cache_data
+def load_complex_summary(path: str, version: float) -> pd.DataFrame:
+    """단지별 요약(호가/평당 호가/버블 지수/최근 실거래) - 주변 단지 비교용 (데이터셋 버전별 1회)"""
+    from src.reports import build_complex_summary, COMPLEX_SUMMARY_COLUMNS
+    if not version:
+        return pd.DataFrame(columns=COMPLEX_SUMMARY_COLUMNS)
+    return build_complex_summary(load_result_data(path, version))
+
+@st.cache_data
+def load_pyeong_summary(path: str, version: float) -> pd.DataFrame:
+    """(단지, 평형)별 호가/실거래 요약 - 유사 평형 찾기용 (데이터셋 버전별 1회)"""
+    from src.reports import build_pyeong_summary, PYEONG_SUMMARY_COLUMNS
+    if not version:
+        return pd.DataFrame(columns=PYEONG_SUMMARY_COLUMNS)
+    return build_pyeong_summary(load_result_data(path, version))
+
+@st.cache_data
+def load_listing_changes(path: str, version: float) -> Optional[pd.DataFrame]:
+    """직전 수집 대비 매물 변경표(listing_changes.csv) 로딩 (없으면 None - 이력 기록 전 실행)"""
+    if not version:
+        return None
+    df = read_dataset(path, "changes")
+    df["pyeongName3"] = df["pyeongName"].str.replace(r"[A-Za-z]+$", "", regex=True)
+    return df
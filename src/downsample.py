@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링 인덱스 반환
+
+    x는 오름차순 정렬되어 있어야 하며, 첫/마지막 점은 항상 포함됨.
+    점 개수가 threshold 이하이면 전체 인덱스를 그대로 반환.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    # 버킷 경계: 첫 점(0)과 마지막 점(n-1)을 제외한 구간을 threshold-2개로 분할
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.int64)
+    edges[-1] = n - 1
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 버킷의 평균점 (마지막 버킷이면 마지막 점)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # 현재 버킷 점들 중 (a, 평균점)과 이루는 삼각형 면적이 최대인 점 선택
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_frame(df: pd.DataFrame, x_col: str, y_col: str, threshold: int) -> pd.DataFrame:
+    """x_col 기준 정렬 후 LTTB로 형태를 보존하며 threshold개 행으로 축소"""
+    df = df.dropna(subset=[x_col, y_col]).sort_values(x_col)
+    if len(df) <= threshold:
+        return df
+    x = df[x_col]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = x.astype("int64")
+    idx = lttb_indices(x.to_numpy(), df[y_col].to_numpy(), threshold)
+    return df.iloc[idx]
@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from src.downsample import downsample_frame
+
+if TYPE_CHECKING:
+    # plotly는 무거우므로 차트를 실제로 그릴 때 각 함수에서 임포트
+    import plotly.graph_objects as go
+from src.formatters import (
+    format_eokwan, format_date, format_int_series,
+    to_number_series, format_eokwan_series, gap_to_number_series
+)
+
+# 차트에 필요한 컬럼만 남겨 지문 계산과 전송 payload를 줄임
+DAILY_COLUMNS = ["color_label", "complexName", "pyeongName2", "floor", "dealDate", "dealAmount_numeric", "dealAmount_eok"]
+MONTHLY_COLUMNS = ["color_label", "year_month", "dealAmount_eok"]
+RANGE_COLUMNS = [
+    "complexName", "pyeongName3", "pyeongName", "floorInfo", "dealOrWarrantPrc", "dealOrWarrantPrc2",
+    "real_max_5_gap", "pyeong_max_5", "pyeong_min_5", "pyeong_max_5_DT", "pyeong_min_5_DT",
+    "latestdealAmount", "latestdealDate", "latestdealFloor"
+]
+
+
+def _customdata(*columns) -> np.ndarray:
+    """점별 hover 값 배열 (숫자 컬럼은 숫자 그대로 유지)"""
+    data = np.empty((len(columns[0]), len(columns)), dtype=object)
+    for i, col in enumerate(columns):
+        data[:, i] = col
+    return data
+
+
+def _floor_labels(floor: pd.Series) -> pd.Series:
+    """실거래 층 hover 표기 ('N층', 층 정보가 없으면 '-')"""
+    return (format_int_series(floor, na="") + "층").where(floor.notna(), "-")
+
+
+def build_trend_figure(
+    df_daily: pd.DataFrame,
+    df_monthly: pd.DataFrame,
+    df_gap: pd.DataFrame,
+    labels: List[str],
+    x_range: Optional[Tuple] = None,
+    downsample_target: Optional[int] = None
+) -> Tuple["go.Figure", int]:
+    """실거래가 추이 차트 (월별 평균 라인 + 일별 거래 점 + 두 단지 갭 막대)
+
+    downsample_target이 주어지면 WebGL 트레이스와 LTTB 다운샘플링을 사용.
+    반환값: (figure, 표시된 일별 거래 점 수)
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    colors = qualitative.Set1
+    color_map = {label: colors[i % len(colors)] for i, label in enumerate(labels)}
+
+    fig_line = go.Figure()
+    fig_line.update_layout(hovermode="closest")
+
+    if not df_gap.empty:
+        mask_real = ~df_gap['is_estimated']
+        mask_estimated = df_gap['is_estimated']
+
+        # 날짜는 x값 포맷으로 표시하여 customdata 없이 전송
+        if mask_real.any():
+            fig_line.add_trace(go.Bar(
+                x=df_gap.loc[mask_real, 'year_month'],
+                y=df_gap.loc[mask_real, 'price_gap'],
+                name='실거래가 갭',
+                marker_color='rgba(180, 180, 180, 0.6)',
+                yaxis='y2',
+                hovertemplate="%{x|'%y.%m월}<br>갭 금액: %{y:.1f}억<extra></extra>"
+            ))
+
+        if mask_estimated.any():
+            fig_line.add_trace(go.Bar(
+                x=df_gap.loc[mask_estimated, 'year_month'],
+                y=df_gap.loc[mask_estimated, 'price_gap'],
+                name='실거래가 갭(추정)',
+                marker_color='rgba(180, 180, 180, 0.2)',
+                yaxis='y2',
+                hovertemplate="%{x|'%y.%m월}<br>갭 금액(추정): %{y:.1f}억<extra></extra>"
+            ))
+
+    for label in labels:
+        monthly_sub = df_monthly[df_monthly["color_label"] == label].sort_values("year_month")
+        if not monthly_sub.empty:
+            fig_line.add_trace(go.Scatter(
+                x=monthly_sub["year_month"],
+                y=monthly_sub["dealAmount_eok"],
+                mode="lines",
+                name=label,
+                hoverinfo="skip",
+                line=dict(color=color_map[label])
+            ))
+
+    scatter_cls = go.Scattergl if downsample_target else go.Scatter
+    shown_points = 0
+    for label in labels:
+        daily_sub = df_daily[df_daily["color_label"] == label].sort_values("dealDate")
+        if downsample_target:
+            daily_sub = downsample_frame(daily_sub, "dealDate", "dealAmount_eok", downsample_target)
+        if daily_sub.empty:
+            continue
+        shown_points += len(daily_sub)
+        # 단지명은 트레이스 공통값이므로 hovertemplate에 직접 넣고, 점별 값만 customdata로 전송
+        complex_name = str(daily_sub["complexName"].iloc[0])
+        customdata = _customdata(
+            daily_sub["pyeongName2"].fillna("-").astype(str).to_numpy(),
+            _floor_labels(daily_sub["floor"]).to_numpy(),
+            format_eokwan_series(daily_sub["dealAmount_numeric"]).to_numpy(),
+        )
+        fig_line.add_trace(scatter_cls(
+            x=daily_sub["dealDate"],
+            y=daily_sub["dealAmount_eok"],
+            mode="markers",
+            marker=dict(size=6, opacity=0.3, color=color_map[label]),
+            showlegend=False,
+            customdata=customdata,
+            hovertemplate=(
+                f"{complex_name}<br>%{{x|%Y.%m.%d}}<br>"
+                "%{customdata[0]} / %{customdata[1]}<br>%{customdata[2]}<extra></extra>"
+            )
+        ))
+
+    if x_range is not None:
+        fig_line.update_xaxes(range=list(x_range))
+    fig_line.update_xaxes(tickformat="'%y.%m월", hoverformat="'%y.%m월")
+    fig_line.update_yaxes(tickformat=".0f", ticksuffix="억")
+    fig_line.update_layout(
+        xaxis_title="",
+        yaxis_title="",
+        yaxis2=dict(
+            overlaying='y',
+            side='right',
+            showgrid=False,
+            tickformat=".1f",
+            ticksuffix="억"
+        ),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0)',
+            bordercolor='rgba(255,255,255,0)',
+            x=0.01,  # 왼쪽 여백에서의 위치
+            y=1.15,  # 그래프 위쪽으로 이동
+            orientation='h'  # 범례를 가로로 배열
+        ),
+        legend_title="",
+        margin=dict(l=20, r=20, t=40, b=10),  # 상단 여백 증가
+        autosize=True,
+        bargap=0.3
+    )
+    return fig_line, shown_points
+
+
+def build_range_figure(df: pd.DataFrame, use_webgl: bool = False) -> "go.Figure":
+    """매물 현황 차트 (평형별 5년 전고점/전저점 범위 + 매물 호가 점 + 최신 실거래가)"""
+    import plotly.graph_objects as go
+
+    group_cols = ["complexName", "pyeongName3"]
+    agg_dict = {
+        "pyeong_max_5": "first",
+        "pyeong_min_5": "first",
+        "latestdealAmount": "first",
+        "latestdealDate": "first",
+        "pyeong_max_5_DT": "first",
+        "pyeong_min_5_DT": "first",
+        "latestdealFloor": "first",
+    }
+    df_group = df.groupby(group_cols, as_index=False, observed=True).agg(agg_dict)
+    df_group["max_val"] = to_number_series(df_group["pyeong_max_5"]) / 10000
+    df_group["min_val"] = to_number_series(df_group["pyeong_min_5"]) / 10000
+    df_group["latestdealAmount"] = to_number_series(df_group["latestdealAmount"])
+    df_group["star_val"] = df_group["latestdealAmount"] / 10000
+    df_group.sort_values(by=["complexName", "pyeongName3"], inplace=True)
+    combos = list(df_group[["complexName", "pyeongName3"]].itertuples(index=False, name=None))
+    x_mapping = {}
+    current_x = 0
+    last_apt = None
+    apt_boundaries = []
+    for (apt, pnum) in combos:
+        if last_apt is not None and apt != last_apt:
+            apt_boundaries.append(current_x - 0.5)
+        x_mapping[(apt, pnum)] = current_x
+        current_x += 1
+        last_apt = apt
+
+    # 매물 점 공통 값은 벡터 연산으로 한 번에 계산
+    df_points_all = df.copy()
+    df_points_all["price_val"] = to_number_series(df_points_all["dealOrWarrantPrc2"]) / 10000
+    df_points_all["gap_num"] = gap_to_number_series(df_points_all["real_max_5_gap"])
+    points_by_combo = dict(list(df_points_all.groupby(group_cols, observed=True)))
+    point_hover = (
+        "평형타입: %{customdata[0]}<br>"
+        "층수: %{customdata[1]}<br>"
+        "호가: %{customdata[2]}<br>"
+        "전고점 갭: "
+    )
+    # 갭 부호별로 트레이스를 나누어 색상 표시를 hovertemplate 한 곳에서 처리
+    gap_groups = [
+        (lambda g: g > 0, '<span style="color:red;">▲%{customdata[3]:.1f}%</span>'),
+        (lambda g: g < 0, '<span style="color:blue;">▼%{customdata[3]:.1f}%</span>'),
+        (lambda g: g == 0, "0.0%"),
+        (lambda g: g.isna(), ""),
+    ]
+    points_cls = go.Scattergl if use_webgl else go.Scatter
+
+    fig = go.Figure()
+    for (apt, pnum), row_g in zip(combos, df_group.itertuples(index=False)):
+        x_val = x_mapping[(apt, pnum)]
+        minv = row_g.min_val
+        maxv = row_g.max_val
+        starv = row_g.star_val
+        max_date_str = format_date(row_g.pyeong_max_5_DT)
+        min_date_str = format_date(row_g.pyeong_min_5_DT)
+        max_str = f"{format_eokwan(row_g.pyeong_max_5)}({max_date_str})" if max_date_str != "-" else format_eokwan(row_g.pyeong_max_5)
+        min_str = f"{format_eokwan(row_g.pyeong_min_5)}({min_date_str})" if min_date_str != "-" else format_eokwan(row_g.pyeong_min_5)
+        count_points = 20
+        fig.add_trace(go.Scatter(
+            x=[x_val]*count_points,
+            y=np.linspace(minv, maxv, count_points),
+            mode="lines",
+            line=dict(color="blue", width=1),
+            hovertemplate=f"최근 5년 전고점 : {max_str}<br>최근 5년 전저점 : {min_str}<extra></extra>",
+            showlegend=False
+        ))
+        top_points = 5
+        fig.add_trace(go.Scatter(
+            x=np.linspace(x_val-0.1, x_val+0.1, top_points),
+            y=[maxv]*top_points,
+            mode="lines",
+            line=dict(color="blue", width=1),
+            hovertemplate=f"최근 5년 전고점 : {max_str}<extra></extra>",
+            showlegend=False
+        ))
+        bot_points = 5
+        fig.add_trace(go.Scatter(
+            x=np.linspace(x_val-0.1, x_val+0.1, bot_points),
+            y=[minv]*bot_points,
+            mode="lines",
+            line=dict(color="blue", width=1),
+            hovertemplate=f"최근 5년 전저점 : {min_str}<extra></extra>",
+            showlegend=False
+        ))
+        df_points = points_by_combo.get((apt, pnum))
+        if df_points is not None and not df_points.empty:
+            for gap_mask, gap_template in gap_groups:
+                df_sub = df_points[gap_mask(df_points["gap_num"])]
+                if df_sub.empty:
+                    continue
+                customdata = _customdata(
+                    df_sub["pyeongName"].astype(str).to_numpy(),
+                    df_sub["floorInfo"].astype(str).to_numpy(),
+                    df_sub["dealOrWarrantPrc"].astype(str).to_numpy(),
+                    df_sub["gap_num"].abs().to_numpy(),
+                )
+                fig.add_trace(points_cls(
+                    x=[x_val]*len(df_sub),
+                    y=df_sub["price_val"],
+                    mode="markers",
+                    marker=dict(size=8, color="red", opacity=0.3),
+                    hovertemplate=point_hover + gap_template + "<extra></extra>",
+                    customdata=customdata,
+                    showlegend=False
+                ))
+        if not pd.isnull(starv) and starv > 0:
+            star_date_str = format_date(row_g.latestdealDate)
+            star_val_str = format_eokwan(row_g.latestdealAmount)
+            latestdealFloor = row_g.latestdealFloor
+            floor_str = f"({int(latestdealFloor)}층)" if pd.notnull(latestdealFloor) and str(latestdealFloor).strip() != "" else ""
+            label_text = f"최신 실거래가<br>{star_val_str}{floor_str}<br>{star_date_str}"
+            fig.add_trace(go.Scatter(
+                x=[x_val],
+                y=[starv],
+                mode="markers+text",
+                text=[label_text],
+                texttemplate="%{text}",
+                textposition="middle right",
+                textfont=dict(color="black", size=11),
+                marker_symbol="star",
+                marker_size=15,
+                marker_color="yellow",
+                marker_line_color="black",
+                marker_line_width=1,
+                opacity=1.0,
+                hoverinfo="none",
+                showlegend=False
+            ))
+    shapes = []
+    for boundary_x in apt_boundaries:
+        shapes.append(dict(
+            type="line",
+            xref="x", yref="paper",
+            x0=boundary_x, x1=boundary_x,
+            y0=0, y1=1,
+            line=dict(color="gray", dash="dot")
+        ))
+    fig.update_layout(shapes=shapes)
+    x_vals = [x_mapping[c] for c in combos]
+    x_text = [f"{apt} {pnum}평" for (apt, pnum) in combos]
+    fig.update_xaxes(
+        range=[-0.5, len(combos)-0.5],
+        tickmode="array",
+        tickvals=x_vals,
+        ticktext=x_text
+    )
+    fig.update_yaxes(
+        ticksuffix="억",
+        zeroline=True
+    )
+    fig.update_layout(
+        hovermode="closest",
+        margin=dict(l=10, r=10, t=10, b=10),
+        autosize=True,
+        height=500
+    )
+    return fig
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+# --- 단일 값 포맷 함수 ---
+def to_number(val):
+    if pd.isnull(val):
+        return float('nan')
+    s = str(val).replace(",", "").strip()
+    try:
+        return float(s)
+    except:
+        return float('nan')
+
+def format_eokwan(val_in_manwon):
+    num = to_number(val_in_manwon)
+    if pd.isnull(num):
+        return "-"
+    v = int(round(num, 0))
+    eok = v // 10000
+    rem = v % 10000
+    if eok > 0 and rem > 0:
+        return f"{eok}억 {rem}"
+    elif eok > 0:
+        return f"{eok}억"
+    elif rem > 0:
+        return f"{rem}"
+    else:
+        return "-"
+
+def format_date(ymd):
+    if pd.isnull(ymd):
+        return "-"
+    if isinstance(ymd, pd.Timestamp):
+        return ymd.strftime("%Y.%m.%d")
+    if not isinstance(ymd, str):
+        return "-"
+    parts = ymd.replace("-", ".").replace("/", ".").split(".")
+    if len(parts) == 3:
+        return f"{parts[0]}.{parts[1].zfill(2)}.{parts[2].zfill(2)}"
+    return ymd
+
+def color_gap_html(val):
+    if pd.isnull(val) or not isinstance(val, str):
+        return ""
+    val_str = val.strip()
+    if val_str == "":
+        return ""
+    raw = val_str.replace("%", "")
+    try:
+        num = float(raw)
+        if num > 0:
+            return f'<span style="color:red;">▲{abs(num):.1f}%</span>'
+        elif num < 0:
+            return f'<span style="color:blue;">▼{abs(num):.1f}%</span>'
+        else:
+            return "0.0%"
+    except:
+        return val_str
+
+def plain_gap(val):
+    if pd.isnull(val) or not isinstance(val, str):
+        return ""
+    raw = val.replace("%", "").strip()
+    try:
+        num = float(raw)
+        if num > 0:
+            return f"▲{abs(num):.1f}%"
+        elif num < 0:
+            return f"▼{abs(num):.1f}%"
+        else:
+            return "0.0%"
+    except:
+        return val
+
+def style_gap(cell_value):
+    if isinstance(cell_value, str):
+        if cell_value.startswith("▲"):
+            return "color: red;"
+        elif cell_value.startswith("▼"):
+            return "color: blue;"
+    return ""
+
+# --- 벡터화 포맷 함수 (Series 단위) ---
+def _map_uniques(values, func) -> pd.Series:
+    """고유값에만 func(Series → Series)를 적용한 뒤 코드로 펼침
+
+    매물/거래 표의 가격·날짜·갭 컬럼은 행 수에 비해 값 종류가 적으므로
+    포맷 비용이 행 수가 아니라 고유값 수에 비례하게 됨. 결측은 마지막 자리에 둠.
+    category 컬럼(src/schema.py)은 이미 있는 코드/범주를 그대로 사용.
+    """
+    s = pd.Series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+    else:
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    base = pd.Series(uniques).reindex(range(len(uniques) + 1))  # 마지막 = 결측 (코드 -1)
+    formatted = func(base).to_numpy(dtype=object)
+    return pd.Series(formatted[codes], index=s.index, dtype=object)
+
+def fill_text_series(values, na: str = "") -> pd.Series:
+    """문자열/범주 Series의 결측을 na로 채운 object Series (category 컬럼에 fillna 대신 사용)"""
+    s = pd.Series(values)
+    return s.astype(object).where(s.notna(), na)
+
+def to_number_series(values) -> pd.Series:
+    """콤마가 포함된 문자열/숫자 Series를 float Series로 변환"""
+    s = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    return pd.to_numeric(s.astype(str).str.replace(",", "").str.strip(), errors="coerce")
+
+def _eokwan(s: pd.Series) -> pd.Series:
+    num = to_number_series(s).round(0)
+    v = num.fillna(0).astype("int64")
+    eok = v // 10000
+    rem = v % 10000
+    eok_str = eok.astype(str)
+    rem_str = rem.astype(str)
+    out = np.select(
+        [(eok > 0) & (rem > 0), eok > 0, rem > 0],
+        [eok_str + "억 " + rem_str, eok_str + "억", rem_str],
+        default="-"
+    )
+    out = np.where(num.isna(), "-", out)
+    return pd.Series(out, index=num.index, dtype=object)
+
+def format_eokwan_series(values) -> pd.Series:
+    """format_eokwan의 벡터화 버전 (만원 단위 → 'N억 M')"""
+    return _map_uniques(values, _eokwan)
+
+def _parse_eokwan(s: pd.Series) -> pd.Series:
+    parts = s.astype(str).str.replace(",", "").str.extract(r"^\s*(?:(\d+)\s*억)?\s*(\d*)\s*$")
+    eok = pd.to_numeric(parts[0], errors="coerce")
+    rem = pd.to_numeric(parts[1], errors="coerce")
+    out = eok.fillna(0) * 10000 + rem.fillna(0)
+    return out.where(eok.notna() | rem.notna())
+
+def parse_eokwan_series(values) -> pd.Series:
+    """'13억 4050', '9억', '8,500' 형태의 호가 문자열 Series를 만원 단위 float Series로 변환 (format_eokwan의 역변환)"""
+    s = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    return pd.to_numeric(_map_uniques(s, _parse_eokwan), errors="coerce")
+
+def gap_to_number_series(values) -> pd.Series:
+    """'12.3%' 형태의 갭 문자열 Series를 float Series로 변환"""
+    s = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    return pd.to_numeric(s.astype(str).str.replace("%", "").str.strip(), errors="coerce")
+
+def _int_strings(num: pd.Series, pattern: str) -> pd.Series:
+    """정수부 문자열 (결측은 None)"""
+    ints = np.trunc(num.fillna(0)).astype("int64")
+    out = ints.map(pattern.format).astype(object)
+    return out.where(num.notna(), None)
+
+def format_int_series(values, na: str = "-") -> pd.Series:
+    """정수 문자열 변환 (str(int(x))와 동일, 결측은 na)"""
+    return _map_uniques(values, lambda s: _int_strings(to_number_series(s), "{:d}").fillna(na))
+
+def format_thousands_series(values, na: str = "") -> pd.Series:
+    """천 단위 콤마 정수 문자열 변환 (f"{int(x):,}"와 동일, 결측은 na)"""
+    return _map_uniques(values, lambda s: _int_strings(to_number_series(s), "{:,d}").fillna(na))
+
+def _ymd(s: pd.Series, na: str) -> pd.Series:
+    out = s.astype(str).str.replace("-", ".", regex=False).str.replace("/", ".", regex=False)
+    parts = out.str.extract(r"^([^.]*)\.([^.]*)\.([^.]*)$")
+    padded = parts[0] + "." + parts[1].str.zfill(2) + "." + parts[2].str.zfill(2)
+    out = padded.where(parts[0].notna(), out)
+    return out.where(s.notna(), na)
+
+def format_ymd_series(values, na: str = "") -> pd.Series:
+    """'YYYY-M-D' 형태 문자열(또는 날짜 컬럼)을 'YYYY.MM.DD'로 변환 (세 부분이 아니면 구분자만 '.'로 통일)"""
+    return _map_uniques(values, lambda s: _ymd(s, na))
+
+def _plain_gap(s: pd.Series) -> pd.Series:
+    if s.dtype != object:
+        # 문자열이 아닌 값은 원본 함수와 같이 빈 문자열
+        return pd.Series("", index=s.index, dtype=object)
+    num = gap_to_number_series(s)
+    magnitude = num.abs().map("{:.1f}".format)
+    out = np.select(
+        [num > 0, num < 0, num == 0],
+        ["▲" + magnitude + "%", "▼" + magnitude + "%", "0.0%"],
+        default=None
+    )
+    out = pd.Series(out, index=s.index, dtype=object)
+    # 숫자로 변환되지 않는 문자열은 원본 유지, 결측은 빈 문자열
+    return out.fillna(s).fillna("")
+
+def plain_gap_series(values) -> pd.Series:
+    """plain_gap의 벡터화 버전 ('12.3%' → '▲12.3%', 숫자가 아닌 문자열은 그대로, 결측은 '')"""
+    return _map_uniques(values, _plain_gap)
+
+def gap_style_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """style_gap의 벡터화 버전 (Styler.apply(axis=None)용 CSS 프레임)"""
+    values = df.to_numpy(dtype=str)
+    up = np.char.startswith(values, "▲")
+    down = np.char.startswith(values, "▼")
+    css = np.where(up, "color: red;", np.where(down, "color: blue;", ""))
+    return pd.DataFrame(css, index=df.index, columns=df.columns)
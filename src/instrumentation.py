@@ -0,0 +1,179 @@
+"""가벼운 구간 계측 (API 요청, 수집/병합 단계, 화면 섹션)
+
+    with trace("job-1234") as t:                      # 이 블록(과 run_parallel 작업 스레드)의 span을 t에 모음
+        with span("fetch", "http", endpoint="complexes/{id}") as attrs:
+            attrs["status"] = 200                     # 블록 안에서 속성 추가
+    t.summary()                                       # 항목별 횟수/합계/p50/p95/최대
+
+활성 trace도 기록 파일도 프로파일러도 없으면 span은 시간을 재지 않고 바로 통과함.
+TRACE_CONFIG["FILE"](ZIPCHECK_TRACE_FILE 환경변수)이 있으면 끝난 span을 JSON lines로 덧붙임.
+PROFILERS에 등록한 프로파일러(src.memory_profile)는 span 시작/종료 때 호출되어 속성을 추가함.
+"""
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from src.config import TRACE_CONFIG
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("zipcheck_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("zipcheck_span", default=None)  # (이름, 속성)
+_file_lock = threading.Lock()
+
+# span 시작/종료 때 호출할 프로파일러: enter(name, category) → 상태, exit(상태, attrs)
+PROFILERS: List = []
+
+
+class Trace:
+    """span 기록 모음 (작업 1건 또는 화면 렌더링 1회 단위, 스레드 안전)"""
+
+    def __init__(self, trace_id: str, max_spans: int = TRACE_CONFIG["MAX_SPANS"]):
+        self.trace_id = trace_id
+        self.started_at = time.time()
+        self._spans: deque = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict):
+        with self._lock:
+            self._spans.append(record)
+
+    def records(self) -> List[Dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self):
+        """항목별 집계 DataFrame (summarize 참고)"""
+        return summarize(self.records())
+
+
+@contextmanager
+def trace(trace_or_id: Union[str, Trace]) -> Iterator[Trace]:
+    """with 블록 안에서 끝난 span을 Trace에 모음 (문자열이면 새 Trace 생성)"""
+    current = trace_or_id if isinstance(trace_or_id, Trace) else Trace(trace_or_id)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def _write_trace_file(record: Dict):
+    path = Path(TRACE_CONFIG["FILE"])
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _file_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **attrs) -> Iterator[Dict]:
+    """구간 시간 측정 (yield한 딕셔너리에 넣은 값은 기록의 속성이 됨)
+
+    예외가 나면 error 속성에 예외 종류를 남기고 다시 던짐.
+    """
+    current = _current_trace.get()
+    if current is None and not TRACE_CONFIG["FILE"] and not PROFILERS:
+        yield attrs
+        return
+    parent = _current_span.get()
+    token = _current_span.set((name, attrs))
+    profiling = [(profiler, profiler.enter(name, category)) for profiler in list(PROFILERS)]
+    started_at = time.time()
+    started = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        for profiler, state in reversed(profiling):
+            profiler.exit(state, attrs)
+        _current_span.reset(token)
+        record = {
+            "trace": current.trace_id if current is not None else None,
+            "name": name,
+            "category": category,
+            "parent": parent[0] if parent else None,
+            "start": round(started_at, 6),
+            "duration_ms": round(duration_ms, 3),
+            "thread": threading.current_thread().name,
+            **attrs,
+        }
+        if current is not None:
+            current.add(record)
+        if TRACE_CONFIG["FILE"]:
+            _write_trace_file(record)
+
+
+def annotate(**attrs):
+    """현재 진행 중인 가장 안쪽 span에 속성 추가 (span 밖이면 무시)"""
+    active = _current_span.get()
+    if active is not None:
+        active[1].update(attrs)
+
+
+class PhaseTimer:
+    """연속된 단계를 들여쓰기 없이 계측
+
+        phases = PhaseTimer("merge")
+        phases.start("load")     # 이전 단계를 끝내고 merge.load 시작
+        ...
+        phases.close()           # 마지막 단계 종료
+
+    단계 이름은 "<prefix>.<단계>", 분류는 category.
+    """
+
+    def __init__(self, prefix: str, category: str = "stage"):
+        self.prefix = prefix
+        self.category = category
+        self._active = None
+
+    def start(self, phase: str, **attrs) -> Dict:
+        self.close()
+        self._active = span(f"{self.prefix}.{phase}", self.category, **attrs)
+        return self._active.__enter__()
+
+    def close(self, error: Optional[BaseException] = None):
+        """진행 중인 단계 종료 (error를 주면 그 단계에 예외 종류를 기록)"""
+        if self._active is not None:
+            active, self._active = self._active, None
+            if error is None:
+                active.__exit__(None, None, None)
+            else:
+                active.__exit__(type(error), error, error.__traceback__)
+
+
+def summarize(records: List[Dict]):
+    """span 기록을 (분류, 항목)별로 집계
+
+    http 분류는 endpoint별로 묶음. 컬럼: category, label, count, total_ms, p50_ms, p95_ms, max_ms, kb, errors
+    (errors: 예외 또는 200이 아닌 응답 수)
+    """
+    import pandas as pd
+
+    columns = ["category", "label", "count", "total_ms", "p50_ms", "p95_ms", "max_ms", "kb", "errors"]
+    if not records:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(records)
+    for col in ("endpoint", "bytes", "status", "error"):
+        if col not in df.columns:
+            df[col] = None
+    df["label"] = df["endpoint"].where(df["category"].eq("http") & df["endpoint"].notna(), df["name"])
+    df["failed"] = df["error"].notna() | (df["status"].notna() & df["status"].ne(200))
+    grouped = df.groupby(["category", "label"], sort=False)
+    result = grouped["duration_ms"].agg(
+        count="count", total_ms="sum", p50_ms="median",
+        p95_ms=lambda s: s.quantile(0.95), max_ms="max"
+    )
+    result["kb"] = grouped["bytes"].sum(min_count=1) / 1024
+    result["errors"] = grouped["failed"].sum()
+    return result.reset_index()[columns].sort_values("total_ms", ascending=False, ignore_index=True)
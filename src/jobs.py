@@ -0,0 +1,200 @@
+import hashlib
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import streamlit as st
+from src.config import JOB_CONFIG
+from src.runs import open_staging, publish_run, discard_run, gc_runs
+from src.instrumentation import Trace, trace, span
+from src.memory_profile import enable_from_config
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+class JobCancelled(Exception):
+    """사용자 요청으로 작업이 취소됨"""
+
+
+def make_job_key(complex_ids: List[str]) -> str:
+    """단지 조합 키 (순서와 무관하게 같은 단지 조합이면 같은 키)"""
+    joined = ",".join(sorted(str(c) for c in complex_ids))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class Job:
+    """백그라운드 분석 작업 1건의 상태"""
+
+    def __init__(self, complex_ids: List[str]):
+        self.complex_ids = [str(c) for c in complex_ids]
+        self.key = make_job_key(self.complex_ids)
+        self.job_id = f"{self.key}-{uuid.uuid4().hex[:8]}"
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "대기 중"
+        self.logs: List[str] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.run_id: Optional[str] = None   # 완료 후 게시된 실행 폴더 id (job_id와 동일)
+        self.trace = Trace(self.job_id)     # 요청/단계별 소요 시간 기록 (사이드바 성능 패널)
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def report(self, fraction: float, message: str):
+        """진행률 갱신 (취소 요청이 있으면 JobCancelled 발생)"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        with self._lock:
+            self.progress = max(0.0, min(1.0, fraction))
+            self.message = message
+
+    def log(self, message):
+        with self._lock:
+            self.logs.append(str(message))
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def snapshot(self) -> Dict:
+        """UI 표시용 상태 사본"""
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "complex_ids": list(self.complex_ids),
+                "status": self.status,
+                "progress": self.progress,
+                "message": self.message,
+                "logs": list(self.logs),
+                "error": self.error,
+            }
+
+
+def run_analysis_pipeline(job: Job):
+    """Step 1 (데이터 수집) + Step 2 (데이터 병합) 실행
+
+    산출물은 작업 전용 임시 폴더에 쓰고, 모두 성공한 경우에만 runs/<job_id>/로 게시함.
+    모든 구간 기록은 job.trace에 모임.
+    """
+    from src.naver_apt_v5 import main_function as run_01
+    from src.sell_price_merge_v2 import main as run_03
+    from src.listing_history import record_sell_snapshot
+    from src.similarity import record_units
+
+    staging = open_staging(job.job_id)
+    try:
+        with trace(job.trace):
+            job.report(0.0, "Step 1: 데이터 수집 중...💾")
+            with span("pipeline.collect", complexes=len(job.complex_ids)):
+                run_01(
+                    job.complex_ids,
+                    progress_callback=lambda f, m: job.report(0.8 * f, f"Step 1: {m}"),
+                    paths=staging.paths
+                )
+            job.log("Step 1 완료: 데이터 수집 완료")
+            with span("pipeline.history"):
+                record_sell_snapshot(staging.paths, job.complex_ids, log=job.log)
+                record_units(staging.paths, log=job.log)
+            for key in ["COMPLEX", "PYEONG", "SELL", "REAL_PRICE", "DONG", "PROVIDER"]:
+                if not os.path.exists(staging.path(key)):
+                    job.log(f"{key} 파일이 존재하지 않습니다.")
+
+            job.report(0.8, "Step 2: 데이터 처리 중...⚙")
+            with span("pipeline.merge"):
+                merged = run_03(job.complex_ids, log=job.log, paths=staging.paths)
+            if merged is None:
+                raise RuntimeError("데이터 병합에 실패했습니다.")
+            job.log("Step 2 완료: 데이터 병합 완료")
+            job.report(0.95, "결과 게시 중...")
+            with span("pipeline.publish"):
+                job.run_id = publish_run(staging).run_id
+            job.report(1.0, "분석 완료")
+    except BaseException:
+        discard_run(staging)
+        raise
+
+
+class JobManager:
+    """프로세스 전체에서 공유되는 작업 실행기
+
+    같은 단지 조합의 작업은 세션과 무관하게 하나만 실행되며,
+    완료된 작업도 RESULT_TTL_SEC 동안은 재실행 없이 재사용됨.
+    """
+
+    def __init__(self, max_workers: int = JOB_CONFIG["MAX_WORKERS"], pipeline=run_analysis_pipeline):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zipcheck-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pipeline = pipeline
+
+    def submit(self, complex_ids: List[str]) -> Job:
+        """작업 제출 (진행 중이거나 최근 완료된 동일 조합 작업이 있으면 그 작업을 반환)"""
+        key = make_job_key(complex_ids)
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.key != key:
+                    continue
+                if job.is_active or (job.status == DONE and not self._expired(job)):
+                    return job
+            job = Job(complex_ids)
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        job = self.get(job_id)
+        if job is not None and job.is_active:
+            job.cancel()
+
+    def _run(self, job: Job):
+        if job._cancel_event.is_set():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        try:
+            self._pipeline(job)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+            job.message = "작업이 취소되었습니다."
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            job.log(traceback.format_exc())
+        finally:
+            job.finished_at = time.time()
+
+    def _expired(self, job: Job) -> bool:
+        return job.finished_at is not None and time.time() - job.finished_at > JOB_CONFIG["RESULT_TTL_SEC"]
+
+    def _prune(self):
+        """만료된 종료 작업 정리 및 오래된 실행 폴더 정리 (진행 중/재사용 가능한 작업의 폴더는 유지)"""
+        for job_id in [j.job_id for j in self._jobs.values() if not j.is_active and self._expired(j)]:
+            del self._jobs[job_id]
+        gc_runs(keep_ids=self._jobs.keys())
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """모든 세션이 공유하는 JobManager (메모리 프로파일링 설정도 프로세스당 한 번 적용)"""
+    enable_from_config()
+    return JobManager()
@@ -0,0 +1,362 @@
+"""매물 호가 이력 저장소 (articleNo 기준 추가 전용 스냅샷, 바뀐 값만 기록)
+
+sell_data.csv는 실행마다 덮어써져 호가 인하/인상 이력이 사라지므로, 수집할 때마다 직전 상태와 비교해
+바뀐 필드(호가, 확인일자, 상태)만 델타 조각(Parquet)으로 추가함. 저장 용량은 실행 횟수 × 매물 수가 아니라
+변경 건수에 비례함.
+
+history/
+    deltas/<스냅샷 시각(µs)>-<순번>-<pid>-<uuid>.parquet   델타 행: snapshot_at, articleNo, event, complexNo, 바뀐 필드만 값(나머지 결측)
+    snapshots.csv                  스냅샷 목록 (변경이 없던 실행도 기록)
+    state.parquet                  최신 상태 (다음 스냅샷 비교용, 델타에서 다시 만들 수 있는 캐시)
+
+event: new(처음 등록), changed(호가/확인일자 변경), removed(수집 범위 단지에서 사라짐), relisted(다시 등장)
+수집할 때마다 diff_listings()가 직전 상태와 비교한 변경 분류표(신규/가격 인하/인상/재등록/재확인/내려감)를
+실행 폴더의 listing_changes.csv로 남기며, 화면의 매물 현황 섹션이 이를 배지와 변경 표로 보여줌.
+특정 시점의 매물 목록은 as_of()로 그 시각까지의 델타를 articleNo별로 마지막 값(결측 제외)만 취해 복원함.
+"""
+import itertools
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.config import HISTORY_DIR, HISTORY_CONFIG
+from src.formatters import parse_eokwan_series
+from src.schema import coerce, read_dataset
+
+ACTIVE = "active"
+REMOVED = "removed"
+EVENTS = ["new", "changed", "removed", "relisted"]
+
+# 변경을 추적하는 필드 / 처음 등록될 때만 기록하는 필드 (complexNo는 단지별 조회를 위해 모든 델타에 기록)
+TRACKED_FIELDS = ["price", "confirm_ymd", "status"]
+STATIC_FIELDS = ["complexNo", "tradeTypeName", "pyeongName", "floorInfo", "buildingName", "area2"]
+DELTA_COLUMNS = ["snapshot_at", "articleNo", "event"] + TRACKED_FIELDS + STATIC_FIELDS
+LISTING_COLUMNS = ["articleNo"] + TRACKED_FIELDS + STATIC_FIELDS + ["first_seen", "last_changed"]
+STATE_COLUMNS = LISTING_COLUMNS + ["content_hash"]
+# snapshot_frame이 읽는 sell_data.csv 컬럼
+SNAPSHOT_SOURCE_COLUMNS = [
+    "articleNo", "dealOrWarrantPrc", "articleConfirmYmd", "complexNo", "tradeTypeName", "pyeongName",
+    "floorInfo", "buildingName", "area2",
+]
+
+# 직전 수집 대비 변경 분류 (매물 현황 배지/변경 표, 같은 매물이 여러 조건이면 앞쪽 우선)
+CHANGE_TYPES = ["new", "price_cut", "price_raised", "relisted", "reconfirmed", "removed"]
+CHANGE_LABELS = {
+    "new": "🆕 신규", "price_cut": "🔻 가격 인하", "price_raised": "🔺 가격 인상",
+    "relisted": "♻️ 재등록", "reconfirmed": "✅ 재확인", "removed": "⛔ 내려감",
+}
+CHANGE_COLUMNS = [
+    "articleNo", "complexNo", "change", "tradeTypeName", "pyeongName", "floorInfo", "buildingName",
+    "price", "prev_price", "price_diff", "confirm_ymd", "prev_confirm_ymd",
+]
+SNAPSHOT_COLUMNS = ["snapshot_at", "complexes", "listings"] + CHANGE_TYPES + ["segment"]
+
+_lock = threading.Lock()  # 같은 프로세스의 동시 작업(JobManager)이 상태 파일을 번갈아 덮어쓰지 않도록
+_segment_seq = itertools.count()  # 같은 시각에 기록한 조각도 파일명 순서 = 기록 순서가 되도록
+
+
+def _dtypes() -> Dict[str, str]:
+    return {
+        "articleNo": "int64", "price": "Int32", "confirm_ymd": "Int32", "status": "category",
+        "event": "category", "complexNo": "category", "tradeTypeName": "category",
+        "pyeongName": "category", "floorInfo": "string", "buildingName": "category", "area2": "Int32",
+        "snapshot_at": "datetime64[ns]", "first_seen": "datetime64[ns]", "last_changed": "datetime64[ns]",
+        "content_hash": "uint64", "change": "category",
+        "prev_price": "Int32", "price_diff": "Int32", "prev_confirm_ymd": "Int32",
+    }
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    dtypes = {c: t for c, t in _dtypes().items() if c in df.columns}
+    # 범주형은 object를 거쳐 변환 (모두 결측인 float 컬럼이 float 범주가 되지 않도록)
+    df = df.astype({c: object for c, t in dtypes.items() if t == "category" and df[c].dtype != "category"})
+    return df.astype(dtypes)
+
+
+def _arrow_schema(columns: List[str]):
+    """Parquet 저장 스키마 (모두 결측인 컬럼도 조각마다 같은 타입으로 저장되도록 고정)"""
+    import pyarrow as pa
+
+    arrow_types = {
+        "int64": pa.int64(), "uint64": pa.uint64(), "Int32": pa.int32(), "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()), "datetime64[ns]": pa.timestamp("ns"),
+    }
+    return pa.schema([(c, arrow_types[_dtypes()[c]]) for c in columns])
+
+
+def snapshot_frame(df_sell: pd.DataFrame) -> pd.DataFrame:
+    """수집된 매물 목록(schema "sell" 형식) → 이력 비교용 프레임 (articleNo 중복은 마지막 값)"""
+    confirmed = df_sell["articleConfirmYmd"]
+    df = pd.DataFrame({
+        "articleNo": df_sell["articleNo"],
+        "price": parse_eokwan_series(df_sell["dealOrWarrantPrc"]).round(),
+        "confirm_ymd": confirmed.dt.year * 10000 + confirmed.dt.month * 100 + confirmed.dt.day,
+        "status": ACTIVE,
+        "complexNo": df_sell["complexNo"],
+        "tradeTypeName": df_sell["tradeTypeName"],
+        "pyeongName": df_sell["pyeongName"],
+        "floorInfo": df_sell["floorInfo"],
+        "buildingName": df_sell["buildingName"],
+        "area2": df_sell["area2"].round(),
+    })
+    df = df.dropna(subset=["articleNo"]).drop_duplicates("articleNo", keep="last")
+    return _typed(df).set_index("articleNo")
+
+
+def content_hash(df: pd.DataFrame) -> np.ndarray:
+    """매물별 추적 필드(호가, 확인일자, 상태) 해시 (uint64, 행 순서 그대로)"""
+    return pd.util.hash_pandas_object(df[TRACKED_FIELDS].astype(object), index=False).to_numpy()
+
+
+def diff_listings(state: pd.DataFrame, current: pd.DataFrame, scope: set) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """직전 상태 대비 (델타 행, 변경 분류표)를 O(매물 수)로 계산
+
+    articleNo 해시 인덱스(get_indexer)로 직전 행 위치를 찾고 content_hash가 다른 매물만 필드 단위로 비교함.
+    델타: 바뀐 필드만 값이 있는 행 (index: articleNo). 변경 분류표: CHANGE_COLUMNS.
+    처음 수집하는 단지(직전 상태에 매물이 하나도 없는 단지)의 매물은 변경 분류표에서 '신규'로 보지 않음.
+    """
+    positions = state.index.get_indexer(current.index)
+    known = positions >= 0
+    current_hash = content_hash(current)
+    state_hash = state["content_hash"].to_numpy(dtype="uint64")
+    dirty = known.copy()
+    dirty[known] = current_hash[known] != state_hash[positions[known]]
+
+    new_rows = current[~known]
+    after = current[dirty]
+    before = state.iloc[positions[dirty]]
+    gone = state.index[state["complexNo"].astype(str).isin(scope) & state["status"].eq(ACTIVE)].difference(current.index)
+    removed_rows = state.loc[gone]
+
+    # --- 델타 ---
+    frames = []
+    if len(new_rows):
+        frames.append(new_rows.assign(event="new"))
+    if len(after):
+        changed = pd.DataFrame({
+            f: after[f].astype(object).ne(before[f].astype(object).to_numpy()) & after[f].notna()
+            for f in TRACKED_FIELDS
+        })
+        rows = changed.any(axis=1).to_numpy()
+        delta = after[TRACKED_FIELDS][rows].astype(object).where(changed[rows])
+        delta["complexNo"] = after["complexNo"][rows]
+        delta["event"] = np.where(before["status"].eq(REMOVED).to_numpy()[rows], "relisted", "changed")
+        frames.append(delta)
+    if len(removed_rows):
+        frames.append(pd.DataFrame({"status": REMOVED, "event": "removed",
+                                    "complexNo": removed_rows["complexNo"].astype(str)}, index=gone))
+    if frames:
+        deltas = pd.concat([f.astype(object) for f in frames])
+        deltas.index.name = "articleNo"
+        deltas = deltas.reindex(columns=DELTA_COLUMNS[2:])
+    else:
+        deltas = pd.DataFrame(columns=DELTA_COLUMNS[1:]).set_index("articleNo")
+
+    # --- 변경 분류표 ---
+    seen_complexes = set(state["complexNo"].astype(str))
+    new_rows = new_rows[new_rows["complexNo"].astype(str).isin(seen_complexes)]
+    price_diff = after["price"].astype("Float64") - before["price"].astype("Float64").to_numpy()
+    confirm_changed = after["confirm_ymd"].astype("Float64").ne(before["confirm_ymd"].astype("Float64").to_numpy())
+    change = np.select(
+        [before["status"].eq(REMOVED).to_numpy(), (price_diff < 0).to_numpy(dtype=bool, na_value=False),
+         (price_diff > 0).to_numpy(dtype=bool, na_value=False), confirm_changed.to_numpy(dtype=bool, na_value=False)],
+        ["relisted", "price_cut", "price_raised", "reconfirmed"], default="",
+    )
+    parts = [
+        new_rows.assign(change="new"),
+        after.assign(change=change, prev_price=before["price"].to_numpy(), price_diff=price_diff,
+                     prev_confirm_ymd=before["confirm_ymd"].to_numpy())[change != ""],
+        removed_rows.assign(change="removed", prev_price=removed_rows["price"], price=pd.NA,
+                            prev_confirm_ymd=removed_rows["confirm_ymd"], confirm_ymd=pd.NA),
+    ]
+    changes = pd.concat([p.astype(object) for p in parts if len(p)]) if any(len(p) for p in parts) else pd.DataFrame()
+    changes = changes.rename_axis("articleNo").reset_index().reindex(columns=CHANGE_COLUMNS)
+    changes = _typed(changes)
+    changes["change"] = pd.Categorical(changes["change"], categories=CHANGE_TYPES)
+    return deltas, changes.sort_values(["change", "complexNo"], kind="stable", ignore_index=True)
+
+
+def change_counts(changes: pd.DataFrame) -> Dict[str, int]:
+    return changes["change"].value_counts().reindex(CHANGE_TYPES, fill_value=0).astype(int).to_dict()
+
+
+class ListingHistory:
+    """매물 이력 저장소 1개 (기본: data/history/)"""
+
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.base_dir = Path(base_dir) if base_dir is not None else HISTORY_DIR
+        self.deltas_dir = self.base_dir / "deltas"
+        self.state_path = self.base_dir / "state.parquet"
+        self.snapshots_path = self.base_dir / "snapshots.csv"
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def load_state(self) -> pd.DataFrame:
+        """최신 상태 (index: articleNo, content_hash: 추적 필드 해시)"""
+        if not self.state_path.exists():
+            return _typed(pd.DataFrame(columns=STATE_COLUMNS)).set_index("articleNo")
+        return pd.read_parquet(self.state_path).set_index("articleNo")
+
+    def snapshots(self) -> pd.DataFrame:
+        if not self.snapshots_path.exists():
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+        return pd.read_csv(self.snapshots_path, encoding="utf-8-sig", parse_dates=["snapshot_at"])
+
+    def record(self, df_sell: pd.DataFrame, complex_ids: Iterable[str],
+               snapshot_at: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """이번 수집 결과를 직전 상태와 비교해 델타 조각을 추가하고 변경 분류표(CHANGE_COLUMNS) 반환
+
+        complex_ids: 이번에 수집한 단지 (여기 속한 단지의 매물만 '사라짐'으로 판단)
+        """
+        snapshot_at = pd.Timestamp(snapshot_at) if snapshot_at is not None else pd.Timestamp.now()
+        scope = {str(c) for c in complex_ids}
+        current = snapshot_frame(df_sell)
+        with _lock:
+            state = self.load_state()
+            deltas, changes = diff_listings(state, current, scope)
+            deltas.insert(0, "snapshot_at", snapshot_at)
+            counts = change_counts(changes)
+
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            segment = ""
+            if not deltas.empty:
+                self.deltas_dir.mkdir(exist_ok=True)
+                segment = _segment_name(snapshot_at)
+                _write_parquet(_typed(deltas.reset_index()[DELTA_COLUMNS]), self.deltas_dir / segment, DELTA_COLUMNS,
+                               exclusive=True)
+                self._write_state(state, deltas)
+            row = pd.DataFrame([{
+                "snapshot_at": snapshot_at, "complexes": len(scope), "listings": len(current),
+                **counts, "segment": segment,
+            }], columns=SNAPSHOT_COLUMNS)
+            row.to_csv(self.snapshots_path, mode="a", index=False, header=not self.snapshots_path.exists(),
+                       encoding="utf-8-sig")
+        return changes
+
+    def _write_state(self, state: pd.DataFrame, deltas: pd.DataFrame):
+        """최신 상태 갱신 (바뀐 매물 행만 델타의 결측이 아닌 값으로 덮어쓰고 해시 재계산)"""
+        snapshot_at = deltas["snapshot_at"].iloc[0]
+        updates = deltas.drop(columns=["snapshot_at", "event"])
+        previous = state.reindex(updates.index)
+        merged = updates.astype(object).combine_first(previous[updates.columns].astype(object))
+        merged["first_seen"] = previous["first_seen"].fillna(snapshot_at)
+        merged["last_changed"] = snapshot_at
+        merged = _typed(merged.rename_axis("articleNo").reset_index()[LISTING_COLUMNS])
+        merged["content_hash"] = content_hash(merged)
+        unchanged = state[~state.index.isin(updates.index)].reset_index()
+        # 범주가 다른 범주형 컬럼만 object로 합쳐진 뒤 다시 범주형으로 바뀜 (숫자/날짜 컬럼은 그대로)
+        parts = [f[STATE_COLUMNS] for f in (unchanged, merged) if len(f)]
+        state = _typed(pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0])
+        _write_parquet(state, self.state_path, STATE_COLUMNS)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def deltas(self, until=None, complex_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """until 시각까지의 델타 (조각 파일명이 시각 순이므로 파일명만으로 범위를 고름)"""
+        if not self.deltas_dir.exists():
+            return _typed(pd.DataFrame(columns=DELTA_COLUMNS))
+        files = sorted(self.deltas_dir.glob("*.parquet"))
+        if until is not None:
+            limit = pd.Timestamp(until).strftime("%Y%m%dT%H%M%S")
+            files = [f for f in files if f.name[:15] <= limit]
+        if not files:
+            return _typed(pd.DataFrame(columns=DELTA_COLUMNS))
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        filters = [("complexNo", "in", [str(c) for c in complex_ids])] if complex_ids else None
+        # 조각마다 범주(dictionary) 값이 다르므로 pyarrow에서 스키마를 맞춰 한 번에 합침
+        table = pa.concat_tables([pq.read_table(f, filters=filters) for f in files], promote_options="permissive")
+        df = _typed(table.to_pandas())
+        if until is not None:
+            df = df[df["snapshot_at"] <= pd.Timestamp(until)]
+        return df
+
+    def as_of(self, when, complex_ids: Optional[Iterable[str]] = None, include_removed: bool = False) -> pd.DataFrame:
+        """when 시각 기준 매물 목록 복원 (articleNo별 마지막 값, first_seen/last_changed 포함)"""
+        df = self.deltas(until=when, complex_ids=complex_ids)
+        if df.empty:
+            return _typed(pd.DataFrame(columns=LISTING_COLUMNS))
+        df = df.sort_values("snapshot_at", kind="stable")
+        grouped = df.groupby("articleNo", sort=False)
+        state = grouped[TRACKED_FIELDS + STATIC_FIELDS].last()  # 결측(바뀌지 않은 필드)은 건너뜀
+        state["first_seen"] = grouped["snapshot_at"].min()
+        state["last_changed"] = grouped["snapshot_at"].max()
+        state = state.reset_index()
+        if not include_removed:
+            state = state[state["status"] == ACTIVE]
+        return _typed(state[LISTING_COLUMNS]).reset_index(drop=True)
+
+    def price_history(self, article_nos: Iterable[int]) -> pd.DataFrame:
+        """매물별 호가 변경 이력 (snapshot_at, articleNo, price)"""
+        df = self.deltas()
+        df = df[df["articleNo"].isin(list(article_nos)) & df["price"].notna()]
+        return df[["snapshot_at", "articleNo", "price"]].sort_values(["articleNo", "snapshot_at"], ignore_index=True)
+
+
+def _segment_name(snapshot_at: pd.Timestamp) -> str:
+    """델타 조각 파일명 - 앞 15자(초 단위 시각)로 범위를 고르고, 이름순 = 기록 순서
+
+    같은 초(같은 시각)에 여러 번 기록해도 µs 시각, 프로세스 내 순번, pid, uuid로 겹치지 않음.
+    """
+    return (f"{snapshot_at.strftime('%Y%m%dT%H%M%S%f')}-{next(_segment_seq):06d}"
+            f"-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet")
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, columns: List[str], exclusive: bool = False):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)
+
+    exclusive: 같은 이름의 파일이 이미 있으면 덮어쓰지 않고 FileExistsError (추가 전용 델타 조각)
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    df.to_parquet(tmp, index=False, compression="zstd", schema=_arrow_schema(columns))
+    if not exclusive:
+        os.replace(tmp, path)
+        return
+    try:
+        os.link(tmp, path)  # 대상이 있으면 실패하는 원자적 게시
+    finally:
+        os.unlink(tmp)
+
+
+def read_sell_snapshot(path) -> pd.DataFrame:
+    """sell_data.csv의 snapshot_frame 입력 컬럼
+
+    매물이 하나도 없는 실행은 파일이 없거나(수집) 헤더만 있으므로(크롤 병합) 빈 표로 읽음 -
+    그래야 수집 범위 단지의 마지막 매물이 사라진 것도 '내려감'으로 기록됨.
+    """
+    path = Path(path)
+    df = pd.DataFrame(columns=SNAPSHOT_SOURCE_COLUMNS)
+    if path.exists() and path.stat().st_size:
+        try:
+            df = read_dataset(path, "sell", columns=SNAPSHOT_SOURCE_COLUMNS)
+        except pd.errors.EmptyDataError:
+            pass
+    return coerce(df.reindex(columns=SNAPSHOT_SOURCE_COLUMNS), "sell")
+
+
+def record_sell_snapshot(paths: Dict[str, Path], complex_ids: List[str], log=print,
+                         history: Optional[ListingHistory] = None) -> Optional[pd.DataFrame]:
+    """수집 직후 sell_data.csv를 이력 저장소에 기록하고 변경 분류표를 paths["CHANGES"]에 저장
+
+    '사라짐' 판단 범위는 complex_data.csv에 있는 단지로 한정함 (단지 정보 조회부터 실패한 단지의
+    매물이 모두 사라진 것으로 기록되지 않도록). 실패해도 분석은 계속되도록 예외는 로그로만 남김.
+    """
+    if not HISTORY_CONFIG["RECORD"]:
+        return None
+    try:
+        df_sell = read_sell_snapshot(paths["SELL"])
+        collected = set(read_dataset(paths["COMPLEX"], "complex", columns=["complexNo"])["complexNo"])
+        scope = [c for c in map(str, complex_ids) if c in collected]
+        changes = (history or ListingHistory()).record(df_sell, scope)
+        changes.to_csv(paths["CHANGES"], index=False, encoding="utf-8-sig")
+        log("매물 변경 기록: " + ", ".join(f"{CHANGE_LABELS[k]} {v}" for k, v in change_counts(changes).items()))
+        return changes
+    except Exception as e:
+        log(f"매물 이력 기록 실패: {e}")
+        return None
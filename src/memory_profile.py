@@ -0,0 +1,180 @@
+"""메모리 프로파일링 모드 (tracemalloc)
+
+    with memory_profiling():            # tracemalloc 시작 + 단계(stage/viz) span마다 메모리 기록
+        with trace("run") as t:
+            ...
+    print(memory_report(t.records()))
+
+TRACE_CONFIG["MEMORY"](ZIPCHECK_PROFILE_MEMORY=1)이면 앱 프로세스 전체에서 켜지고 성능 패널에 표시됨.
+단계 span에 추가되는 속성:
+  mem_peak_kb      단계 시작 시점 대비 최고 사용량 증가분
+  mem_retained_kb  단계가 끝난 뒤에도 남은 증가분 (끝 - 시작)
+  mem_top          단계 동안 늘어난 할당 상위 위치 [{"where": "파일:줄", "kb", "count"}]
+  frames_kb        record_frames로 남긴 DataFrame memory_usage(deep=True) (KB)
+tracemalloc의 최고값은 프로세스 전체 기준이라 작업을 여러 개 동시에 실행하면 서로 섞임 (단독 실행 시 정확).
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+import pandas as pd
+from src.config import BASE_DIR, TRACE_CONFIG
+from src.instrumentation import PROFILERS, annotate
+
+# 메모리를 기록할 span 분류 (요청/작업 span은 스레드에서 겹쳐 실행되므로 제외)
+PROFILED_CATEGORIES = ("stage", "viz")
+
+# 할당 위치 집계에서 뺄 파일 (측정 도구 자체)
+_IGNORED_FILES = ("tracemalloc.py", "memory_profile.py", "instrumentation.py")
+
+
+def _short_path(filename: str) -> str:
+    """저장소 안 파일은 상대 경로, 라이브러리는 site-packages 이후 경로"""
+    base = str(BASE_DIR)
+    if filename.startswith(base):
+        return filename[len(base) + 1:]
+    return filename.split("site-packages/")[-1]
+
+
+def top_allocations(stats: List[tracemalloc.StatisticDiff], limit: int) -> List[Dict]:
+    """compare_to 결과에서 늘어난 할당 상위 limit개 (측정 도구 자체의 할당 제외)"""
+    grown = [
+        s for s in stats
+        if s.size_diff > 0 and not s.traceback[0].filename.endswith(_IGNORED_FILES)
+    ][:limit]
+    return [{
+        "where": f"{_short_path(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+        "kb": round(s.size_diff / 1024, 1),
+        "count": s.count_diff,
+    } for s in grown]
+
+
+class MemoryProfiler:
+    """단계 span마다 최고/잔류 메모리와 할당 위치를 기록
+
+    중첩된 단계는 자식의 최고값이 부모에도 반영됨 (reset_peak로 단계별 최고값을 분리).
+    top: 단계별로 남길 할당 위치 수 (0이면 스냅샷을 찍지 않아 가벼움)
+    """
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self._stack: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def enter(self, name: str, category: str):
+        if category not in PROFILED_CATEGORIES or not tracemalloc.is_tracing():
+            return None
+        # 스냅샷은 필터링하지 않음 (전체 복사 비용이 큼) - 제외할 파일은 비교 결과에서 거름
+        snapshot = tracemalloc.take_snapshot() if self.top else None
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for frame in self._stack:
+                frame["peak"] = max(frame["peak"], peak)
+            tracemalloc.reset_peak()
+            frame = {"start": current, "peak": current, "snapshot": snapshot}
+            self._stack.append(frame)
+        return frame
+
+    def exit(self, frame, attrs: Dict):
+        if frame is None:
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            self._stack = [f for f in self._stack if f is not frame]
+            frame_peak = max(frame["peak"], peak)
+            for parent in self._stack:
+                parent["peak"] = max(parent["peak"], frame_peak)
+        attrs["mem_peak_kb"] = round((frame_peak - frame["start"]) / 1024, 1)
+        attrs["mem_retained_kb"] = round((current - frame["start"]) / 1024, 1)
+        if frame["snapshot"] is not None:
+            stats = tracemalloc.take_snapshot().compare_to(frame["snapshot"], "lineno")
+            attrs["mem_top"] = top_allocations(stats, self.top)
+
+
+def is_profiling() -> bool:
+    return any(isinstance(p, MemoryProfiler) for p in PROFILERS)
+
+
+def enable(top: int = 10) -> MemoryProfiler:
+    """tracemalloc 시작 및 프로파일러 등록 (이미 켜져 있으면 기존 것 반환)"""
+    for profiler in PROFILERS:
+        if isinstance(profiler, MemoryProfiler):
+            return profiler
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    profiler = MemoryProfiler(top)
+    PROFILERS.append(profiler)
+    return profiler
+
+
+def disable():
+    """프로파일러 해제 및 tracemalloc 중지"""
+    PROFILERS[:] = [p for p in PROFILERS if not isinstance(p, MemoryProfiler)]
+    tracemalloc.stop()
+
+
+@contextmanager
+def memory_profiling(top: int = 10) -> Iterator[MemoryProfiler]:
+    """with 블록 동안만 메모리 프로파일링"""
+    profiler = enable(top)
+    try:
+        yield profiler
+    finally:
+        disable()
+
+
+def enable_from_config():
+    """TRACE_CONFIG["MEMORY"]가 켜져 있으면 프로세스 전체 프로파일링 시작"""
+    if TRACE_CONFIG["MEMORY"]:
+        enable()
+
+
+def record_frames(**frames: pd.DataFrame):
+    """현재 단계 span에 DataFrame별 memory_usage(deep=True) 기록 (프로파일링 중일 때만 계산)"""
+    if not is_profiling():
+        return
+    annotate(frames_kb={
+        name: round(df.memory_usage(index=True, deep=True).sum() / 1024, 1)
+        for name, df in frames.items() if df is not None
+    })
+
+
+def memory_table(records: List[Dict]) -> pd.DataFrame:
+    """메모리가 기록된 단계 span 목록 (최고 사용량 순)"""
+    rows = [r for r in records if "mem_peak_kb" in r]
+    columns = ["name", "duration_ms", "mem_peak_kb", "mem_retained_kb", "frames_kb"]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(rows).reindex(columns=columns)
+    df["frames_kb"] = df["frames_kb"].map(
+        lambda d: ", ".join(f"{k} {v / 1024:.1f}MB" for k, v in d.items()) if isinstance(d, dict) else ""
+    )
+    return df.sort_values("mem_peak_kb", ascending=False, ignore_index=True)
+
+
+def top_allocators(records: List[Dict], limit: int = 15) -> pd.DataFrame:
+    """모든 단계의 할당 위치를 합산한 상위 목록 (단계 간 중첩은 가장 안쪽 단계만 합산)"""
+    parents = {r.get("parent") for r in records if "mem_top" in r}
+    leaves = [r for r in records if "mem_top" in r and r["name"] not in parents]
+    rows = [dict(item, stage=r["name"]) for r in leaves for item in r["mem_top"]]
+    if not rows:
+        return pd.DataFrame(columns=["where", "kb", "count", "stages"])
+    df = pd.DataFrame(rows)
+    grouped = df.groupby("where").agg(
+        kb=("kb", "sum"), count=("count", "sum"), stages=("stage", lambda s: ", ".join(dict.fromkeys(s)))
+    )
+    return grouped.sort_values("kb", ascending=False).head(limit).reset_index()
+
+
+def memory_report(records: List[Dict], limit: int = 15) -> str:
+    """단계별 최고/잔류 메모리와 상위 할당 위치 보고서 (텍스트)"""
+    lines = ["[단계별 메모리] (MB, 단계 시작 대비)"]
+    for row in memory_table(records).itertuples():
+        lines.append(
+            f"  {row.name:28s} 최고 {row.mem_peak_kb / 1024:8.1f}  잔류 {row.mem_retained_kb / 1024:8.1f}"
+            f"  {row.duration_ms / 1000:6.2f}s  {row.frames_kb}"
+        )
+    lines.append("\n[상위 할당 위치] (가장 안쪽 단계 기준 증가분 합계)")
+    for row in top_allocators(records, limit).itertuples():
+        lines.append(f"  {row.kb / 1024:8.1f} MB  {row.count:>9,}개  {row.where}  ({row.stages})")
+    return "\n".join(lines)
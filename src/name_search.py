@@ -0,0 +1,125 @@
+"""단지명 검색 - 로컬 단지 목록(src/catalog.py) 위의 메모리 색인
+
+단지명을 소문자/공백 제거 형태와 초성 형태로 한 번 변환해 각각 하나의 긴 문자열로 이어 붙여
+두고, 조회는 그 문자열에서 re.finditer로 일치 위치를 찾은 뒤 np.searchsorted로 단지 행을
+되찾음. 행마다 비교하는 반복이 없어 전국 단지 목록에서도 수 ms 안에 끝남.
+
+    "래미안"  → 앞부분 일치 우선, 그다음 중간 일치
+    "ㄹㅁㅇ"  → 초성 일치 (자음만 입력하면 초성으로 검색)
+    "래미ㅇ"  → 자음이 섞이면 입력 전체를 초성으로 바꿔 초성 검색
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.catalog import REGION_COLUMNS
+from src.schema import coerce
+
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JAMO_CONSONANTS = set("ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ")
+_SEPARATOR = "\n"
+
+# 일치 종류별 순위 (작을수록 위)
+MATCH_EXACT, MATCH_PREFIX, MATCH_SUBSTRING, MATCH_CHOSUNG_PREFIX, MATCH_CHOSUNG = range(5)
+SEARCH_COLUMNS = ["complexNo", "complexName", "cortarNo"] + REGION_COLUMNS + ["totalHouseholdCount", "match"]
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화 (소문자, 공백 제거)"""
+    return re.sub(r"\s+", "", str(text)).lower()
+
+
+@lru_cache(maxsize=None)
+def _chosung_table() -> dict:
+    """완성형 한글 11,172자 → 초성 변환표 (그 밖의 문자는 그대로)
+
+    앱 시작 시간을 늘리지 않도록 import 시점이 아니라 처음 초성 변환할 때 한 번 만듦.
+    """
+    return {code: CHOSUNG[(code - HANGUL_BASE) // 588] for code in range(HANGUL_BASE, HANGUL_LAST + 1)}
+
+
+def to_chosung(text: str) -> str:
+    """완성형 한글을 초성으로 바꾼 문자열 (예: '래미안' → 'ㄹㅁㅇ')"""
+    return text.translate(_chosung_table())
+
+
+class _JoinedColumn:
+    """문자열 목록을 구분자로 이어 붙인 검색 대상 (행 시작 위치 보관)"""
+
+    def __init__(self, values):
+        values = list(values)
+        lengths = np.fromiter((len(v) + 1 for v in values), dtype=np.int64, count=len(values))
+        self.starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(values) else np.empty(0, dtype=np.int64)
+        self.text = _SEPARATOR.join(values)
+
+    def find(self, query: str):
+        """query가 나타나는 (행, 행 안에서의 위치) - 행마다 첫 일치만"""
+        positions = np.fromiter((m.start() for m in re.finditer(re.escape(query), self.text)), dtype=np.int64)
+        rows = np.searchsorted(self.starts, positions, side="right") - 1
+        rows, first = np.unique(rows, return_index=True)
+        return rows, positions[first] - self.starts[rows]
+
+
+class ComplexNameIndex:
+    """단지명 검색 색인
+
+    complexes: complexNo/complexName/cortarNo를 포함한 단지 목록 (complexNo 중복은 첫 행)
+    regions: 법정동 코드 표 (cortarNo → 시/도, 시/군/구, 읍/면/동) - 없으면 지역 이름은 빈 칸
+    """
+
+    def __init__(self, complexes: pd.DataFrame, regions: Optional[pd.DataFrame] = None):
+        df = coerce(complexes, "catalog").drop_duplicates("complexNo")
+        df = df[df["complexName"].notna()]
+        if regions is not None and len(regions):
+            region_names = coerce(regions, "region")[["cortarNo"] + REGION_COLUMNS]
+            df = df.drop(columns=REGION_COLUMNS, errors="ignore").merge(region_names, on="cortarNo", how="left")
+        df = df.reindex(columns=SEARCH_COLUMNS[:-1]).reset_index(drop=True)
+        df[REGION_COLUMNS] = df[REGION_COLUMNS].fillna("")
+        self.complexes = df
+        self.households = pd.to_numeric(df["totalHouseholdCount"], errors="coerce").fillna(0).to_numpy()
+        names = [normalize(n) for n in df["complexName"]]
+        self.name_lengths = np.fromiter((len(n) for n in names), dtype=np.int64, count=len(names))
+        self.names = _JoinedColumn(names)
+        self.chosung = _JoinedColumn(to_chosung(n) for n in names)
+
+    def __len__(self) -> int:
+        return len(self.complexes)
+
+    def search(self, query: str, limit: int = 20) -> pd.DataFrame:
+        """단지명 검색 결과 (순위순, match 컬럼: MATCH_* 값)
+
+        순위: 일치 종류 → 일치 위치(앞일수록) → 세대수(많을수록) → 이름 길이(짧을수록)
+        """
+        query = normalize(query)
+        if not query or not len(self):
+            return pd.DataFrame(columns=SEARCH_COLUMNS)
+        if any(ch in JAMO_CONSONANTS for ch in query):
+            rows, offsets = self.chosung.find(to_chosung(query))
+            kinds = np.where(offsets == 0, MATCH_CHOSUNG_PREFIX, MATCH_CHOSUNG)
+        else:
+            rows, offsets = self.names.find(query)
+            kinds = np.where(offsets == 0, MATCH_PREFIX, MATCH_SUBSTRING)
+            kinds[(offsets == 0) & (self.name_lengths[rows] == len(query))] = MATCH_EXACT
+        order = np.lexsort((self.name_lengths[rows], -self.households[rows], offsets, kinds))[:limit]
+        out = self.complexes.iloc[rows[order]].reset_index(drop=True)
+        out["match"] = kinds[order]
+        return out
+
+
+def region_label(row) -> str:
+    """검색 결과 한 행의 지역 표시 (예: '서울특별시 강남구 역삼동')"""
+    return " ".join(str(row[c]) for c in REGION_COLUMNS if row[c])
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_name_index(catalog_path: str, catalog_version: float, _regions: Optional[pd.DataFrame] = None) -> ComplexNameIndex:
+    """로컬 단지 목록 버전별 1회 생성하는 검색 색인 (세션 간 공유 - 수정하지 말 것)
+
+    _regions: 법정동 코드 표 (캐시 키에서 제외 - 앱 실행 중 바뀌지 않음)
+    """
+    from src.catalog import load_catalog
+
+    return ComplexNameIndex(load_catalog(catalog_path), _regions)
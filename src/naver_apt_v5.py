@@ -1,108 +1,17 @@
-import os
-from dotenv import load_dotenv
 from datetime import datetime
 import requests
 import csv
 import copy
 import math
 import re
-from src.config import DATA_PATHS, DATA_DIR
-
-# .env 파일 로드
-load_dotenv()
-
-# -------------------------------
-# 모든 산출물의 업데이트 날짜 (시간까지)
-# -------------------------------
-updated_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-# -------------------------------
-# 기본 설정 (쿠키, 헤더 등)
-# -------------------------------
-BASE_COOKIES = {
-    'NNB': os.getenv('NNB'),
-    'ASID': os.getenv('ASID'),
-    'NAC': os.getenv('NAC'),
-    'landHomeFlashUseYn': 'Y',
-    '_ga': 'GA1.1.737295237.1698157835',
-}
-
-BASE_HEADERS = {
-    'accept': '*/*',
-    'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-    'authorization': os.getenv('AUTHORIZATION'),
-    'user-agent': os.getenv('USER_AGENT'),
-    'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132"',
-    'sec-ch-ua-mobile': '?0',
-    'sec-ch-ua-platform': '"Windows"',
-}
-
-# -------------------------------
-# Sell 데이터 요청용 설정
-# -------------------------------
-SELL_COOKIES = {
-    'NNB': os.getenv('NNB'),
-    'ASID': os.getenv('ASID'),
-    'NAC': os.getenv('NAC'),
-    'landHomeFlashUseYn': 'Y',
-    'REALESTATE': os.getenv('SELL_REALESTATE'),
-    '_fwb': os.getenv('SELL_FWB'),
-    'SHOW_FIN_BADGE': os.getenv('SELL_SHOW_FIN_BADGE'),
-    '_ga_0ZGH3YC3W6': os.getenv('SELL_GA_0ZGH3YC3W6'),
-    '_ga': os.getenv('SELL_GA'),
-}
-
-SELL_HEADERS = {
-    'accept': '*/*',
-    'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
-    'authorization': os.getenv('SELL_AUTHORIZATION'),
-    'user-agent': os.getenv('USER_AGENT'),
-    'referer': os.getenv('SELL_REFERER'),
-}
-
-# -------------------------------
-# 학교 정보 요청용 설정
-# -------------------------------
-SCHOOL_COOKIES = {
-    'NNB': os.getenv('NNB'),
-    'ASID': os.getenv('ASID'),
-    'NAC': os.getenv('NAC'),
-    'landHomeFlashUseYn': 'Y',
-    'page_uid': os.getenv('SCHOOL_PAGE_UID'),
-    'REALESTATE': os.getenv('SCHOOL_REALESTATE'),
-    'SRT30': os.getenv('SCHOOL_SRT30'),
-    'SRT5': os.getenv('SCHOOL_SRT5'),
-    'BUC': os.getenv('SCHOOL_BUC'),
-}
-
-SCHOOL_HEADERS = {
-    'accept': '*/*',
-    'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
-    'authorization': os.getenv('SCHOOL_AUTHORIZATION'),
-    'user-agent': os.getenv('USER_AGENT'),
-}
-
-# -------------------------------
-# 동 정보 요청용 설정
-# -------------------------------
-DONG_COOKIES = {
-    'NNB': os.getenv('NNB'),
-    'ASID': os.getenv('ASID'),
-    'NAC': os.getenv('NAC'),
-    'landHomeFlashUseYn': 'Y',
-    'page_uid': os.getenv('DONG_PAGE_UID'),
-    'REALESTATE': os.getenv('DONG_REALESTATE'),
-    'SRT30': os.getenv('DONG_SRT30'),
-    'SRT5': os.getenv('DONG_SRT5'),
-    'BUC': os.getenv('DONG_BUC'),
-}
-
-DONG_HEADERS = {
-    'accept': '*/*',
-    'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
-    'authorization': os.getenv('DONG_AUTHORIZATION'),
-    'user-agent': os.getenv('USER_AGENT'),
-}
+import contextvars
+from pathlib import Path
+from urllib.parse import urlsplit
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.config import DATA_PATHS, DATA_DIR, COLLECT_CONFIG
+from src.credentials import get_request_profile, get_api_base_url, api_url
+from src.instrumentation import span, PhaseTimer
 
 COMMON_PARAMS = {
     'tradeType': 'A1',
@@ -111,13 +20,160 @@ COMMON_PARAMS = {
     'type': 'chart',
 }
 
+# 단지 정보 필드
+COMPLEX_KEYS = [
+    "complexNo", "complexName", "cortarNo", "realEstateTypeCode", "realEstateTypeName",
+    "detailAddress", "roadAddress", "latitude", "longitude", "totalHouseholdCount",
+    "totalLeaseHouseholdCount", "permanentLeaseHouseholdCount", "nationLeaseHouseholdCount",
+    "civilLeaseHouseholdCount", "publicLeaseHouseholdCount", "longTermLeaseHouseholdCount",
+    "etcLeaseHouseholdCount", "highFloor", "lowFloor", "useApproveYmd", "totalDongCount",
+    "maxSupplyArea", "minSupplyArea", "dealCount", "rentCount", "leaseCount", "shortTermRentCount",
+    "isBookmarked", "batlRatio", "btlRatio", "parkingPossibleCount", "parkingCountByHousehold",
+    "constructionCompanyName", "heatMethodTypeCode", "heatFuelTypeCode", "pyoengNames",
+    "address", "roadAddressPrefix", "roadZipCode"
+]
+
+# 학교 정보 필드 (총 12개)
+SCHOOL_KEYS = [
+    "schoolName", "walkTime", "studentStatisticsBaseYmd", "studentCountPerTeacher",
+    "studentCountPerClassroom", "maleStudentCount", "femaleStudentCount", "totalStudentCount",
+    "averageStudentCountPerClassroomOnCity", "averageStudentCountPerTeacherOnCity",
+    "averageStudentCountPerClassroomOnDivision", "averageStudentCountPerTeacherOnDivision"
+]
+
+# 단지 정보 CSV 컬럼
+COMPLEX_HEADER = COMPLEX_KEYS + ["매매매물출현율", "전세매물출현율", "월세매물출현율"] + SCHOOL_KEYS
+
+# 평형 정보 CSV 컬럼 (원본 33개 + 변환값 9개)
+PYEONG_HEADER = [
+    "complexNo", "complexName", "pyeongNo", "supplyArea", "supplyPyeong", "pyeongName", "pyeongName2",
+    "exclusiveArea", "exclusivePyeong", "exclusiveRate", "realEstateTypeCode", "householdCountByPyeong",
+    "dealCount", "leaseCount", "rentCount", "shortTermRentCount",
+    "dealPriceMin", "dealPriceMax", "dealPricePerSpaceMin", "dealPricePerSpaceMax",
+    "dealPriceString", "dealPricePerSpaceString", "leasePriceString", "leasePricePerSpaceString",
+    "leasePriceRateString", "rentPriceString", "rentDepositPriceMin", "rentPriceMin",
+    "rentDepositPriceMax", "rentPriceMax",
+    "roomCnt", "bathroomCnt", "averageTotalPrice",
+    "dealPriceMin2", "dealPriceMax2", "rentDepositPriceMin2", "rentPriceMin2", "rentDepositPriceMax2", "rentPriceMax2",
+    "매매매물출현율", "전세매물출현율", "월세매물출현율"
+]
+
+# sell_data에 맵핑할 필드 목록 (총 25개)
+SELL_PYEONG_FIELDS = [
+    "householdCountByPyeong", "dealCount", "leaseCount", "rentCount", "shortTermRentCount",
+    "roomCnt", "bathroomCnt", "averageTotalPrice",
+    "dealPriceMin2", "dealPriceMax2", "dealPricePerSpaceMin", "dealPricePerSpaceMax",
+    "dealPriceString", "dealPricePerSpaceString", "leasePriceString", "leasePricePerSpaceString",
+    "leasePriceRateString", "rentPriceString", "rentDepositPriceMin2", "rentPriceMin2",
+    "rentDepositPriceMax2", "rentPriceMax2", "매매매물출현율", "전세매물출현율", "월세매물출현율"
+]
+
+# sell_data에 붙이는 KB 시세(provider_data) 필드
+SELL_PROVIDER_FIELDS = [
+    "provider", "baseYearMonthDay", "dealUpperPriceLimit", "dealAveragePrice",
+    "dealLowPriceLimit", "dealAveragePriceChangeAmount", "leaseUpperPriceLimit",
+    "leaseAveragePrice", "leaseLowPriceLimit", "leaseAveragePriceChangeAmount",
+    "rentLowPrice", "deposit", "rentUpperPrice", "upperPriceLimit",
+    "averagePriceLimit", "lowPriceLimit", "priceChangeAmount", "leasePerDealRate"
+]
+
+# 실거래가 CSV 컬럼 (원본 10개 + 파생 4개)
+PRICE_HEADER = [
+    "complexNo", "complexName", "pyeongNo", "pyeongName", "pyeongName2", "tradeType", "year", "floor", "date", "price",
+    "pyeongName3", "dealDate", "dealAmount", "dealDateClass"
+]
+
+# 공급자별 시세 CSV 컬럼
+PROVIDER_HEADER = ["complexNo", "complexName", "pyeongNo", "pyeongName", "pyeongName2"] + SELL_PROVIDER_FIELDS
+
+# 동 정보 CSV 컬럼
+DONG_HEADER = ["complexNo", "complexName", "dongNo", "dongNm", "max_floor"]
+
+# sell_data.csv에서 제외하는 매물 API 필드
+SELL_EXCLUDE_FIELDS = {
+    "articleStatus", "realEstateTypeCode", "realEstateTypeName", "articleRealEstateTypeCode", "tradeTypeCode",
+    "verificationTypeCode",
+    "representativeImgUrl", "representativeImgTypeCode",
+    "representativeImgThumb", "siteImageCount", "sameAddrDirectCnt", "cpid", "cpPcArticleBridgeUrl",
+    "cpPcArticleLinkUseAtArticleTitleYn", "cpPcArticleLinkUseAtCpNameYn", "cpMobileArticleUrl",
+    "cpMobileArticleLinkUseAtArticleTitleYn", "cpMobileArticleLinkUseAtCpNameYn", "isLocationShow", "realtorId",
+    "tradeCheckedByOwner", "isDirectTrade", "isInterest", "isComplex", "detailAddress", "detailAddressYn", "isVrExposed"
+}
+
+def build_sell_columns(article_keys):
+    """가공된 매물(article) 딕셔너리의 키 순서로 sell_data.csv 컬럼 순서 결정"""
+    filtered_keys = [key for key in article_keys if key not in SELL_EXCLUDE_FIELDS]
+
+    if "articleName" in filtered_keys and "complexNo" in filtered_keys:
+        filtered_keys.remove("complexNo")
+        idx = filtered_keys.index("articleName")
+        filtered_keys.insert(idx, "complexNo")
+    if "areaName" in filtered_keys and "pyeongName" in filtered_keys:
+        filtered_keys.remove("pyeongName")
+        idx = filtered_keys.index("areaName")
+        filtered_keys.insert(idx+1, "pyeongName")
+    if "rentPrc" in filtered_keys:
+        filtered_keys.remove("rentPrc")
+    if "dealOrWarrantPrc" in filtered_keys:
+        idx = filtered_keys.index("dealOrWarrantPrc")
+        filtered_keys.insert(idx+1, "rentPrc")
+
+    if "floorType" not in filtered_keys:
+        filtered_keys.append("floorType")
+
+    filtered_keys.append("downloadDate")
+    return filtered_keys
+
+# 정상 응답을 받을 때마다 호출할 콜백 (요청 URL(쿼리 포함), JSON) - 응답 녹화용
+# 프로세스 전체에 적용되므로 수집을 단독으로 실행할 때만 등록할 것
+RESPONSE_HOOKS = []
+
+@contextmanager
+def response_hook(callback):
+    """with 블록 안에서 fetch_json의 정상 응답을 callback(url, data)으로 전달"""
+    RESPONSE_HOOKS.append(callback)
+    try:
+        yield
+    finally:
+        RESPONSE_HOOKS.remove(callback)
+
+# 네트워크 대신 응답을 돌려줄 함수 (요청 URL(쿼리 포함) → JSON, 없으면 None) - 보관 응답 재생용
+# ContextVar이므로 run_parallel의 작업 스레드에도 전달되고 동시에 실행 중인 다른 수집에는 영향 없음
+RESPONSE_SOURCE = contextvars.ContextVar("response_source", default=None)
+
+@contextmanager
+def response_source(source):
+    """with 블록 안에서 fetch_json이 요청을 보내지 않고 source(url)의 응답을 사용"""
+    token = RESPONSE_SOURCE.set(source)
+    try:
+        yield
+    finally:
+        RESPONSE_SOURCE.reset(token)
+
+def endpoint_family(url):
+    """계측용 엔드포인트 분류 ('.../api/complexes/138183/prices/real?...' → 'complexes/{id}/prices/real')"""
+    path = urlsplit(url).path.split("/api/", 1)[-1].strip("/")
+    return re.sub(r"\d+", "{id}", path)
+
 def fetch_json(url, params, cookies, headers):
     """URL에 GET 요청 후 JSON 데이터를 반환합니다."""
+    endpoint = endpoint_family(url)
+    source = RESPONSE_SOURCE.get()
+    if source is not None:
+        with span("replay", "io", endpoint=endpoint):
+            return source(requests.Request("GET", url, params=params).prepare().url)
     try:
-        resp = requests.get(url, params=params, cookies=cookies, headers=headers)
+        with span("fetch", "http", endpoint=endpoint) as attrs:
+            resp = requests.get(url, params=params, cookies=cookies, headers=headers)
+            attrs["status"] = resp.status_code
+            attrs["bytes"] = len(resp.content)
         if resp.status_code == 200:
             try:
-                return resp.json()
+                with span("parse", "parse", endpoint=endpoint):
+                    data = resp.json()
+                for hook in list(RESPONSE_HOOKS):
+                    hook(resp.url, data)
+                return data
             except Exception as e:
                 print(f"JSON decode error at {url}: {resp.text}")
                 raise e
@@ -127,20 +183,25 @@ def fetch_json(url, params, cookies, headers):
         print(f"URL 요청 중 예외 발생: {url}, 예외: {e}")
     return None
 
-def write_csv(filename, header, rows):
-    from src.config import DATA_PATHS, DATA_DIR
-    
-    # 수정: filename을 문자열로 변환 후 replace()
-    file_key = str(filename).replace('.csv', '').upper()
-    if file_key in DATA_PATHS:
-        filepath = DATA_PATHS[file_key]
-    else:
-        filepath = DATA_DIR / filename
+def write_csv(filename, header, rows, paths=None, updated_date=None):
+    """CSV 저장 (paths: 실행별 경로 딕셔너리, 없으면 공용 DATA_PATHS 사용)
+
+    updated_date: 모든 행에 붙일 다운로드 시각 (없으면 현재 시각)
+    """
+    if paths is None:
+        paths = DATA_PATHS
+    if updated_date is None:
+        updated_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # 파일명으로 경로 조회 (price_data.csv → REAL_PRICE 등), 없으면 결과 파일과 같은 폴더
+    file_path_by_name = {Path(path).name: Path(path) for path in paths.values()}
+    filepath = file_path_by_name.get(filename, Path(paths["RESULT"]).parent / filename)
 
     # 디렉토리가 없으면 생성
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+    with span("write_csv", "io", file=filename, rows=len(rows)), \
+            open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
         writer = csv.writer(f)
         header_with_updated = header + ["downloadDate"]
         writer.writerow(header_with_updated)
@@ -200,9 +261,9 @@ def get_floor_type(floor_info):
     except:
         return ""
 
-def fetch_real_price_data(complex_no, pyeong_no, cookies, headers):
+def fetch_real_price_data(complex_no, pyeong_no, cookies, headers, api_base_url=None):
     """네이버 부동산 UI와 유사하게 실거래 데이터를 수집합니다."""
-    base_url = f'https://new.land.naver.com/api/complexes/{complex_no}/prices/real'
+    base_url = api_url(f'complexes/{complex_no}/prices/real', api_base_url)
     transactions = []
     collected_keys = set()
 
@@ -224,34 +285,105 @@ def fetch_real_price_data(complex_no, pyeong_no, cookies, headers):
         "areaNo": pyeong_no,
         "type": "table"
     }
-    resp_json = fetch_json(base_url, params=params, cookies=cookies, headers=headers)
-    if not resp_json:
-        return []
-    new_data = parse_transactions(resp_json)
-    transactions.extend(new_data)
-    prev_added = resp_json.get("addedRowCount", "")
-    if not resp_json.get("realPriceOnMonthList", []):
+    with span("real_price", "pagination", complexNo=str(complex_no), pyeongNo=str(pyeong_no)) as attrs:
+        attrs["pages"] = 1
+        resp_json = fetch_json(base_url, params=params, cookies=cookies, headers=headers)
+        if not resp_json:
+            return []
+        new_data = parse_transactions(resp_json)
+        transactions.extend(new_data)
+        prev_added = resp_json.get("addedRowCount", "")
+        if not resp_json.get("realPriceOnMonthList", []):
+            return transactions
+
+        while prev_added and str(prev_added).strip():
+            params["addedRowCount"] = str(prev_added)
+            attrs["pages"] += 1
+            resp_json2 = fetch_json(base_url, params=params, cookies=cookies, headers=headers)
+            if not resp_json2:
+                break
+            new_data2 = parse_transactions(resp_json2)
+            if not new_data2:
+                break
+            transactions.extend(new_data2)
+            new_added = resp_json2.get("addedRowCount", "")
+            if not new_added or new_added == prev_added:
+                break
+            prev_added = new_added
+        attrs["rows"] = len(transactions)
         return transactions
 
-    while prev_added and str(prev_added).strip():
-        params["addedRowCount"] = str(prev_added)
-        resp_json2 = fetch_json(base_url, params=params, cookies=cookies, headers=headers)
-        if not resp_json2:
-            break
-        new_data2 = parse_transactions(resp_json2)
-        if not new_data2:
-            break
-        transactions.extend(new_data2)
-        new_added = resp_json2.get("addedRowCount", "")
-        if not new_added or new_added == prev_added:
-            break
-        prev_added = new_added
-    return transactions
-
-def main_function(complex_ids=None):
-    """매개변수로 받은 아파트 단지들의 데이터만 수집"""
+def report_progress(progress_callback, fraction, message):
+    """진행률 콜백 호출 (콜백에서 예외가 발생하면 수집이 중단됨)"""
+    if progress_callback is not None:
+        progress_callback(fraction, message)
+
+def run_parallel(func, items, progress_callback=None, start=0.0, width=1.0, message="", max_workers=None):
+    """items 각각에 func를 스레드 풀에서 실행하고 입력 순서대로 결과 반환 (max_workers 기본값: COLLECT_CONFIG)
+
+    하나가 끝날 때마다 진행률(start ~ start+width)을 보고하며,
+    콜백에서 예외(작업 취소)가 발생하면 대기 중인 작업을 취소하고 예외를 다시 던짐.
+    항목별 실행 시간은 func 이름의 span으로 기록됨 (호출 스레드의 계측 컨텍스트를 이어받음).
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results
+
+    def run_item(item):
+        with span(func.__name__, "task", item=str(item)):
+            return func(item)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers or COLLECT_CONFIG["MAX_WORKERS"], len(items)))
+    try:
+        futures = {
+            executor.submit(contextvars.copy_context().run, run_item, item): i
+            for i, item in enumerate(items)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            report_progress(progress_callback, start + width * done / len(items),
+                            f"{message} ({done}/{len(items)})")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+def main_function(complex_ids=None, progress_callback=None, paths=None, api_base_url=None, updated_date=None,
+                  max_workers=None):
+    """매개변수로 받은 아파트 단지들의 데이터만 수집
+
+    progress_callback: (진행률 0~1, 메시지)를 받는 함수. 작업 취소 시 예외를 던져 수집을 중단할 수 있음.
+    paths: 산출물 경로 딕셔너리 (RunHandle.paths). 없으면 공용 DATA_PATHS에 저장.
+    api_base_url: API 서버 주소 (없으면 NAVER_LAND_BASE_URL 환경변수 또는 API_CONFIG 기본값)
+    updated_date: 산출물 기준 시각 "YYYY-MM-DD HH:MM:SS" (없으면 현재 시각, 보관 응답 재생 시 원래 수집 시각)
+    max_workers: 단지별 동시 요청 수 (없으면 COLLECT_CONFIG["MAX_WORKERS"])
+    """
     if complex_ids is None:
         complex_ids = [138183, 136913]  # 기본값 유지
+    if paths is None:
+        paths = DATA_PATHS
+    api_base_url = api_base_url or get_api_base_url()
+
+    # 모든 산출물의 업데이트 날짜 (시간까지) - 수집 실행 시점 기준
+    updated_date = updated_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # 네트워크로 수집할 때는 원본 응답을 보관 (src/raw_archive.py, 보관 응답 재생 중에는 다시 보관하지 않음)
+    if RESPONSE_SOURCE.get() is None:
+        from src.raw_archive import archive_responses
+        with archive_responses(updated_date):
+            return _collect(complex_ids, progress_callback, paths, api_base_url, updated_date, max_workers)
+    return _collect(complex_ids, progress_callback, paths, api_base_url, updated_date, max_workers)
+
+def _collect(complex_ids, progress_callback, paths, api_base_url, updated_date, max_workers):
+    """main_function 본체 (인자는 기본값이 채워진 상태)"""
+    # 요청별 쿠키/헤더 (환경변수는 프로세스당 한 번만 읽음)
+    BASE_COOKIES, BASE_HEADERS = get_request_profile("BASE")
+    SELL_COOKIES, SELL_HEADERS = get_request_profile("SELL")
+    SCHOOL_COOKIES, SCHOOL_HEADERS = get_request_profile("SCHOOL")
+    DONG_COOKIES, DONG_HEADERS = get_request_profile("DONG")
+
+    # 단계별 소요 시간 계측 (collect.<단계>)
+    phases = PhaseTimer("collect")
 
     # -------------------------------
     # 데이터 저장용 리스트 생성
@@ -261,32 +393,13 @@ def main_function(complex_ids=None):
     price_data = []       # 차트용 가격 데이터
     provider_data = []    # 공급자별 가격 데이터
 
-    # 단지 정보 필드
-    complex_keys = [
-        "complexNo", "complexName", "cortarNo", "realEstateTypeCode", "realEstateTypeName",
-        "detailAddress", "roadAddress", "latitude", "longitude", "totalHouseholdCount",
-        "totalLeaseHouseholdCount", "permanentLeaseHouseholdCount", "nationLeaseHouseholdCount",
-        "civilLeaseHouseholdCount", "publicLeaseHouseholdCount", "longTermLeaseHouseholdCount",
-        "etcLeaseHouseholdCount", "highFloor", "lowFloor", "useApproveYmd", "totalDongCount",
-        "maxSupplyArea", "minSupplyArea", "dealCount", "rentCount", "leaseCount", "shortTermRentCount",
-        "isBookmarked", "batlRatio", "btlRatio", "parkingPossibleCount", "parkingCountByHousehold",
-        "constructionCompanyName", "heatMethodTypeCode", "heatFuelTypeCode", "pyoengNames",
-        "address", "roadAddressPrefix", "roadZipCode"
-    ]
-
-    # 학교 정보 필드 (총 12개)
-    school_keys = [
-        "schoolName", "walkTime", "studentStatisticsBaseYmd", "studentCountPerTeacher",
-        "studentCountPerClassroom", "maleStudentCount", "femaleStudentCount", "totalStudentCount",
-        "averageStudentCountPerClassroomOnCity", "averageStudentCountPerTeacherOnCity",
-        "averageStudentCountPerClassroomOnDivision", "averageStudentCountPerTeacherOnDivision"
-    ]
-
     # -------------------------------
     # 단지별 데이터 처리
     # -------------------------------
-    for complex_id in complex_ids:
-        url_complex = f'https://new.land.naver.com/api/complexes/{complex_id}'
+    def collect_complex(complex_id):
+        """단지 1곳의 기본정보/평형/실거래/공급자 시세 수집 (스레드에서 실행)"""
+        complex_rows, pyeong_rows, price_rows, provider_rows = [], [], [], []
+        url_complex = api_url(f'complexes/{complex_id}', api_base_url)
         complex_params = {"sameAddressGroup": "true"}
         data = fetch_json(url_complex, params=complex_params, cookies=BASE_COOKIES, headers=BASE_HEADERS)
         if data:
@@ -334,24 +447,24 @@ def main_function(complex_ids=None):
             complex_detail["pyoengNames"] = pyoengNames
 
             # 학교 정보 요청
-            school_url = f'https://new.land.naver.com/api/complexes/{complex_id}/schools'
+            school_url = api_url(f'complexes/{complex_id}/schools', api_base_url)
             school_data = fetch_json(school_url, params={}, cookies=SCHOOL_COOKIES, headers=SCHOOL_HEADERS)
             if school_data and "schools" in school_data and len(school_data["schools"]) > 0:
                 first_school = school_data["schools"][0]
-                school_row = [first_school.get(k, "") for k in school_keys]
+                school_row = [first_school.get(k, "") for k in SCHOOL_KEYS]
             else:
-                school_row = ["" for _ in range(len(school_keys))]
+                school_row = ["" for _ in range(len(SCHOOL_KEYS))]
 
-            row = [complex_detail.get(k, "") for k in complex_keys]
+            row = [complex_detail.get(k, "") for k in COMPLEX_KEYS]
             row.extend([매매매물출현율, 전세매물출현율, 월세매물출현율])
             row.extend(school_row)
-            complex_data.append(row)
+            complex_rows.append(row)
 
             # 평형(호) 데이터 처리
             for pyeong in data.get("complexPyeongDetailList", []):
                 pyeong_no = pyeong.get("pyeongNo", "")
                 stat = pyeong.get("articleStatistics", {})
-                pyeong_data.append([
+                pyeong_rows.append([
                     complex_id,
                     pyeong_no,
                     pyeong.get("supplyArea", ""),
@@ -387,9 +500,9 @@ def main_function(complex_ids=None):
                 ])
 
                 # **변경된 부분**: price_data 수집을 fetch_real_price_data 함수로 대체
-                transactions = fetch_real_price_data(complex_id, pyeong_no, BASE_COOKIES, BASE_HEADERS)
+                transactions = fetch_real_price_data(complex_id, pyeong_no, BASE_COOKIES, BASE_HEADERS, api_base_url)
                 for t in transactions:
-                    price_data.append([
+                    price_rows.append([
                         complex_id,
                         pyeong_no,
                         t.get("tradeType", ""),
@@ -414,7 +527,7 @@ def main_function(complex_ids=None):
                     provider_headers['referer'] = (f'https://new.land.naver.com/complexes/{complex_id}?'
                                                    'ms=37.2890027,127.0591203,17&a=APT:PRE:ABYG:JGC&e=RETAIL')
                     provider_json = fetch_json(
-                        f'https://new.land.naver.com/api/complexes/{complex_id}/prices',
+                        api_url(f'complexes/{complex_id}/prices', api_base_url),
                         params=provider_params, cookies=BASE_COOKIES, headers=provider_headers
                     )
                     if provider_json:
@@ -427,7 +540,7 @@ def main_function(complex_ids=None):
                                     bymd = datetime.strptime(bymd, "%Y%m%d").strftime("%Y-%m-%d")
                                 except:
                                     pass
-                            provider_data.append([
+                            provider_rows.append([
                                 complex_id,
                                 pyeong_no,
                                 prov,
@@ -449,7 +562,19 @@ def main_function(complex_ids=None):
                                 top_data.get("priceChangeAmount", ""),
                                 top_data.get("leasePerDealRate", "")
                             ])
-
+        return complex_rows, pyeong_rows, price_rows, provider_rows
+
+    # 단지별 수집은 병렬로 실행하고, 결과는 입력 순서대로 합침
+    phases.start("complex_info", complexes=len(complex_ids))
+    collected = run_parallel(collect_complex, complex_ids, progress_callback, 0.0, 0.6, "단지 정보/실거래가 수집 중",
+                             max_workers)
+    for complex_rows, pyeong_rows, price_rows, provider_rows in collected:
+        complex_data.extend(complex_rows)
+        pyeong_data.extend(pyeong_rows)
+        price_data.extend(price_rows)
+        provider_data.extend(provider_rows)
+
+    phases.start("derive_pyeong")
     # =============================================================================
     # 매핑 딕셔너리 생성 및 insert_complex_name() 호출
     # =============================================================================
@@ -530,28 +655,17 @@ def main_function(complex_ids=None):
         ])
     # 이제 각 pyeong_data 행의 최종 길이는 33 + 9 = 42
 
-    pyeong_header = [
-        "complexNo", "complexName", "pyeongNo", "supplyArea", "supplyPyeong", "pyeongName", "pyeongName2",
-        "exclusiveArea", "exclusivePyeong", "exclusiveRate", "realEstateTypeCode", "householdCountByPyeong",
-        "dealCount", "leaseCount", "rentCount", "shortTermRentCount",
-        "dealPriceMin", "dealPriceMax", "dealPricePerSpaceMin", "dealPricePerSpaceMax",
-        "dealPriceString", "dealPricePerSpaceString", "leasePriceString", "leasePricePerSpaceString",
-        "leasePriceRateString", "rentPriceString", "rentDepositPriceMin", "rentPriceMin",
-        "rentDepositPriceMax", "rentPriceMax",
-        "roomCnt", "bathroomCnt", "averageTotalPrice",
-        "dealPriceMin2", "dealPriceMax2", "rentDepositPriceMin2", "rentPriceMin2", "rentDepositPriceMax2", "rentPriceMax2",
-        "매매매물출현율", "전세매물출현율", "월세매물출현율"
-    ]
-
     # =============================================================================
     # sell_data 처리
     # =============================================================================
     all_articles = []
-    for complex_no in complex_ids:
+    def collect_articles(complex_no):
+        """단지 1곳의 매물 목록 전체 페이지 수집 (스레드에서 실행)"""
+        complex_articles = []
         page = 1
         while True:
             sell_url = (
-                f'https://new.land.naver.com/api/articles/complex/{complex_no}'
+                api_url(f'articles/complex/{complex_no}', api_base_url) +
                 f'?realEstateType=APT%3APRE%3AABYG%3AJGC&tradeType='
                 f'&page={page}&complexNo={complex_no}&type=list&order=rank'
                 f'&sameAddressGroup=true'
@@ -575,13 +689,20 @@ def main_function(complex_ids=None):
                         article["pyeongName"] = ""
                     # rentPrc 필드 추가 (없으면 빈 문자열)
                     article["rentPrc"] = article.get("rentPrc", "")
-                all_articles.extend(articles)
+                complex_articles.extend(articles)
                 page += 1
             else:
                 print(f"Sell 데이터 가져오기 실패: complex {complex_no}의 page {page}")
                 break
+        return complex_articles
+
+    phases.start("articles")
+    for complex_articles in run_parallel(collect_articles, complex_ids, progress_callback, 0.6, 0.2, "매물 수집 중", max_workers):
+        all_articles.extend(complex_articles)
+
+    phases.start("derive_articles", articles=len(all_articles))
 
-    today = datetime.today().date()
+    today = datetime.strptime(updated_date, "%Y-%m-%d %H:%M:%S").date()
     for article in all_articles:
         acymd = article.get('articleConfirmYmd', '')
         if acymd:
@@ -600,16 +721,6 @@ def main_function(complex_ids=None):
     # ====================================================================
     # sell_data에 pyeong_data의 일부 데이터를 맵핑 (신규 필드 추가)
     # ====================================================================
-    # sell_data에 맵핑할 필드 목록 (총 25개)
-    pyeong_fields = [
-        "householdCountByPyeong", "dealCount", "leaseCount", "rentCount", "shortTermRentCount",
-        "roomCnt", "bathroomCnt", "averageTotalPrice",
-        "dealPriceMin2", "dealPriceMax2", "dealPricePerSpaceMin", "dealPricePerSpaceMax",
-        "dealPriceString", "dealPricePerSpaceString", "leasePriceString", "leasePricePerSpaceString",
-        "leasePriceRateString", "rentPriceString", "rentDepositPriceMin2", "rentPriceMin2",
-        "rentDepositPriceMax2", "rentPriceMax2", "매매매물출현율", "전세매물출현율", "월세매물출현율"
-    ]
-
     # 매핑 키는 (complexNo, pyeongName2) → pyeongName2는 now index 6
     pyeong_mapping = {}
     for row in pyeong_data:
@@ -650,7 +761,7 @@ def main_function(complex_ids=None):
         if key in pyeong_mapping:
             article.update(pyeong_mapping[key])
         else:
-            for field in pyeong_fields:
+            for field in SELL_PYEONG_FIELDS:
                 article[field] = ""
 
     # =============================================================================
@@ -687,14 +798,6 @@ def main_function(complex_ids=None):
              "leasePerDealRate": row[19]
         }
 
-    new_fields = [
-        "provider", "baseYearMonthDay", "dealUpperPriceLimit", "dealAveragePrice",
-        "dealLowPriceLimit", "dealAveragePriceChangeAmount", "leaseUpperPriceLimit",
-        "leaseAveragePrice", "leaseLowPriceLimit", "leaseAveragePriceChangeAmount",
-        "rentLowPrice", "deposit", "rentUpperPrice", "upperPriceLimit",
-        "averagePriceLimit", "lowPriceLimit", "priceChangeAmount", "leasePerDealRate"
-    ]
-
     for article in all_articles:
         comp_no = str(article.get("complexNo", "")).strip()
         pyeong_unique = str(article.get("pyeongName", "")).strip()
@@ -702,42 +805,14 @@ def main_function(complex_ids=None):
         if key in provider_kbstar_mapping:
             article.update(provider_kbstar_mapping[key])
         else:
-            for field in new_fields:
+            for field in SELL_PROVIDER_FIELDS:
                 article[field] = ""
 
     # =============================================================================
     # sell_data CSV 파일 생성 (필드 순서 조정)
     # =============================================================================
     if all_articles:
-        exclude_fields = {
-            "articleStatus", "realEstateTypeCode", "realEstateTypeName", "articleRealEstateTypeCode", "tradeTypeCode",
-            "verificationTypeCode",
-            "representativeImgUrl", "representativeImgTypeCode",
-            "representativeImgThumb", "siteImageCount", "sameAddrDirectCnt", "cpid", "cpPcArticleBridgeUrl",
-            "cpPcArticleLinkUseAtArticleTitleYn", "cpPcArticleLinkUseAtCpNameYn", "cpMobileArticleUrl",
-            "cpMobileArticleLinkUseAtArticleTitleYn", "cpMobileArticleLinkUseAtCpNameYn", "isLocationShow", "realtorId",
-            "tradeCheckedByOwner", "isDirectTrade", "isInterest", "isComplex", "detailAddress", "detailAddressYn", "isVrExposed"
-        }
-        filtered_keys = [key for key in all_articles[0].keys() if key not in exclude_fields]
-        
-        if "articleName" in filtered_keys and "complexNo" in filtered_keys:
-            filtered_keys.remove("complexNo")
-            idx = filtered_keys.index("articleName")
-            filtered_keys.insert(idx, "complexNo")
-        if "areaName" in filtered_keys and "pyeongName" in filtered_keys:
-            filtered_keys.remove("pyeongName")
-            idx = filtered_keys.index("areaName")
-            filtered_keys.insert(idx+1, "pyeongName")
-        if "rentPrc" in filtered_keys:
-            filtered_keys.remove("rentPrc")
-        if "dealOrWarrantPrc" in filtered_keys:
-            idx = filtered_keys.index("dealOrWarrantPrc")
-            filtered_keys.insert(idx+1, "rentPrc")
-        
-        if "floorType" not in filtered_keys:
-            filtered_keys.append("floorType")
-        
-        filtered_keys.append("downloadDate")
+        filtered_keys = build_sell_columns(all_articles[0].keys())
         
         for article in all_articles:
             if 'floorInfo' in article:
@@ -754,7 +829,7 @@ def main_function(complex_ids=None):
             except:
                 pass
             article["downloadDate"] = updated_date
-        sell_filename = DATA_PATHS.get("SELL", DATA_DIR / "sell_data.csv")
+        sell_filename = paths.get("SELL", DATA_DIR / "sell_data.csv")
         with open(sell_filename, mode='w', newline='', encoding='utf-8-sig') as file:
             writer = csv.DictWriter(file, fieldnames=filtered_keys)
             writer.writeheader()
@@ -776,7 +851,6 @@ def main_function(complex_ids=None):
         new_row = row[:3] + [pn, pn2] + row[3:]
         new_price_data.append(new_row)
     price_data = new_price_data
-    price_header = ["complexNo", "complexName", "pyeongNo", "pyeongName", "pyeongName2", "tradeType", "year", "floor", "date", "price"]
     # ----- 추가: 새 필드 생성 처리 -----
     # downloadDate는 updated_date 변수에 저장되어 있음. 날짜 부분만 사용 (YYYY-MM-DD)
     download_dt = datetime.strptime(updated_date, "%Y-%m-%d %H:%M:%S").date()
@@ -813,9 +887,6 @@ def main_function(complex_ids=None):
         # 새로운 필드들을 현재 행의 끝에 추가
         row.extend([pyeongName3, dealDate, str(dealAmount), dealDateClass])
 
-    # 새로 추가한 필드명을 헤더에 포함
-    price_header.extend(["pyeongName3", "dealDate", "dealAmount", "dealDateClass"])
-
     provider_data = insert_complex_name(provider_data, 0)
     new_provider_data = []
     for row in provider_data:
@@ -825,17 +896,13 @@ def main_function(complex_ids=None):
         new_row = row[:3] + [pn, pn2] + row[3:]
         new_provider_data.append(new_row)
     provider_data = new_provider_data
-    provider_header = provider_data[0] and (["complexNo", "complexName", "pyeongNo", "pyeongName", "pyeongName2"] + 
-                                             ["provider", "baseYearMonthDay", "dealUpperPriceLimit", "dealAveragePrice",
-                                              "dealLowPriceLimit", "dealAveragePriceChangeAmount", "leaseUpperPriceLimit",
-                                              "leaseAveragePrice", "leaseLowPriceLimit", "leaseAveragePriceChangeAmount",
-                                              "rentLowPrice", "deposit", "rentUpperPrice", "upperPriceLimit",
-                                              "averagePriceLimit", "lowPriceLimit", "priceChangeAmount", "leasePerDealRate"]) or []
-
-    write_csv("complex_data.csv", complex_keys + ["매매매물출현율", "전세매물출현율", "월세매물출현율"] + school_keys, complex_data)
-    write_csv("pyeong_data.csv", pyeong_header, pyeong_data)
-    write_csv("price_data.csv", price_header, price_data)
-    write_csv("provider_data.csv", provider_header, provider_data)
+    provider_header = PROVIDER_HEADER if provider_data else []
+
+    phases.start("write")
+    write_csv("complex_data.csv", COMPLEX_HEADER, complex_data, paths=paths, updated_date=updated_date)
+    write_csv("pyeong_data.csv", PYEONG_HEADER, pyeong_data, paths=paths, updated_date=updated_date)
+    write_csv("price_data.csv", PRICE_HEADER, price_data, paths=paths, updated_date=updated_date)
+    write_csv("provider_data.csv", provider_header, provider_data, paths=paths, updated_date=updated_date)
 
     print(f"기본 정보 파일 생성 완료: complex_data.csv")
     print(f"평형 정보 파일 생성 완료: pyeong_data.csv")
@@ -845,6 +912,7 @@ def main_function(complex_ids=None):
     # =============================================================================
     # (추가) 동 데이터 수집 및 CSV 파일 생성
     # =============================================================================
+    phases.start("dong")
     dong_data = []  # 최종 동 정보 저장 리스트
 
     def find_first_non_empty(records, key):
@@ -854,12 +922,14 @@ def main_function(complex_ids=None):
                 return value
         return ""
 
-    for complex_id in complex_ids:
+    def collect_dong(complex_id):
+        """단지 1곳의 동별 최고층 정보 수집 (스레드에서 실행)"""
+        dong_rows = []
         complex_name = complex_mapping.get(str(complex_id), "")
         consecutive_no_data = 0
         max_try = 50
         for dong_no in range(1, max_try + 1):
-            url_dong = f'https://new.land.naver.com/api/complexes/{complex_id}/buildings/landprice'
+            url_dong = api_url(f'complexes/{complex_id}/buildings/landprice', api_base_url)
             params = {
                 'dongNo': str(dong_no),
                 'complexNo': str(complex_id),
@@ -896,10 +966,16 @@ def main_function(complex_ids=None):
             hscpNm_val = find_first_non_empty(chosen_landPrices, "hscpNm")
             dongNm_val = find_first_non_empty(chosen_landPrices, "dongNm")
             row = [hscpNo_val, hscpNm_val, str(dong_no), dongNm_val, max_floor]
-            dong_data.append(row)
+            dong_rows.append(row)
+        return dong_rows
+
+    for dong_rows in run_parallel(collect_dong, complex_ids, progress_callback, 0.8, 0.2, "동 정보 수집 중", max_workers):
+        dong_data.extend(dong_rows)
             
-    write_csv("dong_data.csv", ["complexNo", "complexName", "dongNo", "dongNm", "max_floor"], dong_data)
+    write_csv("dong_data.csv", DONG_HEADER, dong_data, paths=paths, updated_date=updated_date)
     print(f"동 정보 파일 생성 완료: dong_data.csv")
+    phases.close()
+    report_progress(progress_callback, 1.0, "데이터 수집 완료")
 
 if __name__ == "__main__":
     main_function()  # 직접 실행시 기본값으로 실행
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""API 원본 응답 보관소 + 보관 응답으로 산출물 다시 만들기 (네트워크 없이)
+
+수집(main_function)할 때마다 fetch_json이 받은 응답을 단지·날짜별 gzip JSON Lines로 추가 보관하고,
+파싱 규칙(pyeong_fields, get_floor_type 등)을 바꾼 뒤에는 rebuild()로 보관 응답을 main_function에
+그대로 재생해 CSV 산출물을 다시 만듦. API 속도 제한 없이 로컬 디스크 속도로, 단지 묶음별 프로세스 병렬로 실행됨.
+
+    python -m src.cli rebuild                       # 가장 최근 날짜의 보관 응답 전체
+    python -m src.cli rebuild --day 2026-10-19 138183 --out data/rebuilt --workers 8
+
+raw/
+    <YYYY-MM-DD>/<단지번호>.jsonl.gz   한 줄: {"run": 수집 시각, "key": 요청 키, "data": 응답 JSON}
+    <YYYY-MM-DD>/_shared.jsonl.gz      단지에 속하지 않는 요청
+
+요청 키는 /api/ 이후 경로 + 정렬한 쿼리 (서버 주소와 무관, benchmarks/fake_naver.py 녹화 파일과 같은 규칙).
+버퍼를 한 번에 압축해 gzip 멤버 하나로 추가(append)하므로 같은 날 여러 번 수집해도 파일 하나에 이어짐.
+다시 만들 때는 단지마다 그날 마지막 수집(run)의 응답만 사용하고, 산출물 기준 시각도 그 수집 시각으로 맞춤.
+보관 기간/용량은 RAW_ARCHIVE_CONFIG["KEEP_DAYS"/"MAX_BYTES"]로 제한하며, 수집이 끝날 때 gc_archive()가
+날짜 폴더 단위로 오래된 것부터 삭제함.
+"""
+import contextvars
+import gzip
+import io
+import json
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from src.config import RAW_ARCHIVE_DIR, RAW_ARCHIVE_CONFIG, REBUILDS_DIR
+from src.naver_apt_v5 import RESPONSE_HOOKS, response_source
+from src.runs import RunHandle
+
+SHARED_PARTITION = "_shared"
+SUFFIX = ".jsonl.gz"
+_COMPLEX_KEY = re.compile(r"^(?:complexes|articles/complex)/(\d+)")
+
+
+def response_key(url: str) -> str:
+    """요청 URL → 보관/조회 키 (/api/ 이후 경로 + 정렬한 쿼리)"""
+    parts = urlsplit(url)
+    api_path = parts.path.split("/api/", 1)[-1].strip("/")
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    return f"{api_path}?{urlencode(query)}"
+
+
+def partition_of(key: str) -> str:
+    """요청 키가 속한 파티션 (단지번호, 단지와 무관한 요청은 SHARED_PARTITION)"""
+    match = _COMPLEX_KEY.match(key)
+    return match.group(1) if match else SHARED_PARTITION
+
+
+class ResponseArchive:
+    """수집 1회(run)의 응답 기록기
+
+    파티션별 버퍼가 FLUSH_BYTES를 넘거나 close()할 때 압축해 파일 끝에 한 번의 write로 추가함
+    (열어 두는 파일이 없어 단지 수와 무관하고, 다른 프로세스의 동시 수집과도 줄이 섞이지 않음).
+    """
+
+    def __init__(self, run: str, base_dir: Optional[Path] = None):
+        self.run = run
+        self.day_dir = Path(base_dir or RAW_ARCHIVE_DIR) / run[:10]
+        self._buffers: Dict[str, List[bytes]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def record(self, url: str, data):
+        key = response_key(url)
+        line = json.dumps({"run": self.run, "key": key, "data": data},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        partition = partition_of(key)
+        with self._lock:
+            self._buffers.setdefault(partition, []).append(line)
+            self._sizes[partition] = self._sizes.get(partition, 0) + len(line)
+            self._total += len(line)
+            if self._total > RAW_ARCHIVE_CONFIG["MAX_BUFFER_BYTES"]:
+                pending = list(self._buffers)
+            elif self._sizes[partition] >= RAW_ARCHIVE_CONFIG["FLUSH_BYTES"]:
+                pending = [partition]
+            else:
+                return
+            chunks = [(p, self._take(p)) for p in pending]
+        for p, lines in chunks:
+            self._write(p, lines)
+
+    def _take(self, partition: str) -> List[bytes]:
+        self._total -= self._sizes.pop(partition, 0)
+        return self._buffers.pop(partition, [])
+
+    def _write(self, partition: str, lines: List[bytes]):
+        if not lines:
+            return
+        payload = gzip.compress(b"".join(lines), compresslevel=RAW_ARCHIVE_CONFIG["COMPRESS_LEVEL"])
+        self.day_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.day_dir / f"{partition}{SUFFIX}", "ab") as f:
+            f.write(payload)
+
+    def close(self):
+        with self._lock:
+            chunks = [(p, self._take(p)) for p in list(self._buffers)]
+        for p, lines in chunks:
+            self._write(p, lines)
+
+
+# 현재 컨텍스트의 기록기 - run_parallel 작업 스레드에 전달되고, 동시에 실행 중인 다른 수집과 섞이지 않음
+_ACTIVE = contextvars.ContextVar("raw_archive", default=None)
+
+
+def _record_active(url: str, data):
+    archive = _ACTIVE.get()
+    if archive is not None:
+        archive.record(url, data)
+
+
+RESPONSE_HOOKS.append(_record_active)
+
+
+@contextmanager
+def archive_responses(run: str, base_dir: Optional[Path] = None):
+    """with 블록 안의 fetch_json 정상 응답을 보관 (run: 수집 시각 "YYYY-MM-DD HH:MM:SS")
+
+    이미 보관 중인 블록 안에서는 바깥 기록기를 그대로 사용 (벤치마크가 base_dir을 임시 폴더로 바꿀 때 등).
+    """
+    if not RAW_ARCHIVE_CONFIG["RECORD"] or _ACTIVE.get() is not None:
+        yield _ACTIVE.get()
+        return
+    archive = ResponseArchive(run, base_dir)
+    token = _ACTIVE.set(archive)
+    try:
+        yield archive
+    finally:
+        _ACTIVE.reset(token)
+        archive.close()
+        _maybe_gc(archive.day_dir.parent, keep_days=[run[:10]])
+
+
+_gc_lock = threading.Lock()
+_last_gc: Dict[Path, float] = {}
+
+
+def _maybe_gc(base_dir: Path, keep_days: Iterable[str] = ()):
+    """보관소별로 GC_INTERVAL_SEC에 한 번만 gc_archive 실행 (크롤 배치마다 전체 크기를 세지 않도록)"""
+    with _gc_lock:
+        now = time.monotonic()
+        if base_dir in _last_gc and now - _last_gc[base_dir] < RAW_ARCHIVE_CONFIG["GC_INTERVAL_SEC"]:
+            return
+        _last_gc[base_dir] = now
+    gc_archive(base_dir, keep_days=keep_days)
+
+
+def gc_archive(base_dir: Optional[Path] = None, keep_days: Iterable[str] = (),
+               max_days: Optional[int] = None, max_bytes: Optional[int] = None) -> List[str]:
+    """보관 기간/용량을 넘은 날짜 폴더를 오래된 것부터 삭제하고 삭제한 날짜 반환
+
+    max_days: 오늘 기준 이 일수보다 오래된 날짜 삭제 (기본 KEEP_DAYS, 0이면 제한 없음)
+    max_bytes: 전체 크기가 이를 넘으면 오래된 날짜부터 삭제 (기본 MAX_BYTES, 0이면 제한 없음)
+    keep_days에 포함된 날짜(지금 기록 중인 날 등)는 삭제하지 않음.
+    """
+    root = Path(base_dir or RAW_ARCHIVE_DIR)
+    max_days = RAW_ARCHIVE_CONFIG["KEEP_DAYS"] if max_days is None else max_days
+    max_bytes = RAW_ARCHIVE_CONFIG["MAX_BYTES"] if max_bytes is None else max_bytes
+    keep = set(keep_days)
+    days = archive_days(root)
+    expired = []
+    if max_days:
+        cutoff = (date.today() - timedelta(days=max_days)).isoformat()
+        expired = [d for d in days if d < cutoff and d not in keep]
+    if max_bytes:
+        sizes = {d: sum(p.stat().st_size for p in (root / d).iterdir() if p.is_file()) for d in days}
+        total = sum(size for d, size in sizes.items() if d not in expired)
+        for d in days:
+            if total <= max_bytes:
+                break
+            if d in expired or d in keep:
+                continue
+            expired.append(d)
+            total -= sizes[d]
+    for d in expired:
+        shutil.rmtree(root / d, ignore_errors=True)
+    return sorted(expired)
+
+
+def archive_days(base_dir: Optional[Path] = None) -> List[str]:
+    """응답이 보관된 날짜 목록 (오래된 순)"""
+    root = Path(base_dir or RAW_ARCHIVE_DIR)
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir() and re.fullmatch(r"\d{4}-\d{2}-\d{2}", p.name))
+
+
+def archived_complexes(day: str, base_dir: Optional[Path] = None) -> List[str]:
+    """그날 응답이 보관된 단지번호 목록"""
+    day_dir = Path(base_dir or RAW_ARCHIVE_DIR) / day
+    if not day_dir.exists():
+        return []
+    names = (p.name[:-len(SUFFIX)] for p in day_dir.glob(f"*{SUFFIX}"))
+    return sorted(n for n in names if n != SHARED_PARTITION)
+
+
+def read_partition(day: str, partition: str, base_dir: Optional[Path] = None) -> Tuple[Optional[str], Dict[str, object]]:
+    """파티션 하나의 (마지막 수집 시각, 요청 키 → 응답) - 그날 마지막 수집의 응답만"""
+    path = Path(base_dir or RAW_ARCHIVE_DIR) / day / f"{partition}{SUFFIX}"
+    if not path.exists():
+        return None, {}
+    runs: Dict[str, Dict[str, object]] = {}
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            entry = json.loads(line)
+            runs.setdefault(entry["run"], {})[entry["key"]] = entry["data"]
+    if not runs:
+        return None, {}
+    latest = max(runs)
+    return latest, runs[latest]
+
+
+def _rebuild_batch(day: str, complex_ids: List[str], parts_dir: str, batch_no: int,
+                   base_dir: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """단지 묶음 1개를 보관 응답으로 다시 수집 (프로세스 풀에서 실행) → (조각 폴더들, 다시 만든 단지)
+
+    수집 시각이 같은 단지끼리 main_function을 한 번씩 실행해 산출물 기준 시각을 원래 수집과 맞춤.
+    """
+    from src.naver_apt_v5 import main_function
+
+    _, responses = read_partition(day, SHARED_PARTITION, base_dir)
+    groups: Dict[str, List[str]] = {}
+    for complex_no in complex_ids:
+        run, data = read_partition(day, complex_no, base_dir)
+        if run is None:
+            continue
+        groups.setdefault(run, []).append(complex_no)
+        responses.update(data)
+
+    parts = []
+    for i, (run, ids) in enumerate(sorted(groups.items())):
+        part_dir = Path(parts_dir) / f"{batch_no:05d}-{i}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        with response_source(lambda url: responses.get(response_key(url))), redirect_stdout(io.StringIO()):
+            main_function(ids, paths=RunHandle(part_dir.name, part_dir).paths, updated_date=run)
+        parts.append(str(part_dir))
+    return parts, [c for ids in groups.values() for c in ids]
+
+
+def rebuild(day: Optional[str] = None, out_dir: Optional[Path] = None, complex_ids: Optional[Iterable[str]] = None,
+            workers: Optional[int] = None, batch_size: Optional[int] = None, merge: bool = True,
+            base_dir: Optional[Path] = None, log: Callable[[str], None] = print) -> Dict[str, Path]:
+    """보관 응답으로 그날의 산출물(CSV)을 다시 만들어 out_dir에 저장 (네트워크 요청 없음)
+
+    day: 날짜 "YYYY-MM-DD" (없으면 가장 최근 보관일). out_dir: 기본 REBUILDS_DIR/<day>.
+    complex_ids: 대상 단지 (없으면 그날 보관된 전체). merge: result.csv까지 병합.
+    """
+    from src.crawl import PART_KEYS, concat_parts
+
+    days = archive_days(base_dir)
+    day = day or (days[-1] if days else None)
+    if day is None or day not in days:
+        raise FileNotFoundError(f"보관된 응답이 없습니다: {day or RAW_ARCHIVE_DIR}")
+    archived = archived_complexes(day, base_dir)
+    archived_set = set(archived)
+    targets = archived if complex_ids is None else [c for c in map(str, complex_ids) if c in archived_set]
+    if not targets:
+        raise FileNotFoundError(f"{day}에 보관된 대상 단지가 없습니다.")
+    workers = workers or RAW_ARCHIVE_CONFIG["WORKERS"]
+    batch_size = batch_size or RAW_ARCHIVE_CONFIG["BATCH_SIZE"]
+
+    out = RunHandle(f"rebuild-{day}", Path(out_dir) if out_dir else REBUILDS_DIR / day)
+    out.base_dir.mkdir(parents=True, exist_ok=True)
+    parts_dir = out.base_dir / ".parts"
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    batches = [targets[i:i + batch_size] for i in range(0, len(targets), batch_size)]
+    log(f"{day}: 단지 {len(targets):,}곳, 묶음 {len(batches)}개 (프로세스 {workers}개) → {out.base_dir}")
+
+    started = time.perf_counter()
+    parts, rebuilt = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_rebuild_batch, day, batch, str(parts_dir), n, str(base_dir) if base_dir else None)
+            for n, batch in enumerate(batches)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            batch_parts, batch_ids = future.result()
+            parts += batch_parts
+            rebuilt += batch_ids
+            log(f"묶음 {done}/{len(batches)} 완료 ({time.perf_counter() - started:.1f}s)")
+
+    # 변경 분류표(listing_changes)는 수집 시점의 이력 비교 결과라 다시 만들지 않음
+    concat_parts(sorted(map(Path, parts)), out, keys=[k for k in PART_KEYS if k != "CHANGES"], log=log)
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    if merge and rebuilt:
+        from src.sell_price_merge_v2 import main as merge_main
+        if merge_main(sorted(rebuilt), log=log, paths=out.paths) is None:
+            raise RuntimeError("병합에 실패했습니다.")
+    log(f"다시 만들기 완료: 단지 {len(rebuilt):,}곳, {time.perf_counter() - started:.1f}s")
+    return out.paths
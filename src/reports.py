@@ -0,0 +1,181 @@
+"""분석 결과 요약표 (Streamlit 없이 사용, CLI 보고서 등)"""
+import numpy as np
+import pandas as pd
+
+# 요약표 컬럼 (가격 단위: 만원)
+PYEONG_SUMMARY_COLUMNS = [
+    "complexNo", "complexName", "pyeongName3", "listings", "ask_min", "ask_median",
+    "bubble_median", "real_max_5", "real_med_5", "real_min_5", "ask_vs_max_5_pct",
+    "latest_deal_date", "latest_deal_amount",
+]
+# build_pyeong_summary가 읽는 result.csv 컬럼 (필요한 컬럼만 읽을 때 usecols로 사용)
+SUMMARY_SOURCE_COLUMNS = [
+    "complexNo", "complexName", "tradeTypeName", "pyeongName3", "dealOrWarrantPrc2", "bubble_score",
+    "pyeong_max_5", "pyeong_med_5", "pyeong_min_5", "latestdealDate", "latestdealAmount",
+]
+SUMMARY_PRICE_COLUMNS = ["dealOrWarrantPrc2", "pyeong_max_5", "pyeong_min_5", "latestdealAmount"]
+
+
+def build_pyeong_summary(df_result: pd.DataFrame) -> pd.DataFrame:
+    """병합 결과(result.csv)의 매매 매물을 (단지, 평형)별로 요약
+
+    listings: 매물 수, ask_*: 호가(dealOrWarrantPrc2), bubble_median: 버블 지수 중위값,
+    real_*_5: 최근 5년 실거래 최고/중위/최저, ask_vs_max_5_pct: 호가 중위값의 5년 최고가 대비(%)
+    """
+    df = df_result[df_result["tradeTypeName"] == "매매"]
+    if df.empty:
+        return pd.DataFrame(columns=PYEONG_SUMMARY_COLUMNS)
+    # 가격은 float로 집계 (결측 NaN) - 키/형식은 src/schema.py가 보장
+    df = df.assign(**{c: _numeric(df[c]) for c in SUMMARY_PRICE_COLUMNS})
+    summary = df.groupby(["complexNo", "complexName", "pyeongName3"], sort=False, observed=True).agg(
+        listings=("dealOrWarrantPrc2", "size"),
+        ask_min=("dealOrWarrantPrc2", "min"),
+        ask_median=("dealOrWarrantPrc2", "median"),
+        bubble_median=("bubble_score", "median"),
+        real_max_5=("pyeong_max_5", "first"),
+        real_med_5=("pyeong_med_5", "first"),
+        real_min_5=("pyeong_min_5", "first"),
+        latest_deal_date=("latestdealDate", "first"),
+        latest_deal_amount=("latestdealAmount", "first"),
+    ).reset_index()
+    summary["ask_vs_max_5_pct"] = (summary["ask_median"] / summary["real_max_5"] - 1) * 100
+    summary = summary.replace([np.inf, -np.inf], np.nan)
+    return summary[PYEONG_SUMMARY_COLUMNS].sort_values(["complexName", "pyeongName3"], ignore_index=True)
+
+
+# 단지 요약 컬럼 (가격 단위: 만원, ask_per_pyeong: 공급면적 3.3㎡당 호가 중위값)
+COMPLEX_SUMMARY_COLUMNS = [
+    "complexNo", "complexName", "sale_listings", "ask_min", "ask_median", "ask_max", "ask_per_pyeong",
+    "bubble_score", "latestdealDate", "latestdealAmount", "latestdealFloor",
+]
+SQM_PER_PYEONG = 3.3058
+
+
+def build_complex_summary(df_result: pd.DataFrame, pyeong_summary: pd.DataFrame = None) -> pd.DataFrame:
+    """병합 결과를 단지별 한 행으로 요약 (주변 단지 비교, API 단지 요약에서 사용)
+
+    bubble_score: 평형별 버블 지수 중위값의 평균 (화면의 투자 지표와 같은 정의),
+    latestdeal*: 단지 최근 실거래. pyeong_summary를 넘기면 다시 계산하지 않음.
+    """
+    if pyeong_summary is None:
+        pyeong_summary = build_pyeong_summary(df_result)
+    complexes = df_result.groupby("complexNo", sort=False)[["complexName"]].first()
+    bubble = pyeong_summary.groupby("complexNo")["bubble_median"].mean().rename("bubble_score")
+    sale = df_result[df_result["tradeTypeName"] == "매매"]
+    ask = _numeric(sale["dealOrWarrantPrc2"])
+    sale = sale.assign(ask=ask, ask_per_pyeong=ask / (_numeric(sale["area1"]) / SQM_PER_PYEONG))
+    sale_stats = sale.groupby("complexNo").agg(
+        sale_listings=("ask", "size"),
+        ask_min=("ask", "min"),
+        ask_median=("ask", "median"),
+        ask_max=("ask", "max"),
+        ask_per_pyeong=("ask_per_pyeong", "median"),
+    )
+    latest = df_result.groupby("complexNo")[["latestdealDate", "latestdealAmount", "latestdealFloor"]].first()
+    summary = complexes.join([bubble, sale_stats, latest]).reset_index()
+    return summary.replace([np.inf, -np.inf], np.nan)[COMPLEX_SUMMARY_COLUMNS]
+
+
+# 지역 순위표 컬럼 (가격 단위: 만원, *_pct는 %)
+LEADERBOARD_COLUMNS = [
+    "rank", "complexNo", "complexName", "pyeongName3", "listings", "ask_min", "ask_median",
+    "bubble_median", "real_max_5", "latest_deal_amount", "drawdown_pct", "kb_upper", "kb_gap_pct",
+    "bubble_rank", "drawdown_rank", "kb_rank", "score",
+]
+# 순위 계산 전 (단지, 평형)별 집계 컬럼 (aggregate_leaderboard)
+LEADERBOARD_AGG_COLUMNS = [
+    "complexNo", "complexName", "pyeongName3", "listings", "ask_min", "ask_median", "bubble_median",
+    "real_max_5", "latest_deal_amount", "kb_upper",
+]
+# build_district_leaderboard가 읽는 result.csv 컬럼
+LEADERBOARD_SOURCE_COLUMNS = [
+    "complexNo", "complexName", "tradeTypeName", "pyeongName3", "dealOrWarrantPrc2", "bubble_score",
+    "pyeong_max_5", "latestdealAmount", "dealUpperPriceLimit",
+]
+# 정렬 기준: 모두 낮을수록 (자기 시세 대비) 싸다는 의미
+LEADERBOARD_METRICS = {
+    "score": "score",                # 세 지표 백분위 순위의 평균
+    "bubble": "bubble_median",       # 버블 지수 중위값
+    "drawdown": "drawdown_pct",      # 최근 실거래가의 5년 최고가 대비 하락률
+    "kb": "kb_gap_pct",              # 호가 중위값의 KB 상위평균 대비 괴리
+}
+
+
+def _numeric(series: pd.Series) -> pd.Series:
+    """정수(Int32, 결측 허용) 가격 컬럼을 float로 (결측은 NaN)"""
+    return series.astype("float64")
+
+
+def build_district_leaderboard(df_result: pd.DataFrame, top: int = 20, by: str = "score",
+                               min_listings: int = 1) -> pd.DataFrame:
+    """지역(시/군/구 등) 전체 매매 매물을 (단지, 평형)별로 묶어 자기 시세 대비 싼 순서로 순위 매김
+
+    한 번의 groupby 집계와 rank 연산으로 처리 (단지 쌍을 고르지 않고 지역 전체 비교).
+    drawdown_pct: 최근 실거래가 / 5년 최고가 - 1, kb_gap_pct: 호가 중위값 / KB 상위평균 - 1,
+    score: bubble/drawdown/kb 백분위 순위 평균 (없는 지표는 제외하고 평균).
+    by: LEADERBOARD_METRICS 키, top: 상위 몇 개 (0이면 전체)
+    """
+    if by not in LEADERBOARD_METRICS:
+        raise ValueError(f"정렬 기준은 {list(LEADERBOARD_METRICS)} 중 하나여야 합니다: {by}")
+    return score_leaderboard(aggregate_leaderboard(df_result), by, top, min_listings)
+
+
+def aggregate_leaderboard(df_result: pd.DataFrame) -> pd.DataFrame:
+    """매매 매물의 (단지, 평형)별 집계 (순위 계산 전 - API 서버는 이것만 미리 만들어 둠)"""
+    df = df_result[df_result["tradeTypeName"] == "매매"]
+    if df.empty:
+        return pd.DataFrame(columns=LEADERBOARD_AGG_COLUMNS)
+    df = pd.DataFrame({
+        "complexNo": df["complexNo"],
+        "complexName": df["complexName"],
+        "pyeongName3": df["pyeongName3"],
+        "ask": _numeric(df["dealOrWarrantPrc2"]),
+        "bubble_score": df["bubble_score"],
+        "pyeong_max_5": _numeric(df["pyeong_max_5"]),
+        "latestdealAmount": _numeric(df["latestdealAmount"]),
+        "dealUpperPriceLimit": _numeric(df["dealUpperPriceLimit"]),
+    })
+    return df.groupby(["complexNo", "complexName", "pyeongName3"], sort=False, observed=True).agg(
+        listings=("ask", "size"),
+        ask_min=("ask", "min"),
+        ask_median=("ask", "median"),
+        bubble_median=("bubble_score", "median"),
+        real_max_5=("pyeong_max_5", "first"),
+        latest_deal_amount=("latestdealAmount", "first"),
+        kb_upper=("dealUpperPriceLimit", "first"),
+    ).reset_index()
+
+
+def score_leaderboard(board: pd.DataFrame, by: str = "score", top: int = 20, min_listings: int = 1) -> pd.DataFrame:
+    """aggregate_leaderboard 결과에서 매물 수 조건을 적용한 뒤 지표별 순위/score를 계산해 정렬
+
+    순위와 score는 min_listings로 거른 뒤의 단지-평형만 모집단으로 계산함 (CLI와 API가 같은 결과).
+    """
+    board = board[board["listings"] >= min_listings]
+    if board.empty:
+        return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+    board = board.assign(
+        drawdown_pct=(board["latest_deal_amount"] / board["real_max_5"] - 1) * 100,
+        kb_gap_pct=(board["ask_median"] / board["kb_upper"] - 1) * 100,
+    ).replace([np.inf, -np.inf], np.nan)
+
+    metrics = board[["bubble_median", "drawdown_pct", "kb_gap_pct"]]
+    ranks = metrics.rank(method="min")
+    board["bubble_rank"] = ranks["bubble_median"].astype("Int64")
+    board["drawdown_rank"] = ranks["drawdown_pct"].astype("Int64")
+    board["kb_rank"] = ranks["kb_gap_pct"].astype("Int64")
+    board["score"] = metrics.rank(pct=True).mean(axis=1) * 100
+
+    return rank_leaderboard(board, by, top)
+
+
+def rank_leaderboard(board: pd.DataFrame, by: str = "score", top: int = 20) -> pd.DataFrame:
+    """순위/score가 계산된 순위표를 by 기준으로 정렬하고 rank 부여"""
+    if by not in LEADERBOARD_METRICS:
+        raise ValueError(f"정렬 기준은 {list(LEADERBOARD_METRICS)} 중 하나여야 합니다: {by}")
+    key = LEADERBOARD_METRICS[by]
+    board = board.sort_values([key, "score"], na_position="last", kind="stable", ignore_index=True)
+    board["rank"] = board[key].rank(method="min").astype("Int64")
+    if top:
+        board = board.head(top)
+    return board[LEADERBOARD_COLUMNS]
@@ -0,0 +1,114 @@
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from src.config import DATA_PATHS, RUNS_DIR, RUN_CONFIG
+
+# 실행별로 분리하지 않는 공용 파일 (정적 참조 데이터)
+SHARED_KEYS = ("CORTAR", "CATALOG")
+STAGING_PREFIX = ".staging-"
+
+
+class RunHandle:
+    """분석 실행 1건의 데이터 네임스페이스
+
+    runs/<run_id>/ 아래에 DATA_PATHS와 같은 파일명으로 산출물을 저장함.
+    게시(publish)된 실행 폴더는 이후 수정되지 않으므로 경로만으로 캐시 키를 만들 수 있음.
+    """
+
+    def __init__(self, run_id: str, base_dir: Optional[Path] = None):
+        self.run_id = run_id
+        self.base_dir = Path(base_dir) if base_dir is not None else RUNS_DIR / run_id
+
+    def path(self, key: str) -> Path:
+        """데이터 키(DATA_PATHS 키)에 해당하는 이 실행의 파일 경로"""
+        if key in SHARED_KEYS:
+            return DATA_PATHS[key]
+        return self.base_dir / DATA_PATHS[key].name
+
+    @property
+    def paths(self) -> Dict[str, Path]:
+        """DATA_PATHS와 같은 형태의 경로 딕셔너리 (수집/병합 함수에 그대로 전달)"""
+        return {key: self.path(key) for key in DATA_PATHS}
+
+    @property
+    def is_staging(self) -> bool:
+        return self.base_dir.name.startswith(STAGING_PREFIX)
+
+    def exists(self) -> bool:
+        return self.base_dir.is_dir()
+
+    def __repr__(self):
+        return f"RunHandle({self.run_id!r}, {str(self.base_dir)!r})"
+
+
+def open_staging(run_id: str) -> RunHandle:
+    """쓰기용 임시 폴더 생성 (게시 전까지 다른 세션에서 보이지 않음)"""
+    staging_dir = RUNS_DIR / f"{STAGING_PREFIX}{run_id}"
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+    return RunHandle(run_id, staging_dir)
+
+
+def publish_run(staging: RunHandle) -> RunHandle:
+    """임시 폴더를 최종 위치로 원자적으로 이동 (os.replace는 같은 파일시스템에서 원자적)"""
+    final = RunHandle(staging.run_id)
+    os.replace(staging.base_dir, final.base_dir)
+    return final
+
+
+def discard_run(handle: RunHandle):
+    """실패/취소된 실행의 폴더 삭제"""
+    shutil.rmtree(handle.base_dir, ignore_errors=True)
+
+
+def get_run(run_id: Optional[str]) -> Optional[RunHandle]:
+    """게시된 실행 핸들 반환 (없거나 정리된 경우 None)"""
+    # URL 파라미터로 들어온 값이므로 폴더 이름 형태만 허용 (상위 경로/임시 폴더 접근 차단)
+    if not run_id or run_id.startswith(".") or Path(run_id).name != run_id:
+        return None
+    handle = RunHandle(run_id)
+    return handle if handle.exists() else None
+
+
+def list_runs() -> List[RunHandle]:
+    """게시된 실행 목록 (최근 순)"""
+    if not RUNS_DIR.exists():
+        return []
+    runs = [
+        RunHandle(p.name) for p in RUNS_DIR.iterdir()
+        if p.is_dir() and not p.name.startswith(STAGING_PREFIX)
+    ]
+    return sorted(runs, key=lambda r: r.base_dir.stat().st_mtime, reverse=True)
+
+
+def gc_runs(keep_ids: Iterable[str] = ()) -> int:
+    """오래된 실행 폴더 정리
+
+    - 게시된 실행: TTL_SEC가 지났거나 MAX_RUNS개를 넘는 오래된 것부터 삭제
+    - 임시 폴더: STAGING_TTL_SEC가 지난 것 삭제 (비정상 종료로 남은 것)
+    keep_ids에 포함된 실행(진행 중/참조 중)은 삭제하지 않음. 삭제한 폴더 수 반환.
+    """
+    if not RUNS_DIR.exists():
+        return 0
+    keep = set(keep_ids)
+    now = time.time()
+    removed = 0
+
+    for i, run in enumerate(list_runs()):
+        if run.run_id in keep:
+            continue
+        age = now - run.base_dir.stat().st_mtime
+        if age > RUN_CONFIG["TTL_SEC"] or i >= RUN_CONFIG["MAX_RUNS"]:
+            discard_run(run)
+            removed += 1
+
+    for p in RUNS_DIR.iterdir():
+        if not p.name.startswith(STAGING_PREFIX) or p.name[len(STAGING_PREFIX):] in keep:
+            continue
+        if now - p.stat().st_mtime > RUN_CONFIG["STAGING_TTL_SEC"]:
+            shutil.rmtree(p, ignore_errors=True)
+            removed += 1
+    return removed
@@ -0,0 +1,262 @@
+"""데이터셋 컬럼 형식 등록부 - 수집/병합 CSV를 읽고 쓸 때 한 곳에서 형식을 정함
+
+수집기가 쓰는 CSV(complex/pyeong/sell/price/provider/dong)와 병합 결과(result), 그 밖의 저장 파일
+(매물 변경표 changes, 단지 목록 catalog, 법정동 코드 표 region, 누적 평형 목록 unit)의 컬럼별 형식을
+SCHEMAS에 모아 두고, 읽기(read_dataset)·메모리 상 변환(coerce)·쓰기(write_dataset)가 모두 이를 따름.
+
+    str       조인/필터 키 (complexNo, cortarNo, 평형명) - 앞자리 0과 '34' 같은 표기를 그대로 유지
+    category  단지명, 거래 유형, 방향, 중개사 등 반복되는 문자열 (원본 API 표기 그대로 보관)
+    Int32     가격(만원)·층·건수 등 정수 (결측 허용)
+    Int64     int32 범위를 넘는 정수 (articleNo)
+    float64   좌표, 면적, 비율, 평균/중위값
+    datetime  날짜 ('YYYY-MM-DD', 'YYYYMMDD', 'YYYYMM' 등 → datetime64, 쓸 때는 다시 'YYYY-MM-DD')
+
+등록되지 않은 컬럼은 pandas 추론 형식 그대로 둠. 읽은 뒤 소비자 쪽에서 astype(str)/to_numeric을
+반복하지 않도록, 키는 항상 문자열, 가격은 항상 정수로 들어온다는 것을 이 모듈이 보장함.
+"""
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+STR, CATEGORY, INT, BIGINT, FLOAT, DATE = "str", "category", "Int32", "Int64", "float64", "datetime"
+
+
+def _same(columns: Iterable[str], kind: str) -> Dict[str, str]:
+    return {c: kind for c in columns}
+
+
+RATE_COLUMNS = ["매매매물출현율", "전세매물출현율", "월세매물출현율"]
+LEASE_HOUSEHOLD_COLUMNS = [
+    "totalLeaseHouseholdCount", "permanentLeaseHouseholdCount", "nationLeaseHouseholdCount",
+    "civilLeaseHouseholdCount", "publicLeaseHouseholdCount", "longTermLeaseHouseholdCount",
+    "etcLeaseHouseholdCount",
+]
+COUNT_COLUMNS = ["dealCount", "leaseCount", "rentCount", "shortTermRentCount"]
+
+# 여러 데이터셋에 공통으로 나오는 키/이름
+_KEYS = {
+    **_same(["complexNo", "cortarNo", "pyeongNo", "pyeongName", "pyeongName2", "pyeongName3", "areaName"], STR),
+    "complexName": CATEGORY,
+    "downloadDate": DATE,
+}
+
+# complex_data.csv (naver_apt_v5.COMPLEX_HEADER)
+_COMPLEX = {
+    **_same(["realEstateTypeCode", "realEstateTypeName", "detailAddress", "roadAddress", "isBookmarked",
+             "constructionCompanyName", "heatMethodTypeCode", "heatFuelTypeCode", "pyoengNames", "address",
+             "roadAddressPrefix", "schoolName"] + RATE_COLUMNS, CATEGORY),
+    "roadZipCode": STR,
+    **_same(["latitude", "longitude", "maxSupplyArea", "minSupplyArea", "batlRatio", "btlRatio",
+             "parkingCountByHousehold", "studentCountPerTeacher", "studentCountPerClassroom",
+             "averageStudentCountPerClassroomOnCity", "averageStudentCountPerTeacherOnCity",
+             "averageStudentCountPerClassroomOnDivision", "averageStudentCountPerTeacherOnDivision"], FLOAT),
+    **_same(["totalHouseholdCount", "highFloor", "lowFloor", "totalDongCount", "parkingPossibleCount",
+             "walkTime", "maleStudentCount", "femaleStudentCount", "totalStudentCount"]
+            + LEASE_HOUSEHOLD_COLUMNS + COUNT_COLUMNS, INT),
+    **_same(["useApproveYmd", "studentStatisticsBaseYmd"], DATE),
+}
+
+# 평형 통계 (pyeong_data.csv, sell_data에 붙는 SELL_PYEONG_FIELDS)
+# 만원 단위로 변환한 *2 컬럼만 정수이고, 그 밖의 가격 필드는 API 표기('13억 5,000' 등) 그대로 보관
+_PYEONG_STATS = {
+    **_same(["householdCountByPyeong", "roomCnt", "bathroomCnt", "dealPriceMin2", "dealPriceMax2",
+             "rentDepositPriceMin2", "rentPriceMin2", "rentDepositPriceMax2", "rentPriceMax2"]
+            + COUNT_COLUMNS, INT),
+    **_same(["averageTotalPrice", "dealPriceMin", "dealPriceMax", "dealPricePerSpaceMin", "dealPricePerSpaceMax",
+             "dealPriceString", "dealPricePerSpaceString", "leasePriceString", "leasePricePerSpaceString",
+             "leasePriceRateString", "rentPriceString", "rentDepositPriceMin", "rentPriceMin",
+             "rentDepositPriceMax", "rentPriceMax"] + RATE_COLUMNS, CATEGORY),
+}
+
+_PYEONG = {
+    **_PYEONG_STATS,
+    **_same(["supplyArea", "supplyPyeong", "exclusiveArea", "exclusivePyeong", "exclusiveRate"], FLOAT),
+    "realEstateTypeCode": CATEGORY,
+}
+
+# KB 시세 (provider_data.csv, sell_data에 붙는 SELL_PROVIDER_FIELDS)
+_PROVIDER = {
+    "provider": CATEGORY,
+    "baseYearMonthDay": DATE,
+    **_same(["dealUpperPriceLimit", "dealAveragePrice", "dealLowPriceLimit", "dealAveragePriceChangeAmount",
+             "leaseUpperPriceLimit", "leaseAveragePrice", "leaseLowPriceLimit", "leaseAveragePriceChangeAmount",
+             "rentLowPrice", "deposit", "rentUpperPrice", "upperPriceLimit", "averagePriceLimit",
+             "lowPriceLimit", "priceChangeAmount"], INT),
+    "leasePerDealRate": CATEGORY,
+}
+
+# 매물 목록 API 필드 (sell_data.csv)
+_ARTICLE = {
+    "articleNo": BIGINT,
+    **_same(["articleName", "articleStatus", "realEstateTypeCode", "realEstateTypeName",
+             "articleRealEstateTypeCode", "articleRealEstateTypeName", "tradeTypeCode", "tradeTypeName",
+             "verificationTypeCode", "floorInfo", "floorType", "priceChangeState", "isPriceModification",
+             "dealOrWarrantPrc", "direction", "articleFeatureDesc", "tagList", "buildingName",
+             "sameAddrMaxPrc", "sameAddrMinPrc", "cpid", "cpName", "cpPcArticleUrl", "realtorName"], CATEGORY),
+    **_same(["rentPrc", "sameAddrCnt", "sameAddrDirectCnt", "siteImageCount", "매물등록경과일"], INT),
+    **_same(["area1", "area2", "latitude", "longitude"], FLOAT),
+    "articleConfirmYmd": DATE,
+}
+
+# sell_price_merge_v2.py가 단지 정보에서 매물에 붙이는 컬럼
+COMPLEX_MERGE_COLUMNS = [
+    "totalHouseholdCount", "totalLeaseHouseholdCount", "permanentLeaseHouseholdCount",
+    "nationLeaseHouseholdCount", "civilLeaseHouseholdCount", "publicLeaseHouseholdCount",
+    "longTermLeaseHouseholdCount", "etcLeaseHouseholdCount", "highFloor", "lowFloor",
+    "useApproveYmd", "totalDongCount", "maxSupplyArea", "minSupplyArea", "dealCount",
+    "rentCount", "leaseCount", "shortTermRentCount", "batlRatio", "btlRatio",
+    "parkingPossibleCount", "parkingCountByHousehold", "constructionCompanyName",
+    "pyoengNames", "매매매물출현율", "전세매물출현율", "월세매물출현율", "schoolName", "walkTime"
+]
+
+
+def _derived_columns() -> Dict[str, str]:
+    """sell_price_merge_v2.py가 만드는 파생 컬럼"""
+    out = {"buildingName2": INT, "dealOrWarrantPrc2": INT}
+    for label in (5, 3, 1):
+        for stat in ("max", "min"):
+            out[f"pyeong_{stat}_{label}"] = INT
+            out[f"pyeong_{stat}_{label}_DT"] = DATE
+            out[f"pyeongtype_{stat}_{label}"] = INT
+        out.update({f"pyeong_avg_{label}": FLOAT, f"pyeong_med_{label}": FLOAT, f"pyeongtype_avg_{label}": FLOAT})
+    out.update({
+        "latestdealDate": DATE, "latestdealAmount": INT, "latestdealFloor": INT,
+        "real_price_median": FLOAT, "bubble_score": FLOAT,
+        **_same(["real_max_5_gap", "real_min_5_gap", "kb_upper_gap", "deal_min_gap"], CATEGORY),
+    })
+    return out
+
+
+def _result_columns(sell: Dict[str, str], complex_: Dict[str, str]) -> Dict[str, str]:
+    """매물 컬럼 + 단지 정보 병합 컬럼 (겹치는 컬럼은 pandas merge와 같이 _x/_y) + 파생 컬럼"""
+    mapped = {c: complex_[c] for c in COMPLEX_MERGE_COLUMNS}
+    out = {}
+    for column, kind in sell.items():
+        if column in mapped:
+            out[f"{column}_x"] = kind
+        out[column] = kind
+    for column, kind in mapped.items():
+        if column in sell:
+            out[f"{column}_y"] = kind
+        else:
+            out[column] = kind
+    return {**out, **_derived_columns()}
+
+
+_SELL = {**_KEYS, **_ARTICLE, **_PYEONG_STATS, **_PROVIDER}
+_COMPLEX_ALL = {**_KEYS, **_COMPLEX}
+
+# 데이터셋 이름 → {컬럼: 형식}
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "complex": _COMPLEX_ALL,
+    "pyeong": {**_KEYS, **_PYEONG},
+    "sell": _SELL,
+    "price": {
+        **_KEYS,
+        "tradeType": CATEGORY, "price": CATEGORY,
+        **_same(["year", "floor", "dealAmount", "dealDateClass"], INT),
+        **_same(["date", "dealDate"], DATE),
+    },
+    "provider": {**_KEYS, **_PROVIDER},
+    "dong": {**_KEYS, "dongNo": STR, "dongNm": CATEGORY, "max_floor": INT},
+    # 유사 평형 찾기용 누적 평형 목록 (src/similarity.py, useApproveYmd는 소수 연도)
+    "unit": {
+        **_KEYS,
+        **_same(["totalHouseholdCount", "highFloor", "walkTime", "roomCnt"], INT),
+        **_same(["useApproveYmd", "batlRatio", "btlRatio", "parkingCountByHousehold", "exclusiveArea"], FLOAT),
+    },
+    "result": {**_KEYS, **_result_columns(_SELL, _COMPLEX_ALL)},
+    # 직전 수집 대비 매물 변경표 (listing_changes.csv, src/listing_history.CHANGE_COLUMNS - 등록일은 YYYYMMDD 정수로 저장)
+    "changes": {
+        **_KEYS,
+        "articleNo": BIGINT,
+        # 변경된 매물만 담긴 작은 표이고 화면에서 결측을 빈 칸으로 채우므로 이름도 문자열
+        **_same(["change", "tradeTypeName", "floorInfo", "buildingName"], STR),
+        **_same(["price", "prev_price", "price_diff"], INT),
+        **_same(["confirm_ymd", "prev_confirm_ymd"], DATE),
+    },
+    # 법정동별 단지 목록 (src/catalog.py) - 행이 단지 목록 API 응답으로 그대로 재사용되므로 사용승인일은 원본 표기 유지
+    "catalog": {
+        **_KEYS,
+        "realEstateTypeCode": CATEGORY,
+        "useApproveYmd": STR,
+        **_same(["latitude", "longitude"], FLOAT),
+        **_same(["totalHouseholdCount", "totalBuildingCount", "highFloor", "lowFloor"] + COUNT_COLUMNS, INT),
+    },
+    # 법정동 코드 표 (cortarNo.csv) - 지역 이름은 선택/검색 조건이라 문자열
+    "region": _same(["cortarNo", "시/도", "시/군/구", "읍/면/동"], STR),
+}
+
+
+def _to_datetime(s: pd.Series) -> pd.Series:
+    """'YYYY-MM-DD[ HH:MM:SS]', 'YYYYMMDD', 'YYYYMM'(1일로 간주) 표기를 datetime64로 (해석 불가는 NaT)
+
+    날짜 컬럼은 행 수에 비해 값 종류가 적으므로 고유값만 해석한 뒤 코드로 펼침.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    parsed = pd.to_datetime(text, format="ISO8601", errors="coerce")
+    digits = text.str.replace(r"\D", "", regex=True)
+    retry = parsed.isna() & digits.str.len().isin([6, 8])
+    if retry.any():
+        ymd = digits[retry].where(digits[retry].str.len() == 8, digits[retry] + "01")
+        parsed[retry] = pd.to_datetime(ymd, format="%Y%m%d", errors="coerce")
+    values = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))  # 마지막 = 결측 (코드 -1)
+    return pd.Series(values[codes], index=s.index, name=s.name)
+
+
+def _convert(s: pd.Series, kind: str) -> pd.Series:
+    if kind == STR:
+        if s.dtype == object:
+            return s
+        return s.astype(object).where(s.isna(), s.astype(str))
+    if kind == CATEGORY:
+        if not isinstance(s.dtype, pd.CategoricalDtype):
+            return s.astype("category")
+        # read_csv가 청크별로 만든 범주는 순서가 섞여 있음 - 정렬해 두어야 sort_values가 문자열 순서와 같음
+        categories = s.cat.categories
+        return s if categories.is_monotonic_increasing else s.cat.reorder_categories(categories.sort_values())
+    if kind == DATE:
+        return s if pd.api.types.is_datetime64_dtype(s) else _to_datetime(s)
+    if not pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+        s = pd.to_numeric(s.astype(object).where(s.notna()).astype(str).str.replace(",", ""), errors="coerce")
+    if kind == FLOAT:
+        return s.astype(FLOAT)
+    if pd.api.types.is_float_dtype(s):
+        s = s.round()
+    return s.astype(kind)
+
+
+def coerce(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """메모리 상 DataFrame을 SCHEMAS[dataset] 형식으로 변환 (이미 맞는 컬럼은 그대로, 등록 안 된 컬럼 유지)"""
+    schema = SCHEMAS[dataset]
+    converted = {c: _convert(df[c], schema[c]) for c in df.columns if c in schema}
+    return df.assign(**converted) if converted else df
+
+
+def read_dataset(path, dataset: str, columns: Optional[Iterable[str]] = None, **kwargs) -> pd.DataFrame:
+    """CSV를 SCHEMAS[dataset] 형식으로 읽기
+
+    columns: 읽을 컬럼 (없는 컬럼은 무시, 없으면 전체). 그 밖의 인자는 pd.read_csv로 전달.
+    키는 문자열, 날짜는 범주로 읽은 뒤 변환하므로 '20240101' 같은 값이 정수로 추론되지 않음.
+    """
+    schema = SCHEMAS[dataset]
+    dtype = {c: (str if kind == STR else "category")
+             for c, kind in schema.items() if kind in (STR, CATEGORY, DATE)}
+    if columns is not None:
+        wanted = set(columns)
+        kwargs["usecols"] = lambda c: c in wanted
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=dtype, **kwargs)
+    return coerce(df, dataset)
+
+
+def write_dataset(df: pd.DataFrame, path, dataset: str) -> None:
+    """SCHEMAS[dataset] 형식으로 맞춘 뒤 CSV 저장 (정수는 '.0' 없이, 시각이 없는 날짜는 'YYYY-MM-DD')"""
+    coerce(df, dataset).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def format_dates(df: pd.DataFrame, fmt: str = "%Y-%m-%d") -> pd.DataFrame:
+    """datetime 컬럼을 fmt 문자열로 바꾼 사본 (JSON/표 출력용, NaT는 NaN)"""
+    converted = {c: df[c].dt.strftime(fmt).astype(object).where(df[c].notna())
+                 for c in df.columns if pd.api.types.is_datetime64_dtype(df[c])}
+    return df.assign(**converted) if converted else df
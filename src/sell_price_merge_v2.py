@@ -1,43 +1,58 @@
 import pandas as pd
 import numpy as np
 import re
-import streamlit as st
 from src.config import DATA_PATHS
-
-# 파일 경로 설정
-sell_data_path = DATA_PATHS["SELL"]
-real_price_path = DATA_PATHS["REAL_PRICE"]
-complex_data_path = DATA_PATHS["COMPLEX"]
-output_path = DATA_PATHS["RESULT"]
-
-def main(complex_ids=None):
-    """선택된 아파트 단지들의 매물과 실거래가 데이터를 병합하여 통계 계산"""
+from src.instrumentation import PhaseTimer
+from src.memory_profile import record_frames
+from src.formatters import parse_eokwan_series
+from src.schema import COMPLEX_MERGE_COLUMNS, read_dataset, write_dataset
+
+def main(complex_ids=None, log=None, paths=None):
+    """선택된 아파트 단지들의 매물과 실거래가 데이터를 병합하여 통계 계산
+
+    log: 진행 메시지 출력 함수 (기본값 print, 백그라운드 작업에서는 작업 로그로 대체)
+    paths: 입력/결과 경로 딕셔너리 (RunHandle.paths). 없으면 공용 DATA_PATHS 사용.
+    반환값: 성공 시 결과 파일 경로, 실패 시 None
+    """
     if complex_ids is None:
         complex_ids = []
-
+    if log is None:
+        log = print
+    if paths is None:
+        paths = DATA_PATHS
+
+    # 파일 경로 설정
+    sell_data_path = paths["SELL"]
+    real_price_path = paths["REAL_PRICE"]
+    complex_data_path = paths["COMPLEX"]
+    output_path = paths["RESULT"]
+
+    # 단계별 소요 시간 계측 (merge.<단계>)
+    phases = PhaseTimer("merge")
     try:
         # ========================
         # 2. 데이터 로드
         # ========================
-        st.write("Loading sell_data.csv...")
-        df_sell = pd.read_csv(sell_data_path, encoding='utf-8')
+        phases.start("load")
+        log("Loading sell_data.csv...")
+        df_sell = read_dataset(sell_data_path, "sell")
         
-        st.write("Loading price_data.csv...")
-        df_real = pd.read_csv(real_price_path, encoding='utf-8')
+        log("Loading price_data.csv...")
+        df_real = read_dataset(real_price_path, "price")
         
-        # 선택된 단지만 필터링
+        # 선택된 단지만 필터링 (complexNo는 src/schema.py가 문자열로 읽음)
         if complex_ids:
-            df_sell['complexNo'] = df_sell['complexNo'].astype(str)
-            df_real['complexNo'] = df_real['complexNo'].astype(str)
             df_sell = df_sell[df_sell['complexNo'].isin(complex_ids)]
             df_real = df_real[df_real['complexNo'].isin(complex_ids)]
             if df_sell.empty or df_real.empty:
-                st.write("선택된 단지의 데이터가 없습니다.")
-                return
+                log("선택된 단지의 데이터가 없습니다.")
+                return None
 
         # ------------------------
         # 2-1. 문자열 전처리 및 파생변수 생성
         # ------------------------
+        record_frames(df_sell=df_sell, df_real=df_real)
+        phases.start("preprocess", sell_rows=len(df_sell), real_rows=len(df_real))
         def extract_pyeong(pyeong):
             if isinstance(pyeong, str):
                 num_str = re.sub(r'[A-Za-z]+$', '', pyeong)
@@ -46,55 +61,26 @@ def main(complex_ids=None):
 
         df_sell['pyeongName3'] = df_sell['pyeongName'].apply(extract_pyeong)
         
-        # df_real의 pyeongName3을 문자열로 강제 변환
-        df_real['pyeongName3'] = df_real['pyeongName3'].astype(str)
-        
-        def extract_building_number(bname):
-            if isinstance(bname, str):
-                bname = bname.strip()
-                num_str = bname[:-1] if bname.endswith("동") else bname
-                try:
-                    return int(num_str)
-                except Exception:
-                    return np.nan
-            return bname
-
-        df_sell['buildingName2'] = df_sell['buildingName'].apply(extract_building_number)
+        # buildingName은 범주형(src/schema.py) - '101동' → 101, 숫자가 아니면 NaN
+        df_sell['buildingName2'] = pd.to_numeric(
+            df_sell['buildingName'].str.strip().str.removesuffix('동').str.strip(), errors='coerce'
+        )
         
         # 문자열 컬럼 공백 제거
-        df_sell['pyeongName'] = df_sell['pyeongName'].astype(str).str.strip()
-        df_real['pyeongName2'] = df_real['pyeongName2'].astype(str).str.strip()
+        df_sell['pyeongName'] = df_sell['pyeongName'].str.strip()
+        df_real['pyeongName2'] = df_real['pyeongName2'].str.strip()
 
         # ------------------------
         # 2-2. 기타 형변환: 가격 문자열 변환
         # ------------------------
-        def convert_deal_price(price_str):
-            if not isinstance(price_str, str):
-                return np.nan
-            price_str = price_str.strip()
-            try:
-                if '억' in price_str:
-                    parts = price_str.split('억')
-                    billion_part = int(parts[0].strip()) * 10000
-                    if len(parts) > 1 and parts[1].strip():
-                        thousand_part = int(parts[1].strip())
-                        return billion_part + thousand_part
-                    return billion_part
-                else:
-                    return int(price_str.replace(',', ''))
-            except (ValueError, IndexError):
-                return np.nan
-
-        df_sell['dealOrWarrantPrc2'] = df_sell['dealOrWarrantPrc'].apply(convert_deal_price)
+        # '13억 4050' → 134050 (범주별로 한 번만 변환)
+        df_sell['dealOrWarrantPrc2'] = parse_eokwan_series(df_sell['dealOrWarrantPrc'])
 
         # ========================
         # 3. 미리 계산할 열 생성 (실거래 데이터)
         # ========================
-        df_real['dealAmount_numeric'] = pd.to_numeric(
-            df_real['dealAmount'].astype(str).str.replace(',', ''),
-            errors='coerce'
-        )
-        df_real['dealDateClass_numeric'] = pd.to_numeric(df_real['dealDateClass'], errors='coerce')
+        # dealAmount/dealDateClass는 Int32로 읽힘 - 통계는 float로 계산
+        df_real['dealAmount_numeric'] = df_real['dealAmount'].astype('float64')
 
         # ========================
         # 4. 통계 계산에 사용할 allowed 리스트 설정
@@ -106,87 +92,63 @@ def main(complex_ids=None):
         # ========================
         # 5. 통계 계산 함수 정의 및 계산
         # ========================
-        def filter_by_dealDateClass(matched, allowed):
-            return matched[matched['dealDateClass_numeric'].isin(allowed)]
-
-        def compute_stats_pyeong(row, allowed, label):
-            comp_no = row['complexNo']
-            pyeong_val = row['pyeongName3']
-            matched = df_real[(df_real['complexNo'] == comp_no) & (df_real['pyeongName3'] == pyeong_val)]
-            filtered = filter_by_dealDateClass(matched, allowed)
-            if filtered.empty:
-                return pd.Series({
-                    f'pyeong_max_{label}': np.nan, f'pyeong_max_{label}_DT': np.nan,
-                    f'pyeong_avg_{label}': np.nan, f'pyeong_med_{label}': np.nan,
-                    f'pyeong_min_{label}': np.nan, f'pyeong_min_{label}_DT': np.nan
-                })
-            max_idx = filtered['dealAmount_numeric'].idxmax()
-            max_price = filtered.loc[max_idx, 'dealAmount_numeric']
-            max_date = filtered.loc[max_idx, 'dealDate'] if pd.notnull(max_price) else np.nan
-
-            min_idx = filtered['dealAmount_numeric'].idxmin()
-            min_price = filtered.loc[min_idx, 'dealAmount_numeric']
-            min_date = filtered.loc[min_idx, 'dealDate'] if pd.notnull(min_price) else np.nan
-
-            return pd.Series({
-                f'pyeong_max_{label}': max_price, f'pyeong_max_{label}_DT': max_date,
-                f'pyeong_avg_{label}': filtered['dealAmount_numeric'].mean(),
-                f'pyeong_med_{label}': filtered['dealAmount_numeric'].median(),
-                f'pyeong_min_{label}': min_price, f'pyeong_min_{label}_DT': min_date
-            })
-
-        def compute_stats_pyeongtype(row, allowed, label):
-            comp_no = row['complexNo']
-            pyeong_val = row['pyeongName']
-            matched = df_real[(df_real['complexNo'] == comp_no) & (df_real['pyeongName2'] == pyeong_val)]
-            filtered = filter_by_dealDateClass(matched, allowed)
-            if filtered.empty:
-                return pd.Series({f'pyeongtype_max_{label}': np.nan, f'pyeongtype_avg_{label}': np.nan, f'pyeongtype_min_{label}': np.nan})
-            return pd.Series({
-                f'pyeongtype_max_{label}': filtered['dealAmount_numeric'].max(),
-                f'pyeongtype_avg_{label}': filtered['dealAmount_numeric'].mean(),
-                f'pyeongtype_min_{label}': filtered['dealAmount_numeric'].min()
-            })
-
-        st.write("Calculating statistics for df_sell...")
-        stats_pyeong_5 = df_sell.apply(lambda row: compute_stats_pyeong(row, allowed_5, 5), axis=1)
-        stats_pyeong_3 = df_sell.apply(lambda row: compute_stats_pyeong(row, allowed_3, 3), axis=1)
-        stats_pyeong_1 = df_sell.apply(lambda row: compute_stats_pyeong(row, allowed_1, 1), axis=1)
-
-        stats_pyeongtype_5 = df_sell.apply(lambda row: compute_stats_pyeongtype(row, allowed_5, 5), axis=1)
-        stats_pyeongtype_3 = df_sell.apply(lambda row: compute_stats_pyeongtype(row, allowed_3, 3), axis=1)
-        stats_pyeongtype_1 = df_sell.apply(lambda row: compute_stats_pyeongtype(row, allowed_1, 1), axis=1)
-
-        df_sell = pd.concat([
-            df_sell, 
-            stats_pyeong_5, stats_pyeong_3, stats_pyeong_1,
-            stats_pyeongtype_5, stats_pyeongtype_3, stats_pyeongtype_1
-        ], axis=1)
+        def period_stats(keys, allowed):
+            """허용 기간(dealDateClass)의 실거래를 keys별로 한 번에 집계"""
+            filtered = df_real[
+                df_real['dealDateClass'].isin(allowed) & df_real['dealAmount_numeric'].notna()
+            ]
+            grouped = filtered.groupby(keys)['dealAmount_numeric']
+            stats = grouped.agg(['max', 'mean', 'median', 'min'])
+            # 최고/최저가 거래일 (동일 가격이면 먼저 나온 거래)
+            stats['max_DT'] = filtered.loc[grouped.idxmax(), 'dealDate'].to_numpy()
+            stats['min_DT'] = filtered.loc[grouped.idxmin(), 'dealDate'].to_numpy()
+            return stats.reset_index()
+
+        def compute_stats_pyeong(allowed, label):
+            stats = period_stats(['complexNo', 'pyeongName3'], allowed)
+            return stats.rename(columns={
+                'max': f'pyeong_max_{label}', 'max_DT': f'pyeong_max_{label}_DT',
+                'mean': f'pyeong_avg_{label}', 'median': f'pyeong_med_{label}',
+                'min': f'pyeong_min_{label}', 'min_DT': f'pyeong_min_{label}_DT'
+            })[['complexNo', 'pyeongName3',
+                f'pyeong_max_{label}', f'pyeong_max_{label}_DT', f'pyeong_avg_{label}',
+                f'pyeong_med_{label}', f'pyeong_min_{label}', f'pyeong_min_{label}_DT']]
+
+        def compute_stats_pyeongtype(allowed, label):
+            # 매물의 pyeongName은 실거래의 pyeongName2(고유 평형값)와 대응
+            stats = period_stats(['complexNo', 'pyeongName2'], allowed)
+            stats[['max', 'mean', 'min']] = stats[['max', 'mean', 'min']].astype(float)
+            return stats.rename(columns={
+                'pyeongName2': 'pyeongName',
+                'max': f'pyeongtype_max_{label}', 'mean': f'pyeongtype_avg_{label}', 'min': f'pyeongtype_min_{label}'
+            })[['complexNo', 'pyeongName',
+                f'pyeongtype_max_{label}', f'pyeongtype_avg_{label}', f'pyeongtype_min_{label}']]
+
+        # 단지-평형별 통계를 먼저 집계한 뒤 매물에 병합 (매물 행마다 실거래 전체를 필터링하지 않음)
+        log("Calculating statistics for df_sell...")
+        phases.start("period_stats")
+        for allowed, label in [(allowed_5, 5), (allowed_3, 3), (allowed_1, 1)]:
+            df_sell = df_sell.merge(compute_stats_pyeong(allowed, label), on=['complexNo', 'pyeongName3'], how='left')
+        for allowed, label in [(allowed_5, 5), (allowed_3, 3), (allowed_1, 1)]:
+            df_sell = df_sell.merge(compute_stats_pyeongtype(allowed, label), on=['complexNo', 'pyeongName'], how='left')
 
         # ========================
         # 7. complex_data.csv 병합
         # ========================
-        st.write("Merging with complex_data.csv...")
-        df_complex = pd.read_csv(complex_data_path, encoding='utf-8')
-        df_complex['complexNo'] = df_complex['complexNo'].astype(str)
-        columns_to_map = [
-            "totalHouseholdCount", "totalLeaseHouseholdCount", "permanentLeaseHouseholdCount",
-            "nationLeaseHouseholdCount", "civilLeaseHouseholdCount", "publicLeaseHouseholdCount",
-            "longTermLeaseHouseholdCount", "etcLeaseHouseholdCount", "highFloor", "lowFloor",
-            "useApproveYmd", "totalDongCount", "maxSupplyArea", "minSupplyArea", "dealCount",
-            "rentCount", "leaseCount", "shortTermRentCount", "batlRatio", "btlRatio",
-            "parkingPossibleCount", "parkingCountByHousehold", "constructionCompanyName",
-            "pyoengNames", "매매매물출현율", "전세매물출현율", "월세매물출현율", "schoolName", "walkTime"
-        ]
+        record_frames(df_sell=df_sell)
+        log("Merging with complex_data.csv...")
+        phases.start("complex_merge")
+        columns_to_map = COMPLEX_MERGE_COLUMNS
+        df_complex = read_dataset(complex_data_path, "complex", columns=['complexNo'] + columns_to_map)
         df_sell = pd.merge(df_sell, df_complex[['complexNo'] + columns_to_map],
                           on='complexNo', how='left')
 
         # ========================
         # 8. 최신 거래 데이터 매핑
         # ========================
-        st.write("Mapping latest deal data...")
-        df_real['dealDate_dt'] = pd.to_datetime(df_real['dealDate'], errors='coerce')
-        latest_idx = df_real.groupby(['complexNo', 'pyeongName3'])['dealDate_dt'].idxmax()
+        log("Mapping latest deal data...")
+        phases.start("latest_deal")
+        latest_idx = df_real.groupby(['complexNo', 'pyeongName3'])['dealDate'].idxmax()
         df_latest = df_real.loc[latest_idx, ['complexNo', 'pyeongName3', 'dealDate', 'dealAmount', 'floor']].rename(
             columns={'dealDate': 'latestdealDate', 'dealAmount': 'latestdealAmount', 'floor': 'latestdealFloor'}
         )
@@ -195,7 +157,8 @@ def main(complex_ids=None):
         # ========================
         # 9. 매물 중위값 계산 및 bubble_score, gap 계산
         # ========================
-        st.write("Calculating selling price statistics...")
+        log("Calculating selling price statistics...")
+        phases.start("bubble_gap")
         real_stats = df_real.groupby(['complexNo', 'pyeongName3']).agg({
             'dealAmount_numeric': 'median'
         }).reset_index()
@@ -208,7 +171,7 @@ def main(complex_ids=None):
             how='left'
         )
 
-        st.write("Computing bubble scores...")
+        log("Computing bubble scores...")
         mask = df_sell['tradeTypeName'] == '매매'
         df_sell['bubble_score'] = np.nan
 
@@ -226,7 +189,7 @@ def main(complex_ids=None):
         ) * 50
         df_sell.loc[mask_case2, 'bubble_score'] = np.maximum(case2_scores, 0)
 
-        st.write("Computing gaps...")
+        log("Computing gaps...")
 
         # 각 gap 값을 개별적으로 처리 (NaN 체크 포함)
         df_sell.loc[mask, 'real_max_5_gap'] = (
@@ -248,12 +211,19 @@ def main(complex_ids=None):
         # ========================
         # 10. 결과 저장
         # ========================
-        st.write(f"Saving to {output_path}...")
-        df_sell.to_csv(output_path, index=False, encoding='utf-8-sig')
-        st.write("저장 완료")
+        log(f"Saving to {output_path}...")
+        phases.start("save", rows=len(df_sell))
+        record_frames(df_sell=df_sell, df_real=df_real)
+        write_dataset(df_sell, output_path, "result")
+        log("저장 완료")
+        return output_path
 
     except Exception as e:
-        st.write(f"sell_price_merge.py 실행 중 오류: {e}")
+        phases.close(e)
+        log(f"sell_price_merge.py 실행 중 오류: {e}")
+        return None
+    finally:
+        phases.close()
 
 if __name__ == "__main__":
     main(complex_ids=['138183', '136913'])
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""유사 평형 찾기 - 단지/평형 수치 특성 벡터의 최근접 이웃 검색
+
+(단지, 평형) 한 행을 세대수, 사용승인 연도, 최고층, 용적률, 건폐율, 세대당 주차대수, 전용면적,
+방 수, 초교 도보 시간으로 이루어진 벡터로 보고, 특성별 표준화(z-score)와 가중치를 적용한
+float32 행렬을 한 번 만들어 둠. 조회는 행렬을 SIMILARITY_CONFIG["BATCH_ROWS"]행씩 나눠
+|x|² - 2x·q + |q|²로 거리를 계산하고 구간별 상위 k개만 남기므로 메모리 사용량이 일정함.
+
+실행 폴더에는 이번에 선택한 단지만 있으므로, 수집할 때마다 실행의 평형 특성을 공용 누적 목록
+(DATA_PATHS["UNITS"])에 단지 단위로 교체 반영하고(record_units), 검색은 기본적으로 이 목록과
+이번 실행 평형을 합친 범위에서 함 (SIMILARITY_CONFIG["SCOPE"]).
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.config import DATA_PATHS, SIMILARITY_CONFIG
+from src.schema import read_dataset, write_dataset
+
+# 단지 특성은 complex_data, 평형 특성은 pyeong_data에서 가져옴
+COMPLEX_FEATURES = [
+    "totalHouseholdCount", "useApproveYmd", "highFloor", "batlRatio", "btlRatio",
+    "parkingCountByHousehold", "walkTime",
+]
+PYEONG_FEATURES = ["exclusiveArea", "roomCnt"]
+FEATURES = COMPLEX_FEATURES + PYEONG_FEATURES
+UNIT_KEYS = ["complexNo", "pyeongName3"]
+UNIT_COLUMNS = UNIT_KEYS + ["complexName"] + FEATURES
+
+
+def _pyeong_name3(df_pyeong: pd.DataFrame) -> pd.Series:
+    if "pyeongName3" in df_pyeong.columns:
+        return df_pyeong["pyeongName3"]
+    # naver_apt_v5.py의 실거래 평형명과 같은 규칙 (pyeongName2에서 후행 알파벳 제거)
+    return df_pyeong["pyeongName2"].str.replace(r"[A-Za-z]+$", "", regex=True).str.strip()
+
+
+def build_units(df_pyeong: pd.DataFrame, df_complex: pd.DataFrame) -> pd.DataFrame:
+    """pyeong_data + complex_data → (단지, 평형)별 특성 표
+
+    같은 평형(34A/34B 등)은 전용면적 평균, 방 수 최댓값으로 묶음. 사용승인일은 소수 연도로 변환.
+    """
+    pyeong = pd.DataFrame({
+        "complexNo": df_pyeong["complexNo"],
+        "pyeongName3": _pyeong_name3(df_pyeong),
+        "exclusiveArea": df_pyeong["exclusiveArea"],
+        "roomCnt": df_pyeong["roomCnt"],
+    })
+    pyeong = pyeong.groupby(UNIT_KEYS, sort=False).agg(
+        exclusiveArea=("exclusiveArea", "mean"), roomCnt=("roomCnt", "max")
+    ).reset_index()
+
+    complexes = df_complex.drop_duplicates("complexNo")
+    approve = complexes["useApproveYmd"]
+    complexes = complexes.assign(useApproveYmd=approve.dt.year + (approve.dt.dayofyear - 1) / 365.25)
+    units = pyeong.merge(complexes[["complexNo", "complexName"] + COMPLEX_FEATURES], on="complexNo", how="inner")
+    return units[UNIT_COLUMNS]
+
+
+class SimilarityIndex:
+    """(단지, 평형) 특성 벡터 행렬과 배치 거리 계산
+
+    units: build_units 결과. weights: 특성별 가중치 (없으면 SIMILARITY_CONFIG["WEIGHTS"]).
+    결측 특성은 표준화 후 0(평균값)으로 채워 거리에 영향을 주지 않게 함.
+    """
+
+    def __init__(self, units: pd.DataFrame, weights: Optional[dict] = None):
+        self.units = units.reset_index(drop=True)
+        weights = {**SIMILARITY_CONFIG["WEIGHTS"], **(weights or {})}
+        features = self.units[FEATURES].astype(np.float64)
+        raw = features.to_numpy()
+        self.mean = np.nan_to_num(features.mean().to_numpy())
+        std = features.std(ddof=0).to_numpy()
+        self.std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        self.scale = np.sqrt(np.array([weights.get(f, 1.0) for f in FEATURES])) / self.std
+        self.matrix = np.ascontiguousarray(self._normalize(raw), dtype=np.float32)
+        self.sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self.complex_codes = pd.factorize(self.units["complexNo"])[0]
+        self.positions = pd.MultiIndex.from_frame(self.units[UNIT_KEYS])
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def _normalize(self, raw: np.ndarray) -> np.ndarray:
+        return np.nan_to_num((raw - self.mean) * self.scale)
+
+    def locate(self, pairs: Iterable[Tuple[str, str]]) -> np.ndarray:
+        """(complexNo, pyeongName3) 쌍들의 행 위치 (없으면 -1)"""
+        pairs = [(str(c), str(p)) for c, p in pairs]
+        if not pairs:
+            return np.empty(0, dtype=np.int64)
+        return self.positions.get_indexer(pd.MultiIndex.from_tuples(pairs, names=UNIT_KEYS))
+
+    def search(self, rows: np.ndarray, k: int, exclude_same_complex: bool = True,
+               batch_rows: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """행 위치 rows(질의 m개) 각각에 대해 가장 가까운 k개의 (위치, 거리) 배열 (m, k) 반환
+
+        질의 자신은 항상 제외하고, exclude_same_complex면 같은 단지의 다른 평형도 제외.
+        전체 행이 k개 이하이면 있는 만큼만 반환하며, 제외된 칸은 위치 -1, 거리 inf.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        batch_rows = batch_rows or SIMILARITY_CONFIG["BATCH_ROWS"]
+        queries = self.matrix[rows]
+        q_norms = self.sq_norms[rows]
+        q_complex = self.complex_codes[rows]
+        best_idx = np.full((len(rows), 0), -1, dtype=np.int64)
+        best_dist = np.empty((len(rows), 0), dtype=np.float32)
+        for start in range(0, len(self), batch_rows):
+            stop = min(start + batch_rows, len(self))
+            d2 = q_norms[:, None] - 2 * queries @ self.matrix[start:stop].T + self.sq_norms[None, start:stop]
+            cols = np.arange(start, stop)
+            d2[cols[None, :] == rows[:, None]] = np.inf
+            if exclude_same_complex:
+                d2[self.complex_codes[None, start:stop] == q_complex[:, None]] = np.inf
+            cand_idx = np.concatenate([best_idx, np.broadcast_to(cols, d2.shape)], axis=1)
+            cand_dist = np.concatenate([best_dist, d2], axis=1)
+            if cand_dist.shape[1] > k:
+                keep = np.argpartition(cand_dist, k - 1, axis=1)[:, :k]
+                cand_idx = np.take_along_axis(cand_idx, keep, axis=1)
+                cand_dist = np.take_along_axis(cand_dist, keep, axis=1)
+            best_idx, best_dist = cand_idx, cand_dist
+        order = np.argsort(best_dist, axis=1, kind="stable")
+        best_idx = np.take_along_axis(best_idx, order, axis=1)
+        best_dist = np.sqrt(np.maximum(np.take_along_axis(best_dist, order, axis=1), 0))
+        best_idx[~np.isfinite(best_dist)] = -1
+        return best_idx, best_dist
+
+    def similar(self, complex_no: str, pyeong: str, k: Optional[int] = None,
+                exclude_same_complex: bool = True) -> pd.DataFrame:
+        """선택한 (단지, 평형)과 가장 비슷한 평형 k개 (distance: 가중 표준화 거리, 작을수록 유사)"""
+        k = k or SIMILARITY_CONFIG["TOP_K"]
+        row = self.locate([(complex_no, pyeong)])
+        if not len(row) or row[0] < 0 or k <= 0:
+            return pd.DataFrame(columns=UNIT_COLUMNS + ["distance"])
+        idx, dist = self.search(row, k, exclude_same_complex)
+        found = idx[0] >= 0
+        out = self.units.iloc[idx[0][found]].reset_index(drop=True)
+        out["distance"] = dist[0][found]
+        return out
+
+
+def similar_with_stats(index: SimilarityIndex, complex_no: str, pyeong: str, pyeong_summary: pd.DataFrame,
+                       k: Optional[int] = None, exclude_same_complex: bool = True) -> pd.DataFrame:
+    """기준 (단지, 평형) 한 행 + 유사 평형 k개에 평형별 가격 통계(reports.build_pyeong_summary)를 붙인 표"""
+    row = index.locate([(complex_no, pyeong)])
+    if not len(row) or row[0] < 0:
+        return pd.DataFrame(columns=UNIT_COLUMNS + ["distance"])
+    base = index.units.iloc[row].assign(distance=0.0)
+    similar = index.similar(complex_no, pyeong, k, exclude_same_complex)
+    stats = pyeong_summary.drop(columns=["complexName"], errors="ignore")
+    frames = [f for f in (base, similar) if len(f)]
+    return pd.concat(frames, ignore_index=True).merge(stats, on=UNIT_KEYS, how="left")
+
+
+def _read(path: str, dataset: str, columns) -> Optional[pd.DataFrame]:
+    if not Path(path).exists():
+        return None
+    return read_dataset(path, dataset, columns=columns)
+
+
+def load_units(pyeong_path: str, complex_path: str) -> pd.DataFrame:
+    """실행 폴더의 pyeong_data/complex_data로 특성 표 생성 (파일이 없으면 빈 표)"""
+    df_pyeong = _read(pyeong_path, "pyeong", ["complexNo", "pyeongName2", "pyeongName3", "exclusiveArea", "roomCnt"])
+    df_complex = _read(complex_path, "complex", ["complexNo", "complexName"] + COMPLEX_FEATURES)
+    if df_pyeong is None or df_complex is None:
+        return pd.DataFrame(columns=UNIT_COLUMNS)
+    return build_units(df_pyeong, df_complex)
+
+
+def units_path(path=None) -> Path:
+    return Path(path) if path is not None else DATA_PATHS["UNITS"]
+
+
+def load_unit_catalog(path=None) -> pd.DataFrame:
+    """누적 평형 목록 전체 (없으면 빈 표)"""
+    path = units_path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=UNIT_COLUMNS)
+    return read_dataset(path, "unit", columns=UNIT_COLUMNS)
+
+
+def combine_units(run_units: pd.DataFrame, catalog: pd.DataFrame) -> pd.DataFrame:
+    """이번 실행 평형 + 누적 목록 (같은 단지는 이번 실행 값 우선)"""
+    others = catalog[~catalog["complexNo"].isin(run_units["complexNo"])]
+    frames = [f for f in (run_units, others) if len(f)]
+    return pd.concat(frames, ignore_index=True)[UNIT_COLUMNS] if frames else run_units
+
+
+_units_lock = threading.Lock()  # 같은 프로세스의 동시 작업이 누적 목록을 번갈아 덮어쓰지 않도록
+
+
+def record_units(paths: Dict[str, Path], log=print, path=None) -> Optional[pd.DataFrame]:
+    """수집 직후 실행의 pyeong_data/complex_data 특성 표를 누적 평형 목록에 반영 (같은 단지는 교체)
+
+    실패해도 수집/분석은 계속되도록 예외는 로그로만 남김.
+    """
+    try:
+        units = load_units(str(paths["PYEONG"]), str(paths["COMPLEX"]))
+        if units.empty:
+            return None
+        path = units_path(path)
+        with _units_lock:
+            catalog = combine_units(units, load_unit_catalog(path))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            write_dataset(catalog, tmp_path, "unit")
+            os.replace(tmp_path, path)
+        log(f"평형 목록 갱신: {units['complexNo'].nunique()}개 단지 반영 (누적 {len(catalog):,}개 평형)")
+        return catalog
+    except Exception as e:
+        log(f"평형 목록 갱신 실패: {e}")
+        return None
+
+
+def load_scope_units(pyeong_path: str, complex_path: str, scope: str = "catalog", catalog_path=None) -> pd.DataFrame:
+    """검색 범위별 특성 표 (catalog: 누적 목록 + 이번 실행, run: 이번 실행 단지만)"""
+    units = load_units(pyeong_path, complex_path)
+    if scope == "catalog":
+        units = combine_units(units, load_unit_catalog(catalog_path))
+    return units
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_similarity_index(pyeong_path: str, pyeong_version: float,
+                          complex_path: str, complex_version: float,
+                          catalog_path: Optional[str] = None, catalog_version: float = 0.0) -> SimilarityIndex:
+    """파일 버전별 1회 생성하는 특성 행렬 (세션 간 공유 - 수정하지 말 것)
+
+    catalog_path: 누적 평형 목록 (None이면 이번 실행 단지만)
+    """
+    if catalog_path is None:
+        return SimilarityIndex(load_units(pyeong_path, complex_path))
+    return SimilarityIndex(load_scope_units(pyeong_path, complex_path, "catalog", catalog_path))
@@ -0,0 +1,164 @@
+"""단지 좌표(위도/경도) 공간 색인 - 반경 N km 이내 / 가까운 k개 단지 조회
+
+좌표를 위도/경도 격자(한 칸 약 SPATIAL_CONFIG["CELL_KM"] km)로 나누고 격자 번호순으로
+정렬해 두어, 조회 시 질의 범위에 걸치는 격자 열만 np.searchsorted로 잘라 후보를 모은 뒤
+후보에 대해서만 실제 거리(haversine)를 계산함. 전체 단지와의 거리를 매번 계산하지 않음.
+"""
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.config import SPATIAL_CONFIG
+from src.schema import read_dataset
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_LAT_DEG = 110.574
+KM_PER_LON_DEG_EQUATOR = 111.320
+
+# 색인에 함께 보관하는 단지 정보 (단지 목록/complex_data 공통 컬럼)
+INDEX_COLUMNS = [
+    "complexNo", "complexName", "cortarNo", "latitude", "longitude",
+    "totalHouseholdCount", "useApproveYmd", "highFloor", "dealCount",
+]
+NEIGHBOR_COLUMNS = INDEX_COLUMNS + ["distance_km"]
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """두 좌표(배열 가능) 사이의 대원 거리(km)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class ComplexIndex:
+    """단지 좌표 격자 색인
+
+    complexes: complexNo/latitude/longitude를 포함한 단지 표 (좌표 없는 행은 제외, complexNo 중복은 첫 행)
+    cell_km: 격자 한 칸의 크기(km) - 주로 묻는 반경과 비슷하게 두면 후보 수가 가장 적음
+    """
+
+    def __init__(self, complexes: pd.DataFrame, cell_km: Optional[float] = None):
+        df = complexes.dropna(subset=["latitude", "longitude"]).drop_duplicates("complexNo")
+        self.cell_km = float(cell_km or SPATIAL_CONFIG["CELL_KM"])
+        self.lat = df["latitude"].to_numpy(dtype=np.float64)
+        self.lon = df["longitude"].to_numpy(dtype=np.float64)
+
+        # 경도 1도의 거리는 위도에 따라 줄어듦 - 가장 남쪽(가장 긴) 기준으로 격자 폭을 잡아 한 칸이 cell_km 이상이 되게 함
+        lat_ref = float(np.abs(self.lat).min()) if len(df) else 0.0
+        self.cell_lat = self.cell_km / KM_PER_LAT_DEG
+        self.cell_lon = self.cell_km / (KM_PER_LON_DEG_EQUATOR * np.cos(np.radians(lat_ref)))
+        self.lat0 = float(self.lat.min()) if len(df) else 0.0
+        self.lon0 = float(self.lon.min()) if len(df) else 0.0
+
+        row, col = self._cells(self.lat, self.lon)
+        self.n_rows = int(row.max()) + 1 if len(df) else 1
+        self.n_cols = int(col.max()) + 1 if len(df) else 1
+        # 경도 열(col) 우선 정렬: 한 열 안의 위도 구간이 연속된 키 구간이 됨
+        keys = col * self.n_rows + row
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.lat, self.lon = self.lat[order], self.lon[order]
+        self.complexes = df.iloc[order].reset_index(drop=True)
+        self.positions = pd.Index(self.complexes["complexNo"])
+
+    def __len__(self) -> int:
+        return len(self.complexes)
+
+    def _cells(self, lat, lon):
+        row = np.floor((np.asarray(lat) - self.lat0) / self.cell_lat).astype(np.int64)
+        col = np.floor((np.asarray(lon) - self.lon0) / self.cell_lon).astype(np.int64)
+        return row, col
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """(lat, lon) 중심 반경 radius_km를 덮는 격자들에 속한 단지 위치"""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        d_lat = radius_km / KM_PER_LAT_DEG
+        # 범위 안에서 적도에 가장 가까운 위도 기준 (경도 폭을 가장 넓게 잡아 빠뜨리지 않음)
+        lat_near = max(0.0, abs(lat) - d_lat)
+        d_lon = radius_km / (KM_PER_LON_DEG_EQUATOR * max(np.cos(np.radians(lat_near)), 1e-6))
+        (row_lo, row_hi), (col_lo, col_hi) = self._cells([lat - d_lat, lat + d_lat], [lon - d_lon, lon + d_lon])
+        row_lo, row_hi = max(row_lo, 0), min(row_hi, self.n_rows - 1)
+        col_lo, col_hi = max(col_lo, 0), min(col_hi, self.n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+        cols = np.arange(col_lo, col_hi + 1, dtype=np.int64) * self.n_rows
+        starts = np.searchsorted(self.keys, cols + row_lo, side="left")
+        ends = np.searchsorted(self.keys, cols + row_hi, side="right")
+        spans = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def _result(self, idx: np.ndarray, dist: np.ndarray) -> pd.DataFrame:
+        order = np.lexsort((idx, dist))
+        out = self.complexes.iloc[idx[order]].reset_index(drop=True)
+        out["distance_km"] = dist[order]
+        return out
+
+    def _exclude_mask(self, idx: np.ndarray, exclude: Optional[Iterable[str]]) -> np.ndarray:
+        if not exclude:
+            return np.ones(len(idx), dtype=bool)
+        excluded = self.positions.get_indexer(pd.Index([str(c) for c in exclude]))
+        return ~np.isin(idx, excluded[excluded >= 0])
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               exclude: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """반경 radius_km 이내 단지 (가까운 순, distance_km 컬럼 추가)"""
+        idx = self._candidates(lat, lon, radius_km)
+        idx = idx[self._exclude_mask(idx, exclude)]
+        dist = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+        keep = dist <= radius_km
+        return self._result(idx[keep], dist[keep])
+
+    def nearest(self, lat: float, lon: float, k: int,
+                exclude: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """가장 가까운 k개 단지 (가까운 순)
+
+        격자 한 칸 반경에서 시작해 후보가 k개 이상이고 k번째 거리가 탐색 반경 안에 들 때까지
+        반경을 두 배씩 넓힘 (k번째보다 가까운 단지는 모두 탐색 반경 안에 있으므로 정확한 결과).
+        """
+        if k <= 0 or not len(self):
+            return self._result(np.empty(0, dtype=np.int64), np.empty(0))
+        radius = self.cell_km
+        max_radius = self.cell_km * (self.n_rows + self.n_cols + 2) + haversine_km(
+            lat, lon, self.lat0, self.lon0)
+        while True:
+            idx = self._candidates(lat, lon, radius)
+            idx = idx[self._exclude_mask(idx, exclude)]
+            dist = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+            if len(idx) >= k:
+                part = np.argpartition(dist, k - 1)[:k]
+                if dist[part].max() <= radius or radius >= max_radius:
+                    return self._result(idx[part], dist[part])
+            elif radius >= max_radius:
+                return self._result(idx, dist)
+            radius *= 2
+
+    def locate(self, complex_no: str):
+        """단지 좌표 (색인에 없으면 None)"""
+        pos = self.positions.get_indexer([str(complex_no)])[0]
+        if pos < 0:
+            return None
+        return float(self.lat[pos]), float(self.lon[pos])
+
+
+def build_complex_index(*frames: pd.DataFrame, cell_km: Optional[float] = None) -> ComplexIndex:
+    """여러 단지 표(앞쪽 우선)를 합쳐 색인 생성 - 예: 실행의 complex_data + 로컬 단지 목록"""
+    frames = [f[[c for c in INDEX_COLUMNS if c in f.columns]] for f in frames if f is not None and len(f)]
+    if not frames:
+        return ComplexIndex(pd.DataFrame(columns=INDEX_COLUMNS), cell_km)
+    combined = pd.concat(frames, ignore_index=True).reindex(columns=INDEX_COLUMNS)
+    return ComplexIndex(combined, cell_km)
+
+
+def _read_complexes(path: str) -> Optional[pd.DataFrame]:
+    if not Path(path).exists():
+        return None
+    return read_dataset(path, "complex", columns=INDEX_COLUMNS)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_complex_index(complex_path: str, complex_version: float,
+                       catalog_path: str, catalog_version: float) -> ComplexIndex:
+    """실행의 complex_data와 로컬 단지 목록으로 만든 색인 (파일 버전별 1회, 세션 간 공유 - 수정하지 말 것)"""
+    return build_complex_index(_read_complexes(complex_path), _read_complexes(catalog_path))
@@ -0,0 +1,94 @@
+"""앱 시작 시간 점검 도구
+
+    python -m src.startup_profile            # 첫 화면에 필요한 모듈 임포트 시간 보고
+    python -m src.startup_profile --paint    # app.py 첫 실행(사이드바 표시까지) 시간도 측정
+
+새 프로세스에서 `python -X importtime`으로 임포트하므로 이미 로드된 모듈의 영향을 받지 않음.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from src.config import BASE_DIR
+
+# app.py가 첫 화면을 그리기 위해 임포트하는 모듈
+STARTUP_MODULES = ["streamlit", "src.data_loader", "src.ui_components_v2", "src.styles"]
+
+# 첫 화면에서는 로드되지 않아야 하는 무거운 모듈
+# (plotly.graph_objects 자체는 streamlit이 지연 로딩 형태로 임포트하므로 실제 Figure 클래스로 확인)
+DEFERRED_MODULES = ["plotly.express", "plotly.graph_objs._figure", "requests", "dotenv", "src.naver_apt_v5", "src.sell_price_merge_v2"]
+
+
+def run_importtime(modules: List[str]) -> Tuple[List[Tuple[int, int, str]], List[str], float]:
+    """새 프로세스에서 modules를 임포트하고 (자체 µs, 누적 µs, 모듈명) 목록, 로드된 지연 대상 모듈, 총 소요 초 반환"""
+    code = (
+        "import sys, json\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))\n"
+    )
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return rows, loaded, elapsed
+
+
+def summarize_by_package(rows: List[Tuple[int, int, str]]) -> Dict[str, int]:
+    """최상위 패키지별 자체 임포트 시간 합계 (µs)"""
+    totals: Dict[str, int] = defaultdict(int)
+    for self_us, _, name in rows:
+        totals[name.strip().split(".")[0]] += self_us
+    return dict(totals)
+
+
+def measure_first_paint() -> float:
+    """app.py 첫 실행 시간 (초) - 세션 상태 초기화부터 사이드바 표시까지"""
+    from streamlit.testing.v1 import AppTest
+    started = time.perf_counter()
+    AppTest.from_file(str(BASE_DIR / "app.py"), default_timeout=60).run()
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 시작 시 임포트 시간 보고")
+    parser.add_argument("--top", type=int, default=15, help="표시할 모듈/패키지 수")
+    parser.add_argument("--paint", action="store_true", help="app.py 첫 실행 시간도 측정")
+    args = parser.parse_args(argv)
+
+    rows, loaded, elapsed = run_importtime(STARTUP_MODULES)
+    print(f"임포트 프로세스 총 소요: {elapsed:.2f}s (인터프리터 시작 포함)")
+
+    print("\n[패키지별 자체 임포트 시간]")
+    by_package = sorted(summarize_by_package(rows).items(), key=lambda kv: kv[1], reverse=True)
+    for package, us in by_package[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {package}")
+
+    print("\n[앱 모듈 누적 임포트 시간]")
+    for _, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True):
+        if name.strip().startswith("src."):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+    print("\n[첫 화면에서 로드된 지연 대상 모듈]")
+    print("  " + (", ".join(loaded) if loaded else "없음"))
+
+    if args.paint:
+        print(f"\n첫 화면 실행 시간: {measure_first_paint():.2f}s")
+
+
+if __name__ == "__main__":
+    main()
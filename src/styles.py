@@ -17,5 +17,40 @@ STREAMLIT_STYLE = """
     .js-plotly-plot {
         margin-bottom: 0px;
     }
+    /* 투자 지표 요약 테이블 헤더의 다중 줄 툴팁 */
+    th[data-tooltip] {
+        position: relative;
+    }
+    th[data-tooltip]::after {
+        content: attr(data-tooltip);
+        white-space: pre-line;
+        position: absolute;
+        bottom: -120%;
+        left: 50%;
+        transform: translateX(-50%);
+        background: rgba(85, 85, 85, 0.7);
+        color: #fff;
+        padding: 8px;
+        border-radius: 4px;
+        opacity: 0;
+        visibility: hidden;
+        transition: opacity 0.3s;
+        z-index: 100;
+        width: 300px;
+        text-align: left;
+    }
+    th[data-tooltip]:hover::after {
+        opacity: 1;
+        visibility: visible;
+    }
+    /* 매물 현황의 직전 수집 대비 변경 배지 */
+    .change-badge {
+        display: inline-block;
+        padding: 2px 10px;
+        margin: 0 6px 6px 0;
+        border-radius: 12px;
+        background-color: #f0f2f6;
+        font-size: 0.9em;
+    }
 </style>
 """
@@ -1,100 +1,35 @@
 import streamlit as st
 from typing import Tuple, Optional, List, Dict, Any
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
-from src.data_loader import get_sigungu_options, get_dong_options, get_dropdown_options, load_pyeong_data
+from itertools import combinations
+from src.data_loader import get_sigungu_options, get_dong_options, get_dropdown_options, load_pyeong_data, get_data_version, load_real_price_data, load_result_data, load_listing_changes, load_complex_summary, load_pyeong_summary
+from src.aggregates import PERIOD_CLASSES, load_monthly_cube, query_monthly, compute_gap_frame, compute_pairwise_gap_indices
 from src.api_client import fetch_complex_list
-import numpy as np
-import plotly.graph_objects as go
-import requests
+from src.credentials import get_request_profile, api_url
 import re
 import os
-from dotenv import load_dotenv
-from src.config import DATA_PATHS
-
-# 파일 경로 설정 부분 수정
-real_price_path = DATA_PATHS["REAL_PRICE"]
-output_path = DATA_PATHS["RESULT"]
-
-# .env 파일 로드
-load_dotenv()
+import time
+from src.config import DATA_PATHS, CHART_CONFIG, JOB_CONFIG, UI_CONFIG, TRACE_CONFIG, SPATIAL_CONFIG, SIMILARITY_CONFIG
+from src.jobs import get_job_manager, ACTIVE_STATUSES, DONE, FAILED, CANCELLED
+from src.runs import RunHandle, get_run
+from src.formatters import (
+    format_date, format_eokwan_series, format_int_series, format_thousands_series,
+    format_ymd_series, plain_gap_series, gap_style_frame, fill_text_series
+)
+from src.cache_utils import memoize_by_fingerprint, memoize_resource_by_fingerprint
+from src.instrumentation import trace, span, summarize
+from src.memory_profile import record_frames, memory_table
+from src.listing_history import CHANGE_TYPES, CHANGE_LABELS
+from src.spatial import load_complex_index
+from src.similarity import load_similarity_index, similar_with_stats
+from src.name_search import load_name_index, region_label
+from src.figures import (
+    build_trend_figure, build_range_figure,
+    DAILY_COLUMNS, MONTHLY_COLUMNS, RANGE_COLUMNS
+)
 
 # --- 헬퍼 함수 정의 ---
-def to_number(val):
-    if pd.isnull(val):
-        return float('nan')
-    s = str(val).replace(",", "").strip()
-    try:
-        return float(s)
-    except:
-        return float('nan')
-
-def format_eokwan(val_in_manwon):
-    num = to_number(val_in_manwon)
-    if pd.isnull(num):
-        return "-"
-    v = int(round(num, 0))
-    eok = v // 10000
-    rem = v % 10000
-    if eok > 0 and rem > 0:
-        return f"{eok}억 {rem}"
-    elif eok > 0:
-        return f"{eok}억"
-    elif rem > 0:
-        return f"{rem}"
-    else:
-        return "-"
-
-def format_date(ymd):
-    if pd.isnull(ymd) or not isinstance(ymd, str):
-        return "-"
-    parts = ymd.replace("-", ".").replace("/", ".").split(".")
-    if len(parts) == 3:
-        return f"{parts[0]}.{parts[1].zfill(2)}.{parts[2].zfill(2)}"
-    return ymd
-
-def color_gap_html(val):
-    if pd.isnull(val) or not isinstance(val, str):
-        return ""
-    val_str = val.strip()
-    if val_str == "":
-        return ""
-    raw = val_str.replace("%", "")
-    try:
-        num = float(raw)
-        if num > 0:
-            return f'<span style="color:red;">▲{abs(num):.1f}%</span>'
-        elif num < 0:
-            return f'<span style="color:blue;">▼{abs(num):.1f}%</span>'
-        else:
-            return "0.0%"
-    except:
-        return val_str
-
-def plain_gap(val):
-    if pd.isnull(val) or not isinstance(val, str):
-        return ""
-    raw = val.replace("%", "").strip()
-    try:
-        num = float(raw)
-        if num > 0:
-            return f"▲{abs(num):.1f}%"
-        elif num < 0:
-            return f"▼{abs(num):.1f}%"
-        else:
-            return "0.0%"
-    except:
-        return val
-
-def style_gap(cell_value):
-    if isinstance(cell_value, str):
-        if cell_value.startswith("▲"):
-            return "color: red;"
-        elif cell_value.startswith("▼"):
-            return "color: blue;"
-    return ""
-
 def get_buy_recommendation(gap_index):
     """갭 지수에 따른 매수 추천 등급과 가이드 반환"""
     if pd.isnull(gap_index):
@@ -121,24 +56,10 @@ def get_bubble_grade(bubble_index):
 @st.cache_data
 def fetch_pyeong_list(complex_id: str) -> List[str]:
     """네이버 부동산 API에서 단지별 평형 리스트를 가져옴"""
-    url = f"https://new.land.naver.com/api/complexes/{complex_id}"
-    cookies = {
-        'NNB': os.getenv('NNB'),
-        'ASID': os.getenv('ASID'),
-        'NAC': os.getenv('NAC'),
-        'landHomeFlashUseYn': 'Y',
-        'page_uid': os.getenv('BUILDING_PAGE_UID'),
-        'REALESTATE': os.getenv('BUILDING_REALESTATE'),
-        'SRT30': os.getenv('BUILDING_SRT30'),
-        'SRT5': os.getenv('BUILDING_SRT5'),
-        'BUC': os.getenv('BUILDING_BUC')
-    }
-    headers = {
-        'accept': '*/*',
-        'accept-language': 'en-GB,en;q=0.9,ko-KR;q=0.8',
-        'authorization': os.getenv('BUILDING_AUTHORIZATION'),
-        'user-agent': os.getenv('USER_AGENT')
-    }
+    import requests  # 단지를 고른 뒤에만 필요하므로 지연 임포트
+
+    url = api_url(f"complexes/{complex_id}")
+    cookies, headers = get_request_profile("BUILDING")
     params = {"sameAddressGroup": "true"}
     try:
         response = requests.get(url, params=params, cookies=cookies, headers=headers)
@@ -162,331 +83,473 @@ def render_sidebar(region_df: pd.DataFrame) -> Tuple[List[str], pd.DataFrame]:
 
     with st.sidebar:
         st.title("아파트 단지 선택")
-        # 아파트 1 선택
-        apt1_id, apt1_name = render_apt_selection("1", region_df)
-        if apt1_id:
-            selected_complexes.append(str(apt1_id))
-            st.session_state.app_state["apt1_complex"] = str(apt1_id)
-            st.session_state.app_state["apt1_selected"] = True
-        # 아파트 2 선택
-        apt2_id, apt2_name = render_apt_selection("2", region_df)
-        if apt2_id:
-            selected_complexes.append(str(apt2_id))
-            st.session_state.app_state["apt2_complex"] = str(apt2_id)
-            st.session_state.app_state["apt2_selected"] = True
-
-        if st.session_state.app_state.get("apt1_selected") and st.session_state.app_state.get("apt2_selected"):
+        # 비교 목록에 단지-평형 추가 (최대 MAX_SELECTIONS개)
+        selections = st.session_state.app_state["selections"]
+        if len(selections) < UI_CONFIG["MAX_SELECTIONS"]:
+            candidate = render_apt_selection(region_df)
+            if candidate and st.button("비교 목록에 추가"):
+                if candidate not in selections:
+                    selections.append(candidate)
+                st.rerun()
+        else:
+            st.info(f"최대 {UI_CONFIG['MAX_SELECTIONS']}개 단지까지 비교할 수 있습니다.")
+        render_selection_list()
+        selected_complexes = get_selected_complexes()
+
+        if len(selections) >= 2:
             if st.button("분석 실행", type="primary"):
-                try:
-                    # Step 1: naver_apt_v5를 통한 데이터 수집 및 파일 생성 확인
-                    with st.spinner("Step 1: 데이터 수집 중...💾"):
-                        from src.naver_apt_v5 import main_function as run_01
-                        run_01(selected_complexes)
-                        st.success("Step 1 완료: 데이터 수집 완료")
-                        
-                        st.write("----- Step 1 생성 파일 확인 -----")
-                        files_to_check = {
-                            "COMPLEX": DATA_PATHS["COMPLEX"],
-                            "PYEONG": DATA_PATHS["PYEONG"],
-                            "SELL": DATA_PATHS["SELL"],
-                            "REAL_PRICE": DATA_PATHS["REAL_PRICE"],
-                            "DONG": DATA_PATHS["DONG"],
-                            "PROVIDER": DATA_PATHS["PROVIDER"]
-                        }
-                        for key, path in files_to_check.items():
-                            st.write(f"파일 {key} 경로: {path}")
-                            if os.path.exists(path):
-                                try:
-                                    df_temp = pd.read_csv(path, encoding='utf-8-sig')
-                                    st.success(f"{key} 파일 생성 완료 ({len(df_temp)} 행)")
-                                except Exception as e:
-                                    st.error(f"{key} 파일 읽기 오류: {e}")
-                            else:
-                                st.error(f"{key} 파일이 존재하지 않습니다.")
-                    
-                        # Step 2: sell_price_merge_v2를 통한 데이터 병합 및 result.csv 생성 확인
-                        with st.spinner("Step 2: 데이터 처리 중...⚙"):
-                            from src.sell_price_merge_v2 import main as run_03
-                            run_03(selected_complexes)
-                            st.success("Step 2 완료: 데이터 병합 완료")
-                            
-                            st.write("----- Step 2 생성 파일 확인 -----")
-                            st.write("Result 파일 경로:", output_path)
-                            if os.path.exists(output_path):
-                                try:
-                                    df_result = pd.read_csv(output_path, encoding='utf-8-sig')
-                                    st.success(f"Result 파일 생성 완료 ({len(df_result)} 행)")
-                                except Exception as e:
-                                    st.error(f"Result 파일 읽기 오류: {e}")
-                            else:
-                                st.error("Result 파일이 생성되지 않았습니다.")
-                    
-                    st.session_state.app_state["analysis_done"] = True
-                    st.session_state.app_state["last_analysis_time"] = datetime.now()
-                    st.success("분석이 완료되었습니다!")
-                except Exception as e:
-                    st.session_state.app_state["error"] = str(e)
-                    st.error(f"분석 중 오류 발생: {e}")
+                # 모든 단지를 한 번의 작업으로 병렬 수집/병합 (같은 단지 조합은 세션 간 공유)
+                job = get_job_manager().submit(selected_complexes)
+                st.session_state.app_state["job_id"] = job.job_id
+                st.session_state.app_state["analysis_done"] = False
+                st.session_state.app_state["error"] = None
+                st.query_params["job"] = job.job_id
 
+        render_job_status()
+
+    run = get_current_run()
     if st.session_state.app_state.get("analysis_done") and selected_complexes:
         try:
-            # 파일 존재 확인
+            # 이 세션의 실행 폴더 결과 확인
+            if run is None:
+                st.error("분석 결과가 만료되었습니다. '분석 실행'을 다시 눌러주세요.")
+                st.stop()
+            output_path = run.path("RESULT")
             if not os.path.exists(output_path):
                 st.error(f"결과 파일이 없습니다: {output_path}")
                 st.stop()
-                
-            df_filtered = pd.read_csv(output_path, encoding='utf-8-sig')
-                
-            df_filtered["complexNo"] = df_filtered["complexNo"].astype(str)
+
+            df_filtered = load_result_data(str(output_path), get_data_version(output_path))
             df_filtered = df_filtered[df_filtered["complexNo"].isin(selected_complexes)]
-            
+
             if df_filtered.empty:
                 st.warning("선택된 단지에 대한 데이터가 없습니다")
                 st.stop()
-                
+
         except Exception as e:
             st.error(f"데이터 로드 중 오류 발생: {e}")
             st.write("스택 트레이스:", e.__traceback__)
 
     return selected_complexes, df_filtered
 
-def render_apt_selection(prefix: str, region_df: pd.DataFrame) -> Tuple[Optional[str], Optional[str]]:
-    """아파트 선택 UI 컴포넌트"""
-    st.sidebar.subheader(f"아파트{prefix} 지역 선택")
+def render_job_status():
+    """분석 작업 진행 상태 표시 (새로고침 후에는 URL의 job 파라미터로 복구)"""
+    app_state = st.session_state.app_state
+    job_id = app_state.get("job_id") or st.query_params.get("job")
+    if not job_id:
+        return
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        # 작업 기록은 정리됐지만 게시된 실행 폴더가 남아 있으면 그대로 사용 (run_id == job_id)
+        if get_run(job_id) is not None:
+            if app_state.get("run_id") != job_id:
+                app_state["run_id"] = job_id
+                app_state["analysis_done"] = True
+            return
+        app_state["job_id"] = None
+        st.query_params.pop("job", None)
+        return
+    app_state["job_id"] = job_id
+
+    info = job.snapshot()
+    if info["status"] in ACTIVE_STATUSES:
+        with st.status(f"분석 진행 중... ({int(info['progress'] * 100)}%)", expanded=True):
+            st.progress(info["progress"], text=info["message"])
+            for line in info["logs"][-5:]:
+                st.write(line)
+            if st.button("분석 취소", key="cancel_job"):
+                manager.cancel(job_id)
+    elif info["status"] == DONE:
+        if not app_state.get("analysis_done") or app_state.get("run_id") != job.run_id:
+            app_state["analysis_done"] = True
+            app_state["run_id"] = job.run_id
+            app_state["last_analysis_time"] = datetime.fromtimestamp(job.finished_at)
+            st.success("분석이 완료되었습니다!")
+        with st.status("분석 완료", state="complete", expanded=False):
+            for line in info["logs"]:
+                st.write(line)
+    elif info["status"] == FAILED:
+        app_state["error"] = info["error"]
+        st.error(f"분석 중 오류 발생: {info['error']}")
+    elif info["status"] == CANCELLED:
+        st.warning("분석이 취소되었습니다.")
+
+def get_current_run() -> Optional[RunHandle]:
+    """이 세션이 보고 있는 분석 실행 핸들 (없거나 정리된 경우 None)"""
+    return get_run(st.session_state.app_state.get("run_id"))
+
+def poll_active_job():
+    """진행 중인 작업이 있으면 잠시 후 화면을 다시 그려 진행 상태를 갱신"""
+    job_id = st.session_state.app_state.get("job_id")
+    job = get_job_manager().get(job_id) if job_id else None
+    if job is not None and job.is_active:
+        time.sleep(JOB_CONFIG["POLL_INTERVAL_SEC"])
+        st.rerun()
+
+def render_pyeong_selection(complex_no: str, complex_name: str) -> Dict[str, Optional[str]]:
+    """평형 선택 후 비교 목록 후보 반환 (평형을 고르지 않으면 전체 평형)"""
+    pyeong_options = fetch_pyeong_list(str(complex_no))
+    selected_pyeong = st.sidebar.selectbox(
+        "평형 선택",
+        [""] + pyeong_options,  # 빈 문자열을 추가하여 선택 해제 가능
+        key="pyeong"
+    )
+    return {
+        "complexNo": str(complex_no),
+        "complexName": complex_name,
+        "pyeong": selected_pyeong if selected_pyeong else None,
+    }
+
+# 지역 선택 상자 key → 법정동 코드 표 컬럼
+REGION_KEYS = {"sido": "시/도", "sigungu": "시/군/구", "dong": "읍/면/동"}
+
+def render_name_search(region_df: pd.DataFrame) -> Optional[pd.Series]:
+    """단지명 검색 (로컬 단지 목록 색인, 앞부분/중간/초성 일치), 결과를 고르면 해당 단지 행 반환"""
+    catalog_path = DATA_PATHS["CATALOG"]
+    index = load_name_index(str(catalog_path), get_data_version(catalog_path), region_df)
+    query = st.sidebar.text_input(
+        "단지명 검색", key="apt_query", placeholder="단지명 또는 초성 (예: 래미안, ㄹㅁㅇ)",
+        help="저장된 단지 목록에서 검색합니다. 목록에 없는 단지는 아래에서 지역을 골라 찾아 주세요."
+    )
+    if not query:
+        return None
+    results = index.search(query, limit=UI_CONFIG["SEARCH_LIMIT"])
+    if results.empty:
+        st.sidebar.caption("검색 결과가 없습니다." if len(index) else
+                           "저장된 단지 목록이 없습니다. 지역을 골라 단지 목록을 먼저 불러와 주세요.")
+        return None
+    labels = [f"{row['complexName']} · {region_label(row)}" for _, row in results.iterrows()]
+    # 같은 법정동에 이름이 같은 단지가 있으면 단지번호로 구분
+    labels = [f"{label} ({no})" if labels.count(label) > 1 else label
+              for label, no in zip(labels, results["complexNo"])]
+    options = dict(zip(labels, range(len(results))))
+    choice = st.sidebar.selectbox("검색 결과", [""] + list(options), key="apt_search_result")
+    if not choice:
+        return None
+    return results.iloc[options[choice]]
+
+def render_apt_selection(region_df: pd.DataFrame) -> Optional[Dict[str, Optional[str]]]:
+    """비교 단지 선택 UI 컴포넌트 (단지명 검색 또는 지역 → 단지 → 평형), 선택 완료 시 후보 반환"""
+    st.sidebar.subheader("비교 단지 추가")
+    found = render_name_search(region_df)
+    if found is not None:
+        st.sidebar.caption(f"📍 {region_label(found)} · 단지번호 {found['complexNo']}")
+        # 검색어를 지우면 지역 선택이 이 단지의 법정동에서 이어지도록 기억해 둠
+        if all(found[column] for column in REGION_KEYS.values()):
+            st.session_state["apt_search_region"] = {key: found[column] for key, column in REGION_KEYS.items()}
+        return render_pyeong_selection(found["complexNo"], found["complexName"])
+    region = st.session_state.pop("apt_search_region", None)
+    if region:
+        st.session_state.update(region)
     sido_options = get_dropdown_options(region_df, "시/도")
-    selected_sido = st.sidebar.selectbox(f"시/도({prefix})", [""] + sido_options, key=f"sido_{prefix}")
+    selected_sido = st.sidebar.selectbox("시/도", [""] + sido_options, key="sido")
     if not selected_sido:
-        return None, None
+        return None
     sigungu_options = get_sigungu_options(region_df, selected_sido)
-    selected_sigungu = st.sidebar.selectbox(f"시/군/구({prefix})", [""] + sigungu_options, key=f"sigungu_{prefix}")
+    selected_sigungu = st.sidebar.selectbox("시/군/구", [""] + sigungu_options, key="sigungu")
     if not selected_sigungu:
-        return None, None
+        return None
     dong_options = get_dong_options(region_df, selected_sido, selected_sigungu)
-    selected_dong = st.sidebar.selectbox(f"읍/면/동({prefix})", [""] + dong_options, key=f"dong_{prefix}")
+    selected_dong = st.sidebar.selectbox("읍/면/동", [""] + dong_options, key="dong")
     if not selected_dong:
-        return None, None
+        return None
     complexes = fetch_complex_list(str(region_df[
         (region_df["시/도"] == selected_sido) &
         (region_df["시/군/구"] == selected_sigungu) &
         (region_df["읍/면/동"] == selected_dong)
     ]["cortarNo"].iloc[0]))
     if not complexes:
-        return None, None
+        return None
     complex_options = {comp["complexName"]: comp["complexNo"] for comp in complexes}
-    selected_apt = st.sidebar.selectbox(f"아파트{prefix} 단지 선택", [""] + list(complex_options.keys()), key=f"apt_{prefix}")
+    selected_apt = st.sidebar.selectbox("단지 선택", [""] + list(complex_options.keys()), key="apt")
     if not selected_apt:
-        return None, None
-    pyeong_options = fetch_pyeong_list(str(complex_options[selected_apt]))
-    # multiselect를 selectbox로 변경
-    selected_pyeong = st.sidebar.selectbox(
-        f"아파트{prefix} 평형 선택",
-        [""] + pyeong_options,  # 빈 문자열을 추가하여 선택 해제 가능
-        key=f"pyeong_{prefix}"
-    )
-    # 단일 값으로 저장 (리스트가 아님)
-    st.session_state.app_state[f"apt{prefix}_pyeong"] = selected_pyeong if selected_pyeong else None
-    return str(complex_options[selected_apt]), selected_apt
+        return None
+    return render_pyeong_selection(complex_options[selected_apt], selected_apt)
 
-def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFrame):
-    """메인 시각화 컴포넌트"""
+def render_selection_list():
+    """비교 목록 표시 및 개별 삭제"""
+    selections = st.session_state.app_state["selections"]
+    if not selections:
+        return
+    st.sidebar.subheader(f"비교 목록 ({len(selections)})")
+    for i, sel in enumerate(selections):
+        col_name, col_remove = st.sidebar.columns([5, 1])
+        pyeong_text = f" {sel['pyeong']}평" if sel["pyeong"] else " (전체 평형)"
+        col_name.write(f"{sel['complexName']}{pyeong_text}")
+        if col_remove.button("✕", key=f"remove_selection_{i}"):
+            selections.pop(i)
+            st.rerun()
+
+def get_selected_complexes() -> List[str]:
+    """비교 목록의 단지 번호 (중복 제거, 추가 순서 유지)"""
+    selections = st.session_state.app_state["selections"]
+    return list(dict.fromkeys(sel["complexNo"] for sel in selections))
+
+VIZ_SECTIONS = ["📄 기본 정보", "📌 투자 지표 요약", "📈 실거래가 추이", "📊 매물 현황", "🗺️ 주변 단지 비교", "🧬 유사 평형 찾기"]
+# 성능 패널/추적 기록에 쓰는 섹션 이름
+VIZ_SECTION_KEYS = dict(zip(VIZ_SECTIONS, ["basic_info", "metrics", "trend", "listing", "nearby", "similar"]))
+
+def get_selected_pairs() -> List[Tuple[str, str]]:
+    """비교 목록에서 평형까지 선택된 (단지, 평형) 쌍 반환"""
+    selections = st.session_state.app_state["selections"]
+    return list(dict.fromkeys((sel["complexNo"], sel["pyeong"]) for sel in selections if sel["pyeong"]))
+
+@st.cache_data(show_spinner=False)
+def select_trades(path: str, version: float, pairs: Tuple[Tuple[str, str], ...]) -> pd.DataFrame:
+    """선택된 (단지, 평형) 쌍의 실거래 데이터 (데이터셋 버전, 선택 쌍별 캐시)"""
+    df_real = load_real_price_data(path, version)
+    df_pairs = pd.DataFrame(list(pairs), columns=["complexNo", "pyeongName3"]).astype(str)
+    return df_pairs.merge(df_real, on=["complexNo", "pyeongName3"], how="inner")
+
+def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFrame, run: Optional[RunHandle] = None):
+    """메인 시각화 컴포넌트
+
+    섹션 선택기로 고른 섹션만 계산/렌더링하며, 섹션별 계산 결과는 입력 데이터 지문으로 캐시됨.
+    실거래 데이터는 run(이 세션의 실행 폴더)에서 읽음.
+    구간별 소요 시간은 이번 렌더링의 Trace로 모아 성능 패널에 표시함.
+    """
+    with trace("render") as render_trace:
+        _render_visualization(selected_complexes, df_filtered, run)
+    st.session_state.render_trace = render_trace
+
+def _render_visualization(selected_complexes: List[str], df_filtered: pd.DataFrame, run: Optional[RunHandle]):
+    run = run or get_current_run()
+    if run is None:
+        st.error("분석 결과가 만료되었습니다. '분석 실행'을 다시 눌러주세요.")
+        return
+    real_price_path = run.path("REAL_PRICE")
+    real_price_version = get_data_version(real_price_path)
     try:
-        df_real = pd.read_csv(real_price_path, encoding='utf-8-sig')
+        with span("viz.load_cube", "viz"):
+            cube = load_monthly_cube(str(real_price_path), real_price_version)
     except Exception as e:
         st.error(f"price_data.csv 파일을 로드하는 중 오류 발생: {e}")
         return
 
     try:
-        # 데이터 타입 변환 및 필터링 로직
-        df_real["complexNo"] = df_real["complexNo"].astype(str)
-        df_real["pyeongName3"] = df_real["pyeongName3"].astype(str)
-        df_filtered["complexNo"] = df_filtered["complexNo"].astype(str)
-        df_filtered["pyeongName3"] = df_filtered["pyeongName3"].astype(str)
-
-        # 각 아파트의 선택된 평형과 단지 ID 가져오기
-        selected_pyeong_apt1 = st.session_state.app_state.get("apt1_pyeong", None)
-        selected_pyeong_apt2 = st.session_state.app_state.get("apt2_pyeong", None)
-        apt1_complex = st.session_state.app_state.get("apt1_complex", None)
-        apt2_complex = st.session_state.app_state.get("apt2_complex", None)
-
-        # 필터링된 데이터프레임 리스트 초기화
-        df_filtered_list = []
-        df_real_filtered_list = []
-
-        # 아파트1 필터링
-        if apt1_complex and selected_pyeong_apt1:  # selected_pyeong_apt1이 None이 아닌 경우
-            df_filtered_list.append(
-                df_filtered[
-                    (df_filtered["complexNo"] == apt1_complex) &
-                    (df_filtered["pyeongName3"] == selected_pyeong_apt1)  # == 사용
-                ]
-            )
-            df_real_filtered_list.append(
-                df_real[
-                    (df_real["complexNo"] == apt1_complex) &
-                    (df_real["pyeongName3"] == selected_pyeong_apt1)  # == 사용
-                ]
+        # 필터링 로직 (complexNo/pyeongName3은 src/schema.py가 문자열로 읽음)
+        selected_pairs = get_selected_pairs()
+        df_pairs = pd.DataFrame(selected_pairs, columns=["complexNo", "pyeongName3"]).astype(str)
+        df_listing = df_pairs.merge(df_filtered, on=["complexNo", "pyeongName3"], how="inner")
+
+        # 실거래 데이터가 없는 경우 선택 단지 전체 평형으로 대체
+        cube_5 = cube[cube["period"] == 5]
+        if cube_5.merge(df_pairs, on=["complexNo", "pyeongName3"], how="inner").empty:
+            st.warning("선택된 아파트-평형 쌍에 해당하는 데이터가 없습니다.")
+            df_listing = df_filtered[df_filtered["complexNo"].isin(selected_complexes)].copy()
+            selected_pairs = list(
+                cube_5.loc[cube_5["complexNo"].isin(selected_complexes), ["complexNo", "pyeongName3"]]
+                .drop_duplicates().itertuples(index=False, name=None)
             )
+    except Exception as e:
+        st.error(f"데이터 처리 중 오류 발생: {e}")
+        return
 
-        # 아파트2 필터링
-        if apt2_complex and selected_pyeong_apt2:  # selected_pyeong_apt2가 None이 아닌 경우
-            df_filtered_list.append(
-                df_filtered[
-                    (df_filtered["complexNo"] == apt2_complex) &
-                    (df_filtered["pyeongName3"] == selected_pyeong_apt2)  # == 사용
-                ]
-            )
-            df_real_filtered_list.append(
-                df_real[
-                    (df_real["complexNo"] == apt2_complex) &
-                    (df_real["pyeongName3"] == selected_pyeong_apt2)  # == 사용
-                ]
-            )
+    section = st.radio(
+        "섹션 선택",
+        VIZ_SECTIONS,
+        horizontal=True,
+        key="viz_section",
+        label_visibility="collapsed"
+    )
+    with span(f"viz.{VIZ_SECTION_KEYS[section]}", "viz", rows=len(df_listing)):
+        record_frames(df_filtered=df_filtered, df_listing=df_listing, cube=cube)
+        if section == "📄 기본 정보":
+            render_basic_info_section(df_listing)
+        elif section == "📌 투자 지표 요약":
+            render_metrics_section(df_listing, cube, selected_pairs)
+        elif section == "📈 실거래가 추이":
+            with span("viz.select_trades", "viz"):
+                df_real_filtered = select_trades(str(real_price_path), real_price_version, tuple(selected_pairs))
+            render_trend_section(df_real_filtered, cube, selected_pairs)
+        elif section == "📊 매물 현황":
+            render_listing_section(df_listing, run.path("CHANGES"))
+        elif section == "🗺️ 주변 단지 비교":
+            render_nearby_section(selected_complexes, df_filtered, run)
+        else:
+            render_similar_section(selected_pairs, run)
 
-        # 필터링된 결과 합치기
-        df_filtered = pd.concat(df_filtered_list, ignore_index=True) if df_filtered_list else pd.DataFrame()
-        df_real_filtered = pd.concat(df_real_filtered_list, ignore_index=True) if df_real_filtered_list else pd.DataFrame()
+# 성능 패널 표 컬럼 이름
+PERF_COLUMNS = {
+    "label": "항목", "count": "횟수", "total_ms": "합계(ms)", "p50_ms": "p50(ms)",
+    "p95_ms": "p95(ms)", "max_ms": "최대(ms)", "kb": "KB", "errors": "오류",
+}
 
-        # 데이터가 없는 경우 예외 처리
-        if df_real_filtered.empty:
-            st.warning("선택된 아파트-평형 쌍에 해당하는 데이터가 없습니다.")
-            df_real_filtered = df_real[df_real["complexNo"].isin(selected_complexes)].copy()
-            df_filtered = df_filtered[df_filtered["complexNo"].isin(selected_complexes)].copy()
+def _render_perf_table(summary: pd.DataFrame, categories: List[str], title: str):
+    rows = summary[summary["category"].isin(categories)]
+    if rows.empty:
+        return
+    st.caption(title)
+    columns = [c for c in PERF_COLUMNS if c != "kb" or rows["kb"].notna().any()]
+    st.dataframe(
+        rows[columns].rename(columns=PERF_COLUMNS).round(1),
+        hide_index=True, use_container_width=True
+    )
 
-    except Exception as e:
-        st.error(f"데이터 처리 중 오류 발생: {e}")
+def render_performance_panel():
+    """사이드바 "성능" 패널: 최근 분석 작업의 요청/단계별 시간과 직전 화면 렌더링 시간"""
+    if not TRACE_CONFIG["SHOW_PANEL"]:
+        return
+    job_id = st.session_state.app_state.get("job_id")
+    job = get_job_manager().get(job_id) if job_id else None
+    render_trace = st.session_state.get("render_trace")
+    if job is None and render_trace is None:
         return
 
-    # 갭 지수 계산을 여기서 먼저 수행
-    gap_index = None
-    gap_grade = None
-    gap_guide = None
-    
-    # 두 아파트의 월별 평균 실거래가 격차 계산
-    if df_real_filtered is not None and not df_real_filtered.empty:
-        df_rp = df_real_filtered[df_real_filtered["dealDateClass"].isin([5, 3, 1])].copy()
-        if not df_rp.empty:
-            # 기존 계산 로직
-            df_rp["dealAmount_numeric"] = pd.to_numeric(
-                df_rp["dealAmount"].astype(str).str.replace(",", ""),
-                errors="coerce"
+    with st.sidebar.expander("⏱ 성능", expanded=False):
+        if job is not None:
+            summary = job.trace.summary()
+            stages = summary[summary["category"] == "stage"]
+            total = stages.loc[stages["label"].str.startswith("pipeline."), "total_ms"].sum()
+            st.markdown(f"**분석 작업** {total / 1000:.1f}s · 요청 {int(summary.loc[summary['category'] == 'http', 'count'].sum()):,}건")
+            _render_perf_table(summary, ["stage"], "단계")
+            _render_perf_table(summary, ["http"], "API 요청 (엔드포인트별)")
+            _render_perf_table(summary, ["pagination", "task", "parse", "io"], "페이지 조회/단지별 작업/파싱/저장")
+        if render_trace is not None:
+            _render_perf_table(summarize(render_trace.records()), ["viz"], "화면 렌더링 (직전 실행)")
+        records = (job.trace.records() if job is not None else []) + (render_trace.records() if render_trace is not None else [])
+        df_memory = memory_table(records)
+        if not df_memory.empty:
+            st.caption("메모리 (MB, 단계 시작 대비)")
+            st.dataframe(
+                df_memory.assign(
+                    mem_peak_kb=df_memory["mem_peak_kb"] / 1024, mem_retained_kb=df_memory["mem_retained_kb"] / 1024
+                ).drop(columns="duration_ms").rename(columns={
+                    "name": "단계", "mem_peak_kb": "최고", "mem_retained_kb": "잔류", "frames_kb": "DataFrame"
+                }).round(1),
+                hide_index=True, use_container_width=True
             )
-            df_rp["dealAmount_eok"] = df_rp["dealAmount_numeric"] / 10000.0
-            df_rp["color_label"] = df_rp["complexName"].astype(str) + " " + df_rp["pyeongName3"].astype(str) + "평"
-            
-            unique_labels = df_rp["color_label"].unique()
-            if len(unique_labels) == 2:
-                df_rp["dealDate"] = pd.to_datetime(df_rp["dealDate"], errors="coerce")
-                df_rp["year_month"] = df_rp["dealDate"].dt.to_period("M").dt.to_timestamp()
-                df_monthly = df_rp.groupby(["complexName", "pyeongName3", "year_month"], as_index=False).agg({"dealAmount_eok": "mean"})
-                df_monthly["color_label"] = df_monthly["complexName"].astype(str) + " " + df_monthly["pyeongName3"].astype(str) + "평"
-
-                # 피벗 테이블 형태로 변환
-                df_gap = df_monthly.pivot(
-                    index='year_month',
-                    columns='color_label',
-                    values='dealAmount_eok'
-                ).reset_index()
-                
-                # 각 아파트별로 직전 실거래가를 forward/backward fill로 채움
-                df_gap[unique_labels[0]] = df_gap[unique_labels[0]].ffill().bfill()
-                df_gap[unique_labels[1]] = df_gap[unique_labels[1]].ffill().bfill()
-                
-                if not df_gap.empty:
-                    df_gap['price_gap'] = abs(df_gap[unique_labels[0]] - df_gap[unique_labels[1]])
-                    df_gap['is_estimated'] = df_gap[unique_labels[0]].isna() | df_gap[unique_labels[1]].isna()
-                    
-                    # 실제 데이터에서 최대/최소 갭
-                    real_gaps = df_gap.loc[~df_gap['is_estimated'], 'price_gap']
-                    if not real_gaps.empty:
-                        max_real_gap = real_gaps.max()
-                        min_real_gap = real_gaps.min()
-                        latest_gap = df_gap['price_gap'].iloc[-1]
-                        
-                        # 갭 지수 계산
-                        if (max_real_gap - min_real_gap) > 0:
-                            gap_index = ((1-(max_real_gap - latest_gap) / (max_real_gap - min_real_gap)) * 100)
-                            gap_grade, gap_guide = get_buy_recommendation(gap_index)
-
-    # 기본 정보 테이블 렌더링
+        if TRACE_CONFIG["FILE"]:
+            st.caption(f"추적 기록 파일: {TRACE_CONFIG['FILE']}")
+
+def build_basic_info_table(df_filtered: pd.DataFrame) -> pd.DataFrame:
+    """기본 정보 표 데이터 생성"""
+    df_basic = df_filtered.groupby("complexName", as_index=False, observed=True).first()
+    df_basic["세대수(임대)"] = df_basic.apply(
+        lambda x: f"{int(x['totalHouseholdCount']):,}({int(x['totalLeaseHouseholdCount']):,})"
+                  if pd.notnull(x['totalHouseholdCount']) and pd.notnull(x['totalLeaseHouseholdCount'])
+                  else "",
+        axis=1
+    )
+    df_basic["사용승인"] = df_basic["useApproveYmd"].apply(format_date)
+    df_basic["동 수"] = df_basic["totalDongCount"].fillna(0).astype(int)
+    df_basic["최고층수"] = df_basic["highFloor"].fillna(0).astype(int)
+    df_basic["세대당 주차대수"] = df_basic["parkingCountByHousehold"].apply(
+        lambda x: f"{float(x):.2f}" if pd.notnull(x) else ""
+    )
+    df_basic["용적률"] = df_basic["batlRatio"].apply(
+        lambda x: f"{int(x)}%" if pd.notnull(x) else ""
+    )
+    df_basic["건폐율"] = df_basic["btlRatio"].apply(
+        lambda x: f"{int(x)}%" if pd.notnull(x) else ""
+    )
+    df_basic["배정 초교(도보 소요시간)"] = df_basic.apply(
+        lambda x: f"{x['schoolName']}({int(x['walkTime'])}분)"
+                  if pd.notnull(x['schoolName']) and pd.notnull(x['walkTime']) else "",
+        axis=1
+    )
+    df_basic["평형구성"] = fill_text_series(df_basic["pyoengNames"])
+    df_basic["매물수"] = df_basic["dealCount_y"].fillna(0).astype(int)
+    df_basic["매물등록률"] = fill_text_series(df_basic["매매매물출현율_y"], na="0")
+    display_cols = ["complexName", "세대수(임대)", "사용승인", "동 수", "최고층수",
+                    "세대당 주차대수", "용적률", "건폐율", "배정 초교(도보 소요시간)",
+                    "평형구성", "매물수", "매물등록률"]
+    col_rename = {"complexName": "아파트명"}
+    return df_basic[display_cols].rename(columns=col_rename)
+
+def render_basic_info_section(df_filtered: pd.DataFrame):
+    """기본 정보 섹션"""
     st.subheader("📄 기본 정보")
     try:
         if df_filtered.empty:
             st.info("선택된 아파트 데이터가 없습니다.")
         else:
-            df_basic = df_filtered.groupby("complexName", as_index=False).first()
-            df_basic["세대수(임대)"] = df_basic.apply(
-                lambda x: f"{int(x['totalHouseholdCount']):,}({int(x['totalLeaseHouseholdCount']):,})"
-                          if pd.notnull(x['totalHouseholdCount']) and pd.notnull(x['totalLeaseHouseholdCount'])
-                          else "",
-                axis=1
-            )
-            df_basic["사용승인"] = df_basic["useApproveYmd"].apply(format_date)
-            df_basic["동 수"] = df_basic["totalDongCount"].fillna(0).astype(int)
-            df_basic["최고층수"] = df_basic["highFloor"].fillna(0).astype(int)
-            df_basic["세대당 주차대수"] = df_basic["parkingCountByHousehold"].apply(
-                lambda x: f"{float(x):.2f}" if pd.notnull(x) else ""
-            )
-            df_basic["용적률"] = df_basic["batlRatio"].apply(
-                lambda x: f"{int(x)}%" if pd.notnull(x) else ""
-            )
-            df_basic["건폐율"] = df_basic["btlRatio"].apply(
-                lambda x: f"{int(x)}%" if pd.notnull(x) else ""
-            )
-            df_basic["배정 초교(도보 소요시간)"] = df_basic.apply(
-                lambda x: f"{x['schoolName']}({int(x['walkTime'])}분)"
-                          if pd.notnull(x['schoolName']) and pd.notnull(x['walkTime']) else "",
-                axis=1
-            )
-            df_basic["평형구성"] = df_basic["pyoengNames"].fillna("")
-            df_basic["매물수"] = df_basic["dealCount_y"].fillna(0).astype(int)
-            df_basic["매물등록률"] = df_basic["매매매물출현율_y"].fillna(0)
-            display_cols = ["complexName", "세대수(임대)", "사용승인", "동 수", "최고층수",
-                            "세대당 주차대수", "용적률", "건폐율", "배정 초교(도보 소요시간)",
-                            "평형구성", "매물수", "매물등록률"]
-            col_rename = {"complexName": "아파트명"}
-            df_show = df_basic[display_cols].rename(columns=col_rename)
+            df_show = memoize_by_fingerprint(build_basic_info_table, df_filtered)
             st.table(df_show.style.set_table_styles([
                 {"selector": "th", "props": [("background-color", "#f0f2f6"), ("font-weight", "bold")]}
             ]))
     except Exception as e:
         st.error(f"기본 정보 렌더링 중 오류: {e}")
 
-    st.markdown("<hr>", unsafe_allow_html=True)
-
-    # 투자 지표 요약 섹션 (HTML 테이블로 수정)
+def build_bubble_summary(df_metrics: pd.DataFrame) -> pd.DataFrame:
+    """아파트별 버블 지수 요약 (평형별 중위값의 평균)"""
+    # 아파트-평형별로 그룹화하여 bubble_score의 중위값 계산
+    df_bubble = df_metrics.groupby(['complexNo', 'complexName', 'pyeongName3'], observed=True)['bubble_score'].median().reset_index()
+    df_bubble = df_bubble.groupby('complexName', observed=True).agg({
+        'bubble_score': 'mean',
+        'pyeongName3': 'first'  # 평형 정보 추가
+    }).reset_index()
+    return df_bubble
+
+# --- 투자 지표 요약 HTML 템플릿 (툴팁 CSS는 styles.STREAMLIT_STYLE에 포함) ---
+GAP_TOOLTIP_TEXT = (
+    "갭 지수: 두 아파트 간 실거래가 갭에 따른 매수 추천 등급 (쌍별)\n"
+    "80점↑: 유의 🔴 - 매수 비추\n"
+    "40~80점: 중립 🟡 - 매수 신중\n"
+    "40점↓: 추천 🟢 - 매수 검토"
+)
+BUBBLE_TOOLTIP_TEXT = (
+    "버블 지수 : 실거래가 대비 매물호가의 괴리에 따른 매수 추천 등급\n"
+    "100점↑: 높음 🔴 - 매수 비추\n"
+    "80~100점: 주의 🟡 - 매수 신중\n"
+    "80점↓: 보통 🟢 - 매수 검토"
+)
+_CELL_STYLE = "border: 1px solid #e0e0e0; padding: 8px;"
+_HEADER_STYLE = "background-color: #f0f2f6; font-weight: bold; text-align: center;"
+_TABLE_HEAD = (
+    "<table style='border-collapse: collapse; width: 100%;'>"
+    f"<tr style='{_HEADER_STYLE}'>"
+    f"<th style='{_CELL_STYLE} width: 50%;'>{{name_header}}</th>"
+    f"<th style='{_CELL_STYLE} width: 50%;' data-tooltip='{{tooltip}}'>{{score_header}}</th>"
+    "</tr>"
+)
+_TABLE_ROW = (
+    "<tr style='text-align: center;'>"
+    f"<td style='{_CELL_STYLE}'>{{name}}</td>"
+    f"<td style='{_CELL_STYLE}'>{{score}}</td>"
+    "</tr>"
+)
+_SCORE_CELL = "{score}점 ({grade})<br><span style='color: gray; font-size: 0.9em;'>{guide}</span>"
+
+def _render_score_table(name_header: str, score_header: str, tooltip: str, rows: List[Tuple[str, str]]) -> str:
+    head = _TABLE_HEAD.format(name_header=name_header, score_header=score_header, tooltip=tooltip)
+    body = "".join(_TABLE_ROW.format(name=name, score=score) for name, score in rows)
+    return head + body + "</table>"
+
+def _score_cell(score: float, grade_func) -> str:
+    """점수를 정수로 반올림해 등급/가이드와 함께 표시 (점수가 없으면 '-')"""
+    if pd.isnull(score):
+        return "-"
+    score_int = int(round(score, 0))
+    grade, guide = grade_func(score_int)
+    return _SCORE_CELL.format(score=score_int, grade=grade, guide=guide)
+
+def build_metrics_html(df_metrics: pd.DataFrame, df_monthly_5: pd.DataFrame, gap_labels: List[str]) -> Tuple[str, Optional[str]]:
+    """투자 지표 요약 HTML 생성 (버블 지수 테이블, 쌍별 갭 지수 테이블)
+
+    입력 지문 기반으로 메모이즈되므로 입력이 같으면 재실행 시 다시 계산하지 않음.
+    갭 지수를 계산할 쌍이 없으면 두 번째 값은 None.
+    """
+    df_bubble = build_bubble_summary(df_metrics)
+    bubble_html = _render_score_table("아파트", "버블 지수", BUBBLE_TOOLTIP_TEXT, [
+        (f"{name}<br>{pyeong}평", _score_cell(score, get_bubble_grade))
+        for name, pyeong, score in zip(df_bubble["complexName"], df_bubble["pyeongName3"], df_bubble["bubble_score"])
+    ])
+
+    df_pair_gaps = compute_pairwise_gap_indices(df_monthly_5, gap_labels)
+    if df_pair_gaps.empty:
+        return bubble_html, None
+    gap_html = "<br>" + _render_score_table("비교 단지", "갭 지수", GAP_TOOLTIP_TEXT, [
+        (f"{label_a}<br>↔ {label_b}", _score_cell(gap_index, get_buy_recommendation))
+        for label_a, label_b, gap_index in zip(df_pair_gaps["label_a"], df_pair_gaps["label_b"], df_pair_gaps["gap_index"])
+    ])
+    return bubble_html, gap_html
+
+def render_metrics_section(df_filtered: pd.DataFrame, cube: pd.DataFrame, selected_pairs: List[Tuple[str, str]]):
+    """투자 지표 요약 섹션 (HTML 테이블)"""
     st.subheader("📌 투자 지표 요약")
 
-    # 먼저, 커스텀 툴팁용 CSS를 삽입합니다.
-    st.markdown("""
-    <style>
-    th[data-tooltip] {
-        position: relative;
-    }
-    th[data-tooltip]::after {
-        content: attr(data-tooltip);
-        white-space: pre-line;
-        position: absolute;
-        bottom: -120%;
-        left: 50%;
-        transform: translateX(-50%);
-        background: rgba(85, 85, 85, 0.7); /* #555 대신 90% 불투명으로 설정 */
-        color: #fff;
-        padding: 8px;
-        border-radius: 4px;
-        opacity: 0;
-        visibility: hidden;
-        transition: opacity 0.3s;
-        z-index: 100;
-        width: 300px;
-        text-align: left;
-    }
-    th[data-tooltip]:hover::after {
-        opacity: 1;
-        visibility: visible;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     try:
         if not df_filtered.empty:
             # 매매 데이터만 필터링
@@ -497,76 +560,21 @@ def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFram
                     st.error("bubble_score 컬럼이 df_metrics에 없습니다. 데이터 파일을 확인하세요.")
                     df_metrics['bubble_score'] = 50  # 기본값 설정
 
-                # 아파트-평형별로 그룹화하여 bubble_score의 중위값 계산
-                df_bubble = df_metrics.groupby(['complexNo', 'complexName', 'pyeongName3'])['bubble_score'].median().reset_index()
-                df_bubble = df_bubble.groupby('complexName').agg({
-                    'bubble_score': 'mean',
-                    'pyeongName3': 'first'  # 평형 정보 추가
-                }).reset_index()
-
-                # 다중 줄 툴팁 텍스트 (줄바꿈은 \n 사용)
-                gap_tooltip_text = (
-                    "갭 지수: 두 아파트 간 실거래가 갭에 따른 매수 추천 등급\n"
-                    "80점↑: 유의 🔴 - 매수 비추\n"
-                    "40~80점: 중립 🟡 - 매수 신중\n"
-                    "40점↓: 추천 🟢 - 매수 검토"
-                )
-                bubble_tooltip_text = (
-                    "버블 지수 : 실거래가 대비 매물호가의 괴리에 따른 매수 추천 등급\n"
-                    "100점↑: 높음 🔴 - 매수 비추\n"
-                    "80~100점: 주의 🟡 - 매수 신중\n"
-                    "80점↓: 보통 🟢 - 매수 검토"
-                )
+                # 갭 지수 (최근 5년 월별 집계 기준, 모든 단지 쌍)
+                df_monthly_5 = query_monthly(cube, selected_pairs, period=5)
+                gap_labels = list(df_monthly_5["color_label"].unique())
 
-                # HTML 테이블 생성
-                html_table = "<table style='border-collapse: collapse; width: 100%;'>"
-                
-                # 헤더 행 (전체 열 영역에 data-tooltip 적용)
-                html_table += "<tr style='background-color: #f0f2f6; font-weight: bold; text-align: center;'>"
-                html_table += "<th style='border: 1px solid #e0e0e0; padding: 8px; width: 34%;'>아파트</th>"
-                html_table += f"<th style='border: 1px solid #e0e0e0; padding: 8px; width: 33%;' data-tooltip='{gap_tooltip_text}'>갭 지수</th>"
-                html_table += f"<th style='border: 1px solid #e0e0e0; padding: 8px; width: 33%;' data-tooltip='{bubble_tooltip_text}'>버블 지수</th>"
-                html_table += "</tr>"
-
-                # 데이터 행 (두 개의 단지 행; 갭 지수는 두 행에 걸쳐 병합)
-                if len(df_bubble) >= 2:  # 최소 두 개의 단지가 필요
-                    # 첫 번째 단지
-                    row1 = df_bubble.iloc[0]
-                    bubble_score1 = int(round(row1['bubble_score'], 0))
-                    bubble_grade1, bubble_guide1 = get_bubble_grade(bubble_score1)
-                    bubble_cell1 = f"{bubble_score1}점 ({bubble_grade1})<br><span style='color: gray; font-size: 0.9em;'>{bubble_guide1}</span>"
-
-                    # 두 번째 단지
-                    row2 = df_bubble.iloc[1]
-                    bubble_score2 = int(round(row2['bubble_score'], 0))
-                    bubble_grade2, bubble_guide2 = get_bubble_grade(bubble_score2)
-                    bubble_cell2 = f"{bubble_score2}점 ({bubble_grade2})<br><span style='color: gray; font-size: 0.9em;'>{bubble_guide2}</span>"
-
-                    # 갭 지수 정보 (두 행에 걸쳐 표시)
-                    if gap_index is not None:
-                        gap_index_int = int(round(gap_index, 0))  # 소수점 제거 및 정수 변환
-                        gap_grade, gap_guide = get_buy_recommendation(gap_index_int)
-                        gap_cell = f"{gap_index_int}점 ({gap_grade})<br><span style='color: gray; font-size: 0.9em;'>{gap_guide}</span>"
-                    else:
-                        gap_cell = "-"
-
-                    # 첫 번째 행 (아파트명 + 평형, 갭 지수(병합), 버블 지수)
-                    html_table += "<tr style='text-align: center;'>"
-                    html_table += f"<td style='border: 1px solid #e0e0e0; padding: 8px;'>{row1['complexName']}<br>{row1['pyeongName3']}평</td>"
-                    html_table += f"<td style='border: 1px solid #e0e0e0; padding: 8px;' rowspan='2'>{gap_cell}</td>"
-                    html_table += f"<td style='border: 1px solid #e0e0e0; padding: 8px;'>{bubble_cell1}</td>"
-                    html_table += "</tr>"
-
-                    # 두 번째 행 (아파트명 + 평형, 버블 지수)
-                    html_table += "<tr style='text-align: center;'>"
-                    html_table += f"<td style='border: 1px solid #e0e0e0; padding: 8px;'>{row2['complexName']}<br>{row2['pyeongName3']}평</td>"
-                    html_table += f"<td style='border: 1px solid #e0e0e0; padding: 8px;'>{bubble_cell2}</td>"
-                    html_table += "</tr>"
+                bubble_html, gap_html = memoize_by_fingerprint(
+                    build_metrics_html,
+                    df_metrics[["complexNo", "complexName", "pyeongName3", "bubble_score"]],
+                    df_monthly_5[MONTHLY_COLUMNS],
+                    gap_labels,
+                )
+                st.markdown(bubble_html, unsafe_allow_html=True)
+                if gap_html is None:
+                    st.warning("갭 지수를 계산하려면 실거래 데이터가 있는 두 개 이상의 단지-평형이 필요합니다.")
                 else:
-                    st.warning("두 개 이상의 단지가 필요합니다.")
-
-                html_table += "</table>"
-                st.markdown(html_table, unsafe_allow_html=True)
+                    st.markdown(gap_html, unsafe_allow_html=True)
             else:
                 st.warning("매매 데이터가 없습니다.")
         else:
@@ -574,9 +582,20 @@ def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFram
     except Exception as e:
         st.error(f"투자 지표 요약 렌더링 중 오류: {e}")
 
-    st.markdown("<hr>", unsafe_allow_html=True)
-
-    # 실거래가 추이 그래프 렌더링
+def build_trade_table(df_rp: pd.DataFrame) -> pd.DataFrame:
+    """실거래 내역 표 데이터 생성"""
+    df_table = df_rp.copy()
+    df_table["거래일"] = df_table["dealDate"].dt.strftime("%Y.%m.%d").fillna("-")
+    df_table["아파트명"] = fill_text_series(df_table["complexName"], na="-")
+    df_table["평형타입"] = df_table["pyeongName2"].fillna("-")
+    df_table["층수"] = format_int_series(df_table["floor"], na="-")
+    df_table["실거래가"] = format_eokwan_series(df_table["dealAmount_numeric"])
+    df_table.sort_values(by="dealDate", ascending=False, inplace=True)
+    final_cols_table = ["거래일", "아파트명", "평형타입", "층수", "실거래가"]
+    return df_table[final_cols_table]
+
+def render_trend_section(df_real_filtered: pd.DataFrame, cube: pd.DataFrame, selected_pairs: List[Tuple[str, str]]):
+    """실거래가 추이 섹션 (차트 + 실거래 내역 표)"""
     st.subheader("📈 실거래가 추이")
     try:
         period_option = st.radio(
@@ -585,413 +604,220 @@ def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFram
             horizontal=True,
             label_visibility="collapsed"
         )
-        if period_option == "최근 5년간":
-            allowed = [5, 3, 1]
-        elif period_option == "최근 3년간":
-            allowed = [3, 1]
-        else:
-            allowed = [1]
+        period = {"최근 5년간": 5, "최근 3년간": 3, "최근 1년간": 1}[period_option]
 
-        df_rp = df_real_filtered[df_real_filtered["dealDateClass"].isin(allowed)].copy()
+        df_rp = df_real_filtered[df_real_filtered["dealDateClass"].isin(PERIOD_CLASSES[period])].copy()
 
         if not df_rp.empty:
-            if "dealAmount_numeric" not in df_rp.columns:
-                df_rp["dealAmount_numeric"] = pd.to_numeric(
-                    df_rp["dealAmount"].astype(str).str.replace(",", ""),
-                    errors="coerce"
-                )
-            if df_rp["dealDate"].dtype == object:
-                df_rp["dealDate"] = pd.to_datetime(df_rp["dealDate"], errors="coerce")
-            df_rp["dealAmount_eok"] = df_rp["dealAmount_numeric"] / 10000.0
-            df_rp["color_label"] = df_rp["complexName"].astype(str) + " " + df_rp["pyeongName3"].astype(str) + "평"
-            df_rp["year_month"] = df_rp["dealDate"].dt.to_period("M").dt.to_timestamp()
-            df_monthly = df_rp.groupby(["complexName", "pyeongName3", "year_month"], as_index=False).agg({"dealAmount_numeric": "mean"})
-            df_monthly["dealAmount_eok"] = df_monthly["dealAmount_numeric"] / 10000.0
-            df_monthly["color_label"] = df_monthly["complexName"].astype(str) + " " + df_monthly["pyeongName3"].astype(str) + "평"
-
-            colors = px.colors.qualitative.Set1
-            unique_labels = df_rp["color_label"].unique()
-            color_map = {label: colors[i % len(colors)] for i, label in enumerate(unique_labels)}
-
-            # 두 아파트의 월별 평균 실거래가 격차 계산
-            if len(unique_labels) == 2:
-                # 피벗 테이블 형태로 변환
-                df_gap = df_monthly.pivot(
-                    index='year_month',
-                    columns='color_label',
-                    values='dealAmount_eok'
-                ).reset_index()
-                
-                # 각 아파트별로 직전 실거래가를 forward/backward fill로 채움
-                df_gap[unique_labels[0]] = (
-                    df_gap[unique_labels[0]]
-                    .ffill()
-                    .bfill()
-                )
-                df_gap[unique_labels[1]] = (
-                    df_gap[unique_labels[1]]
-                    .ffill()
-                    .bfill()
+            # 월별 평균은 집계 큐브에서 조회 (재파싱/재집계 없음)
+            df_monthly = query_monthly(cube, selected_pairs, period)
+
+            unique_labels = list(df_rp["color_label"].unique())
+
+            # 두 아파트의 월별 평균 실거래가 격차 계산 (3개 이상이면 비교할 쌍 선택)
+            df_gap = pd.DataFrame()
+            gap_pair = unique_labels
+            if len(unique_labels) > 2:
+                pair_options = {f"{a} ↔ {b}": [a, b] for a, b in combinations(unique_labels, 2)}
+                gap_pair = pair_options[st.selectbox("갭 비교 쌍", list(pair_options), key="gap_pair")]
+            if len(gap_pair) == 2:
+                df_gap = compute_gap_frame(df_monthly[df_monthly["color_label"].isin(gap_pair)], gap_pair)
+
+            # 대용량 차트: WebGL 트레이스 + LTTB 다운샘플링, 확대 구간을 좁히면 원본 해상도로 표시
+            use_webgl = len(df_rp) > CHART_CONFIG["WEBGL_POINT_THRESHOLD"]
+            df_daily = df_rp
+            x_range = None
+            if use_webgl:
+                date_min = df_rp["dealDate"].min().date()
+                date_max = df_rp["dealDate"].max().date()
+                zoom_start, zoom_end = st.slider(
+                    "확대 구간",
+                    min_value=date_min,
+                    max_value=date_max,
+                    value=(date_min, date_max),
+                    format="YY.MM.DD"
                 )
-                
-                if not df_gap.empty:
-                    # 실거래가 격차 계산 (절대값)
-                    df_gap['price_gap'] = abs(df_gap[unique_labels[0]] - df_gap[unique_labels[1]])
-                    # 툴팁용 날짜 포맷
-                    df_gap['tooltip_date'] = df_gap['year_month'].dt.strftime("'%y.%m월")
-                    # 값이 채워진 것인지 표시
-                    df_gap['is_filled_0'] = df_gap[unique_labels[0]].ne(df_gap[unique_labels[0]].shift())
-                    df_gap['is_filled_1'] = df_gap[unique_labels[1]].ne(df_gap[unique_labels[1]].shift())
-                    df_gap['is_estimated'] = (~df_gap['is_filled_0']) | (~df_gap['is_filled_1'])
-
-            fig_line = go.Figure()
-            fig_line.update_layout(hovermode="closest")
-
-            # 실제 데이터와 추정치 데이터 처리 전에 갭 지수 계산
-            if len(unique_labels) == 2 and not df_gap.empty:
-                # 실제 데이터에서 최대/최소 갭
-                real_gaps = df_gap.loc[~df_gap['is_estimated'], 'price_gap']
-                max_real_gap = real_gaps.max()
-                min_real_gap = real_gaps.min()
-                # 가장 최근 갭 (추정치 포함)
-                latest_gap = df_gap['price_gap'].iloc[-1]
-                
-                # 갭 지수 계산 ((1-(최대갭-최신갭)/(최대갭-최소갭))×100)
-                gap_index = ((1-(max_real_gap - latest_gap) / (max_real_gap - min_real_gap)) * 100) if (max_real_gap - min_real_gap) > 0 else 0
-                gap_grade, gap_guide = get_buy_recommendation(gap_index)
-
-                mask_real = ~df_gap['is_estimated']
-                mask_estimated = df_gap['is_estimated']
-
-                # Bar 차트 추가 (이전 코드와 동일)
-                if mask_real.any():
-                    fig_line.add_trace(go.Bar(
-                        x=df_gap.loc[mask_real, 'year_month'],
-                        y=df_gap.loc[mask_real, 'price_gap'],
-                        name='실거래가 갭',
-                        marker_color='rgba(180, 180, 180, 0.6)',
-                        yaxis='y2',
-                        hovertemplate='%{customdata[0]}<br>갭 금액: %{y:.1f}억<extra></extra>',
-                        customdata=df_gap.loc[mask_real, ['tooltip_date']].values
-                    ))
-
-                if mask_estimated.any():
-                    fig_line.add_trace(go.Bar(
-                        x=df_gap.loc[mask_estimated, 'year_month'],
-                        y=df_gap.loc[mask_estimated, 'price_gap'],
-                        name='실거래가 갭(추정)',
-                        marker_color='rgba(180, 180, 180, 0.2)',
-                        yaxis='y2',
-                        hovertemplate='%{customdata[0]}<br>갭 금액(추정): %{y:.1f}억<extra></extra>',
-                        customdata=df_gap.loc[mask_estimated, ['tooltip_date']].values
-                    ))
-
-            for label in unique_labels:
-                monthly_sub = df_monthly[df_monthly["color_label"] == label].sort_values("year_month")
-                if not monthly_sub.empty:
-                    fig_line.add_trace(go.Scatter(
-                        x=monthly_sub["year_month"],
-                        y=monthly_sub["dealAmount_eok"],
-                        mode="lines",
-                        name=label,
-                        hoverinfo="skip",
-                        line=dict(color=color_map[label])
-                    ))
-
-            for label in unique_labels:
-                daily_sub = df_rp[df_rp["color_label"] == label].sort_values("dealDate")
-                def make_daily_tooltip(row):
-                    deal_date_str = row["dealDate"].strftime("%Y.%m.%d") if not pd.isnull(row["dealDate"]) else "-"
-                    floor_str = f"{int(row['floor'])}층" if not pd.isnull(row["floor"]) else "-"
-                    price_str = format_eokwan(row["dealAmount_numeric"])
-                    return f"{row['complexName']}<br>{deal_date_str}<br>{row['pyeongName2']} / {floor_str}<br>{price_str}"
-                daily_sub["tooltip"] = daily_sub.apply(make_daily_tooltip, axis=1)
-                if not daily_sub.empty:
-                    fig_line.add_trace(go.Scatter(
-                        x=daily_sub["dealDate"],
-                        y=daily_sub["dealAmount_eok"],
-                        mode="markers",
-                        marker=dict(size=6, opacity=0.3, color=color_map[label]),
-                        showlegend=False,
-                        hovertemplate="%{text}<extra></extra>",
-                        text=daily_sub["tooltip"]
-                    ))
-
-            fig_line.update_xaxes(tickformat="'%y.%m월", hoverformat="'%y.%m월")
-            fig_line.update_yaxes(tickformat=".0f", ticksuffix="억")
-            fig_line.update_layout(
-                xaxis_title="",
-                yaxis_title="",
-                yaxis2=dict(
-                    overlaying='y',
-                    side='right',
-                    showgrid=False,
-                    tickformat=".1f",
-                    ticksuffix="억"
-                ),
-                legend=dict(
-                    bgcolor='rgba(255,255,255,0)',
-                    bordercolor='rgba(255,255,255,0)',
-                    x=0.01,  # 왼쪽 여백에서의 위치
-                    y=1.15,  # 그래프 위쪽으로 이동
-                    orientation='h'  # 범례를 가로로 배열
-                ),
-                legend_title="",
-                margin=dict(l=20, r=20, t=40, b=10),  # 상단 여백 증가
-                autosize=True,
-                bargap=0.3
+                df_daily = df_rp[
+                    (df_rp["dealDate"] >= pd.Timestamp(zoom_start)) &
+                    (df_rp["dealDate"] < pd.Timestamp(zoom_end) + pd.Timedelta(days=1))
+                ]
+                x_range = (pd.Timestamp(zoom_start), pd.Timestamp(zoom_end))
+
+            # 입력 데이터 지문이 같으면 캐시된 figure 재사용
+            fig_line, shown_points = memoize_by_fingerprint(
+                build_trend_figure,
+                df_daily[DAILY_COLUMNS],
+                df_monthly[MONTHLY_COLUMNS],
+                df_gap,
+                unique_labels,
+                x_range=x_range,
+                downsample_target=CHART_CONFIG["DOWNSAMPLE_TARGET"] if use_webgl else None
             )
             st.plotly_chart(fig_line, use_container_width=True)
+            if use_webgl:
+                st.caption(
+                    f"거래 {len(df_daily):,}건 중 {shown_points:,}건 표시 (추이 형태 보존 샘플링) · "
+                    "확대 구간을 좁히면 원본 해상도로 표시됩니다."
+                )
 
-            df_table = df_rp.copy()
-            df_table["거래일"] = df_table["dealDate"].apply(lambda x: x.strftime("%Y.%m.%d") if not pd.isnull(x) else "-")
-            df_table["아파트명"] = df_table["complexName"].fillna("-")
-            df_table["평형타입"] = df_table["pyeongName2"].fillna("-")
-            df_table["층수"] = df_table["floor"].apply(lambda x: str(int(x)) if pd.notnull(x) else "-")
-            df_table["실거래가"] = df_table["dealAmount_numeric"].apply(format_eokwan)
-            df_table.sort_values(by="dealDate", ascending=False, inplace=True)
-            final_cols_table = ["거래일", "아파트명", "평형타입", "층수", "실거래가"]
-            st.dataframe(df_table[final_cols_table], use_container_width=True)
+            df_table = memoize_by_fingerprint(
+                build_trade_table,
+                df_rp[["dealDate", "complexName", "pyeongName2", "floor", "dealAmount_numeric"]]
+            )
+            st.dataframe(df_table, use_container_width=True)
     except Exception as e:
         st.error(f"실거래가 추이 렌더링 중 오류: {e}")
 
-    st.markdown("<hr>", unsafe_allow_html=True)
+def build_listing_table(df_for_list: pd.DataFrame) -> pd.DataFrame:
+    """매물 리스트 표 데이터 생성"""
+    df_for_list = df_for_list.copy()
+    df_for_list["price_numeric"] = df_for_list["dealOrWarrantPrc2"]
+    df_for_list.sort_values("price_numeric", inplace=True)
+    # 표시용 컬럼은 모두 벡터화 포맷 함수로 생성 (행 단위 apply 없음)
+    df_for_list["호가"] = format_eokwan_series(df_for_list["price_numeric"])
+    df_for_list["아파트명"] = df_for_list["complexName"]
+    df_for_list["거래유형"] = df_for_list["tradeTypeName"]
+    df_for_list["층수"] = fill_text_series(df_for_list["floorInfo"])
+    df_for_list["평형타입"] = df_for_list["pyeongName"].fillna("")
+    df_for_list["공급면적(㎡)"] = df_for_list["area1"].fillna(0).astype(int)
+    df_for_list["전용면적(㎡)"] = df_for_list["area2"].fillna(0).astype(int)
+    df_for_list["방향"] = fill_text_series(df_for_list["direction"])
+    df_for_list["동"] = fill_text_series(df_for_list["buildingName"])
+
+    df_for_list["매물등록일"] = format_ymd_series(df_for_list["articleConfirmYmd"])
+    df_for_list["변동"] = df_for_list["change_badge"].fillna("") if "change_badge" in df_for_list else ""
+    df_for_list["동일매물등록수"] = df_for_list["sameAddrCnt"].fillna(0).astype(int)
+    df_for_list["동일타입세대수"] = df_for_list["householdCountByPyeong"].fillna(0).astype(int)
+    df_for_list["동일타입매물수"] = df_for_list["dealCount_x"].fillna(0).astype(int)
+    df_for_list["동일타입매물등록률"] = df_for_list["매매매물출현율_x"]
+
+    df_for_list["실거래가 전고점"] = format_thousands_series(df_for_list["pyeong_max_5"])
+    df_for_list["실거래가 평균"] = format_thousands_series(df_for_list["pyeong_avg_5"])
+    df_for_list["실거래가 전저점"] = format_thousands_series(df_for_list["pyeong_min_5"])
+
+    df_for_list["실거래가 전고점 갭"] = plain_gap_series(df_for_list["real_max_5_gap"])
+    df_for_list["실거래가 전저점 갭"] = plain_gap_series(df_for_list["real_min_5_gap"])
+
+    df_for_list["KB시세(상위평균)"] = format_eokwan_series(df_for_list["dealUpperPriceLimit"])
+    df_for_list["KB시세(일반평균)"] = format_eokwan_series(df_for_list["dealAveragePrice"])
+    df_for_list["KB시세(하위평균)"] = format_eokwan_series(df_for_list["dealLowPriceLimit"])
+    df_for_list["KB시세 전세가율"] = fill_text_series(df_for_list["leasePerDealRate"])
+
+    df_for_list["상세 설명"] = fill_text_series(df_for_list["articleFeatureDesc"])
+    df_for_list["중개사무소"] = fill_text_series(df_for_list["realtorName"])
+
+    df_for_list["매물 링크"] = (
+        "https://new.land.naver.com/complexes/" + df_for_list["complexNo"] +
+        "?articleNo=" + df_for_list["articleNo"].astype(str)
+    )
+
+    # 컬럼 순서 수정
+    final_cols_list = [
+        "아파트명", "거래유형", "층수", "호가", "변동", "평형타입",
+        "공급면적(㎡)", "전용면적(㎡)", "방향", "동",
+        "매물등록일", "동일매물등록수", "동일타입세대수", "동일타입매물수",
+        "동일타입매물등록률", "실거래가 전고점 갭", "실거래가 전저점 갭",
+        "KB시세(상위평균)", "KB시세(일반평균)", "KB시세(하위평균)", "KB시세 전세가율",
+        "상세 설명", "중개사무소", "매물 링크"
+    ]
+    if not df_for_list["변동"].astype(bool).any():
+        final_cols_list.remove("변동")
+    return df_for_list[final_cols_list]
+
+def select_listing_changes(df_changes: pd.DataFrame, df_listing: pd.DataFrame) -> pd.DataFrame:
+    """변경표 중 화면에 선택된 단지-평형의 매매 매물만 (단지명 포함)"""
+    pairs = df_listing[["complexNo", "pyeongName3"]].drop_duplicates()
+    names = df_listing.drop_duplicates("complexNo").set_index("complexNo")["complexName"]
+    df = df_changes[df_changes["tradeTypeName"] == "매매"].merge(pairs, on=["complexNo", "pyeongName3"], how="inner")
+    df["complexName"] = df["complexNo"].map(names)
+    return df
+
+def build_change_badges(df_changes: pd.DataFrame) -> pd.Series:
+    """articleNo → 매물 리스트 '변동' 칸 배지 (가격 변경은 변동액 포함)"""
+    labels = df_changes["change"].map(CHANGE_LABELS).fillna("")
+    diff = pd.to_numeric(df_changes["price_diff"], errors="coerce")
+    with_diff = labels + " " + format_eokwan_series(diff.abs()).where(diff.notna(), "")
+    badges = labels.where(~df_changes["change"].isin(["price_cut", "price_raised"]), with_diff)
+    return pd.Series(badges.to_numpy(), index=df_changes["articleNo"].to_numpy())
+
+def build_change_table(df_changes: pd.DataFrame) -> pd.DataFrame:
+    """지난 수집 이후 변경 표 데이터 생성 (내려간 매물 포함)"""
+    df = df_changes.copy()
+    df["change"] = pd.Categorical(df["change"], categories=CHANGE_TYPES)
+    df = df.sort_values(["change", "complexName", "pyeongName3"], kind="stable")
+    table = pd.DataFrame({
+        "변경": df["change"].map(CHANGE_LABELS).astype(str),
+        "아파트명": df["complexName"],
+        "평형타입": df["pyeongName"].fillna(""),
+        "동": df["buildingName"].fillna(""),
+        "층수": df["floorInfo"].fillna(""),
+        "이전 호가": format_eokwan_series(df["prev_price"]),
+        "현재 호가": format_eokwan_series(df["price"]),
+        "변동액": (
+            df["price_diff"].gt(0).map({True: "+", False: "-"}) +
+            format_eokwan_series(df["price_diff"].abs())
+        ).where(df["price_diff"].notna(), ""),
+        "매물등록일": format_ymd_series(df["confirm_ymd"].fillna(df["prev_confirm_ymd"])),
+        "매물 링크": (
+            "https://new.land.naver.com/complexes/" + df["complexNo"].astype(str) +
+            "?articleNo=" + df["articleNo"].astype(str)
+        ),
+    })
+    return table.reset_index(drop=True)
+
+def render_change_summary(df_changes: Optional[pd.DataFrame]):
+    """직전 수집 대비 변경 배지 + '지난 수집 이후 변경' 표"""
+    if df_changes is None:
+        st.caption("이전 수집 기록이 없어 변경 내역은 다음 분석부터 표시됩니다.")
+        return
+    counts = df_changes["change"].value_counts()
+    badges = "".join(
+        f"<span class='change-badge'>{CHANGE_LABELS[c]} {int(counts.get(c, 0))}</span>"
+        for c in CHANGE_TYPES if counts.get(c, 0)
+    )
+    st.markdown(badges or "<span class='change-badge'>지난 수집 이후 변경 없음</span>", unsafe_allow_html=True)
+    if not df_changes.empty:
+        with st.expander(f"🔄 지난 수집 이후 변경 ({len(df_changes)}건)"):
+            st.dataframe(
+                memoize_by_fingerprint(build_change_table, df_changes),
+                column_config={"매물 링크": st.column_config.LinkColumn(label="매물 링크", display_text="🔗")},
+                use_container_width=True, hide_index=True
+            )
+
+LISTING_GAP_COLUMNS = ["실거래가 전고점 갭", "실거래가 전저점 갭"]
 
-    # 매물 현황 플롯차트 렌더링 (실거래가표와 매물 리스트표 사이)
+def build_listing_styler(df_show_list: pd.DataFrame):
+    """매물 리스트 Styler (갭 컬럼 색상을 한 번의 벡터 연산으로 지정)"""
+    return df_show_list.style.apply(gap_style_frame, axis=None, subset=LISTING_GAP_COLUMNS)
+
+def render_listing_section(df_filtered: pd.DataFrame, changes_path: Optional[str] = None):
+    """매물 현황 섹션 (직전 수집 대비 변경 + 호가 범위 차트 + 매물 리스트)"""
+    # 매물 현황 플롯차트 렌더링
     st.subheader("📊 매물 현황")
+    df_changes = None
+    if changes_path is not None:
+        df_all_changes = load_listing_changes(str(changes_path), get_data_version(changes_path))
+        if df_all_changes is not None:
+            df_changes = select_listing_changes(df_all_changes, df_filtered)
+    render_change_summary(df_changes)
     if not df_filtered[df_filtered["tradeTypeName"] == "매매"].empty:
         df_for_range = df_filtered[df_filtered["tradeTypeName"] == "매매"].copy()
-        def draw_range_plot(df: pd.DataFrame):
-            group_cols = ["complexName", "pyeongName3"]
-            agg_dict = {
-                "pyeong_max_5": "first",
-                "pyeong_min_5": "first",
-                "latestdealAmount": "first",
-                "latestdealDate": "first",
-                "pyeong_max_5_DT": "first",
-                "pyeong_min_5_DT": "first",
-                "latestdealFloor": "first",
-            }
-            df_group = df.groupby(group_cols, as_index=False).agg(agg_dict)
-            df_group["max_val"] = df_group["pyeong_max_5"].apply(to_number) / 10000
-            df_group["min_val"] = df_group["pyeong_min_5"].apply(to_number) / 10000
-            df_group["latestdealAmount"] = df_group["latestdealAmount"].apply(to_number)
-            df_group["star_val"] = df_group["latestdealAmount"].apply(to_number) / 10000
-            df_group.sort_values(by=["complexName", "pyeongName3"], inplace=True)
-            combos = list(df_group[["complexName", "pyeongName3"]].itertuples(index=False, name=None))
-            x_mapping = {}
-            current_x = 0
-            last_apt = None
-            apt_boundaries = []
-            for (apt, pnum) in combos:
-                if last_apt is not None and apt != last_apt:
-                    apt_boundaries.append(current_x - 0.5)
-                x_mapping[(apt, pnum)] = current_x
-                current_x += 1
-                last_apt = apt
-            fig = go.Figure()
-            for (apt, pnum) in combos:
-                x_val = x_mapping[(apt, pnum)]
-                row_g = df_group[(df_group["complexName"] == apt) & (df_group["pyeongName3"] == pnum)].iloc[0]
-                minv = row_g["min_val"]
-                maxv = row_g["max_val"]
-                starv = row_g["star_val"]
-                star_date = row_g["latestdealDate"]
-                max_date_str = format_date(row_g["pyeong_max_5_DT"])
-                min_date_str = format_date(row_g["pyeong_min_5_DT"])
-                max_str = f"{format_eokwan(row_g['pyeong_max_5'])}({max_date_str})" if max_date_str != "-" else format_eokwan(row_g["pyeong_max_5"])
-                min_str = f"{format_eokwan(row_g['pyeong_min_5'])}({min_date_str})" if min_date_str != "-" else format_eokwan(row_g["pyeong_min_5"])
-                count_points = 20
-                yvals = np.linspace(minv, maxv, count_points)
-                xvals = [x_val]*count_points
-                custom_line = [[max_str, min_str]]*count_points
-                range_hover = (
-                    "최근 5년 전고점 : %{customdata[0]}<br>"
-                    "최근 5년 전저점 : %{customdata[1]}<extra></extra>"
-                )
-                fig.add_trace(go.Scatter(
-                    x=xvals,
-                    y=yvals,
-                    mode="lines",
-                    line=dict(color="blue", width=1),
-                    customdata=custom_line,
-                    hovertemplate=range_hover,
-                    showlegend=False
-                ))
-                top_points = 5
-                xvals_top = np.linspace(x_val-0.1, x_val+0.1, top_points)
-                yvals_top = [maxv]*top_points
-                top_data = [[max_str]]*top_points
-                fig.add_trace(go.Scatter(
-                    x=xvals_top,
-                    y=yvals_top,
-                    mode="lines",
-                    line=dict(color="blue", width=1),
-                    customdata=top_data,
-                    hovertemplate="최근 5년 전고점 : %{customdata[0]}<extra></extra>",
-                    showlegend=False
-                ))
-                bot_points = 5
-                xvals_bot = np.linspace(x_val-0.1, x_val+0.1, bot_points)
-                yvals_bot = [minv]*bot_points
-                bot_data = [[min_str]]*bot_points
-                fig.add_trace(go.Scatter(
-                    x=xvals_bot,
-                    y=yvals_bot,
-                    mode="lines",
-                    line=dict(color="blue", width=1),
-                    customdata=bot_data,
-                    hovertemplate="최근 5년 전저점 : %{customdata[0]}<extra></extra>",
-                    showlegend=False
-                ))
-                df_points = df[(df["complexName"] == apt) & (df["pyeongName3"] == pnum)].copy()
-                if not df_points.empty:
-                    df_points["price_val"] = df_points["dealOrWarrantPrc2"].apply(to_number) / 10000
-                    df_points["gap_html"] = df_points["real_max_5_gap"].apply(color_gap_html)
-                    df_points["tooltip"] = df_points.apply(
-                        lambda r: [
-                            str(r["pyeongName"]),
-                            str(r["floorInfo"]),
-                            str(r["dealOrWarrantPrc"]),
-                            r["gap_html"]
-                        ],
-                        axis=1
-                    )
-                    point_hover = (
-                        "평형타입: %{customdata[0]}<br>"
-                        "층수: %{customdata[1]}<br>"
-                        "호가: %{customdata[2]}<br>"
-                        "전고점 갭: %{customdata[3]}<extra></extra>"
-                    )
-                    fig.add_trace(go.Scatter(
-                        x=[x_val]*len(df_points),
-                        y=df_points["price_val"],
-                        mode="markers",
-                        marker=dict(size=8, color="red", opacity=0.3),
-                        hovertemplate=point_hover,
-                        customdata=df_points["tooltip"].tolist(),
-                        showlegend=False
-                    ))
-                if not pd.isnull(starv) and starv > 0:
-                    star_date_str = format_date(star_date)
-                    star_val_str = format_eokwan(row_g["latestdealAmount"])
-                    latestdealFloor = row_g["latestdealFloor"]
-                    floor_str = f"({int(latestdealFloor)}층)" if pd.notnull(latestdealFloor) and str(latestdealFloor).strip() != "" else ""
-                    label_text = f"최신 실거래가<br>{star_val_str}{floor_str}<br>{star_date_str}"
-                    fig.add_trace(go.Scatter(
-                        x=[x_val],
-                        y=[starv],
-                        mode="markers+text",
-                        text=[label_text],
-                        texttemplate="%{text}",
-                        textposition="middle right",
-                        textfont=dict(color="black", size=11),
-                        marker_symbol="star",
-                        marker_size=15,
-                        marker_color="yellow",
-                        marker_line_color="black",
-                        marker_line_width=1,
-                        opacity=1.0,
-                        hoverinfo="none",
-                        showlegend=False
-                    ))
-            shapes = []
-            for boundary_x in apt_boundaries:
-                shapes.append(dict(
-                    type="line",
-                    xref="x", yref="paper",
-                    x0=boundary_x, x1=boundary_x,
-                    y0=0, y1=1,
-                    line=dict(color="gray", dash="dot")
-                ))
-            fig.update_layout(shapes=shapes)
-            x_vals = [x_mapping[c] for c in combos]
-            x_text = [f"{apt} {pnum}평" for (apt, pnum) in combos]
-            fig.update_xaxes(
-                range=[-0.5, len(combos)-0.5],
-                tickmode="array",
-                tickvals=x_vals,
-                ticktext=x_text
-            )
-            fig.update_yaxes(
-                ticksuffix="억",
-                zeroline=True
-            )
-            fig.update_layout(
-                hovermode="closest",
-                margin=dict(l=10, r=10, t=10, b=10),
-                autosize=True,
-                height=500
-            )
-            return fig
-        fig_range = draw_range_plot(df_for_range)
+        fig_range = memoize_by_fingerprint(
+            build_range_figure,
+            df_for_range[RANGE_COLUMNS],
+            use_webgl=len(df_for_range) > CHART_CONFIG["WEBGL_POINT_THRESHOLD"]
+        )
         st.plotly_chart(fig_range, use_container_width=True)
     
     # 매물 리스트 렌더링 (기존 코드와 동일)
     try:
         if not df_filtered[df_filtered["tradeTypeName"] == "매매"].empty:
-            df_for_list = df_filtered[df_filtered["tradeTypeName"] == "매매"].copy()
-            df_for_list["price_numeric"] = pd.to_numeric(
-                df_for_list["dealOrWarrantPrc2"].astype(str).str.replace(",", ""),
-                errors="coerce"
-            )
-            df_for_list.sort_values("price_numeric", inplace=True)
-            df_for_list["호가"] = df_for_list["price_numeric"].apply(format_eokwan)
-            df_for_list["아파트명"] = df_for_list["complexName"]
-            df_for_list["거래유형"] = df_for_list["tradeTypeName"]
-            df_for_list["층수"] = df_for_list["floorInfo"].fillna("")
-            df_for_list["평형타입"] = df_for_list["pyeongName"].fillna("")
-            df_for_list["공급면적(㎡)"] = df_for_list["area1"].fillna(0).astype(int)
-            df_for_list["전용면적(㎡)"] = df_for_list["area2"].fillna(0).astype(int)
-            df_for_list["방향"] = df_for_list["direction"].fillna("")
-            df_for_list["동"] = df_for_list["buildingName"].fillna("")
-        
-            def format_ymd_local(val):
-                if pd.isnull(val):
-                    return ""
-                val_str = str(val).replace("-", ".").replace("/", ".")
-                parts = val_str.split(".")
-                if len(parts) == 3:
-                    return f"{parts[0]}.{parts[1].zfill(2)}.{parts[2].zfill(2)}"
-                return val_str
-        
-            df_for_list["매물등록일"] = df_for_list["articleConfirmYmd"].apply(format_ymd_local)
-            df_for_list["동일매물등록수"] = df_for_list["sameAddrCnt"].fillna(0).astype(int)
-            df_for_list["동일타입세대수"] = df_for_list["householdCountByPyeong"].fillna(0).astype(int)
-            df_for_list["동일타입매물수"] = df_for_list["dealCount_x"].fillna(0).astype(int)
-            df_for_list["동일타입매물등록률"] = df_for_list["매매매물출현율_x"]
-        
-            df_for_list["실거래가 전고점"] = df_for_list["pyeong_max_5"].apply(lambda x: f"{int(x):,}" if pd.notnull(x) else "")
-            df_for_list["실거래가 평균"] = df_for_list["pyeong_avg_5"].apply(lambda x: f"{int(x):,}" if pd.notnull(x) else "")
-            df_for_list["실거래가 전저점"] = df_for_list["pyeong_min_5"].apply(lambda x: f"{int(x):,}" if pd.notnull(x) else "")
-        
-            df_for_list["실거래가 전고점 갭"] = df_for_list["real_max_5_gap"].apply(plain_gap)
-            df_for_list["실거래가 전저점 갭"] = df_for_list["real_min_5_gap"].apply(plain_gap)
-        
-            df_for_list["KB시세(상위평균)"] = df_for_list["dealUpperPriceLimit"].apply(format_eokwan)
-            df_for_list["KB시세(일반평균)"] = df_for_list["dealAveragePrice"].apply(format_eokwan)
-            df_for_list["KB시세(하위평균)"] = df_for_list["dealLowPriceLimit"].apply(format_eokwan)
-            df_for_list["KB시세 전세가율"] = df_for_list["leasePerDealRate"].fillna("")
-        
-            df_for_list["상세 설명"] = df_for_list["articleFeatureDesc"].fillna("")
-            df_for_list["중개사무소"] = df_for_list["realtorName"].fillna("")
-        
-            def make_link(row):
-                return f"https://new.land.naver.com/complexes/{row['complexNo']}?articleNo={row['articleNo']}"
-            df_for_list["매물 링크"] = df_for_list.apply(make_link, axis=1)
-        
-            # 컬럼 순서 수정
-            final_cols_list = [
-                "아파트명", "거래유형", "층수", "호가", "평형타입",
-                "공급면적(㎡)", "전용면적(㎡)", "방향", "동",
-                "매물등록일", "동일매물등록수", "동일타입세대수", "동일타입매물수",
-                "동일타입매물등록률", "실거래가 전고점 갭", "실거래가 전저점 갭",
-                "KB시세(상위평균)", "KB시세(일반평균)", "KB시세(하위평균)", "KB시세 전세가율",
-                "상세 설명", "중개사무소", "매물 링크"
-            ]
-            df_show_list = df_for_list[final_cols_list].copy()
-        
-            styler = df_show_list.style.applymap(style_gap, subset=["실거래가 전고점 갭", "실거래가 전저점 갭"])
+            df_for_list = df_filtered[df_filtered["tradeTypeName"] == "매매"]
+            if df_changes is not None and not df_changes.empty:
+                df_for_list = df_for_list.assign(change_badge=df_for_list["articleNo"].map(build_change_badges(df_changes)))
+            df_show_list = memoize_by_fingerprint(build_listing_table, df_for_list)
+
+            styler = memoize_resource_by_fingerprint(build_listing_styler, df_show_list)
             st.dataframe(
                 styler,
                 column_config={
@@ -1004,4 +830,125 @@ def render_visualization(selected_complexes: List[str], df_filtered: pd.DataFram
                 use_container_width=True
             )
     except Exception as e:
-        st.error(f"매물 리스트 렌더링 중 오류: {e}")
\ No newline at end of file
+        st.error(f"매물 리스트 렌더링 중 오류: {e}")
+
+def build_nearby_table(df_near: pd.DataFrame, df_stats: pd.DataFrame) -> pd.DataFrame:
+    """주변 단지 비교 표 데이터 생성 (기준 단지가 첫 행, 가격 통계는 이번 분석에 포함된 단지만)"""
+    df = df_near.merge(df_stats.drop(columns="complexName"), on="complexNo", how="left")
+    return pd.DataFrame({
+        "아파트명": df["complexName"].astype(object).fillna(df["complexNo"]),
+        "거리(km)": df["distance_km"].round(2),
+        "세대수": format_thousands_series(df["totalHouseholdCount"]),
+        "사용승인": df["useApproveYmd"].apply(format_date),
+        "매매 매물수": format_int_series(df["sale_listings"], na=""),
+        "호가 중위": format_eokwan_series(df["ask_median"]).where(df["ask_median"].notna(), ""),
+        "평당 호가(만원)": format_thousands_series(df["ask_per_pyeong"].round(0)),
+        "버블 지수": df["bubble_score"].round(1),
+        "최근 실거래가": format_eokwan_series(df["latestdealAmount"]).where(df["latestdealAmount"].notna(), ""),
+        "최근 실거래일": format_ymd_series(df["latestdealDate"]),
+        "단지 링크": "https://new.land.naver.com/complexes/" + df["complexNo"],
+    })
+
+def render_nearby_section(selected_complexes: List[str], df_filtered: pd.DataFrame, run: RunHandle):
+    """주변 단지 비교 섹션 (단지 좌표 격자 색인으로 반경/가까운 순 조회)"""
+    st.subheader("🗺️ 주변 단지 비교")
+    complex_path, catalog_path = run.path("COMPLEX"), run.path("CATALOG")
+    with span("viz.nearby.index", "viz"):
+        index = load_complex_index(str(complex_path), get_data_version(complex_path),
+                                   str(catalog_path), get_data_version(catalog_path))
+    names = index.complexes.set_index("complexNo")["complexName"]
+    base_options = {names.get(c, c): c for c in selected_complexes if index.locate(c) is not None}
+    if not base_options:
+        st.info("선택된 단지의 좌표 정보가 없습니다.")
+        return
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    base = base_options[col1.selectbox("기준 단지", list(base_options), key="nearby_base")]
+    mode = col2.radio("조회 방식", ["반경", "가까운 순"], horizontal=True, key="nearby_mode")
+    lat, lon = index.locate(base)
+    with span("viz.nearby.query", "viz", indexed=len(index)):
+        if mode == "반경":
+            radius = col3.number_input("반경(km)", min_value=0.1, max_value=20.0, step=0.5,
+                                       value=float(SPATIAL_CONFIG["RADIUS_KM"]), key="nearby_radius")
+            df_near = index.within(lat, lon, radius, exclude=[base])
+        else:
+            k = col3.number_input("단지 수", min_value=1, max_value=100, step=1,
+                                  value=int(SPATIAL_CONFIG["NEAREST_K"]), key="nearby_k")
+            df_near = index.nearest(lat, lon, int(k), exclude=[base])
+    if df_near.empty:
+        st.info("조건에 맞는 주변 단지가 없습니다. 반경을 넓히거나 단지 목록을 먼저 채워 주세요 (warm-cache).")
+        return
+
+    df_base = index.complexes.iloc[[index.positions.get_loc(base)]].assign(distance_km=0.0)
+    df_near = pd.concat([df_base, df_near], ignore_index=True)
+    result_path = run.path("RESULT")
+    df_stats = load_complex_summary(str(result_path), get_data_version(result_path))
+    st.dataframe(
+        memoize_by_fingerprint(build_nearby_table, df_near, df_stats),
+        column_config={"단지 링크": st.column_config.LinkColumn(label="단지 링크", display_text="🔗")},
+        use_container_width=True, hide_index=True
+    )
+    st.caption(
+        f"단지 목록 {len(index):,}개 단지 기준. 가격 통계는 이번 분석에 포함된 단지만 표시되며, "
+        "주변 단지를 비교 목록에 추가해 분석하면 채워집니다."
+    )
+    st.map(df_near[["latitude", "longitude"]], zoom=13)
+
+def build_similar_table(df_similar: pd.DataFrame) -> pd.DataFrame:
+    """유사 평형 표 데이터 생성 (기준 평형이 첫 행, 가격 통계는 이번 분석에 포함된 평형만)"""
+    df = df_similar
+    return pd.DataFrame({
+        "아파트명": df["complexName"],
+        "평형": df["pyeongName3"] + "평",
+        "거리": df["distance"].round(2),
+        "전용면적(㎡)": df["exclusiveArea"].round(1),
+        "방 수": format_int_series(df["roomCnt"], na=""),
+        "세대수": format_thousands_series(df["totalHouseholdCount"]),
+        "사용승인(년)": format_int_series(df["useApproveYmd"], na=""),
+        "최고층": format_int_series(df["highFloor"], na=""),
+        "용적률": (format_int_series(df["batlRatio"]) + "%").where(df["batlRatio"].notna(), ""),
+        "세대당 주차": df["parkingCountByHousehold"].round(2),
+        "초교 도보(분)": format_int_series(df["walkTime"], na=""),
+        "매매 매물수": format_int_series(df["listings"], na=""),
+        "호가 중위": format_eokwan_series(df["ask_median"]).where(df["ask_median"].notna(), ""),
+        "5년 실거래 최고": format_eokwan_series(df["real_max_5"]).where(df["real_max_5"].notna(), ""),
+        "5년 실거래 중위": format_eokwan_series(df["real_med_5"]).where(df["real_med_5"].notna(), ""),
+        "버블 지수": df["bubble_median"].round(1),
+    })
+
+def render_similar_section(selected_pairs: List[Tuple[str, str]], run: RunHandle):
+    """유사 평형 찾기 섹션 (단지/평형 특성 벡터 최근접 이웃)"""
+    st.subheader("🧬 유사 평형 찾기")
+    scopes = {"지금까지 수집한 모든 단지": "catalog", "이번 분석 단지만": "run"}
+    scope = scopes[st.radio("비교 범위", list(scopes), horizontal=True, key="similar_scope",
+                            index=list(scopes.values()).index(SIMILARITY_CONFIG["SCOPE"]))]
+    pyeong_path, complex_path = run.path("PYEONG"), run.path("COMPLEX")
+    units_path = DATA_PATHS["UNITS"]
+    catalog = (str(units_path), get_data_version(units_path)) if scope == "catalog" else (None, 0.0)
+    with span("viz.similar.index", "viz", scope=scope):
+        index = load_similarity_index(str(pyeong_path), get_data_version(pyeong_path),
+                                      str(complex_path), get_data_version(complex_path), *catalog)
+    rows = index.locate(selected_pairs)
+    base_options = {
+        f"{index.units.at[row, 'complexName']} {pyeong}평": (complex_no, pyeong)
+        for (complex_no, pyeong), row in zip(selected_pairs, rows) if row >= 0
+    }
+    if not base_options:
+        st.info("비교 목록에서 평형까지 선택하면 비슷한 평형을 찾을 수 있습니다.")
+        return
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    complex_no, pyeong = base_options[col1.selectbox("기준 평형", list(base_options), key="similar_base")]
+    k = col2.number_input("평형 수", min_value=1, max_value=100, step=1,
+                          value=int(SIMILARITY_CONFIG["TOP_K"]), key="similar_k")
+    exclude_same = col3.checkbox("같은 단지 제외", value=True, key="similar_exclude_same")
+    result_path = run.path("RESULT")
+    summary = load_pyeong_summary(str(result_path), get_data_version(result_path))
+    with span("viz.similar.query", "viz", indexed=len(index)):
+        df_similar = similar_with_stats(index, complex_no, pyeong, summary, int(k), exclude_same)
+    st.dataframe(memoize_by_fingerprint(build_similar_table, df_similar), use_container_width=True, hide_index=True)
+    st.caption(
+        f"{len(index):,}개 단지-평형 중 세대수, 사용승인, 최고층, 용적률, 건폐율, 주차, 초교 도보, 전용면적, 방 수가 "
+        "비슷한 순 (거리: 특성별 표준화 후 가중 유클리드 거리, 작을수록 유사). "
+        "호가/실거래 통계는 이번 분석 단지에만 표시됩니다."
+    )
@@ -0,0 +1,53 @@
+"""매물 이력 저장소 회귀 테스트 (python -m pytest tests)"""
+import pandas as pd
+import pytest
+
+from src.listing_history import ListingHistory, SNAPSHOT_SOURCE_COLUMNS, TRACKED_FIELDS, record_sell_snapshot
+from src.schema import coerce
+
+
+def sell_frame(rows):
+    return coerce(pd.DataFrame(rows, columns=SNAPSHOT_SOURCE_COLUMNS), "sell")
+
+
+ARTICLE_1 = ["1", "5억", "20260101", "100", "매매", "34A", "3/15", "101동", "84"]
+ARTICLE_2 = ["2", "6억 5,000", "20260102", "100", "매매", "34A", "5/15", "102동", "84"]
+
+
+@pytest.mark.parametrize("same_timestamp", [False, True])
+def test_records_within_one_second_keep_every_delta(tmp_path, same_timestamp):
+    history = ListingHistory(tmp_path)
+    first = pd.Timestamp("2026-10-19 09:00:00.100")
+    second = first if same_timestamp else first + pd.Timedelta(milliseconds=300)
+    history.record(sell_frame([ARTICLE_1]), ["100"], snapshot_at=first)
+    history.record(sell_frame([ARTICLE_1, ARTICLE_2]), ["100"], snapshot_at=second)
+
+    assert len(list(history.deltas_dir.glob("*.parquet"))) == 2
+    restored = history.as_of(second).set_index("articleNo")
+    state = history.load_state()
+    assert sorted(restored.index) == sorted(state.index) == [1, 2]
+    for column in TRACKED_FIELDS:
+        assert restored[column].tolist() == state.loc[restored.index, column].tolist()
+    assert restored.loc[1, "first_seen"] == first
+    assert history.price_history([1])["price"].tolist() == [50000]
+
+
+@pytest.mark.parametrize("sell_file", ["missing", "header", "empty"])
+def test_run_without_listings_records_removal(tmp_path, sell_file):
+    paths = {"SELL": tmp_path / "sell_data.csv", "COMPLEX": tmp_path / "complex_data.csv",
+             "CHANGES": tmp_path / "listing_changes.csv"}
+    pd.DataFrame({"complexNo": ["100"]}).to_csv(paths["COMPLEX"], index=False)
+    pd.DataFrame([ARTICLE_1], columns=SNAPSHOT_SOURCE_COLUMNS).to_csv(paths["SELL"], index=False)
+    history = ListingHistory(tmp_path / "history")
+    record_sell_snapshot(paths, ["100"], log=lambda *_: None, history=history)
+
+    if sell_file == "missing":
+        paths["SELL"].unlink()
+    elif sell_file == "header":
+        pd.DataFrame(columns=SNAPSHOT_SOURCE_COLUMNS).to_csv(paths["SELL"], index=False)
+    else:
+        paths["SELL"].write_text("")
+    changes = record_sell_snapshot(paths, ["100"], log=lambda *_: None, history=history)
+
+    assert changes["change"].tolist() == ["removed"]
+    assert history.load_state()["status"].tolist() == ["removed"]
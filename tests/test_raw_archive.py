@@ -0,0 +1,31 @@
+"""원본 응답 보관소 정리 회귀 테스트 (python -m pytest tests)"""
+from datetime import date, timedelta
+
+from src import raw_archive
+from src.raw_archive import archive_days, archive_responses, gc_archive
+
+
+def make_day(root, days_ago, size):
+    day = (date.today() - timedelta(days=days_ago)).isoformat()
+    (root / day).mkdir(parents=True)
+    (root / day / "100.jsonl.gz").write_bytes(b"x" * size)
+    return day
+
+
+def test_gc_removes_expired_then_oldest_over_size(tmp_path):
+    old, middle, recent, today = (make_day(tmp_path, n, 100) for n in (40, 5, 1, 0))
+
+    assert gc_archive(tmp_path, max_days=30, max_bytes=0) == [old]
+    assert gc_archive(tmp_path, keep_days=[middle, today], max_days=0, max_bytes=150) == [recent]
+    assert archive_days(tmp_path) == [middle, today]
+
+
+def test_archive_close_applies_retention(tmp_path, monkeypatch):
+    old = make_day(tmp_path, 400, 10)
+    monkeypatch.setattr(raw_archive, "_last_gc", {})
+    run = date.today().isoformat() + "T09:00:00"
+    with archive_responses(run, tmp_path) as archive:
+        archive.record("https://new.land.naver.com/api/complexes/100?sameAddressGroup=false", {"ok": 1})
+
+    assert old not in archive_days(tmp_path)
+    assert archive_days(tmp_path) == [run[:10]]